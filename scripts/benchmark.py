@@ -1,218 +1,145 @@
 #!/usr/bin/env python3
 """
 Performance Benchmark for SampleMind AI
-Measures analysis speed, memory usage, and throughput
+Runs the micro-benchmark suite on synthetic fixtures and gates regressions
+
+Usage:
+    python scripts/benchmark.py run                       # print results
+    python scripts/benchmark.py run --save-baseline       # refresh the baseline
+    python scripts/benchmark.py run -o results.json --only cache.l1_get fingerprint
+    python scripts/benchmark.py compare                   # run, exit 1 on regression
+    python scripts/benchmark.py compare --current results.json --threshold 0.3
+    python scripts/benchmark.py list
+
+Baselines are machine-specific: refresh them on the runner that gates
+(same CPU, Python and dependency versions) rather than on a laptop.
 """
 
-import statistics
+import argparse
 import sys
-import time
-from dataclasses import dataclass
 from pathlib import Path
 
-import psutil
-
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from samplemind.core.engine.audio_engine import AudioEngine
-
-
-@dataclass
-class BenchmarkResult:
-    """Results from a benchmark run"""
-
-    operation: str
-    total_time: float
-    avg_time: float
-    min_time: float
-    max_time: float
-    std_dev: float
-    throughput: float  # files per second
-    memory_mb: float
-
-
-class PerformanceBenchmark:
-    """Benchmark audio processing performance"""
-
-    def __init__(self):
-        self.engine = AudioEngine(max_workers=4)
-        self.results: list[BenchmarkResult] = []
-
-    def benchmark_analysis(
-        self, test_files: list[Path], iterations: int = 3
-    ) -> BenchmarkResult:
-        """Benchmark audio analysis speed"""
+from samplemind.utils.benchmarking import (
+    BENCHMARKS,
+    DEFAULT_THRESHOLD,
+    Measurement,
+    compare_reports,
+    format_comparison,
+    has_regressions,
+    load_report,
+    run_suite,
+    save_report,
+)
+
+DEFAULT_BASELINE = Path(__file__).parent.parent / "benchmarks" / "baseline.json"
+
+
+def _print_result(result: Measurement) -> None:
+    if result.skipped:
+        print(f"  ⏭️  {result.name:32} skipped ({result.skipped})")
+    else:
         print(
-            f"\n🎯 Benchmarking audio analysis ({len(test_files)} files, {iterations} iterations)..."
+            f"  ✅ {result.name:32} median {result.median_ms:10.4f}ms  "
+            f"p95 {result.p95_ms:10.4f}ms  ({result.ops_per_second:,.0f} ops/s)"
         )
 
-        times = []
-        process = psutil.Process()
-
-        for i in range(iterations):
-            start_mem = process.memory_info().rss / 1024 / 1024
-            start_time = time.time()
 
-            for file_path in test_files:
-                self.engine.analyze_audio(file_path)
-
-            elapsed = time.time() - start_time
-            times.append(elapsed)
-
-            end_mem = process.memory_info().rss / 1024 / 1024
-            print(f"  Iteration {i+1}: {elapsed:.2f}s ({end_mem - start_mem:.1f}MB)")
-
-        result = BenchmarkResult(
-            operation="audio_analysis",
-            total_time=sum(times),
-            avg_time=statistics.mean(times),
-            min_time=min(times),
-            max_time=max(times),
-            std_dev=statistics.stdev(times) if len(times) > 1 else 0,
-            throughput=len(test_files) / statistics.mean(times),
-            memory_mb=end_mem - start_mem,
-        )
-
-        self.results.append(result)
-        return result
-
-    def benchmark_parallel(
-        self, test_files: list[Path], workers: list[int] = None
-    ) -> dict[int, BenchmarkResult]:
-        """Benchmark parallel processing with different worker counts"""
-        if workers is None:
-            workers = [1, 2, 4, 8]
-        print("\n⚡ Benchmarking parallel processing...")
-
-        results = {}
-
-        for num_workers in workers:
-            print(f"\n  Testing with {num_workers} workers...")
-            engine = AudioEngine(max_workers=num_workers)
-
-            start_time = time.time()
-            for file_path in test_files:
-                engine.analyze_audio(file_path)
-            elapsed = time.time() - start_time
-
-            result = BenchmarkResult(
-                operation=f"parallel_{num_workers}w",
-                total_time=elapsed,
-                avg_time=elapsed / len(test_files),
-                min_time=elapsed,
-                max_time=elapsed,
-                std_dev=0,
-                throughput=len(test_files) / elapsed,
-                memory_mb=0,
-            )
-
-            results[num_workers] = result
-            print(f"    {elapsed:.2f}s ({result.throughput:.2f} files/sec)")
-
-        return results
-
-    def benchmark_cache(
-        self, test_file: Path, iterations: int = 10
-    ) -> dict[str, BenchmarkResult]:
-        """Benchmark cache performance"""
-        print("\n💾 Benchmarking cache performance...")
-
-        # Cold cache
-        self.engine.clear_cache()
-        cold_times = []
-        for _ in range(3):
-            start = time.time()
-            self.engine.analyze_audio(test_file, use_cache=False)
-            cold_times.append(time.time() - start)
-
-        cold_result = BenchmarkResult(
-            operation="cache_cold",
-            total_time=sum(cold_times),
-            avg_time=statistics.mean(cold_times),
-            min_time=min(cold_times),
-            max_time=max(cold_times),
-            std_dev=statistics.stdev(cold_times),
-            throughput=1 / statistics.mean(cold_times),
-            memory_mb=0,
+def _run(args: argparse.Namespace) -> dict:
+    print("🚀 SampleMind AI Performance Benchmark")
+    print("=" * 60)
+    return run_suite(
+        names=args.only,
+        rounds=args.rounds,
+        warmup=args.warmup,
+        progress=_print_result,
+    )
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    report = _run(args)
+    if args.output:
+        save_report(report, args.output)
+        print(f"\n💾 Results written to {args.output}")
+    if args.save_baseline:
+        save_report(report, args.baseline)
+        print(f"\n📌 Baseline updated: {args.baseline}")
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    if not args.baseline.exists():
+        print(
+            f"❌ Baseline not found: {args.baseline} (create it with 'run --save-baseline')"
         )
-
-        # Warm cache
-        self.engine.analyze_audio(test_file, use_cache=True)  # Prime cache
-        warm_times = []
-        for _ in range(iterations):
-            start = time.time()
-            self.engine.analyze_audio(test_file, use_cache=True)
-            warm_times.append(time.time() - start)
-
-        warm_result = BenchmarkResult(
-            operation="cache_warm",
-            total_time=sum(warm_times),
-            avg_time=statistics.mean(warm_times),
-            min_time=min(warm_times),
-            max_time=max(warm_times),
-            std_dev=statistics.stdev(warm_times),
-            throughput=1 / statistics.mean(warm_times),
-            memory_mb=0,
+        return 2
+    baseline = load_report(args.baseline)
+    if args.current:
+        current = load_report(args.current)
+    else:
+        # Only re-run what the baseline tracks, unless told otherwise
+        args.only = args.only or sorted(set(baseline["results"]) & set(BENCHMARKS))
+        current = _run(args)
+
+    comparisons = compare_reports(baseline, current, threshold=args.threshold)
+    print()
+    if baseline.get("environment") != current.get("environment"):
+        print(
+            "⚠️  Environment differs from the baseline; timings may not be comparable\n"
         )
+    print(format_comparison(comparisons))
+    if has_regressions(comparisons):
+        regressed = [c.name for c in comparisons if c.status == "regressed"]
+        print(f"\n❌ Regressed beyond {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+    return 0
 
-        speedup = cold_result.avg_time / warm_result.avg_time
-        print(f"  Cold cache: {cold_result.avg_time:.3f}s")
-        print(f"  Warm cache: {warm_result.avg_time:.3f}s")
-        print(f"  Speedup: {speedup:.1f}x")
-
-        return {"cold": cold_result, "warm": warm_result}
-
-    def print_summary(self):
-        """Print benchmark summary"""
-        print("\n" + "=" * 60)
-        print("📊 BENCHMARK SUMMARY")
-        print("=" * 60)
 
-        for result in self.results:
-            print(f"\n{result.operation.upper()}")
-            print(f"  Average Time: {result.avg_time:.3f}s")
-            print(f"  Throughput: {result.throughput:.2f} files/sec")
-            print(f"  Std Dev: {result.std_dev:.3f}s")
-            print(f"  Memory: {result.memory_mb:.1f}MB")
+def cmd_list(args: argparse.Namespace) -> int:
+    for name in sorted(BENCHMARKS):
+        print(name)
+    return 0
 
 
-def main():
+def main(argv: list[str] | None = None) -> int:
     """Run performance benchmarks"""
-    print("🚀 SampleMind AI Performance Benchmark")
-    print("=" * 60)
-
-    # Find test files
-    test_dir = Path("tests/fixtures")
-    if not test_dir.exists():
-        print("❌ Test fixtures directory not found")
-        return
-
-    test_files = list(test_dir.glob("*.wav"))[:5]  # Use first 5 files
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
 
-    if not test_files:
-        print("❌ No test files found")
-        return
-
-    print(f"📁 Found {len(test_files)} test files")
-
-    # Run benchmarks
-    benchmark = PerformanceBenchmark()
-
-    # 1. Basic analysis
-    benchmark.benchmark_analysis(test_files, iterations=3)
-
-    # 2. Parallel processing
-    benchmark.benchmark_parallel(test_files, workers=[1, 2, 4])
-
-    # 3. Cache performance
-    if test_files:
-        benchmark.benchmark_cache(test_files[0], iterations=10)
-
-    # Print summary
-    benchmark.print_summary()
-
-    print("\n✅ Benchmark complete!")
+    def add_run_options(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--only", nargs="+", metavar="NAME", help="Benchmarks to run")
+        p.add_argument(
+            "--rounds", type=int, default=7, help="Timed rounds per benchmark"
+        )
+        p.add_argument("--warmup", type=int, default=2, help="Untimed warm-up calls")
+        p.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+
+    run = sub.add_parser("run", help="Run the suite")
+    add_run_options(run)
+    run.add_argument("-o", "--output", type=Path, help="Write results JSON here")
+    run.add_argument(
+        "--save-baseline", action="store_true", help="Overwrite the baseline"
+    )
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="Compare against the baseline")
+    add_run_options(compare)
+    compare.add_argument("--current", type=Path, help="Results JSON (default: run now)")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed relative slowdown of the median (default: %(default)s)",
+    )
+    compare.set_defaults(func=cmd_compare)
+
+    sub.add_parser("list", help="List benchmarks").set_defaults(func=cmd_list)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
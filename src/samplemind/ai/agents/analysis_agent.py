@@ -3,6 +3,9 @@ AnalysisAgent — Orchestrates AudioEngine + Claude for comprehensive music anal
 
 Uses Claude (claude-sonnet-4-6) with tool_use to drive the audio engine,
 then synthesizes the raw features into a structured analysis report.
+
+features_agent runs the (shared) AudioEngine on its own so that nodes
+needing only features can start before the language model answers.
 """
 
 from __future__ import annotations
@@ -11,58 +14,98 @@ import json
 import logging
 from typing import Any
 
+from samplemind.ai.agents.resources import AgentResources, get_agent_resources
 from samplemind.ai.agents.state import AudioAnalysisState
 
 logger = logging.getLogger(__name__)
 
 
-def analysis_agent(state: AudioAnalysisState) -> AudioAnalysisState:
+def extract_features(file_path: str, engine: Any) -> dict[str, Any]:
+    """Run AudioEngine on *file_path* and return the features dict."""
+    from samplemind.core.engine.audio_engine import AnalysisLevel
+
+    features = engine.analyze_file(file_path, level=AnalysisLevel.STANDARD)
+    return {
+        "bpm": features.bpm,
+        "key": features.key,
+        "scale": features.scale,
+        "duration": features.duration,
+        "sample_rate": features.sample_rate,
+        "rms_energy": features.rms_energy,
+        "spectral_centroid": features.spectral_centroid,
+        "spectral_bandwidth": features.spectral_bandwidth,
+        "zero_crossing_rate": features.zero_crossing_rate,
+        "mfcc_mean": (features.mfcc_mean[:5] if features.mfcc_mean is not None else []),
+    }
+
+
+def features_agent(
+    state: AudioAnalysisState, resources: AgentResources | None = None
+) -> AudioAnalysisState:
+    """
+    Node: Extract audio features with the shared AudioEngine.
+
+    Split from the AI analysis so feature consumers (tagging, mixing, …)
+    do not wait for the language model.
+    """
+    file_path = state.get("file_path", "")
+    if not file_path:
+        return {"errors": ["FeaturesAgent: no file_path"]}
+
+    resources = resources or get_agent_resources()
+    try:
+        features_dict = extract_features(file_path, resources.audio_engine)
+    except Exception as exc:
+        logger.warning("AudioEngine analysis failed: %s", exc)
+        return {
+            "current_stage": "features",
+            "progress_pct": 25,
+            "errors": [f"AudioEngine: {exc}"],
+        }
+    return {
+        "current_stage": "features",
+        "progress_pct": 25,
+        "messages": ["🔬 Audio features extracted"],
+        "audio_features": features_dict,
+        "duration": features_dict["duration"],
+        "sample_rate": features_dict["sample_rate"],
+    }
+
+
+def analysis_agent(
+    state: AudioAnalysisState, resources: AgentResources | None = None
+) -> AudioAnalysisState:
     """
     Node: Run core audio analysis.
 
-    1. Loads audio features via AudioEngine (cached).
+    1. Uses the extracted audio features (runs AudioEngine if missing).
     2. Sends features to Claude with tool_use for deep interpretation.
     3. Returns structured analysis result.
     """
     file_path = state.get("file_path", "")
     if not file_path:
-        return {"errors": state.get("errors", []) + ["AnalysisAgent: no file_path"]}
+        return {"errors": ["AnalysisAgent: no file_path"]}
 
+    resources = resources or get_agent_resources()
     updates: dict[str, Any] = {
         "current_stage": "analysis",
         "progress_pct": 10,
-        "messages": state.get("messages", []) + ["🔬 Analyzing audio features…"],
     }
-
-    try:
-        # ── Step 1: Extract audio features ─────────────────────────────────
-        from samplemind.core.engine.audio_engine import AnalysisLevel, AudioEngine
-
-        engine = AudioEngine()
-        features = engine.analyze_file(file_path, level=AnalysisLevel.STANDARD)
-        features_dict = {
-            "bpm": features.bpm,
-            "key": features.key,
-            "scale": features.scale,
-            "duration": features.duration,
-            "sample_rate": features.sample_rate,
-            "rms_energy": features.rms_energy,
-            "spectral_centroid": features.spectral_centroid,
-            "spectral_bandwidth": features.spectral_bandwidth,
-            "zero_crossing_rate": features.zero_crossing_rate,
-            "mfcc_mean": (
-                features.mfcc_mean[:5] if features.mfcc_mean is not None else []
-            ),
-        }
-        updates["audio_features"] = features_dict
-        updates["duration"] = features.duration
-        updates["sample_rate"] = features.sample_rate
-        updates["progress_pct"] = 25
-
-    except Exception as exc:
-        logger.warning("AudioEngine analysis failed: %s", exc)
-        features_dict = state.get("audio_features", {})
-        updates["errors"] = state.get("errors", []) + [f"AudioEngine: {exc}"]
+    messages = ["🔬 Analyzing audio features…"]
+    errors: list[str] = []
+
+    features_dict = state.get("audio_features") or {}
+    if not features_dict:
+        try:
+            # ── Step 1: Extract audio features (standalone use) ────────────
+            features_dict = extract_features(file_path, resources.audio_engine)
+            updates["audio_features"] = features_dict
+            updates["duration"] = features_dict["duration"]
+            updates["sample_rate"] = features_dict["sample_rate"]
+            updates["progress_pct"] = 25
+        except Exception as exc:
+            logger.warning("AudioEngine analysis failed: %s", exc)
+            errors.append(f"AudioEngine: {exc}")
 
     analysis_depth = state.get("analysis_depth", "standard")
 
@@ -108,25 +151,15 @@ def analysis_agent(state: AudioAnalysisState) -> AudioAnalysisState:
 
         else:
             # ── Step 2b: Standard/quick mode — direct AI manager call ──────
-            import asyncio
+            from samplemind.integrations.ai_manager import AnalysisType
 
-            from samplemind.integrations.ai_manager import (
-                AnalysisType,
-                SampleMindAIManager,
-            )
-
-            mgr = SampleMindAIManager()
-            loop = asyncio.new_event_loop()
-            try:
-                result = loop.run_until_complete(
-                    mgr.analyze_music(
-                        audio_features=features_dict,
-                        analysis_type=AnalysisType.COMPREHENSIVE_ANALYSIS,
-                        user_context={"file": file_path},
-                    )
+            result = resources.run_async(
+                resources.ai_manager.analyze_music(
+                    audio_features=features_dict,
+                    analysis_type=AnalysisType.COMPREHENSIVE_ANALYSIS,
+                    user_context={"file": file_path},
                 )
-            finally:
-                loop.close()
+            )
 
             if result:
                 updates["analysis_result"] = {
@@ -137,17 +170,18 @@ def analysis_agent(state: AudioAnalysisState) -> AudioAnalysisState:
                 }
 
         updates["progress_pct"] = 40
-        updates["messages"] = state.get("messages", []) + ["✅ Analysis complete"]
+        messages.append("✅ Analysis complete")
 
     except Exception as exc:
         logger.error("Claude analysis failed: %s", exc)
-        updates["errors"] = updates.get("errors", state.get("errors", [])) + [
-            f"ClaudeAnalysis: {exc}"
-        ]
+        errors.append(f"ClaudeAnalysis: {exc}")
         updates["analysis_result"] = {
             "summary": "Audio analysis completed (AI unavailable)",
             "detailed_analysis": str(features_dict),
             "provider": "fallback",
         }
 
+    updates["messages"] = messages
+    if errors:
+        updates["errors"] = errors
     return updates
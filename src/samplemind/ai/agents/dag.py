@@ -0,0 +1,262 @@
+"""
+AgentDAG — dependency-driven executor for the agent pipeline.
+
+Each node starts as soon as the nodes it depends on have finished, so
+independent branches run concurrently and end-to-end latency follows the
+critical path instead of the sum of all nodes:
+
+  - nodes run on a shared thread pool (they are blocking: audio I/O,
+    model inference, HTTP calls to AI providers)
+  - every node receives a snapshot of the merged state of its completed
+    ancestors and returns a partial update (merged with merge_update)
+  - results of cacheable nodes are kept per (node, file content hash,
+    analysis depth) so re-analysing an unchanged file skips the work
+  - wall time per node is recorded in state["node_timings"] (ms) and logged
+
+The compiled object mirrors the LangGraph app interface used by callers:
+invoke(), stream() and astream() yielding {node_name: update} chunks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from samplemind.ai.agents.state import AudioAnalysisState, merge_update
+
+logger = logging.getLogger(__name__)
+
+NodeFn = Callable[[AudioAnalysisState], AudioAnalysisState]
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_CACHE_ENTRIES = 512
+
+
+@dataclass(frozen=True)
+class AgentNode:
+    """One pipeline step: its function, prerequisites and cache policy."""
+
+    name: str
+    fn: NodeFn
+    depends_on: tuple[str, ...] = ()
+    cacheable: bool = True
+
+
+class NodeResultCache:
+    """Bounded LRU of node updates keyed by (node, file hash, depth)."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str, str], dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, str, str]) -> dict[str, Any] | None:
+        with self._lock:
+            update = self._entries.get(key)
+            if update is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(update)
+
+    def put(self, key: tuple[str, str, str], update: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = copy.deepcopy(update)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str | None:
+    """Content hash of *file_path* (None if it cannot be read)."""
+    hasher = hashlib.blake2b(digest_size=16)
+    try:
+        with open(file_path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                hasher.update(chunk)
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+
+class AgentDAG:
+    """Compiled agent pipeline; see the module docstring."""
+
+    def __init__(
+        self,
+        nodes: list[AgentNode],
+        cache: NodeResultCache | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
+        self.nodes = {node.name: node for node in nodes}
+        for node in nodes:
+            missing = [d for d in node.depends_on if d not in self.nodes]
+            if missing:
+                raise ValueError(f"Node {node.name!r} depends on unknown {missing}")
+        self._order = self._topological_order()
+        self.cache = cache
+        self.max_workers = max_workers
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        visiting: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle in agent graph at {name!r}")
+            visiting.add(name)
+            for dep in self.nodes[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    def critical_path(self, timings: dict[str, float]) -> float:
+        """Longest dependency chain (ms) for a run's node_timings."""
+        finish: dict[str, float] = {}
+        for name in self._order:
+            deps = self.nodes[name].depends_on
+            start = max((finish[d] for d in deps), default=0.0)
+            finish[name] = start + timings.get(name, 0.0)
+        return max(finish.values(), default=0.0)
+
+    # ── Execution ─────────────────────────────────────────────────────────────
+
+    def _run_node(
+        self, node: AgentNode, snapshot: dict[str, Any], file_hash: str | None
+    ) -> dict[str, Any]:
+        key = None
+        if self.cache is not None and node.cacheable and file_hash:
+            key = (
+                node.name,
+                file_hash,
+                str(snapshot.get("analysis_depth", "standard")),
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug("Agent node %s: cache hit", node.name)
+                cached["node_timings"] = {node.name: 0.0}
+                return cached
+
+        start = time.perf_counter()
+        try:
+            update = dict(node.fn(snapshot) or {})
+        except Exception as exc:
+            # A failing node must not take the rest of the pipeline down
+            logger.exception("Agent node %s failed", node.name)
+            update = {"errors": [f"{node.name}: {exc}"]}
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info("Agent node %s took %.1f ms", node.name, elapsed_ms)
+
+        if key is not None and not update.get("errors"):
+            self.cache.put(key, update)
+        update["node_timings"] = {node.name: round(elapsed_ms, 3)}
+        return update
+
+    def stream(self, state: AudioAnalysisState) -> Iterator[dict[str, dict[str, Any]]]:
+        """Run the pipeline, yielding {node: update} as each node finishes."""
+        merged: dict[str, Any] = dict(state)
+        file_hash = None
+        if self.cache is not None and merged.get("file_path"):
+            file_hash = file_digest(merged["file_path"])
+
+        done: set[str] = set()
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="agent-node"
+        ) as pool:
+            while len(done) < len(self.nodes):
+                for name in self._order:
+                    node = self.nodes[name]
+                    if (
+                        name not in done
+                        and name not in running.values()
+                        and all(d in done for d in node.depends_on)
+                    ):
+                        snapshot = copy.copy(merged)
+                        running[
+                            pool.submit(self._run_node, node, snapshot, file_hash)
+                        ] = name
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    update = future.result()
+                    merge_update(merged, update)
+                    done.add(name)
+                    yield {name: update}
+
+    def invoke(self, state: AudioAnalysisState) -> AudioAnalysisState:
+        """Run the pipeline to completion and return the merged state."""
+        merged: dict[str, Any] = dict(state)
+        for chunk in self.stream(state):
+            for update in chunk.values():
+                merge_update(merged, update)
+        return merged  # type: ignore[return-value]
+
+    async def astream(
+        self, state: AudioAnalysisState
+    ) -> AsyncIterator[dict[str, dict[str, Any]]]:
+        """Async variant of stream(); the pipeline runs off the event loop."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        sentinel = object()
+
+        def produce() -> None:
+            try:
+                for chunk in self.stream(state):
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except BaseException as exc:
+                loop.call_soon_threadsafe(queue.put_nowait, exc)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, sentinel)
+
+        producer = threading.Thread(target=produce, name="agent-dag", daemon=True)
+        producer.start()
+        while (item := await queue.get()) is not sentinel:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+def bind(fn: Callable[..., AudioAnalysisState], **kwargs: Any) -> NodeFn:
+    """Inject shared dependencies (e.g. resources=...) into a node function."""
+
+    def node(state: AudioAnalysisState) -> AudioAnalysisState:
+        return fn(state, **kwargs)
+
+    node.__name__ = getattr(fn, "__name__", "node")
+    return node
+
+
+__all__ = [
+    "AgentDAG",
+    "AgentNode",
+    "NodeResultCache",
+    "bind",
+    "file_digest",
+]
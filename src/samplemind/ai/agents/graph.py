@@ -1,17 +1,17 @@
 """
-SampleMind LangGraph Agent Graph — Phase 16 / v3.0
+SampleMind Agent Graph — Phase 16 / v3.0
 
-Orchestrates the multi-agent pipeline (7 nodes):
+Orchestrates the multi-agent pipeline as a dependency DAG (9 nodes):
 
-  Entry → Router → AnalysisAgent
-                 → TaggingAgent
-                 → MixingAgent
-                 → QualityAgent      ← NEW (P3-006)
-                 → RecommendationAgent
-                 → PackBuilderAgent
-                 → Aggregator → END
+  Router ─┬→ Features ─┬→ Analysis ──────────────┐
+          │            └→ Tagging ─┬→ Mixing ────┴→ PackBuilder ─┐
+          │                        └→ Recommendations ───────────┤
+          └→ Quality ────────────────────────────────────────────┴→ Aggregator
 
-Agents run sequentially (each builds on prior results).
+Each node starts as soon as its inputs are ready (see dag.AgentDAG), so
+quality checks, LLM analysis and tagging overlap instead of running back to
+back.  Engines and classifiers come from a shared AgentResources, and node
+results are cached per file content hash.
 The graph is designed for:
 - Synchronous use via run_analysis_pipeline()
 - Async streaming via stream_analysis_pipeline()
@@ -22,6 +22,7 @@ Usage:
 
     result: AudioAnalysisState = run_analysis_pipeline("/path/to/sample.wav")
     print(result["final_report"])
+    print(result["node_timings"])
 """
 
 from __future__ import annotations
@@ -30,7 +31,10 @@ import logging
 from collections.abc import AsyncIterator
 from pathlib import Path
 
+from samplemind.ai.agents.dag import AgentDAG, AgentNode, NodeResultCache, bind
+from samplemind.ai.agents.resources import AgentResources, get_agent_resources
 from samplemind.ai.agents.state import AudioAnalysisState
+from samplemind.core.progress import agent_topic, publish_progress
 
 logger = logging.getLogger(__name__)
 
@@ -43,15 +47,20 @@ def router_node(state: AudioAnalysisState) -> AudioAnalysisState:
     Validate input and set default pipeline configuration.
     """
     file_path = state.get("file_path", "")
-    errors = list(state.get("errors", []))
 
     if not file_path:
-        errors.append("router: file_path is required")
-        return {"errors": errors, "current_stage": "error", "progress_pct": 0}
+        return {
+            "errors": ["router: file_path is required"],
+            "current_stage": "error",
+            "progress_pct": 0,
+        }
 
     if not Path(file_path).exists():
-        errors.append(f"router: file not found: {file_path}")
-        return {"errors": errors, "current_stage": "error", "progress_pct": 0}
+        return {
+            "errors": [f"router: file not found: {file_path}"],
+            "current_stage": "error",
+            "progress_pct": 0,
+        }
 
     return {
         "current_stage": "routing",
@@ -59,9 +68,6 @@ def router_node(state: AudioAnalysisState) -> AudioAnalysisState:
         "messages": [f"📂 Processing: {Path(file_path).name}"],
         "analysis_depth": state.get("analysis_depth", "standard"),
         "requested_agents": state.get("requested_agents", []),
-        "tool_calls": [],
-        "tool_results": [],
-        "errors": errors,
     }
 
 
@@ -82,70 +88,98 @@ def aggregator_node(state: AudioAnalysisState) -> AudioAnalysisState:
         "similar_samples": state.get("similar_samples", []),
         "pack_manifest": state.get("pack_manifest", {}),
         "errors": state.get("errors", []),
+        "node_timings": dict(state.get("node_timings", {})),
     }
     return {
         "final_report": final_report,
         "current_stage": "done",
         "progress_pct": 100,
-        "messages": state.get("messages", []) + ["🎉 Pipeline complete!"],
+        "messages": ["🎉 Pipeline complete!"],
     }
 
 
 # ── Graph builder ─────────────────────────────────────────────────────────────
 
 
-def build_graph():
+_node_cache = NodeResultCache()
+
+
+def build_graph(
+    resources: AgentResources | None = None,
+    cache: NodeResultCache | None = _node_cache,
+    max_workers: int = 8,
+) -> AgentDAG:
     """
-    Build and compile the LangGraph StateGraph.
+    Build the agent DAG.
+
+    Args:
+        resources: Shared engines/models (defaults to the process-wide set)
+        cache: Node result cache; pass None to always recompute
+        max_workers: Upper bound on concurrently running nodes
 
     Returns:
-        Compiled LangGraph app ready for .invoke() and .stream()
+        Compiled AgentDAG ready for .invoke(), .stream() and .astream()
     """
-    try:
-        from langgraph.graph import END, StateGraph
-
-        from samplemind.ai.agents.analysis_agent import analysis_agent
-        from samplemind.ai.agents.mixing_agent import mixing_agent
-        from samplemind.ai.agents.pack_builder_agent import pack_builder_agent
-        from samplemind.ai.agents.quality_agent import quality_agent
-        from samplemind.ai.agents.recommendation_agent import recommendation_agent
-        from samplemind.ai.agents.tagging_agent import tagging_agent
-
-        graph = StateGraph(AudioAnalysisState)
-
-        # Register nodes (7-node pipeline)
-        graph.add_node("router", router_node)
-        graph.add_node("analysis", analysis_agent)
-        graph.add_node("tagging", tagging_agent)
-        graph.add_node("mixing", mixing_agent)
-        graph.add_node("quality", quality_agent)  # P3-006
-        graph.add_node("recommendations", recommendation_agent)
-        graph.add_node("pack_builder", pack_builder_agent)
-        graph.add_node("aggregator", aggregator_node)
-
-        # Linear pipeline edges
-        graph.set_entry_point("router")
-        graph.add_edge("router", "analysis")
-        graph.add_edge("analysis", "tagging")
-        graph.add_edge("tagging", "mixing")
-        graph.add_edge("mixing", "quality")  # quality gate
-        graph.add_edge("quality", "recommendations")
-        graph.add_edge("recommendations", "pack_builder")
-        graph.add_edge("pack_builder", "aggregator")
-        graph.add_edge("aggregator", END)
-
-        return graph.compile()
-
-    except ImportError as exc:
-        raise ImportError(
-            "LangGraph is required for the agent system. "
-            "Install with: pip install langgraph"
-        ) from exc
+    from samplemind.ai.agents.analysis_agent import analysis_agent, features_agent
+    from samplemind.ai.agents.mixing_agent import mixing_agent
+    from samplemind.ai.agents.pack_builder_agent import pack_builder_agent
+    from samplemind.ai.agents.quality_agent import quality_agent
+    from samplemind.ai.agents.recommendation_agent import recommendation_agent
+    from samplemind.ai.agents.tagging_agent import tagging_agent
+
+    resources = resources or get_agent_resources()
+
+    nodes = [
+        AgentNode("router", router_node, cacheable=False),
+        AgentNode("features", bind(features_agent, resources=resources), ("router",)),
+        AgentNode("quality", quality_agent, ("router",)),  # P3-006
+        AgentNode("analysis", bind(analysis_agent, resources=resources), ("features",)),
+        AgentNode("tagging", bind(tagging_agent, resources=resources), ("features",)),
+        AgentNode("mixing", mixing_agent, ("tagging",)),
+        AgentNode(
+            "recommendations",
+            bind(recommendation_agent, resources=resources),
+            ("tagging",),
+            # Similar samples depend on the library, not only on this file
+            cacheable=False,
+        ),
+        AgentNode("pack_builder", pack_builder_agent, ("analysis", "mixing")),
+        AgentNode(
+            "aggregator",
+            aggregator_node,
+            ("pack_builder", "quality", "recommendations"),
+            cacheable=False,
+        ),
+    ]
+    return AgentDAG(nodes, cache=cache, max_workers=max_workers)
 
 
 # ── Convenience runners ───────────────────────────────────────────────────────
 
 
+def _initial_state(
+    file_path: str,
+    user_id: str | None,
+    session_id: str | None,
+    analysis_depth: str,
+) -> AudioAnalysisState:
+    return {
+        "file_path": file_path,
+        "user_id": user_id,
+        "session_id": session_id,
+        "analysis_depth": analysis_depth,
+        "requested_agents": [],
+        "audio_features": {},
+        "messages": [],
+        "errors": [],
+        "tool_calls": [],
+        "tool_results": [],
+        "node_timings": {},
+        "current_stage": "init",
+        "progress_pct": 0,
+    }
+
+
 def run_analysis_pipeline(
     file_path: str,
     user_id: str | None = None,
@@ -165,25 +199,15 @@ def run_analysis_pipeline(
         Final AudioAnalysisState with all agent outputs populated
     """
     app = build_graph()
-    initial_state: AudioAnalysisState = {
-        "file_path": file_path,
-        "user_id": user_id,
-        "session_id": session_id,
-        "analysis_depth": analysis_depth,
-        "requested_agents": [],
-        "audio_features": {},
-        "messages": [],
-        "errors": [],
-        "tool_calls": [],
-        "tool_results": [],
-        "current_stage": "init",
-        "progress_pct": 0,
-    }
+    initial_state = _initial_state(file_path, user_id, session_id, analysis_depth)
     result = app.invoke(initial_state)
+    timings = result.get("node_timings", {})
     logger.info(
-        "Pipeline complete for %s — %d errors",
+        "Pipeline complete for %s — %d errors, critical path %.0f ms (sum %.0f ms)",
         file_path,
         len(result.get("errors", [])),
+        app.critical_path(timings),
+        sum(timings.values()),
     )
     return result
 
@@ -197,23 +221,23 @@ async def stream_analysis_pipeline(
     """
     Stream agent state updates as they occur (for WebSocket/SSE endpoints).
 
-    Yields partial AudioAnalysisState after each node completes.
+    Yields each node's partial AudioAnalysisState as soon as it completes
+    (independent nodes complete in whichever order they finish).
     """
     app = build_graph()
-    initial_state: AudioAnalysisState = {
-        "file_path": file_path,
-        "user_id": user_id,
-        "session_id": session_id,
-        "analysis_depth": analysis_depth,
-        "requested_agents": [],
-        "audio_features": {},
-        "messages": [],
-        "errors": [],
-        "tool_calls": [],
-        "tool_results": [],
-        "current_stage": "init",
-        "progress_pct": 0,
-    }
+    initial_state = _initial_state(file_path, user_id, session_id, analysis_depth)
     async for chunk in app.astream(initial_state):
-        for _node_name, node_state in chunk.items():
+        for node_name, node_state in chunk.items():
+            if session_id:
+                stage = node_state.get("current_stage", "")
+                publish_progress(
+                    agent_topic(session_id),
+                    {
+                        "stage": stage,
+                        "pct": node_state.get("progress_pct", 0),
+                        "node": node_name,
+                        "ms": node_state.get("node_timings", {}).get(node_name),
+                    },
+                    final=stage == "done",
+                )
             yield node_state
@@ -79,8 +79,6 @@ def mixing_agent(state: AudioAnalysisState) -> AudioAnalysisState:
     updates: dict[str, Any] = {
         "current_stage": "mixing",
         "progress_pct": 70,
-        "messages": state.get("messages", [])
-        + ["🎚️ Computing mixing recommendations…"],
     }
 
     bpm = features.get("bpm") or 0.0
@@ -149,8 +147,9 @@ def mixing_agent(state: AudioAnalysisState) -> AudioAnalysisState:
     }
 
     updates["mixing_recommendations"] = mixing_rec
-    updates["messages"] = state.get("messages", []) + [
-        "✅ Mixing recommendations ready"
+    updates["messages"] = [
+        "🎚️ Computing mixing recommendations…",
+        "✅ Mixing recommendations ready",
     ]
     updates["progress_pct"] = 78
 
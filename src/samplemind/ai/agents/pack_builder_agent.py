@@ -29,7 +29,6 @@ def pack_builder_agent(state: AudioAnalysisState) -> AudioAnalysisState:
     updates: dict[str, Any] = {
         "current_stage": "pack_builder",
         "progress_pct": 92,
-        "messages": state.get("messages", []) + ["📦 Building pack manifest…"],
     }
 
     # ── Derive pack metadata ─────────────────────────────────────────────────
@@ -83,7 +82,7 @@ def pack_builder_agent(state: AudioAnalysisState) -> AudioAnalysisState:
     }
 
     updates["pack_manifest"] = pack_manifest
-    updates["messages"] = state.get("messages", []) + ["✅ Pack manifest ready"]
+    updates["messages"] = ["📦 Building pack manifest…", "✅ Pack manifest ready"]
     updates["progress_pct"] = 95
 
     return updates
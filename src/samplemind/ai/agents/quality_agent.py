@@ -164,17 +164,16 @@ def quality_agent(state: AudioAnalysisState) -> AudioAnalysisState:
     """
     Node: Run audio quality checks and populate state['quality_flags'].
 
-    Sits between the mixing agent and the recommendation agent so that
-    quality issues can influence the final report.
+    Depends only on the file, so it runs alongside feature extraction;
+    its flags are included in the final report.
     """
     file_path: str = state.get("file_path", "")
-    messages: list[str] = list(state.get("messages", []))
-    errors: list[str] = list(state.get("errors", []))
+    messages: list[str] = ["🔍 Running quality checks…"]
 
     updates: dict[str, Any] = {
         "current_stage": "quality",
         "progress_pct": 65,
-        "messages": messages + ["🔍 Running quality checks…"],
+        "messages": messages,
     }
 
     if not file_path or not Path(file_path).exists():
@@ -201,8 +200,7 @@ def quality_agent(state: AudioAnalysisState) -> AudioAnalysisState:
 
     except Exception as exc:
         logger.warning("QualityAgent failed for %s: %s", file_path, exc)
-        errors.append(f"quality_agent: {exc}")
-        updates["errors"] = errors
+        updates["errors"] = [f"quality_agent: {exc}"]
         updates["quality_flags"] = {"error": str(exc)}
         updates["messages"] = messages + [f"⚠️ Quality check failed: {exc}"]
 
@@ -8,38 +8,40 @@ samples that are harmonically or spectrally similar to the input.
 from __future__ import annotations
 
 import logging
+from pathlib import Path
 from typing import Any
 
+from samplemind.ai.agents.resources import AgentResources, get_agent_resources
 from samplemind.ai.agents.state import AudioAnalysisState
 
 logger = logging.getLogger(__name__)
 
 
-def recommendation_agent(state: AudioAnalysisState) -> AudioAnalysisState:
+def recommendation_agent(
+    state: AudioAnalysisState, resources: AgentResources | None = None
+) -> AudioAnalysisState:
     """
     Node: Find similar samples via vector similarity search.
     """
     file_path = state.get("file_path", "")
-    state.get("audio_features", {})
+    resources = resources or get_agent_resources()
 
     updates: dict[str, Any] = {
         "current_stage": "recommendations",
         "progress_pct": 82,
-        "messages": state.get("messages", []) + ["🔍 Finding similar samples…"],
     }
 
     similar: list[dict[str, Any]] = []
 
     try:
-        from samplemind.core.similarity.similarity import AudioEmbeddingEngine
-
-        embedding_engine = AudioEmbeddingEngine()
-        results = embedding_engine.find_similar(file_path, top_k=5)
+        if not Path(file_path).is_file():
+            raise FileNotFoundError(f"Audio file not found: {file_path}")
+        results = resources.similarity_db.find_similar(Path(file_path), n_results=5)
         similar = [
             {
-                "path": str(r.path),
-                "score": round(r.score, 4),
-                "bpm": r.metadata.get("bpm"),
+                "path": str(r.file_path),
+                "score": round(r.similarity, 4),
+                "bpm": r.metadata.get("tempo"),
                 "key": r.metadata.get("key"),
             }
             for r in (results or [])
@@ -55,11 +57,12 @@ def recommendation_agent(state: AudioAnalysisState) -> AudioAnalysisState:
                 "score": 0.0,
             }
         ]
-        updates["errors"] = state.get("errors", []) + [f"RecommendationAgent: {exc}"]
+        updates["errors"] = [f"RecommendationAgent: {exc}"]
 
     updates["similar_samples"] = similar
-    updates["messages"] = state.get("messages", []) + [
-        f"✅ Found {len(similar)} similar sample(s)"
+    updates["messages"] = [
+        "🔍 Finding similar samples…",
+        f"✅ Found {len(similar)} similar sample(s)",
     ]
     updates["progress_pct"] = 88
 
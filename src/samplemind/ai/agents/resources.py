@@ -0,0 +1,158 @@
+"""
+AgentResources — engines and models shared by the agent nodes.
+
+Constructing AudioEngine, the classifiers or the AI manager is far more
+expensive than a typical node run, so they are created once (lazily, on
+first use) and injected into every node by the DAG executor.  Tests and
+callers can pass ready-made instances instead:
+
+    resources = AgentResources(audio_engine=my_engine)
+    build_graph(resources=resources).invoke(state)
+
+Coroutines of the shared AI manager run on one background event loop so
+its async clients are never used from two loops.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _audio_engine() -> Any:
+    from samplemind.core.engine.audio_engine import AudioEngine
+
+    return AudioEngine()
+
+
+def _ai_manager() -> Any:
+    from samplemind.integrations.ai_manager import SampleMindAIManager
+
+    return SampleMindAIManager()
+
+
+def _embedding_engine() -> Any:
+    from samplemind.core.similarity.embedding_engine import AudioEmbeddingEngine
+
+    return AudioEmbeddingEngine()
+
+
+def _similarity_db() -> Any:
+    from samplemind.core.similarity.similarity_db import SimilarityDatabase
+
+    return SimilarityDatabase()
+
+
+def _genre_classifier() -> Any:
+    from samplemind.ai.classification.multi_label_genre import (
+        MultiLabelGenreClassifier,
+    )
+
+    return MultiLabelGenreClassifier(threshold=0.30, top_k=5, use_clap=False)
+
+
+def _mood_detector() -> Any:
+    from samplemind.ai.classification.mood_detector import MoodDetector
+
+    return MoodDetector(use_clap=False)
+
+
+def _instrument_detector() -> Any:
+    from samplemind.ai.classification.instrument_detector import InstrumentDetector
+
+    return InstrumentDetector(top_k=3, use_clap=False)
+
+
+_FACTORIES: dict[str, Callable[[], Any]] = {
+    "audio_engine": _audio_engine,
+    "ai_manager": _ai_manager,
+    "embedding_engine": _embedding_engine,
+    "similarity_db": _similarity_db,
+    "genre_classifier": _genre_classifier,
+    "mood_detector": _mood_detector,
+    "instrument_detector": _instrument_detector,
+}
+
+
+class AgentResources:
+    """Lazily created, thread-safe registry of shared engines and models."""
+
+    def __init__(self, **instances: Any) -> None:
+        unknown = set(instances) - set(_FACTORIES)
+        if unknown:
+            raise TypeError(f"Unknown agent resources: {sorted(unknown)}")
+        self._instances: dict[str, Any] = dict(instances)
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self, name: str) -> Any:
+        """Return resource *name*, constructing it on first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances:
+                logger.info("Loading agent resource: %s", name)
+                self._instances[name] = _FACTORIES[name]()
+            return self._instances[name]
+
+    @property
+    def audio_engine(self) -> Any:
+        return self.get("audio_engine")
+
+    @property
+    def ai_manager(self) -> Any:
+        return self.get("ai_manager")
+
+    @property
+    def embedding_engine(self) -> Any:
+        return self.get("embedding_engine")
+
+    @property
+    def similarity_db(self) -> Any:
+        return self.get("similarity_db")
+
+    @property
+    def genre_classifier(self) -> Any:
+        return self.get("genre_classifier")
+
+    @property
+    def mood_detector(self) -> Any:
+        return self.get("mood_detector")
+
+    @property
+    def instrument_detector(self) -> Any:
+        return self.get("instrument_detector")
+
+    def run_async(
+        self, coro: Coroutine[Any, Any, T], timeout: float | None = None
+    ) -> T:
+        """Run *coro* on the shared background event loop and wait for it."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="agent-resources-loop", daemon=True
+                ).start()
+                self._loop = loop
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+
+_resources: AgentResources | None = None
+_resources_lock = threading.Lock()
+
+
+def get_agent_resources() -> AgentResources:
+    """Process-wide AgentResources used when none is injected."""
+    global _resources
+    with _resources_lock:
+        if _resources is None:
+            _resources = AgentResources()
+        return _resources
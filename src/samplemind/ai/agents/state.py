@@ -1,8 +1,10 @@
 """
 AudioAnalysisState — Shared state schema for the LangGraph agent graph.
 
-Each node in the graph receives and returns a partial or full AudioAnalysisState.
-LangGraph merges updates via TypedDict semantics (last-write wins per key).
+Each node in the graph receives a state snapshot and returns a partial update.
+The DAG executor merges updates with merge_update(): list keys in LIST_KEYS
+are appended (nodes return only their new entries), node_timings is merged,
+progress_pct keeps the maximum and every other key is last-write-wins.
 """
 
 from __future__ import annotations
@@ -52,3 +54,23 @@ class AudioAnalysisState(TypedDict, total=False):
     # ── Final aggregated output ──────────────────────────────────────────────
     final_report: dict[str, Any] | None
     errors: list[str]  # Non-fatal errors accumulated
+
+    # ── Instrumentation ──────────────────────────────────────────────────────
+    node_timings: dict[str, float]  # Wall time per node in ms
+
+
+# Keys whose updates are appended rather than replaced
+LIST_KEYS = frozenset({"messages", "errors", "tool_calls", "tool_results"})
+
+
+def merge_update(state: dict[str, Any], update: dict[str, Any]) -> None:
+    """Merge one node's partial *update* into *state* in place."""
+    for key, value in update.items():
+        if key in LIST_KEYS:
+            state[key] = list(state.get(key, [])) + list(value or [])
+        elif key == "node_timings":
+            state[key] = {**state.get(key, {}), **value}
+        elif key == "progress_pct":
+            state[key] = max(state.get(key, 0), value)
+        else:
+            state[key] = value
@@ -11,6 +11,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from samplemind.ai.agents.resources import AgentResources, get_agent_resources
 from samplemind.ai.agents.state import AudioAnalysisState
 
 logger = logging.getLogger(__name__)
@@ -30,17 +31,17 @@ _MAJOR_MOODS = ["energetic", "happy", "uplifting", "bright"]
 _MINOR_MOODS = ["melancholic", "dark", "emotional", "introspective"]
 
 
-def tagging_agent(state: AudioAnalysisState) -> AudioAnalysisState:
+def tagging_agent(
+    state: AudioAnalysisState, resources: AgentResources | None = None
+) -> AudioAnalysisState:
     """
-    Node: Generate multi-label tags from audio features and analysis.
+    Node: Generate multi-label tags from audio features.
     """
     features = state.get("audio_features", {})
-    state.get("analysis_result", {})
 
     updates: dict[str, Any] = {
         "current_stage": "tagging",
         "progress_pct": 55,
-        "messages": state.get("messages", []) + ["🏷️ Generating tags…"],
     }
 
     tags: dict[str, Any] = {
@@ -104,31 +105,22 @@ def tagging_agent(state: AudioAnalysisState) -> AudioAnalysisState:
     # ── Multi-label genre + mood + instrument (Steps 17 & 18) ────────────────
     file_path = state.get("file_path", "")
     if file_path:
+        resources = resources or get_agent_resources()
         try:
-            from samplemind.ai.classification.instrument_detector import (
-                InstrumentDetector,
-            )
-            from samplemind.ai.classification.mood_detector import MoodDetector
-            from samplemind.ai.classification.multi_label_genre import (
-                MultiLabelGenreClassifier,
-            )
-
-            genre_clf = MultiLabelGenreClassifier(
-                threshold=0.30, top_k=5, use_clap=False
-            )
+            genre_clf = resources.genre_classifier
             genre_result = genre_clf.classify_file(file_path)
             if genre_result.all_genres:
                 tags["genre"] = genre_result.all_genres
                 tags["key_info"]["camelot"] = genre_result.camelot
 
-            mood_det = MoodDetector(use_clap=False)
+            mood_det = resources.mood_detector
             mood_result = mood_det.detect_file(file_path)
             if mood_result.moods:
                 tags["mood"] = mood_result.moods
                 tags["valence"] = mood_result.valence
                 tags["arousal"] = mood_result.arousal
 
-            instr_det = InstrumentDetector(top_k=3, use_clap=False)
+            instr_det = resources.instrument_detector
             instr_result = instr_det.detect_file(file_path)
             if instr_result.instruments:
                 tags["instrument_hints"] = instr_result.instruments
@@ -149,7 +141,7 @@ def tagging_agent(state: AudioAnalysisState) -> AudioAnalysisState:
     )
 
     updates["tags"] = tags
-    updates["messages"] = state.get("messages", []) + ["✅ Tags generated"]
+    updates["messages"] = ["🏷️ Generating tags…", "✅ Tags generated"]
     updates["progress_pct"] = 65
 
     return updates
@@ -5,6 +5,7 @@ automatically tag samples based on their audio content.
 """
 
 import logging
+from collections.abc import Callable
 from pathlib import Path
 
 from samplemind.core.engine.audio_engine import AudioFeatures
@@ -56,7 +57,7 @@ class AutoTagger:
         self,
         file_paths: list[Path],
         get_features_fn,
-        progress_callback: callable | None = None,
+        progress_callback: Callable | None = None,
     ) -> dict[Path, list[str]]:
         """Automatically tag multiple samples.
 
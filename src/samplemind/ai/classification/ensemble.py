@@ -24,6 +24,10 @@ Usage::
     label, confidence = clf.predict_one(features, task="energy")
     if confidence < 0.6:
         print("Uncertain — logged for review")
+
+    # Whole library at once: one predict_proba call per model
+    batch = clf.predict_batch(X_library, task="energy")
+    batch.labels, batch.confidences, batch.is_uncertain
 """
 
 from __future__ import annotations
@@ -31,9 +35,11 @@ from __future__ import annotations
 import json
 import logging
 import os
+from collections.abc import Iterator, Sequence
 from datetime import UTC, datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Literal, NamedTuple
+from typing import Literal, NamedTuple, overload
 
 import numpy as np
 
@@ -61,6 +67,70 @@ class PredictionResult(NamedTuple):
     model_votes: dict[str, str]  # {model_name: predicted_label}
 
 
+class BatchPrediction(Sequence[PredictionResult]):
+    """
+    Ensemble predictions for a feature matrix, backed by arrays.
+
+    Vectorised accessors (``confidences``, ``is_uncertain``, ``label_indices``)
+    are free; label strings and per-row PredictionResult objects are only
+    built when asked for.
+    """
+
+    def __init__(
+        self,
+        classes: list[str],
+        probabilities: np.ndarray,
+        model_votes: dict[str, np.ndarray],
+        threshold: float = UNCERTAINTY_THRESHOLD,
+    ) -> None:
+        self.classes = classes
+        self.probabilities = probabilities  # [n_samples, n_classes]
+        self.model_votes = model_votes  # {model_name: [n_samples] class index}
+        self.label_indices = np.argmax(probabilities, axis=1)
+        self.confidences = probabilities[
+            np.arange(len(probabilities)), self.label_indices
+        ]
+        self.is_uncertain = self.confidences < threshold
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    @overload
+    def __getitem__(self, index: int) -> PredictionResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PredictionResult]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return PredictionResult(
+            label=self.classes[self.label_indices[index]],
+            confidence=float(self.confidences[index]),
+            probabilities=dict(
+                zip(self.classes, self.probabilities[index].tolist(), strict=False)
+            ),
+            is_uncertain=bool(self.is_uncertain[index]),
+            model_votes={
+                name: self.classes[votes[index]]
+                for name, votes in self.model_votes.items()
+            },
+        )
+
+    def __iter__(self) -> Iterator[PredictionResult]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @cached_property
+    def labels(self) -> list[str]:
+        """Predicted label per row."""
+        return np.asarray(self.classes, dtype=object)[self.label_indices].tolist()
+
+
 class EnsembleClassifier:
     """
     Soft-voting ensemble: SVM + XGBoost + KNN.
@@ -216,9 +286,58 @@ class EnsembleClassifier:
         self,
         feature_matrix: np.ndarray,
         task: Task,
-    ) -> list[PredictionResult]:
-        """Predict labels for a batch of feature vectors."""
-        return [self.predict_one(row, task) for row in feature_matrix]
+    ) -> BatchPrediction:
+        """
+        Predict labels for a batch of feature vectors.
+
+        Each model's predict_proba runs once on the whole matrix; soft
+        voting and uncertainty flags are array operations, and uncertain
+        rows are appended to the active-learning log in a single write.
+        """
+        X = np.asarray(feature_matrix)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        classes = self._classes.get(task, [])
+        models = self._models.get(task, {})
+
+        if not models or not classes:
+            raise ValueError(f"Ensemble not trained for task={task}. Call fit() first.")
+
+        prob_sum = np.zeros((len(X), len(classes)), dtype=np.float64)
+        model_votes: dict[str, np.ndarray] = {}
+
+        for name, model in models.items():
+            try:
+                proba = np.asarray(model.predict_proba(X), dtype=np.float64)
+                if proba.shape != prob_sum.shape:
+                    # Model does not batch properly — fall back to per-row calls
+                    proba = np.vstack(
+                        [
+                            np.asarray(model.predict_proba(row.reshape(1, -1)))[0]
+                            for row in X
+                        ]
+                    )
+            except Exception as exc:
+                logger.debug("Model %s predict_proba failed: %s", name, exc)
+                continue
+            prob_sum += proba
+            model_votes[name] = np.argmax(proba, axis=1)
+
+        if not model_votes:
+            raise RuntimeError("All ensemble models failed during prediction")
+
+        # Soft voting: average probabilities
+        batch = BatchPrediction(classes, prob_sum / len(model_votes), model_votes)
+
+        uncertain_rows = np.flatnonzero(batch.is_uncertain)
+        if len(uncertain_rows):
+            self._log_uncertain_batch(
+                np.linalg.norm(X[uncertain_rows], axis=1),
+                task,
+                [classes[i] for i in batch.label_indices[uncertain_rows]],
+                batch.confidences[uncertain_rows],
+            )
+        return batch
 
     # ── Active learning ───────────────────────────────────────────────────────
 
@@ -241,6 +360,36 @@ class EnsembleClassifier:
         with log_path.open("a") as f:
             f.write(json.dumps(record) + "\n")
 
+    def _log_uncertain_batch(
+        self,
+        feature_norms: np.ndarray,
+        task: str,
+        predicted_labels: list[str],
+        confidences: np.ndarray,
+    ) -> None:
+        """Append many uncertain samples to the queue with a single write."""
+        timestamp = datetime.now(UTC).isoformat()
+        lines = [
+            json.dumps(
+                {
+                    "timestamp": timestamp,
+                    "task": task,
+                    "predicted_label": label,
+                    "confidence": confidence,
+                    "feature_norm": norm,
+                }
+            )
+            for label, confidence, norm in zip(
+                predicted_labels,
+                confidences.tolist(),
+                feature_norms.tolist(),
+                strict=True,
+            )
+        ]
+        log_path = ACTIVE_LEARNING_DIR / "uncertain.jsonl"
+        with log_path.open("a") as f:
+            f.write("\n".join(lines) + "\n")
+
     def get_uncertain_count(self) -> int:
         """Return number of uncertain samples pending review."""
         log_path = ACTIVE_LEARNING_DIR / "uncertain.jsonl"
@@ -0,0 +1,30 @@
+"""
+SampleMind AI - Batch Job Subsystem
+Durable job state, a shared fair-queue worker pool and streaming uploads
+for the /batch API
+"""
+
+from .job_store import (
+    BatchJob,
+    BatchJobStore,
+    JobStatus,
+    RedisJobStore,
+    SQLiteJobStore,
+    create_job_store,
+)
+from .uploads import UploadTooLargeError, safe_filename, save_upload_to_disk
+from .worker_pool import BatchWorkerPool, analyze_file
+
+__all__ = [
+    "BatchJob",
+    "BatchJobStore",
+    "JobStatus",
+    "SQLiteJobStore",
+    "RedisJobStore",
+    "create_job_store",
+    "BatchWorkerPool",
+    "analyze_file",
+    "save_upload_to_disk",
+    "safe_filename",
+    "UploadTooLargeError",
+]
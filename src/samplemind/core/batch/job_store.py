@@ -0,0 +1,640 @@
+"""
+Durable Batch Job Store
+
+Persists batch job state and per-file results so jobs survive API restarts
+and can be paginated while they are still running.
+
+Backends:
+- SQLiteJobStore: single-node default, WAL mode, stored under ~/.samplemind
+- RedisJobStore: shared across API workers when Redis is reachable
+
+Both backends update job counters atomically as results arrive, so status
+reads never need to scan the results.  A file's result is recorded once:
+a repeated result for the same file is ignored, so the counters count
+distinct files even when a file was analyzed twice.
+
+Each job's file list is stored with it, together with the worker pool that
+owns the job and when that pool's lease expires.  Pools renew the leases
+of their jobs while they run; a job whose lease has expired belonged to a
+pool that died, and can be claimed and resumed by another one.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path.home() / ".samplemind" / "batch" / "jobs.db"
+REDIS_KEY_PREFIX = "samplemind:batch"
+REDIS_JOB_TTL = 7 * 24 * 3600  # seconds
+
+
+class JobStatus(StrEnum):
+    """Lifecycle states of a batch job"""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_terminal(self) -> bool:
+        return self in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+@dataclass
+class BatchJob:
+    """Persistent batch job record"""
+
+    job_id: str
+    total_files: int
+    tenant_id: str = "default"
+    status: JobStatus = JobStatus.PENDING
+    processed_files: int = 0
+    failed_files: int = 0
+    analysis_type: str = "comprehensive"
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    completed_at: float | None = None
+    error: str | None = None
+    owner: str | None = None  # worker pool running the job
+    lease_expires_at: float | None = None
+
+    @property
+    def finished_files(self) -> int:
+        return self.processed_files + self.failed_files
+
+    @property
+    def progress_percent(self) -> float:
+        if self.total_files == 0:
+            return 100.0
+        return self.finished_files / self.total_files * 100
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["status"] = self.status.value
+        data["progress_percent"] = self.progress_percent
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BatchJob:
+        def _opt_float(value: Any) -> float | None:
+            return None if value in (None, "") else float(value)
+
+        return cls(
+            job_id=data["job_id"],
+            total_files=int(data["total_files"]),
+            tenant_id=data.get("tenant_id") or "default",
+            status=JobStatus(data.get("status", JobStatus.PENDING)),
+            processed_files=int(data.get("processed_files", 0)),
+            failed_files=int(data.get("failed_files", 0)),
+            analysis_type=data.get("analysis_type") or "comprehensive",
+            created_at=float(data.get("created_at") or time.time()),
+            started_at=_opt_float(data.get("started_at")),
+            completed_at=_opt_float(data.get("completed_at")),
+            error=data.get("error") or None,
+            owner=data.get("owner") or None,
+            lease_expires_at=_opt_float(data.get("lease_expires_at")),
+        )
+
+
+class BatchJobStore(ABC):
+    """Storage interface shared by the batch API and worker pool"""
+
+    @abstractmethod
+    def create_job(self, job: BatchJob, file_paths: list[str] | None = None) -> None:
+        """Insert a new job and the (distinct) files it will process"""
+
+    @abstractmethod
+    def get_job_files(self, job_id: str) -> list[str]:
+        """Return the job's files in submission order"""
+
+    @abstractmethod
+    def list_unfinished_jobs(self) -> list[BatchJob]:
+        """Return every job that is still pending or processing"""
+
+    @abstractmethod
+    def claim_job(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Take or renew ownership of an unfinished job
+
+        Succeeds when the job is pending or processing and is unowned, owned
+        by *owner* already, or its lease has expired; the lease then runs
+        for *lease_seconds* from now.
+        """
+
+    @abstractmethod
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a named lock for *ttl* seconds; False if held by another"""
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> BatchJob | None:
+        """Return the job, or None if unknown"""
+
+    @abstractmethod
+    def update_job(self, job_id: str, **fields: Any) -> BatchJob | None:
+        """Set job fields (status, timestamps, error) and return the job"""
+
+    @abstractmethod
+    def record_result(
+        self,
+        job_id: str,
+        file: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> BatchJob | None:
+        """
+        Append one file result and bump counters atomically
+
+        A file that already has a result is left as it is. Returns None when
+        the job does not exist (e.g. it was deleted while running).
+        """
+
+    @abstractmethod
+    def list_results(
+        self, job_id: str, offset: int = 0, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        """Return results in arrival order, ``[offset, offset + limit)``"""
+
+    @abstractmethod
+    def delete_job(self, job_id: str) -> bool:
+        """Remove the job and its results"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release backend resources"""
+
+    def pending_files(self, job_id: str, page_size: int = 1000) -> list[str]:
+        """Return the job's files that have no recorded result yet"""
+        done: set[str] = set()
+        offset = 0
+        while True:
+            page = self.list_results(job_id, offset=offset, limit=page_size)
+            done.update(entry["file"] for entry in page)
+            if len(page) < page_size:
+                break
+            offset += len(page)
+        return [file for file in self.get_job_files(job_id) if file not in done]
+
+
+def _distinct_files(file_paths: list[str] | None) -> list[str]:
+    files = [str(p) for p in file_paths or []]
+    if len(set(files)) != len(files):
+        raise ValueError("A batch job's files must be distinct")
+    return files
+
+
+# ---------------------------------------------------------------------------
+# SQLite backend
+# ---------------------------------------------------------------------------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    job_id TEXT PRIMARY KEY,
+    tenant_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_files INTEGER NOT NULL,
+    processed_files INTEGER NOT NULL DEFAULT 0,
+    failed_files INTEGER NOT NULL DEFAULT 0,
+    analysis_type TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    completed_at REAL,
+    error TEXT,
+    owner TEXT,
+    lease_expires_at REAL
+);
+CREATE TABLE IF NOT EXISTS batch_results (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    payload TEXT,
+    PRIMARY KEY (job_id, seq),
+    UNIQUE (job_id, file)
+);
+CREATE TABLE IF NOT EXISTS batch_files (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE TABLE IF NOT EXISTS batch_locks (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+_UPDATABLE = {"status", "started_at", "completed_at", "error"}
+
+
+class SQLiteJobStore(BatchJobStore):
+    """SQLite-backed store (default when Redis is not available)"""
+
+    def __init__(self, db_path: str | Path = DEFAULT_DB_PATH) -> None:
+        self.db_path = Path(db_path)
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def create_job(self, job: BatchJob, file_paths: list[str] | None = None) -> None:
+        files = _distinct_files(file_paths)
+        data = job.to_dict()
+        data.pop("progress_percent")
+        columns = ", ".join(data)
+        placeholders = ", ".join(f":{k}" for k in data)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO batch_jobs ({columns}) VALUES ({placeholders})", data
+            )
+            self._conn.executemany(
+                "INSERT INTO batch_files (job_id, seq, file) VALUES (?, ?, ?)",
+                [(job.job_id, i, p) for i, p in enumerate(files)],
+            )
+
+    def get_job_files(self, job_id: str) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file FROM batch_files WHERE job_id = ? ORDER BY seq",
+                (job_id,),
+            ).fetchall()
+        return [r["file"] for r in rows]
+
+    def list_unfinished_jobs(self) -> list[BatchJob]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM batch_jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (JobStatus.PENDING.value, JobStatus.PROCESSING.value),
+            ).fetchall()
+        return [BatchJob.from_dict(dict(r)) for r in rows]
+
+    def claim_job(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        now = time.time()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE batch_jobs SET owner = ?, lease_expires_at = ? "
+                "WHERE job_id = ? AND status IN (?, ?) AND (owner IS NULL "
+                "OR owner = ? OR lease_expires_at IS NULL OR lease_expires_at < ?)",
+                (
+                    owner,
+                    now + lease_seconds,
+                    job_id,
+                    JobStatus.PENDING.value,
+                    JobStatus.PROCESSING.value,
+                    owner,
+                    now,
+                ),
+            )
+        return cur.rowcount > 0
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO batch_locks (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, "
+                "expires_at = excluded.expires_at "
+                "WHERE batch_locks.owner = excluded.owner "
+                "OR batch_locks.expires_at < ?",
+                (name, owner, now + ttl, now),
+            )
+        return cur.rowcount > 0
+
+    def get_job(self, job_id: str) -> BatchJob | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM batch_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return BatchJob.from_dict(dict(row)) if row else None
+
+    def update_job(self, job_id: str, **fields: Any) -> BatchJob | None:
+        unknown = set(fields) - _UPDATABLE
+        if unknown:
+            raise ValueError(f"Cannot update fields: {sorted(unknown)}")
+        if fields:
+            assignments = ", ".join(f"{k} = :{k}" for k in fields)
+            params = {
+                k: (v.value if isinstance(v, JobStatus) else v)
+                for k, v in fields.items()
+            }
+            params["job_id"] = job_id
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"UPDATE batch_jobs SET {assignments} WHERE job_id = :job_id",
+                    params,
+                )
+        return self.get_job(job_id)
+
+    def record_result(
+        self,
+        job_id: str,
+        file: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> BatchJob | None:
+        ok = error is None
+        payload = json.dumps(result if ok else {"error": error}, default=str)
+        counter = "processed_files" if ok else "failed_files"
+        with self._lock, self._conn:
+            exists = self._conn.execute(
+                "SELECT 1 FROM batch_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if exists is None:
+                return None
+            seq = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM batch_results WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()[0]
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO batch_results (job_id, seq, file, ok, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, seq, file, int(ok), payload),
+            )
+            if cur.rowcount:
+                self._conn.execute(
+                    f"UPDATE batch_jobs SET {counter} = {counter} + 1 "
+                    "WHERE job_id = ?",
+                    (job_id,),
+                )
+        return self.get_job(job_id)
+
+    def list_results(
+        self, job_id: str, offset: int = 0, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, file, ok, payload FROM batch_results "
+                "WHERE job_id = ? AND seq >= ? ORDER BY seq LIMIT ?",
+                (job_id, offset, limit),
+            ).fetchall()
+        return [
+            _result_entry(r["seq"], r["file"], bool(r["ok"]), r["payload"])
+            for r in rows
+        ]
+
+    def delete_job(self, job_id: str) -> bool:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM batch_results WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM batch_files WHERE job_id = ?", (job_id,))
+            cur = self._conn.execute(
+                "DELETE FROM batch_jobs WHERE job_id = ?", (job_id,)
+            )
+        return cur.rowcount > 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Redis backend
+# ---------------------------------------------------------------------------
+
+
+class RedisJobStore(BatchJobStore):
+    """Redis-backed store shared by every API worker process"""
+
+    def __init__(self, client: Any, ttl: int = REDIS_JOB_TTL) -> None:
+        self.client = client
+        self.ttl = ttl
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:job:{job_id}"
+
+    @staticmethod
+    def _results_key(job_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:results:{job_id}"
+
+    @staticmethod
+    def _files_key(job_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:files:{job_id}"
+
+    @staticmethod
+    def _recorded_key(job_id: str) -> str:
+        # Hash of files that already have a result
+        return f"{REDIS_KEY_PREFIX}:recorded:{job_id}"
+
+    @staticmethod
+    def _lock_key(name: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:lock:{name}"
+
+    # Set of job ids that have not reached a terminal status
+    _UNFINISHED_KEY = f"{REDIS_KEY_PREFIX}:unfinished"
+
+    # KEYS[1] job hash; ARGV owner, new lease expiry, now
+    _CLAIM_SCRIPT = """
+local status = redis.call('hget', KEYS[1], 'status')
+if status ~= 'pending' and status ~= 'processing' then return 0 end
+local owner = redis.call('hget', KEYS[1], 'owner')
+local expires = tonumber(redis.call('hget', KEYS[1], 'lease_expires_at') or '')
+if owner and owner ~= '' and owner ~= ARGV[1] and expires
+    and expires >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('hset', KEYS[1], 'owner', ARGV[1], 'lease_expires_at', ARGV[2])
+return 1
+"""
+
+    # KEYS[1] lock; ARGV owner, ttl in milliseconds
+    _LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+if redis.call('set', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then return 1 end
+return 0
+"""
+
+    def create_job(self, job: BatchJob, file_paths: list[str] | None = None) -> None:
+        files = _distinct_files(file_paths)
+        data = {k: ("" if v is None else v) for k, v in job.to_dict().items()}
+        data.pop("progress_percent")
+        key = self._job_key(job.job_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping=data)
+        pipe.expire(key, self.ttl)
+        if files:
+            files_key = self._files_key(job.job_id)
+            pipe.rpush(files_key, *files)
+            pipe.expire(files_key, self.ttl)
+        if not job.status.is_terminal:
+            pipe.sadd(self._UNFINISHED_KEY, job.job_id)
+        pipe.execute()
+
+    def get_job_files(self, job_id: str) -> list[str]:
+        return [_decode(f) for f in self.client.lrange(self._files_key(job_id), 0, -1)]
+
+    def list_unfinished_jobs(self) -> list[BatchJob]:
+        jobs = []
+        for job_id in self.client.smembers(self._UNFINISHED_KEY):
+            job = self.get_job(_decode(job_id))
+            if job is None or job.status.is_terminal:
+                # Expired, or finished without passing through update_job
+                self.client.srem(self._UNFINISHED_KEY, job_id)
+            else:
+                jobs.append(job)
+        return sorted(jobs, key=lambda j: j.created_at)
+
+    def claim_job(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        now = time.time()
+        claimed = self.client.eval(
+            self._CLAIM_SCRIPT,
+            1,
+            self._job_key(job_id),
+            owner,
+            now + lease_seconds,
+            now,
+        )
+        return bool(claimed)
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        acquired = self.client.eval(
+            self._LOCK_SCRIPT, 1, self._lock_key(name), owner, int(ttl * 1000)
+        )
+        return bool(acquired)
+
+    def get_job(self, job_id: str) -> BatchJob | None:
+        data = self.client.hgetall(self._job_key(job_id))
+        data = {_decode(k): _decode(v) for k, v in data.items()}
+        if "job_id" not in data:
+            # Missing, or only counters written after the job was deleted
+            return None
+        return BatchJob.from_dict(data)
+
+    def update_job(self, job_id: str, **fields: Any) -> BatchJob | None:
+        unknown = set(fields) - _UPDATABLE
+        if unknown:
+            raise ValueError(f"Cannot update fields: {sorted(unknown)}")
+        if fields:
+            mapping = {
+                k: ("" if v is None else (v.value if isinstance(v, JobStatus) else v))
+                for k, v in fields.items()
+            }
+            self.client.hset(self._job_key(job_id), mapping=mapping)
+            if "status" in fields and JobStatus(fields["status"]).is_terminal:
+                self.client.srem(self._UNFINISHED_KEY, job_id)
+        return self.get_job(job_id)
+
+    def record_result(
+        self,
+        job_id: str,
+        file: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> BatchJob | None:
+        ok = error is None
+        entry = json.dumps(
+            {"file": file, "ok": ok, "payload": result if ok else {"error": error}},
+            default=str,
+        )
+        counter = "processed_files" if ok else "failed_files"
+        job_key = self._job_key(job_id)
+        if not self.client.exists(job_key):
+            return None
+        recorded_key = self._recorded_key(job_id)
+        if not self.client.hsetnx(recorded_key, file, 1):
+            return self.get_job(job_id)  # this file already has a result
+
+        results_key = self._results_key(job_id)
+        pipe = self.client.pipeline()
+        pipe.expire(recorded_key, self.ttl)
+        pipe.rpush(results_key, entry)
+        pipe.expire(results_key, self.ttl)
+        pipe.hincrby(job_key, counter, 1)
+        pipe.execute()
+
+        job = self.get_job(job_id)
+        if job is None:
+            # Deleted in between: drop what the increments just recreated
+            self.client.delete(job_key, results_key, recorded_key)
+        return job
+
+    def list_results(
+        self, job_id: str, offset: int = 0, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        raw = self.client.lrange(self._results_key(job_id), offset, offset + limit - 1)
+        entries = []
+        for seq, item in enumerate(raw, start=offset):
+            data = json.loads(_decode(item))
+            entries.append(
+                _result_entry(
+                    seq, data["file"], data["ok"], json.dumps(data["payload"])
+                )
+            )
+        return entries
+
+    def delete_job(self, job_id: str) -> bool:
+        removed = self.client.delete(
+            self._job_key(job_id),
+            self._results_key(job_id),
+            self._files_key(job_id),
+            self._recorded_key(job_id),
+        )
+        self.client.srem(self._UNFINISHED_KEY, job_id)
+        return bool(removed)
+
+    def close(self) -> None:
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+
+def _decode(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _result_entry(seq: int, file: str, ok: bool, payload: str | None) -> dict[str, Any]:
+    data = json.loads(payload) if payload else {}
+    if ok:
+        return {"seq": seq, "file": file, "status": "completed", "result": data}
+    return {"seq": seq, "file": file, "status": "failed", "error": data.get("error")}
+
+
+def create_job_store(backend: str | None = None) -> BatchJobStore:
+    """
+    Build the configured job store
+
+    ``SAMPLEMIND_BATCH_STORE`` selects ``sqlite``, ``redis`` or ``auto``
+    (default): Redis when ``REDIS_URL`` answers a ping, SQLite otherwise.
+    """
+    backend = (backend or os.getenv("SAMPLEMIND_BATCH_STORE", "auto")).lower()
+
+    if backend in ("redis", "auto"):
+        try:
+            import redis  # type: ignore
+
+            client = redis.from_url(
+                os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                decode_responses=True,
+                socket_connect_timeout=1,
+            )
+            client.ping()
+            logger.info("Batch job store: Redis")
+            return RedisJobStore(client)
+        except Exception as e:
+            if backend == "redis":
+                raise
+            logger.info(f"Batch job store: Redis unavailable ({e}), using SQLite")
+
+    db_path = os.getenv("SAMPLEMIND_BATCH_DB", str(DEFAULT_DB_PATH))
+    return SQLiteJobStore(db_path)
@@ -0,0 +1,50 @@
+"""
+Streaming upload helpers for the batch API
+
+Uploads are copied to disk in fixed-size chunks so a request carrying many
+large files never holds more than one chunk per file in memory.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from samplemind.core.loading.upload_stream import (
+    UPLOAD_CHUNK_SIZE,
+    AsyncReadable,
+    UploadTooLargeError,
+    stream_upload,
+)
+
+__all__ = ["UploadTooLargeError", "safe_filename", "save_upload_to_disk"]
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def safe_filename(filename: str | None, index: int) -> str:
+    """Strip directories and unsafe characters, prefix with *index* for uniqueness."""
+    name = Path(filename or "upload").name
+    name = _UNSAFE_CHARS.sub("_", name).strip("._") or "upload"
+    return f"{index:05d}_{name}"
+
+
+async def save_upload_to_disk(
+    upload: AsyncReadable,
+    dest: Path,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    max_bytes: int | None = None,
+) -> int:
+    """
+    Stream *upload* to *dest* chunk by chunk
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        UploadTooLargeError: if more than *max_bytes* arrive (partial file removed)
+    """
+    streamed = await stream_upload(
+        upload, dest, max_bytes=max_bytes, chunk_size=chunk_size
+    )
+    return streamed.size
@@ -0,0 +1,430 @@
+"""
+Shared Batch Worker Pool
+
+One long-lived executor serves every batch job.  Work items are queued per
+tenant and dispatched round-robin, so a tenant submitting 10k files cannot
+starve a tenant submitting 10.  At most ``max_workers`` items are handed to
+the executor at a time; everything else stays in the fair queue, which is
+what makes cancellation effective: cancelling a job drops its queued items
+before they ever reach a worker.  The job's status is re-read from the store
+before each dispatch, so a cancel made through another API worker sharing
+the store takes effect too.
+
+Every job is owned by the pool that runs it, under a lease the pool renews
+from a maintenance thread.  Pools sharing a store elect one of themselves
+(a lock in the store) to recover jobs whose lease expired, i.e. whose pool
+died: it claims them and re-queues the files that have no result yet.  A
+job another pool is still running is never queued twice.
+
+Workers analyze files with a per-process AudioEngine (see
+``samplemind.core.tasks.worker_state``) — only the file path crosses the
+process boundary, never the engine.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any
+
+from .job_store import BatchJob, BatchJobStore, JobStatus
+
+logger = logging.getLogger(__name__)
+
+AnalyzeFn = Callable[[str], dict[str, Any]]
+JobListener = Callable[[BatchJob], None]
+
+DEFAULT_LEASE_SECONDS = 60.0
+RECOVERY_LOCK = "recovery"
+
+
+def analyze_file(file_path: str) -> dict[str, Any]:
+    """Analyze one file with this process's warm AudioEngine."""
+    from samplemind.core.tasks.worker_state import get_audio_engine
+
+    features = get_audio_engine().analyze_audio(file_path)
+    return {
+        "file": file_path,
+        "features": features.to_dict(),
+        "analyzed_at": datetime.now().isoformat(),
+    }
+
+
+def _warm_worker() -> None:
+    """Process-pool initializer: build the engine before the first item."""
+    from samplemind.core.tasks.worker_state import get_audio_engine
+
+    get_audio_engine()
+
+
+class BatchWorkerPool:
+    """Long-lived pool with a per-tenant fair queue and real cancellation"""
+
+    def __init__(
+        self,
+        store: BatchJobStore,
+        max_workers: int | None = None,
+        analyze_fn: AnalyzeFn = analyze_file,
+        use_processes: bool = True,
+        recovery: bool = True,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        worker_id: str | None = None,
+    ) -> None:
+        self.store = store
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.analyze_fn = analyze_fn
+        self.use_processes = use_processes
+        self.recovery = recovery  # stand for election as the recovering pool
+        self.lease_seconds = lease_seconds
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+
+        self._cond = threading.Condition()
+        self._queues: dict[str, deque[tuple[str, str]]] = {}
+        self._rotation: deque[str] = deque()
+        self._inflight: dict[Future, tuple[str, str]] = {}
+        self._claimed: tuple[str, str] | None = None  # popped, not yet submitted
+        self._cancelled: set[str] = set()
+        self._listeners: list[JobListener] = []
+
+        self._executor: Executor | None = None
+        self._dispatcher: threading.Thread | None = None
+        self._maintainer: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._running = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Create the executor and dispatcher thread (idempotent)."""
+        with self._cond:
+            if self._running:
+                return
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="batch"
+                )
+            self._running = True
+            self._stopping.clear()
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name="batch-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+        logger.info(f"Batch worker pool started with {self.max_workers} workers")
+
+        # First pass inline, so recovered work is queued when start() returns
+        self._maintain()
+        self._maintainer = threading.Thread(
+            target=self._maintain_loop, name="batch-maintenance", daemon=True
+        )
+        self._maintainer.start()
+
+    def recover(self) -> int:
+        """
+        Claim jobs whose owner's lease expired and re-queue their unfinished files
+
+        Returns:
+            Number of files queued again
+        """
+        requeued = 0
+        for job in self.store.list_unfinished_jobs():
+            if job.owner == self.worker_id:
+                continue
+            if not self.store.claim_job(job.job_id, self.worker_id, self.lease_seconds):
+                continue  # its pool is alive and renewing the lease
+            files = self.store.pending_files(job.job_id)
+            if files:
+                self._enqueue(job, files)
+                requeued += len(files)
+            elif job.finished_files >= job.total_files:
+                self._finish(job.job_id)
+            else:
+                job = self.store.update_job(
+                    job.job_id,
+                    status=JobStatus.FAILED,
+                    completed_at=time.time(),
+                    error="Interrupted before its file list was stored",
+                )
+                self._notify(job)
+        if requeued:
+            logger.info(f"Recovered {requeued} unfinished batch files")
+        return requeued
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop dispatching and shut the executor down."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._stopping.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout=5)
+        if self._maintainer is not None:
+            self._maintainer.join(timeout=5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
+        self._dispatcher = None
+        self._maintainer = None
+
+    def add_listener(self, listener: JobListener) -> None:
+        """Call *listener(job)* whenever a job's progress or status changes."""
+        self._listeners.append(listener)
+
+    # ------------------------------------------------------------------
+    # Job API
+    # ------------------------------------------------------------------
+
+    def submit_job(self, job: BatchJob, file_paths: list[str]) -> None:
+        """Persist *job*, owned by this pool, and queue its files under its tenant."""
+        file_paths = [str(p) for p in file_paths]
+        job.owner = self.worker_id
+        job.lease_expires_at = time.time() + self.lease_seconds
+        if file_paths:
+            self.start()
+        self.store.create_job(job, file_paths)
+        if not file_paths:
+            self._finish(job.job_id)
+            return
+        self._enqueue(job, file_paths)
+
+    def _enqueue(self, job: BatchJob, file_paths: list[str]) -> None:
+        with self._cond:
+            queue = self._queues.setdefault(job.tenant_id, deque())
+            if job.tenant_id not in self._rotation:
+                self._rotation.append(job.tenant_id)
+            queue.extend((job.job_id, p) for p in file_paths)
+            self._cond.notify_all()
+
+    def cancel_job(self, job_id: str) -> int:
+        """
+        Cancel a job: drop its queued files and discard in-flight results
+
+        Returns:
+            Number of files that were removed before reaching a worker
+        """
+        with self._cond:
+            self._cancelled.add(job_id)
+            dropped = self._drop_queued(job_id)
+            # cancel() runs _on_done inline, which pops from _inflight
+            for future, (fjob, _) in list(self._inflight.items()):
+                if fjob == job_id:
+                    future.cancel()
+            self._forget_cancelled(job_id)
+
+        job = self.store.update_job(
+            job_id, status=JobStatus.CANCELLED, completed_at=time.time()
+        )
+        if job is not None:
+            self._notify(job)
+        logger.info(f"Batch job {job_id} cancelled ({dropped} queued files dropped)")
+        return dropped
+
+    def pending_count(self, job_id: str | None = None) -> int:
+        """Queued (not yet dispatched) items, optionally for one job."""
+        with self._cond:
+            return sum(
+                1 for item in self._iter_items() if job_id is None or item[0] == job_id
+            )
+
+    def _iter_items(self) -> Iterator[tuple[str, str]]:
+        """Queued, claimed and in-flight items (caller holds lock)."""
+        for queue in self._queues.values():
+            yield from queue
+        if self._claimed is not None:
+            yield self._claimed
+        yield from self._inflight.values()
+
+    def _drop_queued(self, job_id: str) -> int:
+        """Remove a job's queued items (caller holds lock)."""
+        dropped = 0
+        for tenant, queue in self._queues.items():
+            kept = deque(item for item in queue if item[0] != job_id)
+            dropped += len(queue) - len(kept)
+            self._queues[tenant] = kept
+        return dropped
+
+    def _forget_cancelled(self, job_id: str) -> None:
+        """Forget a cancelled job once none of its items remain (caller holds lock)."""
+        if job_id in self._cancelled and not any(
+            item[0] == job_id for item in self._iter_items()
+        ):
+            self._cancelled.discard(job_id)
+
+    # ------------------------------------------------------------------
+    # Leases and recovery
+    # ------------------------------------------------------------------
+
+    def _maintain_loop(self) -> None:
+        while not self._stopping.wait(self.lease_seconds / 3):
+            self._maintain()
+
+    def _maintain(self) -> None:
+        """Renew this pool's leases; the elected pool also recovers orphaned jobs."""
+        try:
+            self._renew_leases()
+            if self.recovery and self.store.acquire_lock(
+                RECOVERY_LOCK, self.worker_id, self.lease_seconds
+            ):
+                self.recover()
+        except Exception as e:
+            logger.warning(f"Batch pool maintenance failed: {e}")
+
+    def _renew_leases(self) -> None:
+        with self._cond:
+            job_ids = {item[0] for item in self._iter_items()} - self._cancelled
+        for job_id in job_ids:
+            if not self.store.claim_job(job_id, self.worker_id, self.lease_seconds):
+                # Finished or taken over elsewhere (our lease lapsed): whoever
+                # owns it now queues its remaining files
+                with self._cond:
+                    dropped = self._drop_queued(job_id)
+                logger.warning(
+                    f"Batch job {job_id}: lost ownership, {dropped} queued files dropped"
+                )
+
+    # ------------------------------------------------------------------
+    # Dispatching
+    # ------------------------------------------------------------------
+
+    def _next_item(self) -> tuple[str, str] | None:
+        """Pop the next item round-robin across tenants (caller holds lock)."""
+        for _ in range(len(self._rotation)):
+            tenant = self._rotation[0]
+            self._rotation.rotate(-1)
+            queue = self._queues.get(tenant)
+            if queue:
+                return queue.popleft()
+            # Drop idle tenants from the rotation
+            self._rotation.remove(tenant)
+            self._queues.pop(tenant, None)
+        return None
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and (
+                    len(self._inflight) >= self.max_workers
+                    or not any(self._queues.values())
+                ):
+                    self._cond.wait()
+                if not self._running:
+                    return
+                item = self._claimed = self._next_item()
+                if item is None:
+                    continue
+            job_id, path = item
+            # Store round trip outside the lock; only this thread dispatches
+            runnable = self._mark_started(job_id)
+            with self._cond:
+                self._claimed = None
+                if not self._running:
+                    return
+                if not runnable or job_id in self._cancelled:
+                    self._forget_cancelled(job_id)
+                    self._cond.notify_all()
+                    continue
+                future = self._executor.submit(self.analyze_fn, path)
+                self._inflight[future] = item
+            future.add_done_callback(self._on_done)
+
+    def _mark_started(self, job_id: str) -> bool:
+        """Re-read the job before dispatching; False if it must not run."""
+        job = self.store.get_job(job_id)
+        if job is None or job.status.is_terminal:
+            # Cancelled (or deleted) elsewhere, e.g. via another API worker
+            with self._cond:
+                self._cancelled.add(job_id)
+                self._drop_queued(job_id)
+            return False
+        if job.status == JobStatus.PENDING:
+            job = self.store.update_job(
+                job_id, status=JobStatus.PROCESSING, started_at=time.time()
+            )
+            self._notify(job)
+        return True
+
+    def _on_done(self, future: Future) -> None:
+        with self._cond:
+            job_id, path = self._inflight[future]
+            cancelled = job_id in self._cancelled
+
+        try:
+            if not (cancelled or future.cancelled()):
+                self._record(job_id, path, future)
+        except Exception as e:
+            logger.error(f"Batch job {job_id}: could not record {path}: {e}")
+        finally:
+            # Free the slot only after the result is persisted
+            with self._cond:
+                self._inflight.pop(future, None)
+                self._forget_cancelled(job_id)
+                self._cond.notify_all()
+
+    def _record(self, job_id: str, path: str, future: Future) -> None:
+        try:
+            job = self.store.record_result(job_id, path, result=future.result())
+        except Exception as e:
+            logger.warning(f"Batch job {job_id}: {path} failed: {e}")
+            job = self.store.record_result(job_id, path, error=str(e))
+
+        if job is None:
+            # Deleted while running: treat it as cancelled
+            with self._cond:
+                self._cancelled.add(job_id)
+                self._drop_queued(job_id)
+            return
+        if job.finished_files >= job.total_files:
+            self._finish(job_id)
+        else:
+            self._notify(job)
+
+    def _finish(self, job_id: str) -> None:
+        job = self.store.get_job(job_id)
+        if job is None or job.status.is_terminal:
+            return
+        job = self.store.update_job(
+            job_id, status=JobStatus.COMPLETED, completed_at=time.time()
+        )
+        self._notify(job)
+
+    def _notify(self, job: BatchJob | None) -> None:
+        if job is None:
+            return
+        for listener in self._listeners:
+            try:
+                listener(job)
+            except Exception as e:
+                logger.debug(f"Batch job listener failed: {e}")
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until nothing is queued or in flight (tests / shutdown)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while (
+                self._inflight
+                or self._claimed is not None
+                or any(self._queues.values())
+            ):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
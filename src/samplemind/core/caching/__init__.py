@@ -9,7 +9,7 @@ This module implements intelligent caching with predictive preloading to achieve
 Components:
 - UsagePatternTracker: Real-time workflow analysis
 - MarkovPredictor: Order-2 state transition prediction
-- CacheWarmer: Background preloading service
+- CacheWarmer: Event-driven background preloading fed by predictions
 - AdvancedCacheManager: LRU-K eviction and adaptive TTL
 """
 
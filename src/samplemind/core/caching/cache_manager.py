@@ -218,6 +218,25 @@ class AdvancedCacheManager:
 
         return True
 
+    async def contains(self, key: str) -> bool:
+        """
+        Check whether a live entry exists without counting a hit or miss.
+
+        Used by the cache warmer to skip work that is already cached; unlike
+        ``get`` it does not touch access history, so probes don't skew LRU-K.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and not entry.is_expired():
+            return True
+
+        if self.redis_cache:
+            try:
+                return bool(await self.redis_cache.exists(key))
+            except Exception as e:
+                logger.warning(f"Redis exists failed: {e}")
+
+        return False
+
     def _get_cache_size(self) -> int:
         """Get total cache size in bytes"""
         return sum(entry.size_bytes for entry in self.entries.values())
@@ -3,14 +3,25 @@ Cache Warmer Service for background preloading.
 
 Async background worker that preloads predicted files into cache
 with thermal throttling and priority queue management.
+
+- Event-driven: the worker blocks on the priority queue and a concurrency
+  semaphore instead of polling
+- Predictive: subscribes to UsagePatternTracker events and enqueues the next
+  states predicted by MarkovPredictor and the tracker's lookahead
+- Deduplicated: skips work that is queued, running or already cached
+- Adaptive: concurrency follows measured CPU headroom and drops to zero when
+  CPU or memory cross their thresholds
 """
 
 import asyncio
+import itertools
 import logging
 import time
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from pathlib import Path
 
 import psutil
@@ -39,6 +50,11 @@ class WarmupTask:
     confidence: float
     created_at: float = 0.0
 
+    @property
+    def key(self) -> str:
+        """Usage state this task warms (file_id:feature_type:analysis_level)"""
+        return f"{self.file_id}:{self.feature_type}:{self.analysis_level}"
+
     def __lt__(self, other: "WarmupTask") -> bool:
         """Enable sorting by priority and confidence"""
         if self.priority.value != other.priority.value:
@@ -62,6 +78,7 @@ class WarmupStats:
     completed_tasks: int = 0
     skipped_tasks: int = 0
     failed_tasks: int = 0
+    predicted_tasks: int = 0
     bytes_warmed: int = 0
     last_warmup_time: float = 0.0
     total_time: float = 0.0
@@ -69,14 +86,72 @@ class WarmupStats:
     resume_count: int = 0
 
 
+class _AdaptiveSemaphore:
+    """
+    Semaphore whose limit can be changed while permits are held.
+
+    Lowering the limit never interrupts running work; it only delays new
+    acquisitions until enough permits are released.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._held = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    async def acquire(self) -> None:
+        while self._held >= self._limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._held += 1
+
+    def release(self) -> None:
+        self._held -= 1
+        self._wake()
+
+    def set_limit(self, limit: int) -> None:
+        self._limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self._limit - self._held
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+def _sample_system_load() -> tuple[float, float]:
+    """Non-blocking (cpu, memory) utilisation as fractions"""
+    try:
+        # interval=None compares against the previous call instead of sleeping
+        cpu = psutil.cpu_percent(interval=None) / 100.0
+        memory = psutil.virtual_memory().percent / 100.0
+        return cpu, memory
+    except Exception as e:
+        logger.warning(f"Failed to check system resources: {e}")
+        return 0.0, 0.0  # Continue on error
+
+
 class CacheWarmer:
     """
     Background cache warming service.
 
     Features:
-    - Priority queue management
-    - Thermal throttling (CPU/memory aware)
-    - Background async operation
+    - Priority queue management (priority, then prediction confidence)
+    - Predictions from MarkovPredictor and UsagePatternTracker
+    - Deduplication against queued, running and cached work
+    - Concurrency scaled to CPU headroom, paused under memory/CPU pressure
     - Progress tracking and statistics
     """
 
@@ -88,6 +163,14 @@ class CacheWarmer:
         cpu_threshold: float = 0.60,
         memory_threshold: float = 0.70,
         max_concurrent_tasks: int = 2,
+        usage_tracker=None,
+        path_resolver: Callable[[str], Path | str | None] | None = None,
+        min_concurrent_tasks: int = 1,
+        min_confidence: float = 0.25,
+        prediction_top_n: int = 5,
+        lookahead_depth: int = 2,
+        sample_interval: float = 1.0,
+        load_sampler: Callable[[], tuple[float, float]] | None = None,
     ):
         """
         Initialize cache warmer.
@@ -99,25 +182,47 @@ class CacheWarmer:
             cpu_threshold: CPU usage threshold (0.0-1.0) before pause
             memory_threshold: Memory usage threshold (0.0-1.0) before pause
             max_concurrent_tasks: Maximum concurrent warmup tasks
+            usage_tracker: UsagePatternTracker to subscribe to (defaults to the
+                predictor's tracker)
+            path_resolver: Maps file_id to a path; defaults to the
+                ``file_path`` registered with the predictor
+            min_concurrent_tasks: Concurrency kept while under the thresholds
+            min_confidence: Predictions below this are not preloaded
+            prediction_top_n: Candidates requested from each model per event
+            lookahead_depth: Steps ahead taken from the usage tracker
+            sample_interval: Seconds between CPU/memory samples
+            load_sampler: Returns (cpu, memory) fractions; defaults to psutil
         """
         self.audio_engine = audio_engine
         self.cache = cache
         self.markov_predictor = markov_predictor
+        self.usage_tracker = None
+        self.path_resolver = path_resolver
 
         self.cpu_threshold = cpu_threshold
         self.memory_threshold = memory_threshold
         self.max_concurrent_tasks = max_concurrent_tasks
+        self.min_concurrent_tasks = min(min_concurrent_tasks, max_concurrent_tasks)
+        self.min_confidence = min_confidence
+        self.prediction_top_n = prediction_top_n
+        self.lookahead_depth = lookahead_depth
+        self.sample_interval = sample_interval
+        self._sample_load = load_sampler or _sample_system_load
 
         # Task management
         self.task_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
         self.active_tasks: dict[str, asyncio.Task] = {}
         self.completed_tasks: set = set()
+        self._pending: set[str] = set()  # queued or running
+        self._sequence = itertools.count()  # FIFO among equal priorities
+        self._slots = _AdaptiveSemaphore(max_concurrent_tasks)
 
         # State
         self.is_running = False
         self._pause_event = asyncio.Event()
         self._pause_event.set()  # Start in running state
         self._stop_event = asyncio.Event()
+        self._loop_task: asyncio.Task | None = None
 
         # Statistics
         self.stats = WarmupStats()
@@ -127,11 +232,27 @@ class CacheWarmer:
         self.on_warmup_complete: Callable | None = None
         self.on_warmup_failed: Callable | None = None
 
+        tracker = usage_tracker or getattr(markov_predictor, "usage_tracker", None)
+        if tracker is not None:
+            self.attach(tracker)
+
         logger.info(
             f"Cache warmer initialized "
             f"(cpu_threshold={cpu_threshold}, memory_threshold={memory_threshold})"
         )
 
+    def attach(self, usage_tracker) -> None:
+        """Subscribe to a usage tracker so each access schedules predictions"""
+        if self.usage_tracker is not None:
+            self.usage_tracker.remove_listener(self.schedule_predictions)
+        self.usage_tracker = usage_tracker
+        usage_tracker.add_listener(self.schedule_predictions)
+        if (
+            self.markov_predictor is not None
+            and self.markov_predictor.usage_tracker is None
+        ):
+            self.markov_predictor.set_usage_tracker(usage_tracker)
+
     async def start(self) -> None:
         """Start the cache warmer service"""
         if self.is_running:
@@ -142,16 +263,23 @@ class CacheWarmer:
         self._stop_event.clear()
         logger.info("Cache warmer started")
 
+        self._loop_task = asyncio.create_task(self._run_warmup_loop())
         try:
-            await self._run_warmup_loop()
+            await self._loop_task
+        except asyncio.CancelledError:
+            if not self._stop_event.is_set():
+                raise
         finally:
             self.is_running = False
+            self._loop_task = None
             logger.info("Cache warmer stopped")
 
     async def stop(self) -> None:
         """Stop the cache warmer service"""
         self.is_running = False
         self._stop_event.set()
+        if self._loop_task is not None:
+            self._loop_task.cancel()
 
         # Wait for active tasks to complete
         if self.active_tasks:
@@ -193,68 +321,213 @@ class CacheWarmer:
             confidence: Prediction confidence (for sorting)
 
         Returns:
-            True if added successfully
+            True if added, False if it duplicates queued or completed work
         """
-        # Skip if already completed
-        task_key = f"{file_id}:{feature_type}:{analysis_level}"
-        if task_key in self.completed_tasks:
-            self.stats.skipped_tasks += 1
-            return False
-
         task = WarmupTask(
             file_id=file_id,
-            file_path=file_path,
+            file_path=Path(file_path),
             feature_type=feature_type,
             analysis_level=analysis_level,
             priority=priority,
             confidence=confidence,
             created_at=time.time(),
         )
+        return self._enqueue(task)
+
+    def schedule_predictions(self, current_state: str) -> int:
+        """
+        Enqueue the states predicted to follow ``current_state``.
+
+        Registered as a UsagePatternTracker listener by ``attach``, so it runs
+        synchronously on the event loop thread for every recorded access.
+        Confidence is the highest either model assigns to a state.
+
+        Args:
+            current_state: State just accessed (file_id:feature_type:analysis_level)
+
+        Returns:
+            Number of tasks enqueued
+        """
+        candidates: dict[str, float] = {}
+
+        if self.markov_predictor is not None and self.markov_predictor.usage_tracker:
+            for prediction in self.markov_predictor.predict_next(
+                current_state, top_n=self.prediction_top_n
+            ):
+                state = (
+                    f"{prediction.file_id}:{prediction.feature_type}:"
+                    f"{prediction.analysis_level}"
+                )
+                candidates[state] = max(
+                    candidates.get(state, 0.0), prediction.confidence
+                )
+
+        if self.usage_tracker is not None and self.lookahead_depth > 1:
+            for prediction in self.usage_tracker.predict_next_states(
+                current_state, depth=self.lookahead_depth
+            )[: self.prediction_top_n * 2]:
+                state = prediction["state"]
+                candidates[state] = max(
+                    candidates.get(state, 0.0), prediction["probability"]
+                )
+
+        scheduled = 0
+        for state, confidence in candidates.items():
+            if state == current_state or confidence < self.min_confidence:
+                continue
+            try:
+                file_id, feature_type, analysis_level = state.split(":")
+            except ValueError:
+                logger.warning(f"Invalid state format: {state}")
+                continue
+
+            file_path = self._resolve_path(file_id)
+            if file_path is None:
+                continue
+
+            task = WarmupTask(
+                file_id=file_id,
+                file_path=file_path,
+                feature_type=feature_type,
+                analysis_level=analysis_level,
+                priority=self._priority_for(confidence),
+                confidence=confidence,
+                created_at=time.time(),
+            )
+            if self._enqueue(task):
+                scheduled += 1
+
+        self.stats.predicted_tasks += scheduled
+        return scheduled
+
+    def _enqueue(self, task: WarmupTask) -> bool:
+        """Queue a task unless the same state is pending or known warm"""
+        if task.key in self._pending or (
+            self.cache is None and task.key in self.completed_tasks
+        ):
+            self.stats.skipped_tasks += 1
+            return False
 
+        self.task_queue.put_nowait(
+            (task.priority.value, -task.confidence, next(self._sequence), task)
+        )
+        self._pending.add(task.key)
+        self.stats.total_tasks += 1
+        return True
+
+    @staticmethod
+    def _priority_for(confidence: float) -> WarmupPriority:
+        """Map prediction confidence to a queue priority"""
+        if confidence >= 0.8:
+            return WarmupPriority.HIGH
+        if confidence >= 0.5:
+            return WarmupPriority.NORMAL
+        return WarmupPriority.LOW
+
+    def _resolve_path(self, file_id: str) -> Path | None:
+        """Find the file to analyze for a predicted file_id"""
+        if self.path_resolver is not None:
+            file_path = self.path_resolver(file_id)
+        elif self.markov_predictor is not None:
+            file_path = self.markov_predictor.file_metadata.get(file_id, {}).get(
+                "file_path"
+            )
+        else:
+            file_path = None
+        return Path(file_path) if file_path else None
+
+    @staticmethod
+    def cache_key(task: WarmupTask) -> str:
+        """Cache key the warmer stores analysis results under"""
+        return f"audio:{task.key}"
+
+    async def _is_cached(self, task: WarmupTask) -> bool:
+        """Check the cache without counting a hit (contains/exists probes)"""
+        if self.cache is None:
+            return task.key in self.completed_tasks
+
+        probe = getattr(self.cache, "contains", None) or getattr(
+            self.cache, "exists", None
+        )
+        if probe is None:
+            return False
         try:
-            await self.task_queue.put((priority.value, task_key, task))
-            self.stats.total_tasks += 1
-            return True
+            return bool(await probe(self.cache_key(task)))
         except Exception as e:
-            logger.error(f"Failed to add warmup task: {e}")
+            logger.warning(f"Cache probe failed for {task.key}: {e}")
             return False
 
     async def _run_warmup_loop(self) -> None:
-        """Main warmup loop"""
-        while not self._stop_event.is_set():
-            # Check thermal conditions
-            if not self._should_warmup():
-                self.stats.pause_count += 1
-                await asyncio.sleep(1)
-                continue
+        """Main warmup loop: wait for work, then for a free slot"""
+        monitor = asyncio.create_task(self._monitor_load())
+        try:
+            while not self._stop_event.is_set():
+                *_, task = await self.task_queue.get()
+                acquired = started = False
+                try:
+                    await self._pause_event.wait()
+                    await self._slots.acquire()
+                    acquired = True
+
+                    # It may have been cached on demand while it sat in the queue
+                    if await self._is_cached(task):
+                        self.stats.skipped_tasks += 1
+                        continue
+
+                    worker = asyncio.create_task(self._warmup_task(task))
+                    self.active_tasks[task.key] = worker
+                    worker.add_done_callback(partial(self._task_done, task.key))
+                    started = True
+                finally:
+                    # Once started, _task_done cleans up; otherwise (skipped, or
+                    # cancelled while paused or waiting for a slot) do it here
+                    # so the state can be queued again
+                    if not started:
+                        self._pending.discard(task.key)
+                        if acquired:
+                            self._slots.release()
+        finally:
+            monitor.cancel()
 
-            # Ensure pause event is set (not paused)
-            await self._pause_event.wait()
+    def _task_done(self, task_key: str, _: asyncio.Task) -> None:
+        self.active_tasks.pop(task_key, None)
+        self._pending.discard(task_key)
+        self._slots.release()
 
-            # Check if we have room for more tasks
-            if len(self.active_tasks) >= self.max_concurrent_tasks:
-                await asyncio.sleep(0.5)
-                continue
+    async def _monitor_load(self) -> None:
+        """Re-sample system load periodically and resize the semaphore"""
+        while True:
+            self._adjust_concurrency()
+            await asyncio.sleep(self.sample_interval)
 
-            # Get next task
-            try:
-                _, task_key, task = self.task_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                await asyncio.sleep(0.5)
-                continue
+    def _adjust_concurrency(self) -> int:
+        """
+        Scale concurrency linearly with CPU headroom below the threshold.
+
+        Above either threshold the limit is zero: running tasks finish, but
+        nothing new starts until the next sample shows headroom again.
+        """
+        cpu, memory = self._sample_load()
+
+        if cpu > self.cpu_threshold or memory > self.memory_threshold:
+            logger.debug(f"Throttling warmup (cpu={cpu:.1%}, memory={memory:.1%})")
+            limit = 0
+        else:
+            headroom = 1.0 - cpu / self.cpu_threshold if self.cpu_threshold > 0 else 1.0
+            spread = self.max_concurrent_tasks - self.min_concurrent_tasks
+            limit = self.min_concurrent_tasks + round(spread * headroom)
 
-            # Create warmup task
-            warmup_task = asyncio.create_task(self._warmup_task(task))
-            self.active_tasks[task_key] = warmup_task
+        if limit == 0 and self._slots.limit > 0:
+            self.stats.pause_count += 1
+        elif limit > 0 and self._slots.limit == 0:
+            self.stats.resume_count += 1
 
-            # Clean up completed tasks
-            self.active_tasks = {
-                k: t for k, t in self.active_tasks.items() if not t.done()
-            }
+        self._slots.set_limit(limit)
+        return limit
 
     async def _warmup_task(self, task: WarmupTask) -> None:
         """Execute a single warmup task"""
-        task_key = f"{task.file_id}:{task.feature_type}:{task.analysis_level}"
+        task_key = task.key
 
         try:
             start_time = time.time()
@@ -270,8 +543,9 @@ class CacheWarmer:
 
                 # Store in cache
                 if self.cache:
-                    cache_key = f"audio:{task.file_id}:{task.feature_type}:{task.analysis_level}"
-                    await self.cache.set(cache_key, features, ttl=86400)  # 24 hours
+                    await self.cache.set(
+                        self.cache_key(task), features, ttl=86400
+                    )  # 24 hours
 
                 # Update statistics
                 elapsed = time.time() - start_time
@@ -295,27 +569,6 @@ class CacheWarmer:
             if self.on_warmup_failed:
                 await self.on_warmup_failed(task, e)
 
-    def _should_warmup(self) -> bool:
-        """Check if system is healthy enough to warmup"""
-        try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=0.1) / 100.0
-            if cpu_percent > self.cpu_threshold:
-                logger.debug(f"CPU too high: {cpu_percent:.1%}")
-                return False
-
-            # Memory usage
-            memory_percent = psutil.virtual_memory().percent / 100.0
-            if memory_percent > self.memory_threshold:
-                logger.debug(f"Memory too high: {memory_percent:.1%}")
-                return False
-
-            return True
-
-        except Exception as e:
-            logger.warning(f"Failed to check system resources: {e}")
-            return True  # Continue on error
-
     def get_stats(self) -> dict:
         """Get warmup statistics"""
         return {
@@ -323,15 +576,18 @@ class CacheWarmer:
             "completed_tasks": self.stats.completed_tasks,
             "skipped_tasks": self.stats.skipped_tasks,
             "failed_tasks": self.stats.failed_tasks,
+            "predicted_tasks": self.stats.predicted_tasks,
             "bytes_warmed_mb": round(self.stats.bytes_warmed / 1024 / 1024, 2),
             "last_warmup_time_ms": round(self.stats.last_warmup_time * 1000, 2),
             "avg_warmup_time_ms": round(
                 self.stats.total_time / max(1, self.stats.completed_tasks) * 1000, 2
             ),
             "active_tasks": len(self.active_tasks),
+            "concurrency_limit": self._slots.limit,
             "queue_size": self.task_queue.qsize(),
             "is_running": self.is_running,
             "pause_count": self.stats.pause_count,
+            "resume_count": self.stats.resume_count,
         }
 
     def clear_stats(self) -> None:
@@ -342,9 +598,10 @@ class CacheWarmer:
         """Clear the task queue"""
         while not self.task_queue.empty():
             try:
-                self.task_queue.get_nowait()
+                *_, task = self.task_queue.get_nowait()
             except asyncio.QueueEmpty:
                 break
+            self._pending.discard(task.key)
 
         logger.info("Cache warmup queue cleared")
 
@@ -373,6 +630,7 @@ def init_warmer(
 
 def get_warmer() -> CacheWarmer:
     """Get global cache warmer instance"""
+    global _warmer_instance
     if _warmer_instance is None:
         _warmer_instance = CacheWarmer()
     return _warmer_instance
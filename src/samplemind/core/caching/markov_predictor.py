@@ -95,7 +95,12 @@ class MarkovPredictor:
         logger.info("Usage tracker attached to predictor")
 
     def register_file(
-        self, file_id: str, file_name: str, file_size: int, duration: float
+        self,
+        file_id: str,
+        file_name: str,
+        file_size: int,
+        duration: float,
+        file_path: str | None = None,
     ) -> None:
         """
         Register file metadata for predictions.
@@ -105,11 +110,13 @@ class MarkovPredictor:
             file_name: Human-readable file name
             file_size: File size in bytes
             duration: Audio duration in seconds
+            file_path: Location on disk, needed by the cache warmer to preload
         """
         self.file_metadata[file_id] = {
             "file_name": file_name,
             "file_size": file_size,
             "duration": duration,
+            "file_path": file_path,
         }
 
     def predict_next(self, current_state: str, top_n: int = 5) -> list[Prediction]:
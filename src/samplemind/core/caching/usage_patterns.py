@@ -9,6 +9,7 @@ import asyncio
 import logging
 import time
 from collections import defaultdict
+from collections.abc import Callable
 from dataclasses import asdict, dataclass, field
 
 logger = logging.getLogger(__name__)
@@ -123,8 +124,21 @@ class UsagePatternTracker:
         self._last_state: str | None = None
         self._state_history: list[str] = []
 
+        # Called with each new state (e.g. CacheWarmer.schedule_predictions)
+        self._listeners: list[Callable[[str], None]] = []
+
         logger.info("Usage pattern tracker initialized")
 
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """Register a callback invoked with the state of every recorded event"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str], None]) -> None:
+        """Unregister a callback added with add_listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
     def _make_state(self, event: UsageEvent) -> str:
         """Create state string from event"""
         return f"{event.file_id}:{event.feature_type}:{event.analysis_level}"
@@ -163,6 +177,12 @@ class UsagePatternTracker:
 
         self._last_state = current_state
 
+        for listener in self._listeners:
+            try:
+                listener(current_state)
+            except Exception as e:
+                logger.error(f"Usage listener failed: {e}")
+
         # Persist to Redis if available
         if self.redis_cache:
             asyncio.create_task(self._persist_to_redis(event))
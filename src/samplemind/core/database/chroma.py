@@ -3,16 +3,28 @@
 Features:
 - Semantic search with query result caching
 - Fast duplicate detection via caching
-- TTL-based cache invalidation
 - Cache statistics and monitoring
+
+Query cache:
+- size-bounded LRU; expired entries are swept by a background thread
+- keys combine the query embedding, n_results, a canonical form of the
+  metadata filter and the collection generation
+- every write (add/delete/re-init) bumps the generation, so filtered
+  queries are cached too and results from before a write are never served
 """
 
+import copy
 import hashlib
+import json
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from typing import Any
 
 import chromadb
+import numpy as np
 
 try:
     from chromadb.config import Settings
@@ -28,18 +40,207 @@ _chroma_client = None
 _collection = None
 _settings = AppSettings()
 
-# Query result cache
-_query_cache = {}
-_query_cache_hits = 0
-_query_cache_misses = 0
+QUERY_CACHE_MAX_ENTRIES = 2048
+QUERY_CACHE_TTL_SECONDS = 3600
+QUERY_CACHE_SWEEP_SECONDS = 60
 
 
 def _cache_embedding_hash(embedding: list[float]) -> str:
     """Generate hash for embedding vector."""
-    import json
+    data = np.ascontiguousarray(embedding, dtype=np.float32).tobytes()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _canonical_filter(where: dict[str, Any] | None) -> str:
+    """Stable text form of a metadata filter (dict key order does not matter)."""
+    if not where:
+        return "-"
+    return json.dumps(where, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _copy_result(result: dict[str, Any]) -> dict[str, Any]:
+    # Deep: metadatas are dicts callers may edit in place
+    return copy.deepcopy(result)
+
+
+class QueryResultCache:
+    """
+    Bounded LRU cache for similarity query results.
+
+    Entries are keyed by (collection, generation, embedding hash, n_results,
+    filter).  bump_generation() makes every existing entry unreachable; the
+    sweeper thread then drops them together with expired entries.  All
+    methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = QUERY_CACHE_TTL_SECONDS,
+        sweep_interval: float = QUERY_CACHE_SWEEP_SECONDS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._entries: OrderedDict[tuple, tuple[dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generations: dict[str, int] = {}
+        self._sweeper: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    # ── Keys / generations ────────────────────────────────────────────────────
+
+    def generation(self, collection: str) -> int:
+        with self._lock:
+            return self._generations.get(collection, 0)
+
+    def bump_generation(self, collection: str) -> int:
+        """Invalidate all cached results for *collection* (call on every write)."""
+        with self._lock:
+            generation = self._generations.get(collection, 0) + 1
+            self._generations[collection] = generation
+            self.invalidations += 1
+            return generation
+
+    def make_key(
+        self,
+        collection: str,
+        generation: int,
+        embedding: list[float],
+        n_results: int,
+        where: dict[str, Any] | None,
+    ) -> tuple:
+        return (
+            collection,
+            generation,
+            _cache_embedding_hash(embedding),
+            n_results,
+            _canonical_filter(where),
+        )
+
+    # ── Lookup / store ────────────────────────────────────────────────────────
+
+    def get(self, key: tuple) -> dict[str, Any] | None:
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or key[1] != self._generations.get(key[0], 0):
+                self.misses += 1
+                return None
+            result, stored_at = item
+            if now - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_result(result)
+
+    def set(self, key: tuple, result: dict[str, Any]) -> None:
+        with self._lock:
+            # A write landed while the query ran: the result may be stale
+            if key[1] != self._generations.get(key[0], 0):
+                return
+            # Store a copy: the caller keeps (and may mutate) the original
+            self._entries[key] = (_copy_result(result), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        self._ensure_sweeper()
+
+    def discard_embedding(self, embedding: list[float]) -> int:
+        """Drop every entry for one query embedding; returns the count."""
+        embedding_hash = _cache_embedding_hash(embedding)
+        with self._lock:
+            keys = [k for k in self._entries if k[2] == embedding_hash]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> int:
+        with self._lock:
+            size = len(self._entries)
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.expirations = self.invalidations = 0
+        return size
+
+    # ── Sweeping ──────────────────────────────────────────────────────────────
+
+    def sweep(self) -> int:
+        """Remove expired and superseded-generation entries; returns the count."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        with self._lock:
+            stale = [
+                key
+                for key, (_, stored_at) in self._entries.items()
+                if stored_at <= cutoff or key[1] != self._generations.get(key[0], 0)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.expirations += len(stale)
+        if stale:
+            logger.debug(f"Query cache sweep removed {len(stale)} entries")
+        return len(stale)
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop, name="chroma-query-cache-sweeper", daemon=True
+        )
+        self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            self.sweep()
+
+    def close(self) -> None:
+        """Stop the sweeper thread."""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1)
+            self._sweeper = None
+
+    # ── Metrics ───────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total_requests = self.hits + self.misses
+            hit_rate = (self.hits / total_requests * 100) if total_requests else 0.0
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate_percent": round(hit_rate, 2),
+                "cached_queries": len(self._entries),
+                "max_entries": self.max_entries,
+                "total_requests": total_requests,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "generations": dict(self._generations),
+            }
+
+
+# Query result cache
+_query_cache = QueryResultCache()
 
-    embedding_str = json.dumps(embedding, separators=(",", ":"))
-    return hashlib.sha256(embedding_str.encode()).hexdigest()[:16]
+
+def _collection_name() -> str:
+    name = getattr(_collection, "name", None)
+    return name if isinstance(name, str) else "default"
+
+
+def _invalidate_collection() -> None:
+    _query_cache.bump_generation(_collection_name())
 
 
 def init_chromadb(
@@ -71,6 +272,7 @@ def init_chromadb(
             metadata={"description": "Audio sample embeddings for similarity search"},
         )
 
+        _invalidate_collection()
         logger.info(f"✅ ChromaDB initialized with {_collection.count()} embeddings")
         return _chroma_client
 
@@ -103,6 +305,7 @@ async def add_embedding(
         collection.add(
             ids=[file_id], embeddings=[embedding], metadatas=[metadata or {}]
         )
+        _invalidate_collection()
 
         logger.debug(f"Added embedding for file: {file_id}")
         return True
@@ -130,33 +333,20 @@ async def query_similar(
     Returns:
         Query results with ids, distances, and metadata
     """
-    global _query_cache, _query_cache_hits, _query_cache_misses
-
-    # Generate cache key
     cache_key = None
-    if use_cache and where is None:  # Only cache queries without filters
-
-        embedding_hash = _cache_embedding_hash(embedding)
-        cache_key = f"query:{embedding_hash}:n{n_results}"
-
-        # Check cache
-        if cache_key in _query_cache:
-            cached_result, timestamp = _query_cache[cache_key]
-
-            # Check TTL (3600 seconds = 1 hour)
-            import time
-
-            if time.time() - timestamp < 3600:
-                _query_cache_hits += 1
-                logger.debug(
-                    f"Query cache hit (cached {len(cached_result.get('ids', []))} results)"
-                )
-                return cached_result
-            else:
-                # Expired, remove from cache
-                del _query_cache[cache_key]
-
-    _query_cache_misses += 1
+    if use_cache:
+        name = _collection_name()
+        # Generation is read before querying so a concurrent write makes
+        # this result uncacheable instead of stale
+        cache_key = _query_cache.make_key(
+            name, _query_cache.generation(name), embedding, n_results, where
+        )
+        cached_result = _query_cache.get(cache_key)
+        if cached_result is not None:
+            logger.debug(
+                f"Query cache hit (cached {len(cached_result.get('ids', []))} results)"
+            )
+            return cached_result
 
     try:
         collection = get_collection()
@@ -172,10 +362,8 @@ async def query_similar(
         }
 
         # Cache result
-        if use_cache and cache_key is not None:
-            import time
-
-            _query_cache[cache_key] = (result, time.time())
+        if cache_key is not None:
+            _query_cache.set(cache_key, result)
             logger.debug(f"Cached query result ({len(result.get('ids', []))} items)")
 
         return result
@@ -224,6 +412,7 @@ async def delete_embedding(file_id: str) -> bool:
     try:
         collection = get_collection()
         collection.delete(ids=[file_id])
+        _invalidate_collection()
         logger.debug(f"Deleted embedding for file: {file_id}")
         return True
     except Exception as e:
@@ -247,46 +436,22 @@ async def get_collection_stats() -> dict[str, Any]:
 
 def get_query_cache_stats() -> dict[str, Any]:
     """Get query cache statistics."""
-    global _query_cache, _query_cache_hits, _query_cache_misses
-
-    total_requests = _query_cache_hits + _query_cache_misses
-    hit_rate = (_query_cache_hits / total_requests * 100) if total_requests > 0 else 0.0
-
-    return {
-        "hits": _query_cache_hits,
-        "misses": _query_cache_misses,
-        "hit_rate_percent": round(hit_rate, 2),
-        "cached_queries": len(_query_cache),
-        "total_requests": total_requests,
-    }
+    return _query_cache.stats()
 
 
 def clear_query_cache() -> None:
     """Clear all cached query results."""
-    global _query_cache, _query_cache_hits, _query_cache_misses
-
-    cache_size = len(_query_cache)
-    _query_cache.clear()
-    _query_cache_hits = 0
-    _query_cache_misses = 0
-
+    cache_size = _query_cache.clear()
     logger.info(f"Cleared query cache ({cache_size} entries)")
 
 
 def invalidate_query_cache_for_embedding(embedding: list[float]) -> None:
     """Invalidate cache entries for a specific embedding."""
-    global _query_cache
-
-    embedding_hash = _cache_embedding_hash(embedding)
-    keys_to_delete = [key for key in _query_cache.keys() if embedding_hash in key]
-
-    for key in keys_to_delete:
-        del _query_cache[key]
-
-    if keys_to_delete:
-        logger.debug(f"Invalidated {len(keys_to_delete)} cache entries")
+    removed = _query_cache.discard_embedding(embedding)
+    if removed:
+        logger.debug(f"Invalidated {removed} cache entries")
 
 
 async def invalidate_query_cache_on_add() -> None:
     """Invalidate query cache when new embeddings are added."""
-    clear_query_cache()
+    _invalidate_collection()
@@ -818,6 +818,7 @@ class AudioEngine:
         file_path: str | Path,
         level: AnalysisLevel = AnalysisLevel.STANDARD,
         use_cache: bool = True,
+        file_hash: str | None = None,
     ) -> AudioFeatures:
         """
         Comprehensive audio analysis
@@ -826,6 +827,7 @@ class AudioEngine:
             file_path: Path to audio file
             level: Analysis complexity level
             use_cache: Whether to use feature cache
+            file_hash: Precomputed SHA-256 of the file (skips re-reading it)
 
         Returns:
             AudioFeatures object with comprehensive analysis
@@ -853,7 +855,7 @@ class AudioEngine:
                 duration=len(y) / sr,
                 sample_rate=sr,
                 channels=1,  # We convert to mono
-                file_hash=self._compute_file_hash(file_path),
+                file_hash=file_hash or self._compute_file_hash(file_path),
                 file_size=file_path.stat().st_size,
                 analysis_level=level,
             )
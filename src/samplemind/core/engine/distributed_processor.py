@@ -3,23 +3,574 @@ Distributed audio processing utilities.
 
 This module provides utilities for parallel processing of audio files
 across multiple CPU cores or machines using Dask.
+
+Large runs are kept off the client:
+- files are packed into partitions of roughly equal total size
+- a worker plugin gives every worker one feature extractor, reused across tasks
+- ``process_to_disk`` has each worker write its partition's features to a
+  Parquet file in a shared directory; only a small manifest travels back
+- ``process_audio_files`` returns partition rows over the network unless
+  given such a directory, so remote workers need no shared storage
+- local clusters scale adaptively between ``min_workers`` and ``max_workers``
 """
 
+import functools
+import heapq
+import json
 import os
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
 import dask
-import dask.bag as db
 import numpy as np
-from dask.distributed import Client, LocalCluster, get_worker
+from dask.distributed import (
+    Client,
+    LocalCluster,
+    WorkerPlugin,
+    as_completed,
+    get_worker,
+)
 from loguru import logger
 
 from ..monitoring.monitor import Monitor
 from .audio_engine import AdvancedFeatureExtractor
 
+FEATURE_TYPES = ("rhythm", "spectral", "mfcc", "tonal", "all")
+MANIFEST_FILE = "manifest.json"
+EXTRACTOR_PLUGIN = "samplemind-feature-extractor"
+
+# Parquet schema metadata key listing columns stored as JSON strings
+_JSON_COLUMNS_KEY = b"samplemind.json_columns"
+
+
+# ============================================================================
+# Manifests
+# ============================================================================
+
+
+@dataclass
+class PartitionManifest:
+    """Summary of one partition written to disk by a worker"""
+
+    partition_id: int
+    path: str | None  # file name inside the run's output directory
+    files: list[str]
+    succeeded: int = 0
+    failed: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+    input_bytes: int = 0
+    worker_id: str = "local"
+    processing_time: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        return asdict(self)
+
+
+@dataclass
+class ProcessingManifest:
+    """Index of a distributed run; features stay on disk until read"""
+
+    output_dir: str
+    feature_type: str
+    level: str
+    partitions: list[PartitionManifest] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def total_files(self) -> int:
+        return sum(len(p.files) for p in self.partitions)
+
+    @property
+    def succeeded(self) -> int:
+        return sum(p.succeeded for p in self.partitions)
+
+    @property
+    def failed(self) -> int:
+        return sum(p.failed for p in self.partitions)
+
+    @property
+    def errors(self) -> dict[str, str]:
+        errors = {}
+        for part in self.partitions:
+            errors.update(part.errors)
+        return errors
+
+    def iter_features(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield (file path, features) pairs, reading one partition at a time"""
+        for part in self.partitions:
+            if part.path is None:
+                for file_path in part.files:
+                    yield file_path, {
+                        "_error": part.errors.get(file_path, "Partition failed"),
+                        "_file_path": file_path,
+                    }
+                continue
+            for row in read_partition(Path(self.output_dir) / part.path):
+                yield row["_file_path"], row
+
+    def load_features(self) -> dict[str, dict[str, Any]]:
+        """Read every partition into one dictionary keyed by file path"""
+        return dict(self.iter_features())
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        return {
+            "output_dir": self.output_dir,
+            "feature_type": self.feature_type,
+            "level": self.level,
+            "total_files": self.total_files,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "wall_time": self.wall_time,
+            "partitions": [p.to_dict() for p in self.partitions],
+        }
+
+    def save(self) -> Path:
+        """Write the manifest next to the partition files"""
+        path = Path(self.output_dir) / MANIFEST_FILE
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict(), indent=2))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, output_dir: str | Path) -> "ProcessingManifest":
+        """Reopen the manifest of an earlier run"""
+        data = json.loads((Path(output_dir) / MANIFEST_FILE).read_text())
+        return cls(
+            output_dir=str(output_dir),
+            feature_type=data["feature_type"],
+            level=data["level"],
+            partitions=[PartitionManifest(**p) for p in data["partitions"]],
+            wall_time=data.get("wall_time", 0.0),
+        )
+
+
+# ============================================================================
+# Worker-side extraction
+# ============================================================================
+
+
+class FeatureExtractorPlugin(WorkerPlugin):
+    """
+    Give every Dask worker one long-lived feature extractor.
+
+    The scheduler replays registered plugins on workers that join later,
+    so workers added by adaptive scaling are covered as well.
+    """
+
+    name = EXTRACTOR_PLUGIN
+
+    def __init__(self, sample_rate: int = 44100, use_cache: bool = True):
+        self.sample_rate = sample_rate
+        self.use_cache = use_cache
+        self.extractor: AdvancedFeatureExtractor | None = None
+
+    def setup(self, worker: Any) -> None:
+        self.extractor = AdvancedFeatureExtractor(
+            sample_rate=self.sample_rate, use_cache=self.use_cache
+        )
+        logger.debug(f"Feature extractor ready on worker {worker.id}")
+
+    def teardown(self, worker: Any) -> None:
+        self.extractor = None
+
+
+@functools.lru_cache(maxsize=4)
+def _fallback_extractor(sample_rate: int, use_cache: bool) -> AdvancedFeatureExtractor:
+    return AdvancedFeatureExtractor(sample_rate=sample_rate, use_cache=use_cache)
+
+
+def _worker_extractor(sample_rate: int, use_cache: bool) -> AdvancedFeatureExtractor:
+    """The extractor installed by FeatureExtractorPlugin, or a per-process one"""
+    try:
+        plugin = get_worker().plugins.get(EXTRACTOR_PLUGIN)
+    except ValueError:  # not running on a worker
+        plugin = None
+    if (
+        plugin is not None
+        and plugin.extractor is not None
+        and (plugin.sample_rate, plugin.use_cache) == (sample_rate, use_cache)
+    ):
+        return plugin.extractor
+    return _fallback_extractor(sample_rate, use_cache)
+
+
+def _worker_id() -> str:
+    try:
+        return f"{get_worker().id}"
+    except (ValueError, AttributeError):
+        return "local"
+
+
+def _load_audio(file_path: str, sample_rate: int) -> tuple[np.ndarray, int]:
+    """Load an audio file as mono at the extractor's sample rate."""
+    import librosa
+
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    file_size = os.path.getsize(file_path)
+    logger.debug(f"Loading audio file: {file_path} ({file_size/1024/1024:.2f} MB)")
+
+    try:
+        y, sr = librosa.load(
+            file_path,
+            sr=sample_rate,
+            mono=True,
+            res_type="kaiser_fast",  # Faster resampling
+        )
+    except Exception as e:
+        raise RuntimeError(f"Failed to load {file_path}: {str(e)}") from e
+
+    if len(y) == 0:
+        raise ValueError("Audio file is empty")
+    return y, sr
+
+
+def _extract_file_features(
+    extractor: AdvancedFeatureExtractor,
+    file_path: str,
+    feature_type: str,
+    level: str,
+    worker_id: str,
+) -> dict[str, Any]:
+    """
+    Extract the requested features from a single audio file.
+
+    Failures are returned as an ``_error`` entry rather than raised, so one
+    bad file does not fail its whole partition.
+    """
+    start_time = time.time()
+
+    try:
+        logger.debug(f"Processing {file_path} on worker {worker_id}")
+
+        load_start = time.time()
+        y, sr = _load_audio(file_path, extractor.sample_rate)
+        load_time = time.time() - load_start
+
+        features: dict[str, Any] = {}
+        feature_times: dict[str, float] = {}
+
+        def time_feature_extraction(feature_name, extract_func, *args):
+            """Helper to time feature extraction functions."""
+            start = time.time()
+            try:
+                result = extract_func(*args)
+                feature_times[feature_name] = time.time() - start
+                return result
+            except Exception as e:
+                logger.warning(f"Error extracting {feature_name} from {file_path}: {e}")
+                return None
+
+        if feature_type in ["rhythm", "all"]:
+            rhythm = time_feature_extraction(
+                "rhythm", extractor.extract_rhythmic_features, y
+            )
+            if rhythm:
+                features.update(rhythm)
+
+        if feature_type in ["spectral", "all"]:
+            spectral = time_feature_extraction(
+                "spectral", extractor.extract_spectral_features, y
+            )
+            if spectral:
+                features.update(spectral)
+
+        if feature_type in ["mfcc", "all"]:
+            mfcc = time_feature_extraction("mfcc", extractor.extract_mfcc_features, y)
+            if mfcc:
+                features.update(mfcc)
+
+        if level in ["standard", "advanced"] and feature_type in ["all", "tonal"]:
+            chroma_func = getattr(extractor, "_extract_chroma_features", None)
+            if chroma_func is not None:
+                chroma = time_feature_extraction("chroma", chroma_func, y)
+                if chroma:
+                    features.update(chroma)
+
+        total_time = time.time() - start_time
+        features.update(
+            {
+                "_file_path": file_path,
+                "_sample_rate": sr,
+                "_duration": len(y) / sr if sr > 0 else 0,
+                "_timestamp": time.time(),
+                "_processing_metadata": {
+                    "worker_id": worker_id,
+                    "load_time_seconds": load_time,
+                    "total_processing_time_seconds": total_time,
+                    "feature_extraction_times": feature_times,
+                    "success": True,
+                },
+            }
+        )
+        logger.debug(f"Processed {file_path} in {total_time:.2f}s")
+        return features
+
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"Error processing {file_path}: {error_msg}")
+        return {
+            "_error": error_msg,
+            "_file_path": file_path,
+            "_timestamp": time.time(),
+            "_processing_metadata": {
+                "worker_id": worker_id,
+                "success": False,
+                "error": error_msg,
+            },
+        }
+
+
+def _extract_partition(
+    partition_id: int,
+    file_paths: list[str],
+    feature_type: str,
+    level: str,
+    sample_rate: int,
+    use_cache: bool,
+) -> tuple[PartitionManifest, list[dict[str, Any]]]:
+    """Extract features for one partition with the worker's extractor"""
+    start_time = time.time()
+    worker_id = _worker_id()
+    extractor = _worker_extractor(sample_rate, use_cache)
+
+    rows = []
+    errors = {}
+    input_bytes = 0
+    for file_path in file_paths:
+        try:
+            input_bytes += os.path.getsize(file_path)
+        except OSError:
+            pass
+        features = _extract_file_features(
+            extractor, file_path, feature_type, level, worker_id
+        )
+        if "_error" in features:
+            errors[file_path] = features["_error"]
+        rows.append(features)
+
+    part = PartitionManifest(
+        partition_id=partition_id,
+        path=None,
+        files=list(file_paths),
+        succeeded=len(rows) - len(errors),
+        failed=len(errors),
+        errors=errors,
+        input_bytes=input_bytes,
+        worker_id=worker_id,
+        processing_time=time.time() - start_time,
+    )
+    return part, rows
+
+
+def _process_partition(
+    partition_id: int,
+    file_paths: list[str],
+    output_dir: str,
+    feature_type: str,
+    level: str,
+    sample_rate: int,
+    use_cache: bool,
+) -> tuple[PartitionManifest, None]:
+    """
+    Extract features for one partition and write them to Parquet.
+
+    This function is executed on worker nodes. It is module-level (not a
+    method) so tasks do not serialize the processor, its client or monitor.
+    """
+    part, rows = _extract_partition(
+        partition_id, file_paths, feature_type, level, sample_rate, use_cache
+    )
+    file_name = f"part-{partition_id:05d}.parquet"
+    write_partition(rows, Path(output_dir) / file_name)
+    part.path = file_name
+    return part, None
+
+
+def _collect_partition(
+    partition_id: int,
+    file_paths: list[str],
+    feature_type: str,
+    level: str,
+    sample_rate: int,
+    use_cache: bool,
+) -> tuple[PartitionManifest, list[dict[str, Any]]]:
+    """
+    Extract features for one partition and return them to the client.
+
+    Rows are converted to plain Python so they match what ``read_partition``
+    returns for a run written to disk.
+    """
+    part, rows = _extract_partition(
+        partition_id, file_paths, feature_type, level, sample_rate, use_cache
+    )
+    return part, [_plain(row) for row in rows]
+
+
+# ============================================================================
+# Partitioning and columnar storage
+# ============================================================================
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def partition_files(
+    file_paths: list[str],
+    batch_size: int = 10,
+    partition_bytes: int | None = None,
+    sizes: list[int] | None = None,
+) -> list[list[str]]:
+    """
+    Pack files into partitions of balanced total size.
+
+    There are enough partitions for ``batch_size`` files each on average
+    and, when ``partition_bytes`` is given, for about that many bytes each.
+    Files are placed largest first into the currently lightest partition, so
+    a few long recordings do not end up sharing one straggler task. Files
+    keep their input order within a partition; the heaviest partitions come
+    first so they start first.
+
+    Args:
+        file_paths: Paths to pack
+        batch_size: Target number of files per partition
+        partition_bytes: Optional target number of input bytes per partition
+        sizes: File sizes in bytes, if already known
+
+    Returns:
+        List of partitions, each a list of file paths
+    """
+    if not file_paths:
+        return []
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+    if sizes is None:
+        sizes = [_file_size(p) for p in file_paths]
+
+    n_partitions = -(-len(file_paths) // batch_size)
+    if partition_bytes:
+        n_partitions = max(n_partitions, -(-sum(sizes) // partition_bytes))
+    n_partitions = min(n_partitions, len(file_paths))
+
+    heap = [(0, i) for i in range(n_partitions)]
+    members: list[list[int]] = [[] for _ in range(n_partitions)]
+    totals = [0] * n_partitions
+    for index in sorted(range(len(file_paths)), key=lambda i: -sizes[i]):
+        total, slot = heapq.heappop(heap)
+        members[slot].append(index)
+        totals[slot] = total + sizes[index]
+        heapq.heappush(heap, (totals[slot], slot))
+
+    order = sorted(range(n_partitions), key=lambda slot: -totals[slot])
+    return [[file_paths[i] for i in sorted(members[slot])] for slot in order]
+
+
+def _plain(value: Any) -> Any:
+    """Convert numpy values to plain Python for Arrow and JSON"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _parquet() -> tuple[Any, Any]:
+    """Import pyarrow lazily; it is only needed for Parquet output"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        from ..processing.exceptions import OptionalDependencyError
+
+        raise OptionalDependencyError(
+            "pyarrow",
+            "pyarrow is required to write Parquet feature partitions. "
+            "Install it with 'pip install samplemind-ai[distributed]'.",
+        ) from exc
+    return pa, pq
+
+
+def write_partition(rows: list[dict[str, Any]], path: str | Path) -> Path:
+    """
+    Write feature dictionaries to a Parquet file, one row per file.
+
+    Scalars and (nested) numeric lists become native columns. Dictionaries,
+    and values Arrow cannot type consistently, are stored as JSON strings
+    and listed in the schema metadata so ``read_partition`` restores them.
+    """
+    pa, pq = _parquet()
+
+    rows = [_plain(row) for row in rows]
+    keys = list(dict.fromkeys(key for row in rows for key in row))
+
+    columns = {}
+    json_columns = []
+    for key in keys:
+        values = [row.get(key) for row in rows]
+        if not any(isinstance(v, dict) for v in values):
+            try:
+                column = pa.array(values)
+                if not pa.types.is_null(column.type):
+                    columns[key] = column
+                    continue
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass
+        columns[key] = pa.array(
+            [None if v is None else json.dumps(v) for v in values], type=pa.string()
+        )
+        json_columns.append(key)
+
+    table = pa.table(columns).replace_schema_metadata(
+        {_JSON_COLUMNS_KEY: json.dumps(json_columns).encode()}
+    )
+
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_partition(path: str | Path) -> list[dict[str, Any]]:
+    """Read a partition written by ``write_partition`` back into dictionaries"""
+    _, pq = _parquet()
+
+    table = pq.read_table(path)
+    metadata = table.schema.metadata or {}
+    json_columns = set(json.loads(metadata.get(_JSON_COLUMNS_KEY, b"[]")))
+
+    rows = []
+    for record in table.to_pylist():
+        # Missing keys come back as nulls; drop them to restore each row
+        rows.append(
+            {
+                key: json.loads(value) if key in json_columns else value
+                for key, value in record.items()
+                if value is not None
+            }
+        )
+    return rows
+
+
+# ============================================================================
+# Client
+# ============================================================================
+
 
 class DistributedAudioProcessor:
     """
@@ -37,6 +588,12 @@ class DistributedAudioProcessor:
         local_dir: str = "./dask-worker-space",
         use_cache: bool = True,
         monitor: Monitor | None = None,
+        client: Client | None = None,
+        min_workers: int | None = None,
+        max_workers: int | None = None,
+        adaptive: bool = True,
+        processes: bool = True,
+        sample_rate: int = 44100,
     ):
         """
         Initialize the distributed processor.
@@ -48,14 +605,30 @@ class DistributedAudioProcessor:
             local_dir: Directory for Dask worker files.
             use_cache: Whether to use the feature cache.
             monitor: Optional Monitor instance for collecting metrics.
+            client: Existing Dask client to use instead of starting a local
+                cluster. It is left running on stop().
+            min_workers: Lower bound for adaptive scaling (default 1).
+            max_workers: Upper bound for adaptive scaling (default n_workers).
+            adaptive: Scale the local cluster with load between the bounds;
+                if False it runs a fixed n_workers.
+            processes: Run local workers as processes (False uses threads).
+            sample_rate: Sample rate the worker extractors analyze at.
         """
         self.n_workers = os.cpu_count() if n_workers == -1 else n_workers
         self.threads_per_worker = threads_per_worker
         self.memory_limit = memory_limit
         self.local_dir = Path(local_dir)
         self.use_cache = use_cache
-        self._client = None
+        self.adaptive = adaptive
+        self.processes = processes
+        self.sample_rate = sample_rate
+        self.max_workers = max_workers or self.n_workers
+        self.min_workers = min(min_workers or 1, self.max_workers)
+        self._client = client
+        self._owns_client = client is None
         self._cluster = None
+        self._adaptive = None
+        self._started = False
 
         # Initialize monitoring
         self.monitor = monitor or Monitor(service_name="samplemind-audio-distributed")
@@ -63,10 +636,7 @@ class DistributedAudioProcessor:
         # Create local directory if it doesn't exist
         self.local_dir.mkdir(parents=True, exist_ok=True)
 
-        # Initialize feature extractor with monitoring
-        self.extractor = AdvancedFeatureExtractor(use_cache=use_cache)
-
-    def __enter__(self) -> None:
+    def __enter__(self) -> "DistributedAudioProcessor":
         """Context manager entry."""
         self.start()
         return self
@@ -76,13 +646,22 @@ class DistributedAudioProcessor:
         self.stop()
 
     def start(self) -> None:
-        """Start the Dask client and cluster."""
-        if self._client is not None:
+        """Start the Dask client and cluster, and install worker extractors."""
+        if self._started:
             logger.warning("Client already running")
             return
 
-        logger.info(f"Starting Dask cluster with {self.n_workers} workers")
+        if self._owns_client:
+            self._start_local_cluster()
+
+        self._client.register_plugin(
+            FeatureExtractorPlugin(
+                sample_rate=self.sample_rate, use_cache=self.use_cache
+            )
+        )
+        self._started = True
 
+    def _start_local_cluster(self) -> None:
         # Configure Dask to use disk-based spilling
         dask.config.set(
             {
@@ -94,147 +673,129 @@ class DistributedAudioProcessor:
             }
         )
 
+        if self.adaptive:
+            logger.info(
+                f"Starting adaptive Dask cluster with "
+                f"{self.min_workers}-{self.max_workers} workers"
+            )
+        else:
+            logger.info(f"Starting Dask cluster with {self.n_workers} workers")
+
         # Start a local Dask cluster
         self._cluster = LocalCluster(
-            n_workers=self.n_workers,
+            n_workers=self.min_workers if self.adaptive else self.n_workers,
             threads_per_worker=self.threads_per_worker,
             memory_limit=self.memory_limit,
             local_directory=str(self.local_dir.absolute()),
+            processes=self.processes,
             silence_logs=30,  # Only show warnings and above
         )
+        if self.adaptive:
+            self._adaptive = self._cluster.adapt(
+                minimum=self.min_workers, maximum=self.max_workers
+            )
 
         # Start the Dask client
         self._client = Client(self._cluster)
         logger.info(f"Dask dashboard available at: {self._client.dashboard_link}")
 
     def stop(self) -> None:
-        """Stop the Dask client and cluster."""
-        if self._client is not None:
-            self._client.close()
-            self._client = None
-
-        if self._cluster is not None:
-            self._cluster.close()
-            self._cluster = None
-
+        """Stop the Dask client and cluster (an external client is left running)."""
+        if self._owns_client:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+            if self._cluster is not None:
+                self._cluster.close()
+                self._cluster = None
+            self._adaptive = None
+
+        self._started = False
         logger.info("Stopped Dask cluster")
 
-    def process_audio_files(
-        self,
-        file_paths: list[str | Path],
-        feature_type: str = "all",
-        level: str = "standard",
-        batch_size: int = 10,
-        progress_callback: Callable[[int, int], None] | None = None,
-    ) -> dict[str, Any]:
-        """
-        Process multiple audio files in parallel.
-
-        Args:
-            file_paths: List of paths to audio files
-            feature_type: Type of features to extract ('rhythm', 'spectral', 'mfcc', 'all')
-            level: Analysis level ('basic', 'standard', 'advanced')
-            batch_size: Number of files to process in each batch
-            progress_callback: Optional callback for progress updates (current, total)
-
-        Returns:
-            Dictionary mapping file paths to extracted features
-        """
+    def _check_ready(self, feature_type: str) -> None:
         if self._client is None:
             raise RuntimeError("Dask client not started. Call start() first.")
+        if feature_type not in FEATURE_TYPES:
+            raise ValueError(
+                f"Unknown feature type: {feature_type}. "
+                f"Supported: {', '.join(FEATURE_TYPES)}"
+            )
 
-        if not file_paths:
-            return {}
+    def _map_partitions(
+        self,
+        task: Callable[..., tuple[PartitionManifest, Any]],
+        file_paths: list[str],
+        feature_type: str,
+        level: str,
+        batch_size: int,
+        partition_bytes: int | None,
+        progress_callback: Callable[[int, int], None] | None,
+        **task_kwargs: Any,
+    ) -> Iterator[tuple[PartitionManifest, Any]]:
+        """
+        Run ``task`` over size-balanced partitions of ``file_paths``.
 
-        # Record processing start time
+        Yields each partition's (manifest, payload) as it completes; a
+        partition whose task raised yields a manifest marking all of its
+        files failed and a None payload.
+        """
         start_time = time.time()
-
-        # Convert Path objects to strings
-        file_paths = [str(p) for p in file_paths]
         total_files = len(file_paths)
+        sizes = [_file_size(p) for p in file_paths]
+        for file_path, size in zip(file_paths, sizes, strict=True):
+            self.monitor.audio_metrics.record_file_size(file_path, size)
 
-        # Record metrics
-        self.monitor.audio_metrics.record_processing_time(
-            file_path="batch",
-            duration_seconds=0,  # Will be updated below
-            feature_type=feature_type,
-            success=True,
-        )
-
-        logger.info(f"Processing {total_files} files with {self.n_workers} workers")
-
-        # Process files in batches to manage memory usage
-        results = {}
-        processed_count = 0
+        partitions = partition_files(file_paths, batch_size, partition_bytes, sizes)
+        logger.info(f"Processing {total_files} files in {len(partitions)} partitions")
 
         try:
-            for i in range(0, total_files, batch_size):
-                batch = file_paths[i : i + batch_size]
-                batch_start_time = time.time()
-
-                logger.debug(
-                    f"Processing batch {i//batch_size + 1}/{(total_files + batch_size - 1)//batch_size}"
-                )
-
-                # Create a Dask bag from the batch
-                bag = db.from_sequence(
-                    batch, npartitions=min(len(batch), self.n_workers * 2)
+            futures = self._client.map(
+                task,
+                range(len(partitions)),
+                partitions,
+                feature_type=feature_type,
+                level=level,
+                sample_rate=self.sample_rate,
+                use_cache=self.use_cache,
+                pure=False,
+                **task_kwargs,
+            )
+            pending = {
+                future: (partition_id, files)
+                for partition_id, (future, files) in enumerate(
+                    zip(futures, partitions, strict=True)
                 )
+            }
 
-                # Process the batch in parallel with error handling
+            processed_count = 0
+            for future in as_completed(futures):
+                partition_id, files = pending.pop(future)
                 try:
-                    batch_results = dict(
-                        bag.map(
-                            lambda x: (
-                                x,
-                                self._process_single_file(x, feature_type, level),
-                            )
-                        ).compute()
+                    part, payload = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing partition {partition_id}: {e}")
+                    part = PartitionManifest(
+                        partition_id=partition_id,
+                        path=None,
+                        files=files,
+                        failed=len(files),
+                        errors={file_path: str(e) for file_path in files},
                     )
+                    payload = None
+                future.release()
 
-                    # Update results
-                    results.update(batch_results)
-                    processed_count += len(batch_results)
-
-                except Exception as e:
-                    logger.error(f"Error processing batch: {e}")
-                    # Record failed batch
-                    for file_path in batch:
-                        if file_path not in results:
-                            results[file_path] = {
-                                "_error": str(e),
-                                "_file_path": file_path,
-                                "_timestamp": time.time(),
-                            }
-
-                # Record batch metrics
-                batch_duration = time.time() - batch_start_time
                 self.monitor.audio_metrics.record_feature_extraction(
                     feature_type=f"batch_{feature_type}",
-                    duration_seconds=batch_duration,
+                    duration_seconds=part.processing_time,
                 )
-
-                # Call progress callback if provided
+                processed_count += len(files)
                 if progress_callback:
                     progress_callback(processed_count, total_files)
-
-            # Record overall metrics
-            total_duration = time.time() - start_time
-            self.monitor.audio_metrics.record_processing_time(
-                file_path="batch",
-                duration_seconds=total_duration,
-                feature_type=feature_type,
-                success=True,
-            )
-
-            logger.info(
-                f"Processed {processed_count}/{total_files} files in {total_duration:.2f} seconds"
-            )
-
-            return results
+                yield part, payload
 
         except Exception:
-            # Record error metric
             self.monitor.audio_metrics.record_processing_time(
                 file_path="batch",
                 duration_seconds=time.time() - start_time,
@@ -243,216 +804,144 @@ class DistributedAudioProcessor:
             )
             raise
 
-    def _process_single_file(
-        self, file_path: str, feature_type: str, level: str
-    ) -> dict[str, Any]:
-        """
-        Process a single audio file.
+        self.monitor.audio_metrics.record_processing_time(
+            file_path="batch",
+            duration_seconds=time.time() - start_time,
+            feature_type=feature_type,
+            success=True,
+        )
 
-        This method is executed on worker nodes.
+    def process_to_disk(
+        self,
+        file_paths: list[str | Path],
+        output_dir: str | Path,
+        feature_type: str = "all",
+        level: str = "standard",
+        batch_size: int = 10,
+        partition_bytes: int | None = None,
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> ProcessingManifest:
         """
-        # Get worker ID for logging
-        try:
-            worker = get_worker()
-            worker_id = f"{worker.id}"
-        except (ValueError, AttributeError):
-            worker_id = "local"
-
-        # Record start time
-        start_time = time.time()
-
-        try:
-            # Record file processing start
-            logger.debug(f"Processing {file_path} on worker {worker_id}")
-
-            # Load audio file with timing
-            load_start = time.time()
-            y, sr = self._load_audio(file_path)
-            load_time = time.time() - load_start
-
-            # Record file size metric if available
-            try:
-                file_size = os.path.getsize(file_path)
-                if hasattr(self, "monitor"):
-                    self.monitor.audio_metrics.record_file_size(file_path, file_size)
-            except (OSError, AttributeError):
-                pass
-
-            # Extract requested features
-            features = {}
-
-            # Track feature extraction times
-            feature_times = {}
-
-            def time_feature_extraction(feature_name, extract_func, *args):
-                """Helper to time feature extraction functions."""
-                start = time.time()
-                try:
-                    result = extract_func(*args)
-                    duration = time.time() - start
-                    feature_times[feature_name] = duration
-
-                    # Record metric if monitor is available
-                    if hasattr(self, "monitor"):
-                        self.monitor.audio_metrics.record_feature_extraction(
-                            feature_type=feature_name, duration_seconds=duration
-                        )
-
-                    return result
-                except Exception as e:
-                    logger.warning(
-                        f"Error extracting {feature_name} from {file_path}: {e}"
-                    )
-                    return None
-
-            # Extract features based on requested type
-            if feature_type in ["rhythm", "all"]:
-                rhythm = time_feature_extraction(
-                    "rhythm", self.extractor.extract_rhythmic_features, y
-                )
-                if rhythm:
-                    features.update(rhythm)
+        Extract features into per-partition Parquet files under ``output_dir``.
 
-            if feature_type in ["spectral", "all"]:
-                spectral = time_feature_extraction(
-                    "spectral", self.extractor.extract_spectral_features, y
-                )
-                if spectral:
-                    features.update(spectral)
-
-            if feature_type in ["mfcc", "all"]:
-                mfcc = time_feature_extraction(
-                    "mfcc", self.extractor.extract_mfcc_features, y
-                )
-                if mfcc:
-                    features.update(mfcc)
-
-            if level in ["standard", "advanced"] and feature_type in ["all", "tonal"]:
-                try:
-                    chroma = time_feature_extraction(
-                        "chroma", self.extractor._extract_chroma_features, y
-                    )
-                    if chroma:
-                        features.update(chroma)
-                except Exception as e:
-                    logger.warning(f"Failed to extract chroma features: {e}")
-
-            # Calculate total processing time
-            total_time = time.time() - start_time
-
-            # Add metadata
-            features.update(
-                {
-                    "_file_path": file_path,
-                    "_sample_rate": sr,
-                    "_duration": len(y) / sr if sr > 0 else 0,
-                    "_timestamp": time.time(),
-                    "_processing_metadata": {
-                        "worker_id": worker_id,
-                        "load_time_seconds": load_time,
-                        "total_processing_time_seconds": total_time,
-                        "feature_extraction_times": feature_times,
-                        "success": True,
-                    },
-                }
-            )
+        Workers write their partition's features directly, so the directory
+        must be reachable from every worker (shared storage on multi-machine
+        clusters). Only the manifests are gathered on the client.
 
-            # Record successful processing
-            if hasattr(self, "monitor"):
-                self.monitor.audio_metrics.record_processing_time(
-                    file_path=file_path,
-                    duration_seconds=total_time,
-                    feature_type=feature_type,
-                    success=True,
-                )
-
-            logger.debug(f"Processed {file_path} in {total_time:.2f}s")
-
-            return features
-
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"Error processing {file_path}: {error_msg}")
-
-            # Record failed processing
-            if hasattr(self, "monitor"):
-                self.monitor.audio_metrics.record_processing_time(
-                    file_path=file_path,
-                    duration_seconds=time.time() - start_time,
-                    feature_type=feature_type,
-                    success=False,
-                )
-
-            return {
-                "_error": error_msg,
-                "_file_path": file_path,
-                "_timestamp": time.time(),
-                "_processing_metadata": {
-                    "worker_id": worker_id,
-                    "success": False,
-                    "error": error_msg,
-                },
-            }
-
-    def _load_audio(self, file_path: str) -> tuple[np.ndarray, int]:
-        """
-        Load an audio file with error handling and metrics.
+        Args:
+            file_paths: List of paths to audio files
+            output_dir: Directory for the partition files and manifest.json
+            feature_type: Type of features to extract ('rhythm', 'spectral', 'mfcc', 'tonal', 'all')
+            level: Analysis level ('basic', 'standard', 'advanced')
+            batch_size: Target number of files per partition
+            partition_bytes: Optional target number of input bytes per partition
+            progress_callback: Optional callback for progress updates (current, total)
 
-        This method is executed on worker nodes.
+        Returns:
+            Manifest describing the written partitions
         """
-        import librosa
+        self._check_ready(feature_type)
 
-        # Record start time for metrics
         start_time = time.time()
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        file_paths = [str(p) for p in file_paths]
+        manifest = ProcessingManifest(str(output_dir), feature_type, level)
+
+        for part, _ in self._map_partitions(
+            _process_partition,
+            file_paths,
+            feature_type,
+            level,
+            batch_size,
+            partition_bytes,
+            progress_callback,
+            output_dir=str(output_dir.absolute()),
+        ):
+            manifest.partitions.append(part)
+
+        manifest.partitions.sort(key=lambda p: p.partition_id)
+        manifest.wall_time = time.time() - start_time
+        manifest.save()
+
+        logger.info(
+            f"Processed {manifest.succeeded}/{len(file_paths)} files "
+            f"in {manifest.wall_time:.2f} seconds"
+        )
+        return manifest
 
-        try:
-            # Check if file exists and is accessible
-            if not os.path.isfile(file_path):
-                raise FileNotFoundError(f"File not found: {file_path}")
-
-            # Get file size for metrics
-            file_size = os.path.getsize(file_path)
-
-            # Record file loading start
-            logger.debug(
-                f"Loading audio file: {file_path} ({file_size/1024/1024:.2f} MB)"
-            )
-
-            # Load with resampling to target sample rate if needed
-            y, sr = librosa.load(
-                file_path,
-                sr=self.extractor.sample_rate,
-                mono=True,
-                res_type="kaiser_fast",  # Faster resampling
-            )
+    def process_audio_files(
+        self,
+        file_paths: list[str | Path],
+        feature_type: str = "all",
+        level: str = "standard",
+        batch_size: int = 10,
+        progress_callback: Callable[[int, int], None] | None = None,
+        output_dir: str | Path | None = None,
+    ) -> dict[str, Any]:
+        """
+        Process multiple audio files in parallel.
 
-            # Ensure audio is not empty
-            if len(y) == 0:
-                raise ValueError("Audio file is empty")
+        By default each partition's features are sent back to the client,
+        which works with any cluster (including remote workers behind an
+        external ``client``) and does not need pyarrow.  Pass ``output_dir``,
+        a location every worker can write to, to spill the run to Parquet
+        with ``process_to_disk`` and read it back instead.
 
-            # Record successful load metrics
-            load_time = time.time() - start_time
-            if hasattr(self, "monitor"):
-                self.monitor.audio_metrics.record_feature_extraction(
-                    feature_type="audio_loading", duration_seconds=load_time
-                )
+        Args:
+            file_paths: List of paths to audio files
+            feature_type: Type of features to extract ('rhythm', 'spectral', 'mfcc', 'tonal', 'all')
+            level: Analysis level ('basic', 'standard', 'advanced')
+            batch_size: Target number of files per partition
+            progress_callback: Optional callback for progress updates (current, total)
+            output_dir: Optional shared directory to spill the results to
 
-            logger.debug(f"Loaded {file_path} in {load_time:.2f}s")
+        Returns:
+            Dictionary mapping file paths to extracted features
+        """
+        if not file_paths:
+            return {}
 
-            return y, sr
+        if output_dir is not None:
+            return self.process_to_disk(
+                file_paths,
+                output_dir,
+                feature_type=feature_type,
+                level=level,
+                batch_size=batch_size,
+                progress_callback=progress_callback,
+            ).load_features()
 
-        except Exception as e:
-            # Record error metrics
-            if hasattr(self, "monitor"):
-                self.monitor.audio_metrics.record_processing_time(
-                    file_path=file_path,
-                    duration_seconds=time.time() - start_time,
-                    feature_type="audio_loading",
-                    success=False,
-                )
+        self._check_ready(feature_type)
 
-            logger.error(f"Error loading {file_path}: {str(e)}")
-            raise RuntimeError(f"Failed to load {file_path}: {str(e)}")
+        start_time = time.time()
+        file_paths = [str(p) for p in file_paths]
+        results: dict[str, Any] = {}
+        for part, rows in self._map_partitions(
+            _collect_partition,
+            file_paths,
+            feature_type,
+            level,
+            batch_size,
+            None,
+            progress_callback,
+        ):
+            if rows is None:
+                for file_path in part.files:
+                    results[file_path] = {
+                        "_error": part.errors.get(file_path, "Partition failed"),
+                        "_file_path": file_path,
+                    }
+                continue
+            for row in rows:
+                results[row["_file_path"]] = row
+
+        succeeded = sum("_error" not in r for r in results.values())
+        logger.info(
+            f"Processed {succeeded}/{len(file_paths)} files "
+            f"in {time.time() - start_time:.2f} seconds"
+        )
+        return {p: results[p] for p in file_paths if p in results}
 
 
 def process_audio_files_parallel(
@@ -6,7 +6,8 @@ Maintains a history of recently analyzed audio files for quick access.
 Enables users to use shortcuts like @1, @2, etc. to reference recent files.
 
 Features:
-- Persistent history storage in ~/.samplemind/recent_files.json
+- Persistent history storage in ~/.samplemind/recent_files.json, with
+  changes appended to recent_files.log and compacted periodically
 - Automatic timestamp tracking
 - File size and duration caching
 - Quick @N access shortcuts
@@ -20,6 +21,8 @@ from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
 
+from samplemind.utils.oplog import DEFAULT_COMPACT_EVERY, OpLog
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -93,44 +96,78 @@ class RecentFile:
 class RecentFilesManager:
     """Manages recent file history"""
 
-    def __init__(self, max_history: int = 50) -> None:
+    def __init__(
+        self,
+        max_history: int = 50,
+        config_dir: Path | None = None,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+    ) -> None:
         """
         Initialize Recent Files Manager
 
         Args:
             max_history: Maximum number of files to keep (default: 50)
+            config_dir: Storage directory (default: ~/.samplemind)
+            compact_every: Logged changes before the history is re-snapshotted
         """
         self.max_history = max_history
-        self.config_dir = Path.home() / ".samplemind"
+        self.config_dir = (
+            Path(config_dir) if config_dir else Path.home() / ".samplemind"
+        )
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.history_file = self.config_dir / "recent_files.json"
+        self._log = OpLog(self.history_file, compact_every)
         self._files: list[RecentFile] = []
         self._load()
 
     def _load(self) -> None:
-        """Load recent files from disk"""
-        if self.history_file.exists():
-            try:
-                with open(self.history_file) as f:
-                    data = json.load(f)
-                    self._files = [RecentFile.from_dict(item) for item in data]
-                    logger.debug(f"Loaded {len(self._files)} recent files")
-            except Exception as e:
-                logger.error(f"Failed to load recent files: {e}")
-                self._files = []
-        else:
+        """Load recent files from disk (snapshot + replayed log)"""
+        self._files = []
+        try:
+            state, ops = self._log.load()
+            self._files = [RecentFile.from_dict(item) for item in state or []]
+            for op in ops:
+                self._apply(op)
+            if self._log.needs_compaction:
+                self._save()
+            logger.debug(f"Loaded {len(self._files)} recent files")
+        except Exception as e:
+            logger.error(f"Failed to load recent files: {e}")
             self._files = []
 
     def _save(self) -> None:
-        """Save recent files to disk"""
+        """Snapshot recent files to disk"""
+        try:
+            self._log.compact([f.to_dict() for f in self._files])
+            logger.debug(f"Saved {len(self._files)} recent files")
+        except Exception as e:
+            logger.error(f"Failed to save recent files: {e}")
+
+    def _record(self, op: dict) -> None:
+        """Apply a change and append it to the log"""
+        self._apply(op)
         try:
-            with open(self.history_file, "w") as f:
-                data = [f.to_dict() for f in self._files]
-                json.dump(data, f, indent=2)
-                logger.debug(f"Saved {len(self._files)} recent files")
+            self._log.append(op)
+            if self._log.needs_compaction:
+                self._save()
         except Exception as e:
             logger.error(f"Failed to save recent files: {e}")
 
+    def _apply(self, op: dict) -> None:
+        """Apply one change to the in-memory history"""
+        kind = op.get("op")
+        if kind == "add":
+            recent_file = RecentFile.from_dict(op["file"])
+            self._files = [f for f in self._files if f.path != recent_file.path]
+            # Most recent first, trimmed to max history
+            self._files.insert(0, recent_file)
+            del self._files[self.max_history :]
+        elif kind == "remove":
+            paths = set(op["paths"])
+            self._files = [f for f in self._files if f.path not in paths]
+        else:
+            logger.warning(f"Unknown recent files operation: {kind}")
+
     def add(
         self,
         file_path: Path,
@@ -147,14 +184,7 @@ class RecentFilesManager:
         """
         file_path = Path(file_path).expanduser().resolve()
 
-        # Check if file already exists in history
-        existing_index = None
-        for i, f in enumerate(self._files):
-            if Path(f.path).resolve() == file_path:
-                existing_index = i
-                break
-
-        # Create new recent file entry
+        # Create new recent file entry; an existing entry moves to the top
         recent_file = RecentFile(
             path=str(file_path),
             name=file_path.name,
@@ -164,18 +194,7 @@ class RecentFilesManager:
             tags=tags or [],
         )
 
-        # Remove if already exists (we'll re-add at top)
-        if existing_index is not None:
-            self._files.pop(existing_index)
-
-        # Add to beginning (most recent first)
-        self._files.insert(0, recent_file)
-
-        # Trim to max history
-        self._files = self._files[: self.max_history]
-
-        # Save to disk
-        self._save()
+        self._record({"op": "add", "file": recent_file.to_dict()})
 
     def get_all(self) -> list[RecentFile]:
         """Get all recent files (in order of recency)"""
@@ -184,8 +203,9 @@ class RecentFilesManager:
 
         # Remove invalid files from list
         if len(valid_files) < len(self._files):
-            self._files = valid_files
-            self._save()
+            valid_paths = {f.path for f in valid_files}
+            missing = [f.path for f in self._files if f.path not in valid_paths]
+            self._record({"op": "remove", "paths": missing})
 
         return valid_files
 
@@ -212,7 +232,7 @@ class RecentFilesManager:
     def clear(self) -> None:
         """Clear all recent file history"""
         self._files = []
-        self._save()
+        self._save()  # nothing left to replay; start from an empty snapshot
 
     def remove(self, file_path: Path) -> bool:
         """
@@ -224,13 +244,11 @@ class RecentFilesManager:
         Returns:
             True if removed, False if not found
         """
-        file_path = Path(file_path).expanduser().resolve()
+        file_path = str(Path(file_path).expanduser().resolve())
 
-        for i, f in enumerate(self._files):
-            if Path(f.path).resolve() == file_path:
-                self._files.pop(i)
-                self._save()
-                return True
+        if any(f.path == file_path for f in self._files):
+            self._record({"op": "remove", "paths": [file_path]})
+            return True
 
         return False
 
@@ -8,6 +8,10 @@ Allows users to:
 - Export collections
 - Search across collections
 - Manage collection metadata
+
+Each collection is stored as a snapshot plus an append-only operation log
+(see samplemind.utils.oplog), so adding a sample writes one line instead of
+rewriting the collection.
 """
 
 import json
@@ -17,6 +21,13 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from samplemind.utils.oplog import (
+    DEFAULT_COMPACT_EVERY,
+    OpLog,
+    SubstringIndex,
+    list_records,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -87,6 +98,14 @@ class Collection:
         self.metadata = metadata or {}
         self.created_at = created_at or datetime.now().isoformat()
         self.samples: dict[str, Sample] = {}
+        self._index = SubstringIndex()
+
+    @staticmethod
+    def _search_fields(sample: Sample) -> list[str]:
+        """Text matched by search_samples (indexed when the sample is added)"""
+        return [sample.filename] + [
+            v for v in sample.metadata.values() if isinstance(v, str)
+        ]
 
     def add_sample(self, sample: Sample) -> bool:
         """Add sample to collection"""
@@ -95,6 +114,7 @@ class Collection:
             return False
 
         self.samples[sample.id] = sample
+        self._index.add(sample.id, self._search_fields(sample))
         logger.debug(f"Added {sample.filename} to {self.name}")
         return True
 
@@ -105,6 +125,7 @@ class Collection:
             return False
 
         del self.samples[sample_id]
+        self._index.remove(sample_id)
         logger.debug(f"Removed {sample_id} from {self.name}")
         return True
 
@@ -117,23 +138,8 @@ class Collection:
         return list(self.samples.values())
 
     def search_samples(self, query: str) -> list[Sample]:
-        """Search samples by filename or metadata"""
-        query_lower = query.lower()
-        results = []
-
-        for sample in self.samples.values():
-            # Search filename
-            if query_lower in sample.filename.lower():
-                results.append(sample)
-                continue
-
-            # Search metadata values
-            for _key, value in sample.metadata.items():
-                if isinstance(value, str) and query_lower in value.lower():
-                    results.append(sample)
-                    break
-
-        return results
+        """Search samples by filename or string metadata values"""
+        return [self.samples[sample_id] for sample_id in self._index.search(query)]
 
     def get_size(self) -> int:
         """Get number of samples in collection"""
@@ -182,16 +188,23 @@ class FavoritesManager:
     - Collection export/import
     """
 
-    def __init__(self, storage_dir: str = ".samplemind/collections") -> None:
+    def __init__(
+        self,
+        storage_dir: str = ".samplemind/collections",
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+    ) -> None:
         """
         Initialize favorites manager.
 
         Args:
             storage_dir: Directory for storing collections
+            compact_every: Logged changes before a collection is re-snapshotted
         """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.compact_every = compact_every
         self.collections: dict[str, Collection] = {}
+        self._logs: dict[str, OpLog] = {}
         self._init_favorites_collection()
         self._load_collections()
 
@@ -304,20 +317,20 @@ class FavoritesManager:
 
         old_name = self.collections[collection_id].name
         self.collections[collection_id].name = new_name
-        self._save_collection(self.collections[collection_id])
+        self._record(
+            self.collections[collection_id], {"op": "rename", "name": new_name}
+        )
 
         logger.info(f"Renamed {old_name} to {new_name}")
         return True
 
     def add_to_favorites(self, sample: Sample) -> bool:
         """Add sample to favorites"""
-        favorites = self.collections["favorites"]
-        return favorites.add_sample(sample)
+        return self.add_to_collection("favorites", sample)
 
     def remove_from_favorites(self, sample_id: str) -> bool:
         """Remove sample from favorites"""
-        favorites = self.collections["favorites"]
-        return favorites.remove_sample(sample_id)
+        return self.remove_from_collection("favorites", sample_id)
 
     def add_to_collection(self, collection_id: str, sample: Sample) -> bool:
         """
@@ -337,7 +350,7 @@ class FavoritesManager:
 
         success = collection.add_sample(sample)
         if success:
-            self._save_collection(collection)
+            self._record(collection, {"op": "add", "sample": sample.to_dict()})
 
         return success
 
@@ -358,7 +371,7 @@ class FavoritesManager:
 
         success = collection.remove_sample(sample_id)
         if success:
-            self._save_collection(collection)
+            self._record(collection, {"op": "remove", "sample_id": sample_id})
 
         return success
 
@@ -447,39 +460,78 @@ class FavoritesManager:
             ),
         }
 
-    def _save_collection(self, collection: Collection) -> None:
-        """Save collection to disk"""
-        file_path = self.storage_dir / f"{collection.id}.json"
+    def _log(self, collection_id: str) -> OpLog:
+        """Operation log backing a collection"""
+        if collection_id not in self._logs:
+            self._logs[collection_id] = OpLog(
+                self.storage_dir / f"{collection_id}.json", self.compact_every
+            )
+        return self._logs[collection_id]
+
+    def _record(self, collection: Collection, op: dict) -> None:
+        """Append a change to the collection's log, compacting when due"""
+        log = self._log(collection.id)
+        try:
+            log.append(op)
+            if log.needs_compaction:
+                log.compact(collection.to_dict())
+        except Exception as e:
+            logger.error(f"Failed to save collection: {e}")
 
+    def _save_collection(self, collection: Collection) -> None:
+        """Write a full snapshot of the collection"""
         try:
-            with open(file_path, "w") as f:
-                json.dump(collection.to_dict(), f, indent=2)
+            self._log(collection.id).compact(collection.to_dict())
             logger.debug(f"Saved collection {collection.name}")
         except Exception as e:
             logger.error(f"Failed to save collection: {e}")
 
+    @staticmethod
+    def _apply(collection: Collection, op: dict) -> None:
+        """Replay one logged change"""
+        kind = op.get("op")
+        if kind == "add":
+            collection.add_sample(Sample.from_dict(op["sample"]))
+        elif kind == "remove":
+            collection.remove_sample(op["sample_id"])
+        elif kind == "rename":
+            collection.name = op["name"]
+        else:
+            logger.warning(f"Unknown collection operation: {kind}")
+
     def _load_collections(self) -> None:
-        """Load all collections from disk"""
-        for json_file in self.storage_dir.glob("*.json"):
+        """Load all collections from disk (snapshot + replayed log)"""
+        for collection_id in list_records(self.storage_dir):
+            log = self._log(collection_id)
             try:
-                with open(json_file) as f:
-                    data = json.load(f)
-
-                collection = Collection.from_dict(data)
-                if collection.id != "favorites":  # Skip, already initialized
-                    self.collections[collection.id] = collection
+                state, ops = log.load()
+                if state is None:
+                    if collection_id != "favorites":
+                        logger.warning(
+                            f"Collection {collection_id} has a log but no snapshot"
+                        )
+                        continue
+                    collection = self.collections["favorites"]
+                else:
+                    collection = Collection.from_dict(state)
+
+                for op in ops:
+                    self._apply(collection, op)
+                self.collections[collection.id] = collection
+
+                if log.needs_compaction:
+                    log.compact(collection.to_dict())
 
                 logger.debug(f"Loaded collection: {collection.name}")
             except Exception as e:
-                logger.warning(f"Failed to load collection from {json_file}: {e}")
+                logger.warning(f"Failed to load collection {collection_id}: {e}")
 
     def _delete_collection_file(self, collection_id: str) -> None:
-        """Delete collection file from disk"""
-        file_path = self.storage_dir / f"{collection_id}.json"
-
+        """Delete collection snapshot and log from disk"""
         try:
-            file_path.unlink(missing_ok=True)
-            logger.debug(f"Deleted collection file: {file_path}")
+            self._log(collection_id).delete()
+            self._logs.pop(collection_id, None)
+            logger.debug(f"Deleted collection files for {collection_id}")
         except Exception as e:
             logger.warning(f"Failed to delete collection file: {e}")
 
@@ -8,8 +8,15 @@ Public API surface for the loading pipeline:
 
 from .audio_loader import AdvancedAudioLoader, create_loader_from_config
 from .format_detector import AudioFormatDetector
+from .header_probe import HeaderProbe, probe_header
 from .metadata_extractor import MetadataExtractor
 from .models import AudioFormat, AudioMetadata, LoadedAudio, LoadingStrategy
+from .upload_stream import (
+    StreamedUpload,
+    UnrecognizedAudioError,
+    UploadTooLargeError,
+    stream_upload,
+)
 
 __all__ = [
     # Loader
@@ -18,6 +25,13 @@ __all__ = [
     # Helper classes
     "AudioFormatDetector",
     "MetadataExtractor",
+    # Streaming uploads
+    "HeaderProbe",
+    "probe_header",
+    "StreamedUpload",
+    "stream_upload",
+    "UploadTooLargeError",
+    "UnrecognizedAudioError",
     # Models / enums
     "AudioFormat",
     "AudioMetadata",
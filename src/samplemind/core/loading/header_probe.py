@@ -0,0 +1,207 @@
+"""
+SampleMind AI — Audio Header Probe
+
+Reads format, sample rate, channels and duration from the first bytes of an
+audio stream, without decoding and without the rest of the file.  Used by
+the streaming upload path to validate and describe a file while it is still
+arriving.
+
+Supported headers:
+  - WAV  (RIFF fmt/data chunks)
+  - AIFF (FORM COMM chunk)
+  - FLAC (STREAMINFO block)
+  - OGG  (Vorbis / Opus identification header)
+  - MP3  (first MPEG audio frame; duration estimated from bitrate)
+  - M4A  (ftyp box; format only)
+"""
+
+import struct
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# Enough for the headers above unless a file carries large leading metadata
+PROBE_BYTES = 64 * 1024
+
+
+@dataclass
+class HeaderProbe:
+    """What could be learned from a file's leading bytes"""
+
+    format: str
+    sample_rate: int | None = None
+    channels: int | None = None
+    bits_per_sample: int | None = None
+    duration: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def probe_header(header: bytes, total_size: int | None = None) -> HeaderProbe | None:
+    """
+    Identify an audio stream from its first bytes
+
+    Args:
+        header: Leading bytes of the file (``PROBE_BYTES`` is plenty)
+        total_size: Full file size if known; improves duration estimates
+
+    Returns:
+        HeaderProbe, or None if the bytes are not a recognised audio format
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return _probe_wav(header, total_size)
+    if header[:4] == b"FORM" and header[8:12] in (b"AIFF", b"AIFC"):
+        return _probe_aiff(header)
+    if header[:4] == b"fLaC":
+        return _probe_flac(header)
+    if header[:4] == b"OggS":
+        return _probe_ogg(header)
+    if header[4:8] == b"ftyp":
+        return HeaderProbe(format="m4a")
+    if header[:3] == b"ID3" or _is_mpeg_sync(header, 0):
+        return _probe_mp3(header, total_size)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Format parsers
+# ---------------------------------------------------------------------------
+
+
+def _probe_wav(header: bytes, total_size: int | None) -> HeaderProbe:
+    probe = HeaderProbe(format="wav")
+    byte_rate = 0
+    offset = 12
+    while offset + 8 <= len(header):
+        chunk_id = header[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", header, offset + 4)
+        body = offset + 8
+
+        if chunk_id == b"fmt " and body + 16 <= len(header):
+            _, channels, sample_rate, byte_rate, _, bits = struct.unpack_from(
+                "<HHIIHH", header, body
+            )
+            probe.channels = channels
+            probe.sample_rate = sample_rate
+            probe.bits_per_sample = bits
+        elif chunk_id == b"data":
+            data_size = chunk_size
+            # Streaming writers leave the size at 0 / 0xFFFFFFFF
+            if data_size in (0, 0xFFFFFFFF) and total_size is not None:
+                data_size = total_size - body
+            if byte_rate:
+                probe.duration = data_size / byte_rate
+            break
+
+        offset = body + chunk_size + (chunk_size & 1)
+    return probe
+
+
+def _probe_aiff(header: bytes) -> HeaderProbe:
+    probe = HeaderProbe(format="aiff")
+    offset = 12
+    while offset + 8 <= len(header):
+        chunk_id = header[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from(">I", header, offset + 4)
+        body = offset + 8
+        if chunk_id == b"COMM" and body + 18 <= len(header):
+            channels, frames, bits = struct.unpack_from(">HIH", header, body)
+            sample_rate = _extended_to_float(header[body + 8 : body + 18])
+            probe.channels = channels
+            probe.bits_per_sample = bits
+            probe.sample_rate = int(sample_rate)
+            if sample_rate:
+                probe.duration = frames / sample_rate
+            break
+        offset = body + chunk_size + (chunk_size & 1)
+    return probe
+
+
+def _probe_flac(header: bytes) -> HeaderProbe:
+    probe = HeaderProbe(format="flac")
+    # Metadata block header (4 bytes) then STREAMINFO; bytes 10..17 hold
+    # sample rate (20 bits), channels-1 (3), bits-1 (5), total samples (36)
+    if len(header) >= 4 + 4 + 18 and header[4] & 0x7F == 0:
+        (packed,) = struct.unpack_from(">Q", header, 8 + 10)
+        sample_rate = packed >> 44
+        probe.sample_rate = sample_rate
+        probe.channels = ((packed >> 41) & 0x7) + 1
+        probe.bits_per_sample = ((packed >> 36) & 0x1F) + 1
+        total_samples = packed & 0xFFFFFFFFF
+        if sample_rate and total_samples:
+            probe.duration = total_samples / sample_rate
+    return probe
+
+
+def _probe_ogg(header: bytes) -> HeaderProbe:
+    probe = HeaderProbe(format="ogg")
+    if len(header) < 27:
+        return probe
+    segments = header[26]
+    packet = 27 + segments
+    if header[packet : packet + 7] == b"\x01vorbis" and len(header) >= packet + 16:
+        probe.channels = header[packet + 11]
+        (probe.sample_rate,) = struct.unpack_from("<I", header, packet + 12)
+    elif header[packet : packet + 8] == b"OpusHead" and len(header) >= packet + 16:
+        probe.channels = header[packet + 9]
+        (probe.sample_rate,) = struct.unpack_from("<I", header, packet + 12)
+    return probe
+
+
+# MPEG-1 Layer III bitrates (kbps) and sample rates by version
+_MP3_BITRATES = {
+    3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],  # MPEG-2.5
+}
+
+
+def _is_mpeg_sync(header: bytes, offset: int) -> bool:
+    return (
+        offset + 4 <= len(header)
+        and header[offset] == 0xFF
+        and header[offset + 1] & 0xE0 == 0xE0
+    )
+
+
+def _probe_mp3(header: bytes, total_size: int | None) -> HeaderProbe:
+    probe = HeaderProbe(format="mp3")
+    offset = 0
+    if header[:3] == b"ID3" and len(header) >= 10:
+        # Syncsafe tag size
+        size = 0
+        for byte in header[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        offset = 10 + size
+
+    if not _is_mpeg_sync(header, offset):
+        return probe
+
+    b1, b2, b3 = header[offset + 1], header[offset + 2], header[offset + 3]
+    version = (b1 >> 3) & 0x3
+    bitrate_index = (b2 >> 4) & 0xF
+    rate_index = (b2 >> 2) & 0x3
+    if version == 1 or rate_index == 3 or bitrate_index in (0, 15):
+        return probe
+
+    probe.sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    probe.channels = 1 if (b3 >> 6) == 3 else 2
+    bitrate = _MP3_BITRATES[3 if version == 3 else 2][bitrate_index] * 1000
+    if total_size is not None and bitrate:
+        # Constant-bitrate estimate; good enough for display and validation
+        probe.duration = (total_size - offset) * 8 / bitrate
+    return probe
+
+
+def _extended_to_float(data: bytes) -> float:
+    """Decode an 80-bit IEEE 754 extended float (AIFF sample rate)."""
+    exponent, mantissa = struct.unpack(">HQ", data)
+    sign = -1 if exponent & 0x8000 else 1
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
@@ -0,0 +1,126 @@
+"""
+SampleMind AI — Streaming Upload Writer
+
+Copies an upload (anything with an async ``read(size)``, e.g. FastAPI's
+UploadFile) to disk chunk by chunk:
+
+  - file writes and hashing run in a worker thread, never on the event loop
+  - SHA-256 and byte count are computed as the bytes flow, so nothing has
+    to re-read the file afterwards
+  - the header is probed as soon as the first chunks arrive, so non-audio
+    uploads are rejected before the rest of the body is read
+  - the size limit is enforced per chunk; an oversized upload is never
+    buffered in memory
+"""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+from .header_probe import PROBE_BYTES, HeaderProbe, probe_header
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit"""
+
+
+class UnrecognizedAudioError(ValueError):
+    """Raised when the leading bytes of an upload are not a known audio format"""
+
+
+class AsyncReadable(Protocol):
+    filename: str | None
+
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+@dataclass
+class StreamedUpload:
+    """Result of streaming one upload to disk"""
+
+    path: Path
+    size: int
+    sha256: str
+    probe: HeaderProbe | None = None
+
+
+async def stream_upload(
+    upload: AsyncReadable,
+    dest: Path,
+    max_bytes: int | None = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    require_audio: bool = False,
+) -> StreamedUpload:
+    """
+    Stream *upload* to *dest*, hashing and probing on the way
+
+    Args:
+        upload: Source with an async ``read(size)``
+        dest: Destination path (parent directories are created)
+        max_bytes: Reject uploads larger than this
+        chunk_size: Bytes read per iteration
+        require_audio: Reject the upload as soon as its header is known not
+            to be audio
+
+    Raises:
+        UploadTooLargeError: if more than *max_bytes* arrive
+        UnrecognizedAudioError: if *require_audio* and the header is unknown
+
+    The partial file is removed when an error is raised.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    hasher = hashlib.sha256()
+    header = bytearray()
+    probe: HeaderProbe | None = None
+    probed = False
+    size = 0
+
+    def write_chunk(handle, chunk: bytes) -> None:
+        handle.write(chunk)
+        hasher.update(chunk)
+
+    handle = await asyncio.to_thread(open, dest, "wb")
+    try:
+        while chunk := await upload.read(chunk_size):
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise UploadTooLargeError(
+                    f"{upload.filename} exceeds {max_bytes // (1024 * 1024)} MB limit"
+                )
+
+            if not probed:
+                header += chunk[: PROBE_BYTES - len(header)]
+                if len(header) >= PROBE_BYTES:
+                    probe = _early_probe(upload, bytes(header), require_audio)
+                    probed = True
+
+            await asyncio.to_thread(write_chunk, handle, chunk)
+
+        if not probed:
+            probe = _early_probe(upload, bytes(header), require_audio)
+    except BaseException:
+        handle.close()
+        dest.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(handle.close)
+
+    # Re-probe with the final size so size-derived durations are filled in
+    if probe is not None and probe.duration is None:
+        probe = probe_header(bytes(header), total_size=size) or probe
+
+    return StreamedUpload(path=dest, size=size, sha256=hasher.hexdigest(), probe=probe)
+
+
+def _early_probe(
+    upload: AsyncReadable, header: bytes, require_audio: bool
+) -> HeaderProbe | None:
+    probe = probe_header(header)
+    if probe is None and require_audio:
+        raise UnrecognizedAudioError(
+            f"{upload.filename} is not a recognised audio file"
+        )
+    return probe
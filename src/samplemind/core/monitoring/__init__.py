@@ -2,9 +2,18 @@
 SampleMind AI — Monitoring & Observability Module
 
 Provides system metrics collection, audio processing metrics,
-and a Prometheus-compatible monitoring server.
+a bounded-memory metrics core and a Prometheus-compatible monitoring server.
 """
 
+from .metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    QuantileSketch,
+    Summary,
+)
+
 try:
     from .monitor import (
         AudioProcessingMetrics,
@@ -26,3 +35,12 @@ try:
 except ImportError:
     # psutil or other optional dep missing (e.g. lightweight installs)
     __all__ = []
+
+__all__ += [
+    "MetricsRegistry",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Summary",
+    "QuantileSketch",
+]
@@ -0,0 +1,716 @@
+"""
+Bounded-memory metrics core for SampleMind monitoring.
+
+Metric families keep constant memory per series no matter how many
+observations they receive, and a constant number of series no matter how
+many distinct label values callers pass:
+
+  - Counter    — monotonically increasing total
+  - Gauge      — last value set (or inc/dec)
+  - Histogram  — fixed cumulative buckets plus count/sum/min/max
+  - Summary    — count/sum/min/max plus quantiles from a QuantileSketch
+                 (relative-error log-bucket sketch, DDSketch style)
+
+Series are keyed by label-value tuples in the family's declared label
+order.  Each family admits at most ``max_series`` distinct tuples; further
+ones are folded into a single ``__overflow__`` series.
+
+Writes are lock-free: every thread accumulates into its own shard (found
+through a threading.local) and shards are merged at scrape time by
+collect().  Only the first write of a new series takes a lock.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DURATION_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+DEFAULT_SIZE_BUCKETS: tuple[float, ...] = tuple(
+    float(1024 * 4**i) for i in range(11)  # 1 KiB … 1 GiB
+)
+DEFAULT_QUANTILES: tuple[float, ...] = (0.5, 0.9, 0.99)
+DEFAULT_MAX_SERIES = 1000
+OVERFLOW_LABEL = "__overflow__"
+
+
+class MetricType(StrEnum):
+    """Types of metrics that can be collected."""
+
+    COUNTER = "counter"  # A cumulative metric that increases monotonically
+    GAUGE = "gauge"  # A metric that can go up and down
+    HISTOGRAM = "histogram"  # Samples observations into buckets
+    SUMMARY = "summary"  # Similar to histogram but with quantiles
+
+
+@dataclass
+class Metric:
+    """Base class for all metrics."""
+
+    name: str
+    metric_type: MetricType
+    description: str = ""
+    labels: dict[str, str] = field(default_factory=dict)
+    value: Any = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the metric to a dictionary."""
+        return {
+            "name": self.name,
+            "type": self.metric_type.value,
+            "description": self.description,
+            "labels": self.labels,
+            "value": self.value,
+            "timestamp": self.timestamp,
+            "timestamp_iso": datetime.fromtimestamp(self.timestamp).isoformat(),
+        }
+
+
+# ── Quantile sketch ───────────────────────────────────────────────────────────
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic bins of ratio ``gamma``, so any
+    quantile is returned within ``relative_accuracy`` of the true value.
+    At most ``max_bins`` bins are kept; beyond that the lowest bins are
+    collapsed (losing accuracy only for the smallest values).  Values at or
+    below ``min_value`` (including negatives) are counted as zero.
+    """
+
+    __slots__ = (
+        "relative_accuracy",
+        "max_bins",
+        "min_value",
+        "_log_gamma",
+        "bins",
+        "zero_count",
+        "count",
+    )
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_bins: int = 2048,
+        min_value: float = 1e-9,
+    ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.min_value = min_value
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.count += count
+        if value <= self.min_value:
+            self.zero_count += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        folded = sum(self.bins.pop(k) for k in keys[:excess])
+        self.bins[keys[excess]] += folded
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other._log_gamma != self._log_gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                # Midpoint of (gamma^(k-1), gamma^k] in relative terms
+                return (
+                    2
+                    * math.exp(key * self._log_gamma)
+                    / (1 + math.exp(self._log_gamma))
+                )
+        return (
+            2
+            * math.exp(max(self.bins) * self._log_gamma)
+            / (1 + math.exp(self._log_gamma))
+        )
+
+    def copy(self) -> QuantileSketch:
+        clone = QuantileSketch(self.relative_accuracy, self.max_bins, self.min_value)
+        clone.bins = dict(self.bins)
+        clone.zero_count = self.zero_count
+        clone.count = self.count
+        return clone
+
+
+# ── Per-series cells ──────────────────────────────────────────────────────────
+
+
+class _CounterCell:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def merge(self, other: _CounterCell) -> None:
+        self.value += other.value
+
+    def copy(self) -> _CounterCell:
+        clone = _CounterCell()
+        clone.value = self.value
+        return clone
+
+
+class _DistributionCell:
+    """count/sum/min/max shared by histograms and summaries."""
+
+    __slots__ = ("count", "sum", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def _merge(self, other: _DistributionCell) -> None:
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def stats(self) -> dict[str, float]:
+        empty = self.count == 0
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": 0.0 if empty else self.sum / self.count,
+            "min": 0.0 if empty else self.min,
+            "max": 0.0 if empty else self.max,
+        }
+
+
+class _HistogramCell(_DistributionCell):
+    __slots__ = ("bounds", "bucket_counts")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        super().__init__()
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)  # last one is +Inf
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.bounds, value)] += 1
+        self._observe(value)
+
+    def merge(self, other: _HistogramCell) -> None:
+        for i, n in enumerate(other.bucket_counts):
+            self.bucket_counts[i] += n
+        self._merge(other)
+
+    def copy(self) -> _HistogramCell:
+        clone = _HistogramCell(self.bounds)
+        clone.merge(self)
+        return clone
+
+
+class _SummaryCell(_DistributionCell):
+    __slots__ = ("sketch",)
+
+    def __init__(self, relative_accuracy: float) -> None:
+        super().__init__()
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def observe(self, value: float) -> None:
+        self.sketch.add(value)
+        self._observe(value)
+
+    def merge(self, other: _SummaryCell) -> None:
+        self.sketch.merge(other.sketch)
+        self._merge(other)
+
+    def copy(self) -> _SummaryCell:
+        clone = _SummaryCell(self.sketch.relative_accuracy)
+        clone.merge(self)
+        return clone
+
+
+# ── Families ──────────────────────────────────────────────────────────────────
+
+LabelKey = tuple[str, ...]
+
+
+class _Family(ABC):
+    """A named metric with declared labels; one cell per label tuple."""
+
+    metric_type: MetricType
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        labelnames: Sequence[str] = (),
+        max_series: int = DEFAULT_MAX_SERIES,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self.overflowed = 0  # distinct label tuples folded into the overflow series
+        self._overflow_key: LabelKey = (OVERFLOW_LABEL,) * len(self.labelnames)
+        self._series: set[LabelKey] = set()
+        self._lock = threading.Lock()
+
+    def label_key(self, *values: Any, **labels: Any) -> LabelKey:
+        if labels:
+            if values:
+                raise ValueError("Pass label values positionally or by name, not both")
+            try:
+                values = tuple(labels.pop(name) for name in self.labelnames)
+            except KeyError as e:
+                raise ValueError(f"{self.name}: missing label {e}") from None
+            if labels:
+                raise ValueError(f"{self.name}: unknown labels {sorted(labels)}")
+        if len(values) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {len(values)} values"
+            )
+        return tuple(str(v) for v in values)
+
+    def _admit(self, key: LabelKey) -> LabelKey:
+        """Register a new series, or map it to the overflow series."""
+        with self._lock:
+            if key in self._series:
+                return key
+            if len(self._series) < self.max_series or key == self._overflow_key:
+                self._series.add(key)
+                return key
+            if self.overflowed == 0:
+                logger.warning(
+                    "Metric %s exceeded %d series; folding new label values into %s",
+                    self.name,
+                    self.max_series,
+                    OVERFLOW_LABEL,
+                )
+            self.overflowed += 1
+            self._series.add(self._overflow_key)
+            return self._overflow_key
+
+    def series_count(self) -> int:
+        return len(self._series)
+
+    @abstractmethod
+    def collect(self) -> list[Metric]:
+        """Export the family's current samples"""
+
+
+class _ShardedFamily(_Family):
+    """Family whose cells are accumulated per thread and merged on collect()."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, dict[LabelKey, Any]]] = []
+        self._retired: dict[LabelKey, Any] = {}  # merged cells of finished threads
+        self._known: dict[LabelKey, LabelKey] = {}  # requested key → admitted key
+
+    @abstractmethod
+    def _new_cell(self) -> Any:
+        """Create an empty per-shard cell"""
+
+    def _cell(self, key: LabelKey) -> Any:
+        cells = getattr(self._local, "cells", None)
+        if cells is None:
+            cells = self._local.cells = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), cells))
+        cell = cells.get(key)
+        if cell is None:
+            admitted = self._known.get(key)
+            if admitted is None:
+                admitted = self._admit(key)
+                if admitted == key or len(self._known) < 2 * self.max_series:
+                    self._known[key] = admitted
+            cell = cells.get(admitted)
+            if cell is None:
+                cell = cells[admitted] = self._new_cell()
+        return cell
+
+    def _merged(self) -> dict[LabelKey, Any]:
+        with self._lock:
+            live = []
+            for thread, cells in self._shards:
+                if thread.is_alive():
+                    live.append((thread, cells))
+                    continue
+                # Fold finished threads' shards so shard count stays bounded
+                for key, cell in list(cells.items()):
+                    if key in self._retired:
+                        self._retired[key].merge(cell)
+                    else:
+                        self._retired[key] = cell.copy()
+            self._shards = live
+            merged = {key: cell.copy() for key, cell in self._retired.items()}
+            shards = [cells for _, cells in live]
+
+        for cells in shards:
+            # list() snapshots the dict atomically under the GIL
+            for key, cell in list(cells.items()):
+                if key in merged:
+                    merged[key].merge(cell)
+                else:
+                    merged[key] = cell.copy()
+        return merged
+
+    def _labels(self, key: LabelKey) -> dict[str, str]:
+        return dict(zip(self.labelnames, key, strict=True))
+
+
+class Counter(_ShardedFamily):
+    metric_type = MetricType.COUNTER
+
+    def _new_cell(self) -> _CounterCell:
+        return _CounterCell()
+
+    def inc(self, amount: float = 1.0, *values: Any, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._cell(self.label_key(*values, **labels)).value += amount
+
+    def collect(self) -> list[Metric]:
+        return [
+            Metric(
+                self.name,
+                self.metric_type,
+                self.description,
+                self._labels(key),
+                cell.value,
+            )
+            for key, cell in sorted(self._merged().items())
+        ]
+
+
+class Histogram(_ShardedFamily):
+    metric_type = MetricType.HISTOGRAM
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_DURATION_BUCKETS,
+        max_series: int = DEFAULT_MAX_SERIES,
+    ) -> None:
+        super().__init__(name, description, labelnames, max_series)
+        self.buckets = tuple(sorted(b for b in buckets if b != math.inf))
+
+    def _new_cell(self) -> _HistogramCell:
+        return _HistogramCell(self.buckets)
+
+    def observe(self, value: float, *values: Any, **labels: Any) -> None:
+        self._cell(self.label_key(*values, **labels)).observe(value)
+
+    def collect(self) -> list[Metric]:
+        metrics = []
+        for key, cell in sorted(self._merged().items()):
+            cumulative, running = {}, 0
+            for bound, n in zip(
+                (*self.buckets, math.inf), cell.bucket_counts, strict=True
+            ):
+                running += n
+                cumulative[bound] = running
+            metrics.append(
+                Metric(
+                    self.name,
+                    self.metric_type,
+                    self.description,
+                    self._labels(key),
+                    {**cell.stats(), "buckets": cumulative},
+                )
+            )
+        return metrics
+
+
+class Summary(_ShardedFamily):
+    metric_type = MetricType.SUMMARY
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        labelnames: Sequence[str] = (),
+        quantiles: Iterable[float] = DEFAULT_QUANTILES,
+        relative_accuracy: float = 0.01,
+        max_series: int = DEFAULT_MAX_SERIES,
+    ) -> None:
+        super().__init__(name, description, labelnames, max_series)
+        self.quantiles = tuple(quantiles)
+        self.relative_accuracy = relative_accuracy
+
+    def _new_cell(self) -> _SummaryCell:
+        return _SummaryCell(self.relative_accuracy)
+
+    def observe(self, value: float, *values: Any, **labels: Any) -> None:
+        self._cell(self.label_key(*values, **labels)).observe(value)
+
+    def collect(self) -> list[Metric]:
+        return [
+            Metric(
+                self.name,
+                self.metric_type,
+                self.description,
+                self._labels(key),
+                {
+                    **cell.stats(),
+                    "quantiles": {q: cell.sketch.quantile(q) for q in self.quantiles},
+                },
+            )
+            for key, cell in sorted(self._merged().items())
+        ]
+
+
+class Gauge(_Family):
+    """Last-value metric; writes are rare, so a single locked dict is used."""
+
+    metric_type = MetricType.GAUGE
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[LabelKey, float] = {}
+
+    def set(self, value: float, *values: Any, **labels: Any) -> None:
+        key = self._admit(self.label_key(*values, **labels))
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, *values: Any, **labels: Any) -> None:
+        key = self._admit(self.label_key(*values, **labels))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def collect(self) -> list[Metric]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            Metric(
+                self.name,
+                self.metric_type,
+                self.description,
+                dict(zip(self.labelnames, key, strict=True)),
+                value,
+            )
+            for key, value in items
+        ]
+
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+
+
+class MetricsRegistry:
+    """Creates metric families and collects them all at scrape time."""
+
+    def __init__(self, max_series: int = DEFAULT_MAX_SERIES) -> None:
+        self.max_series = max_series
+        self._families: dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls: type[_Family], name: str, **kwargs: Any) -> Any:
+        kwargs.setdefault("max_series", self.max_series)
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = cls(name, **kwargs)
+            elif type(family) is not cls:
+                raise ValueError(
+                    f"Metric {name} already registered as {family.metric_type}"
+                )
+            return family
+
+    def counter(
+        self,
+        name: str,
+        description: str = "",
+        labelnames: Sequence[str] = (),
+        **kwargs: Any,
+    ) -> Counter:
+        return self._register(
+            Counter, name, description=description, labelnames=labelnames, **kwargs
+        )
+
+    def gauge(
+        self,
+        name: str,
+        description: str = "",
+        labelnames: Sequence[str] = (),
+        **kwargs: Any,
+    ) -> Gauge:
+        return self._register(
+            Gauge, name, description=description, labelnames=labelnames, **kwargs
+        )
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        labelnames: Sequence[str] = (),
+        **kwargs: Any,
+    ) -> Histogram:
+        return self._register(
+            Histogram, name, description=description, labelnames=labelnames, **kwargs
+        )
+
+    def summary(
+        self,
+        name: str,
+        description: str = "",
+        labelnames: Sequence[str] = (),
+        **kwargs: Any,
+    ) -> Summary:
+        return self._register(
+            Summary, name, description=description, labelnames=labelnames, **kwargs
+        )
+
+    def families(self) -> list[_Family]:
+        with self._lock:
+            return list(self._families.values())
+
+    def collect(self) -> list[Metric]:
+        metrics: list[Metric] = []
+        for family in self.families():
+            metrics.extend(family.collect())
+        return metrics
+
+
+# ── Prometheus text format ────────────────────────────────────────────────────
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str], extra: dict[str, str] | None = None) -> str:
+    pairs = {**labels, **(extra or {})}
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and math.isnan(value):
+        return "NaN"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def format_prometheus(metrics: Iterable[Metric]) -> str:
+    """Render metrics in the Prometheus text exposition format (0.0.4)."""
+    lines: list[str] = []
+    declared: set[str] = set()
+    for metric in metrics:
+        name, labels = metric.name, metric.labels
+        if name not in declared:
+            declared.add(name)
+            if metric.description:
+                lines.append(f"# HELP {name} {metric.description}")
+            lines.append(f"# TYPE {name} {metric.metric_type.value}")
+
+        if metric.metric_type == MetricType.HISTOGRAM:
+            for bound, count in metric.value["buckets"].items():
+                le = {"le": _format_value(float(bound))}
+                lines.append(f"{name}_bucket{_format_labels(labels, le)} {count}")
+            lines.append(
+                f"{name}_sum{_format_labels(labels)} {_format_value(metric.value['sum'])}"
+            )
+            lines.append(
+                f"{name}_count{_format_labels(labels)} {metric.value['count']}"
+            )
+        elif metric.metric_type == MetricType.SUMMARY:
+            for q, v in metric.value["quantiles"].items():
+                quantile = {"quantile": _format_value(float(q))}
+                lines.append(
+                    f"{name}{_format_labels(labels, quantile)} {_format_value(v)}"
+                )
+            lines.append(
+                f"{name}_sum{_format_labels(labels)} {_format_value(metric.value['sum'])}"
+            )
+            lines.append(
+                f"{name}_count{_format_labels(labels)} {metric.value['count']}"
+            )
+        else:
+            lines.append(
+                f"{name}{_format_labels(labels)} {_format_value(metric.value)}"
+            )
+
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "Counter",
+    "DEFAULT_DURATION_BUCKETS",
+    "DEFAULT_QUANTILES",
+    "DEFAULT_SIZE_BUCKETS",
+    "Gauge",
+    "Histogram",
+    "Metric",
+    "MetricType",
+    "MetricsRegistry",
+    "OVERFLOW_LABEL",
+    "QuantileSketch",
+    "Summary",
+    "format_prometheus",
+]
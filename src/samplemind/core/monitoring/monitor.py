@@ -6,45 +6,18 @@ of the distributed audio processing pipeline.
 """
 
 import time
-from dataclasses import dataclass, field
 from datetime import datetime
-from enum import StrEnum
 from typing import Any
 
 import psutil
 
-
-class MetricType(StrEnum):
-    """Types of metrics that can be collected."""
-
-    COUNTER = "counter"  # A cumulative metric that increases monotonically
-    GAUGE = "gauge"  # A metric that can go up and down
-    HISTOGRAM = "histogram"  # Samples observations into buckets
-    SUMMARY = "summary"  # Similar to histogram but with quantiles
-
-
-@dataclass
-class Metric:
-    """Base class for all metrics."""
-
-    name: str
-    metric_type: MetricType
-    description: str = ""
-    labels: dict[str, str] = field(default_factory=dict)
-    value: Any = None
-    timestamp: float = field(default_factory=time.time)
-
-    def to_dict(self) -> dict[str, Any]:
-        """Convert the metric to a dictionary."""
-        return {
-            "name": self.name,
-            "type": self.metric_type.value,
-            "description": self.description,
-            "labels": self.labels,
-            "value": self.value,
-            "timestamp": self.timestamp,
-            "timestamp_iso": datetime.fromtimestamp(self.timestamp).isoformat(),
-        }
+from .metrics import (
+    DEFAULT_SIZE_BUCKETS,
+    Metric,
+    MetricsRegistry,
+    MetricType,
+    format_prometheus,
+)
 
 
 class SystemMetricsCollector:
@@ -123,10 +96,32 @@ class SystemMetricsCollector:
 
 
 class AudioProcessingMetrics:
-    """Collects audio processing specific metrics."""
-
-    def __init__(self) -> None:
-        self._metrics = {}
+    """
+    Collects audio processing specific metrics.
+
+    Backed by a MetricsRegistry, so memory stays constant under load:
+    durations go into fixed-bucket histograms / quantile summaries instead
+    of ever-growing lists, and file sizes are bucketed rather than kept as
+    one series per path.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        self.processing_duration = self.registry.histogram(
+            "audio_processing_duration_seconds",
+            "Time taken to process an audio file",
+            labelnames=("feature_type", "success"),
+        )
+        self.file_size = self.registry.histogram(
+            "audio_file_size_bytes",
+            "Size of processed audio files",
+            buckets=DEFAULT_SIZE_BUCKETS,
+        )
+        self.feature_duration = self.registry.summary(
+            "feature_extraction_duration_seconds",
+            "Time taken to extract a single feature",
+            labelnames=("feature",),
+        )
 
     def record_processing_time(
         self,
@@ -136,72 +131,24 @@ class AudioProcessingMetrics:
         success: bool = True,
     ) -> None:
         """Record the time taken to process an audio file."""
-        key = f'audio_processing_duration_seconds{{feature_type="{feature_type}", success="{success}"}}'
-        if key not in self._metrics:
-            self._metrics[key] = []
-        self._metrics[key].append(duration_seconds)
+        self.processing_duration.observe(
+            duration_seconds, feature_type=feature_type, success=str(success).lower()
+        )
 
     def record_file_size(self, file_path: str, size_bytes: int) -> None:
         """Record the size of a processed audio file."""
-        key = f'audio_file_size_bytes{{file="{file_path}"}}'
-        self._metrics[key] = size_bytes
+        # Not labelled by path: that would create one series per file
+        self.file_size.observe(size_bytes)
 
     def record_feature_extraction(
         self, feature_type: str, duration_seconds: float
     ) -> None:
         """Record the time taken to extract a specific feature."""
-        key = f'feature_extraction_duration_seconds{{feature="{feature_type}"}}'
-        if key not in self._metrics:
-            self._metrics[key] = []
-        self._metrics[key].append(duration_seconds)
+        self.feature_duration.observe(duration_seconds, feature=feature_type)
 
     def get_metrics(self) -> list[Metric]:
-        """Get all collected metrics."""
-        metrics = []
-
-        for key, values in self._metrics.items():
-            # Parse labels from the key if present
-            if "{" in key and "}" in key:
-                name, label_str = key.split("{", 1)
-                label_str = label_str.rstrip("}")
-                labels = {}
-                for pair in label_str.split(","):
-                    k, v = pair.split("=")
-                    labels[k.strip()] = v.strip("\"'")
-            else:
-                name = key
-                labels = {}
-
-            # Create appropriate metric type
-            if isinstance(values, list):
-                # For lists, create a histogram
-                metrics.append(
-                    Metric(
-                        name=name,
-                        metric_type=MetricType.HISTOGRAM,
-                        labels=labels,
-                        value={
-                            "count": len(values),
-                            "sum": sum(values),
-                            "avg": sum(values) / len(values) if values else 0,
-                            "min": min(values) if values else 0,
-                            "max": max(values) if values else 0,
-                            "values": values,
-                        },
-                    )
-                )
-            else:
-                # For single values, create a gauge or counter
-                metric_type = (
-                    MetricType.COUNTER if name.endswith("_total") else MetricType.GAUGE
-                )
-                metrics.append(
-                    Metric(
-                        name=name, metric_type=metric_type, labels=labels, value=values
-                    )
-                )
-
-        return metrics
+        """Get all collected metrics (merged across threads)."""
+        return self.registry.collect()
 
 
 class Monitor:
@@ -249,30 +196,4 @@ class Monitor:
 
     def export_prometheus(self) -> str:
         """Export metrics in Prometheus text format."""
-        lines = []
-
-        for metric in self.collect_metrics():
-            # Format metric name and labels
-            labels = ",".join(f'{k}="{v}"' for k, v in metric.labels.items())
-            metric_name = f"{metric.name}"
-
-            if labels:
-                metric_name = f"{metric.name}{{{labels}}}"
-
-            # Format value based on metric type
-            if metric.metric_type == MetricType.HISTOGRAM:
-                # For histograms, export multiple metrics
-                lines.append(f"# TYPE {metric.name} histogram")
-                lines.append(
-                    f'{metric.name}_count{{{labels}}} {len(metric.value["values"])}'
-                )
-                lines.append(f'{metric.name}_sum{{{labels}}} {metric.value["sum"]}')
-                lines.append(f'{metric.name}_avg{{{labels}}} {metric.value["avg"]}')
-                lines.append(f'{metric.name}_min{{{labels}}} {metric.value["min"]}')
-                lines.append(f'{metric.name}_max{{{labels}}} {metric.value["max"]}')
-            else:
-                # For counters and gauges
-                lines.append(f"# TYPE {metric.name} {metric.metric_type.value}")
-                lines.append(f"{metric_name} {metric.value}")
-
-        return "\n".join(lines) + "\n"
+        return format_prometheus(self.collect_metrics())
@@ -6,6 +6,15 @@
   audio/         — audio files (copied from local library)
   preview.wav    — optional short preview (first 30s of first sample)
 
+Build pipeline:
+  - sample metadata comes from the FAISS index path lookup (O(1) per sample)
+  - durations are probed in parallel on a bounded worker pool
+  - audio is streamed from the library straight into the archive (no temp
+    copy); already-compressed formats (FLAC/MP3/OGG/...) are STORED, PCM
+    formats are DEFLATED
+  - the archive is written to ``<name>.smpack.part`` and renamed on success
+  - an optional progress callback receives (stage, done, total)
+
 Spec:
   manifest.json schema:
     {
@@ -52,12 +61,13 @@ Usage::
 from __future__ import annotations
 
 import asyncio
+import io
 import json
 import logging
 import re
 import shutil
-import tempfile
 import zipfile
+from collections.abc import Callable
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -65,6 +75,16 @@ logger = logging.getLogger(__name__)
 
 SMPACK_VERSION = "1.0"
 
+# Formats that are already entropy-coded; deflating them wastes CPU for ~0% gain
+STORED_EXTENSIONS = frozenset(
+    {".flac", ".mp3", ".ogg", ".oga", ".opus", ".m4a", ".aac", ".wma", ".wv"}
+)
+DEFAULT_PROBE_WORKERS = 8
+PREVIEW_SECONDS = 30
+
+# progress(stage, done, total); stage is "probe" or "write"
+ProgressCallback = Callable[[str, int, int], None]
+
 
 class PackBuildError(Exception):
     """Raised when pack construction fails."""
@@ -100,6 +120,8 @@ class PackBuilder:
         author: str = "",
         output_dir: str = ".",
         include_audio: bool = True,
+        progress: ProgressCallback | None = None,
+        max_workers: int = DEFAULT_PROBE_WORKERS,
     ) -> str:
         """
         Build a .smpack archive.
@@ -113,6 +135,9 @@ class PackBuilder:
             output_dir: Directory where the .smpack file will be written.
             include_audio: If True, copies audio files into the archive.
                            Set False to create a metadata-only manifest pack.
+            progress: Optional callback (stage, done, total). "write"
+                      updates are sent from the archive writer thread.
+            max_workers: Maximum concurrent metadata probes.
 
         Returns:
             Absolute path to the created .smpack file.
@@ -124,9 +149,11 @@ class PackBuilder:
         output_path = Path(output_dir) / f"{slug}.smpack"
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        sample_entries = await asyncio.gather(
-            *[self._build_sample_entry(p, include_audio) for p in sample_paths]
+        sample_entries = await self._probe_samples(
+            sample_paths, include_audio, progress, max_workers
         )
+        if include_audio:
+            _dedupe_archive_names(sample_entries)
 
         bpms = [e["bpm"] for e in sample_entries if e.get("bpm")]
         keys = list({e["key"] for e in sample_entries if e.get("key")})
@@ -145,35 +172,73 @@ class PackBuilder:
             "samples": sample_entries,
         }
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp = Path(tmpdir)
-            (tmp / "audio").mkdir()
+        await asyncio.to_thread(
+            self._write_archive,
+            output_path,
+            manifest,
+            sample_entries if include_audio else [],
+            sample_paths[0],
+            progress,
+        )
+
+        logger.info("✓ Built pack: %s (%d samples)", output_path, len(sample_entries))
+        return str(output_path)
 
-            # Write manifest
-            manifest_path = tmp / "manifest.json"
-            manifest_path.write_text(json.dumps(manifest, indent=2))
+    async def _probe_samples(
+        self,
+        sample_paths: list[str],
+        include_audio: bool,
+        progress: ProgressCallback | None,
+        max_workers: int,
+    ) -> list[dict]:
+        """Build manifest entries concurrently, at most *max_workers* at once."""
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+        total = len(sample_paths)
+        done = 0
+
+        async def probe(path: str) -> dict:
+            nonlocal done
+            async with semaphore:
+                entry = await self._build_sample_entry(path, include_audio)
+            done += 1
+            if progress:
+                progress("probe", done, total)
+            return entry
+
+        return list(await asyncio.gather(*(probe(p) for p in sample_paths)))
+
+    def _write_archive(
+        self,
+        output_path: Path,
+        manifest: dict,
+        sample_entries: list[dict],
+        preview_source: str | None,
+        progress: ProgressCallback | None,
+    ) -> None:
+        """Stream manifest, audio and preview into the archive (blocking)."""
+        partial = output_path.with_name(output_path.name + ".part")
+        total = len(sample_entries)
+        try:
+            with zipfile.ZipFile(partial, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr("manifest.json", json.dumps(manifest, indent=2))
 
-            # Copy audio files
-            if include_audio:
-                for entry in sample_entries:
+                for done, entry in enumerate(sample_entries, start=1):
                     src = entry.get("_local_path")
                     if src and Path(src).exists():
-                        shutil.copy2(src, tmp / "audio" / entry["filename"])
-
-            # Create preview from first sample
-            self._maybe_create_preview(sample_paths[0] if sample_paths else None, tmp)
-
-            # Zip everything
-            with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                zf.write(manifest_path, "manifest.json")
-                for audio_file in (tmp / "audio").iterdir():
-                    zf.write(audio_file, f"audio/{audio_file.name}")
-                preview = tmp / "preview.wav"
-                if preview.exists():
-                    zf.write(preview, "preview.wav")
-
-        logger.info("✓ Built pack: %s (%d samples)", output_path, len(sample_entries))
-        return str(output_path)
+                        # ZipFile.write copies in chunks — no full read, no temp copy
+                        zf.write(
+                            src,
+                            entry["path"],
+                            compress_type=_compression_for(src),
+                        )
+                    if progress:
+                        progress("write", done, total)
+
+                self._maybe_create_preview(preview_source, zf)
+            partial.replace(output_path)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
 
     async def _build_sample_entry(self, path: str, include_audio: bool) -> dict:
         """Build a manifest sample entry from a file path."""
@@ -190,11 +255,10 @@ class PackBuilder:
             "duration_s": None,
         }
 
-        # Try FAISS index first
+        # Try FAISS index first (O(1) path lookup)
         if self._index:
-            by_path = {e.path: e for e in self._index._entries}
-            idx_entry = by_path.get(path)
-            if idx_entry:
+            idx_entry = self._index.get_entry(path)
+            if idx_entry and idx_entry.path == path:
                 entry["bpm"] = idx_entry.bpm
                 entry["key"] = idx_entry.key
                 entry["energy"] = idx_entry.energy
@@ -210,17 +274,21 @@ class PackBuilder:
 
         return entry
 
-    def _maybe_create_preview(self, first_path: str | None, tmp: Path) -> None:
-        """Create a 30-second preview clip from the first sample."""
+    def _maybe_create_preview(
+        self, first_path: str | None, zf: zipfile.ZipFile
+    ) -> None:
+        """Add a 30-second preview clip of the first sample to the archive."""
         if not first_path:
             return
         try:
             import soundfile as sf
 
-            data, sr = sf.read(first_path, always_2d=True)
-            preview_samples = min(len(data), sr * 30)
-            preview_data = data[:preview_samples]
-            sf.write(str(tmp / "preview.wav"), preview_data, sr)
+            # Decode only the preview window, not the whole file
+            sr = sf.info(first_path).samplerate
+            data, sr = sf.read(first_path, frames=sr * PREVIEW_SECONDS, always_2d=True)
+            buffer = io.BytesIO()
+            sf.write(buffer, data, sr, format="WAV")
+            zf.writestr("preview.wav", buffer.getvalue())
         except Exception:
             pass  # Preview is optional
 
@@ -314,6 +382,29 @@ def _slugify(text: str) -> str:
     return slug.strip("-")
 
 
+def _compression_for(path: str) -> int:
+    """ZIP_STORED for already-compressed audio, ZIP_DEFLATED otherwise."""
+    if Path(path).suffix.lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _dedupe_archive_names(entries: list[dict]) -> None:
+    """Give samples that share a filename distinct archive paths."""
+    seen: set[str] = set()
+    for entry in entries:
+        name = entry["filename"]
+        if name in seen:
+            stem, suffix = Path(name).stem, Path(name).suffix
+            n = 2
+            while f"{stem}-{n}{suffix}" in seen:
+                n += 1
+            name = f"{stem}-{n}{suffix}"
+            entry["filename"] = name
+            entry["path"] = f"audio/{name}"
+        seen.add(name)
+
+
 def _bpm_from_filename(filename: str) -> int | None:
     """Extract BPM from filename patterns like 'kick_140bpm.wav' or 'snare-130.wav'."""
     patterns = [
@@ -344,8 +435,7 @@ async def _get_duration(path: str) -> float | None:
         except Exception:
             return None
 
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, _read)
+    return await asyncio.to_thread(_read)
 
 
 # ── Module-level convenience ──────────────────────────────────────────────────
@@ -1,5 +1,5 @@
 from .advanced_features import AdvancedAudioFeatures, AdvancedFeatureExtractor
-from .audio_pipeline import AudioFormat, AudioMetadata, AudioPipeline
+from .audio_pipeline import AudioFormat, AudioMetadata, AudioPipeline, PipelineResult
 from .audio_to_midi import AudioToMIDIConverter, AudioToMIDIResult, MidiNoteEvent
 from .exceptions import OptionalDependencyError
 from .forensics_analyzer import (
@@ -11,17 +11,21 @@ from .forensics_analyzer import (
 )
 from .realtime_spectral import FrequencyScale, RealtimeSpectral, SpectralFrame
 from .stem_separation import StemSeparationEngine, StemSeparationResult
+from .stem_service import SeparationStats, StemSeparationService
 
 __all__ = [
     "AudioPipeline",
     "AudioMetadata",
     "AudioFormat",
+    "PipelineResult",
     "AudioToMIDIConverter",
     "AudioToMIDIResult",
     "MidiNoteEvent",
     "OptionalDependencyError",
     "StemSeparationEngine",
     "StemSeparationResult",
+    "StemSeparationService",
+    "SeparationStats",
     "ForensicsAnalyzer",
     "ForensicsResult",
     "CompressionAnalysis",
@@ -8,24 +8,45 @@ This module provides a comprehensive audio preprocessing pipeline that handles:
 - Normalization and gain control
 - Noise reduction and filtering
 - Audio segmentation and framing
+
+Chained calls only record operations.  They run as one plan when the audio
+is needed (``get_audio_data``, ``save`` or ``execute``):
+- the file is decoded once, from the handle its metadata was read from
+- resampling converts all channels in one call
+- adjacent gain/normalize steps fold into a single scale, adjacent filters
+  into one second-order-sections cascade, and the mono downmix moves ahead
+  of linear steps so they only process one channel
+- files longer than ``max_in_memory_seconds`` are saved block-wise, so
+  memory is bounded by the block size rather than the file length
+- ``run_batch`` applies the recorded plan to many files in a process pool
 """
 
 import logging
-from dataclasses import dataclass
+import math
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
 from enum import Enum
 from pathlib import Path
+from typing import Any
 
 import librosa
 import numpy as np
 import soundfile as sf
 from scipy import signal
 
-from ..engine.audio_engine import AudioProcessor
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Peak level normalize() scales to, leaving some headroom
+NORMALIZE_PEAK = 0.95
+
+# Impulse-response level (about -140 dB) below which a filter is considered
+# settled; sets how much context block-wise filtering reads around a block
+SETTLE_TOLERANCE = 1e-7
+
 
 class AudioFormat(Enum):
     """Supported audio formats for input/output"""
@@ -51,55 +72,483 @@ class AudioMetadata:
     codec: str | None = None
 
 
+@dataclass
+class PipelineResult:
+    """Outcome of running a pipeline plan on one file"""
+
+    input_path: str
+    output_path: str | None
+    success: bool
+    error: str | None = None
+    history: list[str] = field(default_factory=list)
+    processing_time: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+# ============================================================================
+# Plan stages
+# ============================================================================
+#
+# Each stage works on channels-first arrays.  ``apply`` transforms a whole
+# signal; ``stream`` returns a block processor (push/flush) for block-wise
+# execution, where every block is 2-D.
+
+
+class _BlockMap:
+    """Stateless block processor"""
+
+    def __init__(self, fn: Callable[[np.ndarray], np.ndarray]) -> None:
+        self.fn = fn
+
+    def push(self, block: np.ndarray) -> np.ndarray:
+        return self.fn(block)
+
+    def flush(self) -> np.ndarray | None:
+        return None
+
+
+class _BlockResampler:
+    """Streaming resampler; output matches resampling the whole signal"""
+
+    def __init__(self, orig_sr: int, target_sr: int) -> None:
+        import soxr  # librosa's default resampling backend
+
+        self._factory = lambda channels: soxr.ResampleStream(
+            orig_sr, target_sr, channels, dtype="float32", quality="HQ"
+        )
+        self._stream = None
+        self._channels = 0
+
+    def push(self, block: np.ndarray) -> np.ndarray:
+        if self._stream is None:
+            self._channels = block.shape[0]
+            self._stream = self._factory(self._channels)
+        chunk = np.ascontiguousarray(block.T, dtype=np.float32)
+        return self._stream.resample_chunk(chunk).T
+
+    def flush(self) -> np.ndarray | None:
+        if self._stream is None:
+            return None
+        empty = np.zeros((0, self._channels), dtype=np.float32)
+        return self._stream.resample_chunk(empty, last=True).T
+
+
+class _BlockFilter:
+    """
+    Zero-phase filtering over blocks.
+
+    Each output block is filtered together with ``margin`` samples of
+    context on both sides, enough for the filter to settle, so the result
+    matches filtering the whole signal to within SETTLE_TOLERANCE.
+    """
+
+    def __init__(self, stage: "_Filter") -> None:
+        self.stage = stage
+        self.margin = stage.settle_samples
+        self._buffer: np.ndarray | None = None
+        self._done = 0  # buffer index where unfinished output starts
+
+    def push(self, block: np.ndarray) -> np.ndarray:
+        buffer = (
+            block
+            if self._buffer is None
+            else np.concatenate([self._buffer, block], axis=-1)
+        )
+        ready = buffer.shape[-1] - self.margin
+        if ready <= self._done:
+            self._buffer = buffer
+            return buffer[..., :0]
+
+        out = self.stage.apply(buffer)[..., self._done : ready]
+        keep = max(0, ready - self.margin)
+        self._buffer = buffer[..., keep:]
+        self._done = ready - keep
+        return out
+
+    def flush(self) -> np.ndarray | None:
+        if self._buffer is None:
+            return None
+        out = self.stage.apply(self._buffer)[..., self._done :]
+        self._buffer = None
+        return out
+
+
+class _BlockCrop:
+    """Keeps samples in [start, end) of the stream"""
+
+    def __init__(self, start: int, end: int) -> None:
+        self.start = start
+        self.end = end
+        self._position = 0
+
+    def push(self, block: np.ndarray) -> np.ndarray:
+        n = block.shape[-1]
+        lo = min(max(self.start - self._position, 0), n)
+        hi = min(max(self.end - self._position, 0), n)
+        self._position += n
+        return block[..., lo:hi]
+
+    def flush(self) -> np.ndarray | None:
+        return None
+
+
+@dataclass
+class _Resample:
+    orig_sr: int
+    target_sr: int
+
+    def apply(self, y: np.ndarray) -> np.ndarray:
+        # One call for all channels
+        return librosa.resample(
+            y, orig_sr=self.orig_sr, target_sr=self.target_sr, axis=-1
+        )
+
+    def stream(self) -> _BlockResampler:
+        return _BlockResampler(self.orig_sr, self.target_sr)
+
+
+@dataclass
+class _Mono:
+    def apply(self, y: np.ndarray) -> np.ndarray:
+        return librosa.to_mono(y) if y.ndim > 1 else y
+
+    def stream(self) -> _BlockMap:
+        return _BlockMap(lambda block: block.mean(axis=0, keepdims=True))
+
+
+@dataclass
+class _Scale:
+    """Multiply by ``factor`` (after peak normalizing), then clip at ``limit``"""
+
+    factor: float = 1.0
+    normalize: bool = False
+    limit: float | None = None
+
+    @property
+    def is_identity(self) -> bool:
+        return self.factor == 1.0 and not self.normalize and self.limit is None
+
+    @property
+    def is_linear(self) -> bool:
+        return not self.normalize and self.limit is None
+
+    def then(self, other: "_Scale") -> "_Scale | None":
+        """This step followed by ``other`` as one step, or None"""
+        if other.normalize:
+            # Peak normalization cancels earlier scaling, but not clipping
+            return other if self.limit is None else None
+
+        # clip(x, L) * f == clip(x * f, L * f) for f > 0
+        limit = self.limit * other.factor if self.limit is not None else None
+        if other.limit is not None:
+            limit = other.limit if limit is None else min(limit, other.limit)
+        return _Scale(self.factor * other.factor, self.normalize, limit)
+
+    def resolved(self, peak: float) -> "_Scale":
+        """Equivalent fixed-factor step for a signal with this input peak"""
+        factor = self.factor
+        if self.normalize and peak > 0:
+            factor *= NORMALIZE_PEAK / peak
+        return _Scale(factor, False, self.limit)
+
+    def apply(self, y: np.ndarray) -> np.ndarray:
+        step = self
+        if self.normalize:
+            step = self.resolved(float(np.max(np.abs(y))) if y.size else 0.0)
+        y = y * np.float32(step.factor)
+        if step.limit is not None:
+            np.clip(y, -step.limit, step.limit, out=y)
+        return y
+
+    def stream(self) -> _BlockMap:
+        if self.normalize:
+            raise ValueError("Normalization must be resolved before streaming")
+        return _BlockMap(self.apply)
+
+
+@dataclass
+class _Filter:
+    """Zero-phase IIR filter as second-order sections"""
+
+    sos: np.ndarray
+
+    def then(self, other: "_Filter") -> "_Filter":
+        return _Filter(np.vstack([self.sos, other.sos]))
+
+    @property
+    def padlen(self) -> int:
+        return 3 * (2 * len(self.sos) + 1)
+
+    @property
+    def settle_samples(self) -> int:
+        """Samples after which the impulse response is below SETTLE_TOLERANCE"""
+        poles = np.concatenate([np.roots(section[3:]) for section in self.sos])
+        radius = float(np.max(np.abs(poles))) if poles.size else 0.0
+        settle = 0
+        if 0.0 < radius < 1.0:
+            settle = math.ceil(math.log(SETTLE_TOLERANCE) / math.log(radius))
+        return max(settle, self.padlen + 1)
+
+    def apply(self, y: np.ndarray) -> np.ndarray:
+        if y.shape[-1] < 2:
+            return y
+        padlen = min(self.padlen, y.shape[-1] - 1)
+        out = signal.sosfiltfilt(self.sos, y, axis=-1, padlen=padlen)
+        return out.astype(np.float32, copy=False)
+
+    def stream(self) -> _BlockFilter:
+        return _BlockFilter(self)
+
+
+@dataclass
+class _Trim:
+    top_db: float
+    frame_length: int
+    hop_length: int
+    bounds: tuple[int, int] | None = None
+
+    @property
+    def streamable(self) -> bool:
+        # Frames must be whole numbers of hops to be summed from hop energies
+        hop = self.hop_length
+        return self.frame_length % hop == 0 and (self.frame_length // 2) % hop == 0
+
+    def apply(self, y: np.ndarray) -> np.ndarray:
+        # Multi-channel input is trimmed to one common region
+        trimmed, _ = librosa.effects.trim(
+            y,
+            top_db=self.top_db,
+            frame_length=self.frame_length,
+            hop_length=self.hop_length,
+        )
+        return trimmed
+
+    def stream(self) -> _BlockCrop:
+        if self.bounds is None:
+            raise ValueError("Trim bounds must be resolved before streaming")
+        return _BlockCrop(*self.bounds)
+
+
+_Stage = _Resample | _Mono | _Scale | _Filter | _Trim
+
+
+def _commutes_with_mono(stage: _Stage) -> bool:
+    """Linear, channel-independent stages give the same result after a downmix"""
+    if isinstance(stage, _Scale):
+        return stage.is_linear
+    return isinstance(stage, (_Resample, _Filter))
+
+
+def _fuse(stages: list[_Stage]) -> list[_Stage]:
+    """Move the downmix forward and merge adjacent compatible stages"""
+    ordered: list[_Stage] = []
+    for stage in stages:
+        ordered.append(stage)
+        if isinstance(stage, _Mono):
+            i = len(ordered) - 1
+            while i > 0 and _commutes_with_mono(ordered[i - 1]):
+                ordered[i - 1], ordered[i] = ordered[i], ordered[i - 1]
+                i -= 1
+
+    fused: list[_Stage] = []
+    for stage in ordered:
+        prev = fused[-1] if fused else None
+        merged: _Stage | None = None
+        if isinstance(prev, _Scale) and isinstance(stage, _Scale):
+            merged = prev.then(stage)
+        elif isinstance(prev, _Filter) and isinstance(stage, _Filter):
+            merged = prev.then(stage)
+        elif isinstance(prev, _Resample) and isinstance(stage, _Resample):
+            merged = _Resample(prev.orig_sr, stage.target_sr)
+        elif isinstance(prev, _Mono) and isinstance(stage, _Mono):
+            merged = prev
+
+        if merged is not None:
+            fused[-1] = merged
+        else:
+            fused.append(stage)
+
+    return [
+        s
+        for s in fused
+        if not (isinstance(s, _Scale) and s.is_identity)
+        and not (isinstance(s, _Resample) and s.orig_sr == s.target_sr)
+    ]
+
+
+# ============================================================================
+# Block-wise statistics
+# ============================================================================
+
+
+class _PeakMeter:
+    def __init__(self) -> None:
+        self.peak = 0.0
+
+    def __call__(self, block: np.ndarray) -> None:
+        if block.size:
+            self.peak = max(self.peak, float(np.max(np.abs(block))))
+
+
+class _SilenceMeter:
+    """
+    Collects per-hop energies, from which trim bounds are placed exactly as
+    ``librosa.effects.trim`` would place them on the whole signal.
+    """
+
+    def __init__(self, hop_length: int) -> None:
+        self.hop_length = hop_length
+        self.length = 0
+        self._energies: list[np.ndarray] = []
+        self._partial: np.ndarray | None = None
+
+    def __call__(self, block: np.ndarray) -> None:
+        self.length += block.shape[-1]
+        if self._partial is not None:
+            block = np.concatenate([self._partial, block], axis=-1)
+        whole = block.shape[-1] // self.hop_length * self.hop_length
+        if whole:
+            hops = block[..., :whole].reshape(block.shape[0], -1, self.hop_length)
+            self._energies.append(np.sum(np.square(hops, dtype=np.float64), axis=-1))
+        self._partial = block[..., whole:]
+
+    def bounds(self, stage: _Trim) -> tuple[int, int]:
+        hop = self.hop_length
+        energies = list(self._energies)
+        if self._partial is not None and self._partial.shape[-1]:
+            energies.append(
+                np.sum(np.square(self._partial, dtype=np.float64), axis=-1)[:, None]
+            )
+        if not energies:
+            return 0, 0
+        per_hop = np.concatenate(energies, axis=-1)
+
+        # Centered frames (librosa's default): frame k covers hops
+        # [k - half, k - half + hops_per_frame), zero-padded at the edges
+        hops_per_frame = stage.frame_length // hop
+        half = (stage.frame_length // 2) // hop
+        padded = np.pad(per_hop, ((0, 0), (half, hops_per_frame)))
+        n_frames = 1 + self.length // hop
+        windows = np.lib.stride_tricks.sliding_window_view(
+            padded, hops_per_frame, axis=-1
+        )[:, :n_frames]
+        rms = np.sqrt(windows.sum(axis=-1) / stage.frame_length)
+
+        db = librosa.amplitude_to_db(rms, ref=np.max, top_db=None).max(axis=0)
+        nonzero = np.flatnonzero(db > -stage.top_db)
+        if nonzero.size == 0:
+            return 0, 0
+        return int(nonzero[0] * hop), min(self.length, int((nonzero[-1] + 1) * hop))
+
+
+def _drain(processors: list) -> np.ndarray | None:
+    """Flush block processors in order, passing each tail downstream"""
+    tail = None
+    for processor in processors:
+        parts = []
+        if tail is not None:
+            parts.append(processor.push(tail))
+        flushed = processor.flush()
+        if flushed is not None:
+            parts.append(flushed)
+        tail = np.concatenate(parts, axis=-1) if parts else None
+    return tail
+
+
+@dataclass
+class _Plan:
+    stages: list[_Stage]
+    history: list[list[str]]  # messages for each recorded operation
+    sample_rate: int
+    channels: int
+
+
+@dataclass
+class _Op:
+    """One recorded pipeline call"""
+
+    name: str
+    params: dict[str, Any] = field(default_factory=dict)
+
+
 class AudioPipeline:
     """
     Audio preprocessing pipeline for SampleMind AI.
 
     This class provides a chainable interface for applying various audio processing
-    operations in a pipeline fashion.
+    operations in a pipeline fashion.  Operations are recorded and executed
+    together as an optimized plan when the result is needed.
     """
 
-    def __init__(self, target_sr: int = 44100, mono: bool = True) -> None:
+    def __init__(
+        self,
+        target_sr: int = 44100,
+        mono: bool = True,
+        max_in_memory_seconds: float = 600.0,
+        block_size: int = 131072,
+    ) -> None:
         """
         Initialize the audio pipeline.
 
         Args:
             target_sr: Target sample rate in Hz
             mono: Whether to convert to mono
+            max_in_memory_seconds: Longer files are saved block-wise
+            block_size: Frames per block for block-wise processing
         """
         self.target_sr = target_sr
         self.mono = mono
-        self.y = None
-        self.sr = None
-        self.metadata = None
+        self.max_in_memory_seconds = max_in_memory_seconds
+        self.block_size = block_size
+        self.metadata: AudioMetadata | None = None
         self.history: list[str] = []
 
+        self._source: Path | None = None
+        self._handle: sf.SoundFile | None = None
+        self._y: np.ndarray | None = None
+        self._sr: int | None = None
+        self._ops: list[_Op] = []
+        self._logged_ops = 0  # recorded ops already written to history
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
     def load(self, input_path: str | Path) -> "AudioPipeline":
         """
         Load an audio file from disk.
 
+        The file is opened and its metadata read; decoding happens when the
+        plan runs.  Formats libsndfile cannot read are decoded with librosa.
+
         Args:
             input_path: Path to the input audio file
 
         Returns:
             Self for method chaining
         """
-        try:
-            # Load audio file
-            self.y, self.sr = librosa.load(
-                str(input_path),
-                sr=None,  # Keep original sample rate
-                mono=False,  # Load all channels
-            )
+        self.close()
+        self._source = Path(input_path)
+        self._y = None
+        self._ops = []
+        self._logged_ops = 0
 
-            # Get file info
-            with sf.SoundFile(str(input_path)) as f:
+        try:
+            try:
+                handle = sf.SoundFile(str(input_path))
+            except RuntimeError:
+                self._load_with_librosa(input_path)
+            else:
+                self._handle = handle
+                self._sr = handle.samplerate
                 self.metadata = AudioMetadata(
-                    sample_rate=f.samplerate,
-                    channels=f.channels,
-                    duration=len(f) / f.samplerate,
-                    format=f.format,
-                    bit_depth=f.subtype,
+                    sample_rate=handle.samplerate,
+                    channels=handle.channels,
+                    duration=handle.frames / handle.samplerate,
+                    format=handle.format,
+                    bit_depth=handle.subtype,
                 )
 
             self.history.append(f"Loaded audio from {input_path}")
@@ -109,6 +558,19 @@ class AudioPipeline:
             logger.error(f"Error loading audio file {input_path}: {str(e)}")
             raise
 
+    def _load_with_librosa(self, input_path: str | Path) -> None:
+        self._y, self._sr = librosa.load(str(input_path), sr=None, mono=False)
+        self.metadata = AudioMetadata(
+            sample_rate=self._sr,
+            channels=1 if self._y.ndim == 1 else self._y.shape[0],
+            duration=self._y.shape[-1] / self._sr,
+            format=Path(input_path).suffix[1:].upper(),
+        )
+
+    def _record(self, name: str, **params: Any) -> "AudioPipeline":
+        self._ops.append(_Op(name, params))
+        return self
+
     def resample(self, target_sr: int | None = None) -> "AudioPipeline":
         """
         Resample audio to target sample rate.
@@ -119,27 +581,7 @@ class AudioPipeline:
         Returns:
             Self for method chaining
         """
-        if self.y is None:
-            raise ValueError("No audio loaded. Call load() first.")
-
-        target_sr = target_sr or self.target_sr
-
-        if self.sr != target_sr:
-            # Resample each channel separately if multi-channel
-            if len(self.y.shape) > 1:
-                y_resampled = []
-                for channel in self.y:
-                    y_resampled.append(
-                        librosa.resample(channel, orig_sr=self.sr, target_sr=target_sr)
-                    )
-                self.y = np.array(y_resampled)
-            else:
-                self.y = librosa.resample(self.y, orig_sr=self.sr, target_sr=target_sr)
-
-            self.history.append(f"Resampled from {self.sr}Hz to {target_sr}Hz")
-            self.sr = target_sr
-
-        return self
+        return self._record("resample", target_sr=target_sr or self.target_sr)
 
     def to_mono(self) -> "AudioPipeline":
         """
@@ -148,14 +590,19 @@ class AudioPipeline:
         Returns:
             Self for method chaining
         """
-        if self.y is None:
-            raise ValueError("No audio loaded. Call load() first.")
+        return self._record("to_mono")
 
-        if len(self.y.shape) > 1 and self.y.shape[0] > 1 and self.mono:
-            self.y = librosa.to_mono(self.y)
-            self.history.append("Converted to mono")
+    def gain(self, gain_db: float) -> "AudioPipeline":
+        """
+        Apply a fixed gain.
 
-        return self
+        Args:
+            gain_db: Gain in dB
+
+        Returns:
+            Self for method chaining
+        """
+        return self._record("gain", gain_db=gain_db)
 
     def normalize(
         self, target_db: float = -16.0, max_peak: float = 0.0
@@ -170,23 +617,7 @@ class AudioPipeline:
         Returns:
             Self for method chaining
         """
-        if self.y is None:
-            raise ValueError("No audio loaded. Call load() first.")
-
-        # Apply normalization
-        self.y = AudioProcessor.normalize_audio(self.y, target_db)
-
-        # Apply peak limiting if requested
-        if max_peak < 0:
-            max_amplitude = 10 ** (max_peak / 20.0)
-            self.y = np.clip(self.y, -max_amplitude, max_amplitude)
-
-        self.history.append(
-            f"Normalized to {target_db} LUFS"
-            + (f" with peak limiting at {max_peak}dBFS" if max_peak < 0 else "")
-        )
-
-        return self
+        return self._record("normalize", target_db=target_db, max_peak=max_peak)
 
     def filter(
         self, low_cut: float = 20.0, high_cut: float = 20000.0
@@ -201,30 +632,7 @@ class AudioPipeline:
         Returns:
             Self for method chaining
         """
-        if self.y is None:
-            raise ValueError("No audio loaded. Call load() first.")
-
-        # Apply high-pass filter
-        if low_cut > 0 and low_cut < self.sr / 2:
-            self.y = AudioProcessor.apply_high_pass_filter(self.y, self.sr, low_cut)
-            self.history.append(f"Applied high-pass filter at {low_cut}Hz")
-
-        # Apply low-pass filter using scipy Butterworth filter
-        if high_cut < self.sr / 2 and high_cut > 0:
-            nyquist = 0.5 * self.sr
-            normalized_cutoff = high_cut / nyquist
-            b, a = signal.butter(4, normalized_cutoff, btype="low")
-
-            if len(self.y.shape) > 1:
-                self.y = np.array(
-                    [signal.filtfilt(b, a, channel) for channel in self.y]
-                )
-            else:
-                self.y = signal.filtfilt(b, a, self.y)
-
-            self.history.append(f"Applied low-pass filter at {high_cut}Hz")
-
-        return self
+        return self._record("filter", low_cut=low_cut, high_cut=high_cut)
 
     def trim_silence(
         self, top_db: float = 30.0, frame_length: int = 2048, hop_length: int = 512
@@ -240,27 +648,12 @@ class AudioPipeline:
         Returns:
             Self for method chaining
         """
-        if self.y is None:
-            raise ValueError("No audio loaded. Call load() first.")
-
-        if len(self.y.shape) > 1:  # Multi-channel
-            trimmed = []
-            for channel in self.y:
-                trimmed_channel, _ = librosa.effects.trim(
-                    channel,
-                    top_db=top_db,
-                    frame_length=frame_length,
-                    hop_length=hop_length,
-                )
-                trimmed.append(trimmed_channel)
-            self.y = np.array(trimmed)
-        else:  # Mono
-            self.y, _ = librosa.effects.trim(
-                self.y, top_db=top_db, frame_length=frame_length, hop_length=hop_length
-            )
-
-        self.history.append(f"Trimmed silence (threshold: {top_db}dB)")
-        return self
+        return self._record(
+            "trim_silence",
+            top_db=top_db,
+            frame_length=frame_length,
+            hop_length=hop_length,
+        )
 
     def process(self, input_path: str | Path, **kwargs) -> "AudioPipeline":
         """
@@ -292,7 +685,7 @@ class AudioPipeline:
         # Update with any provided kwargs
         steps.update(kwargs)
 
-        # Execute processing pipeline
+        # Record processing pipeline
         if steps["load"]:
             self.load(input_path)
 
@@ -319,42 +712,270 @@ class AudioPipeline:
 
         return self
 
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def _source_shape(self) -> tuple[int, int]:
+        """(sample rate, channels) the pending operations start from"""
+        if self._y is not None:
+            return self._sr, 1 if self._y.ndim == 1 else self._y.shape[0]
+        if self.metadata is None:
+            raise ValueError("No audio loaded. Call load() first.")
+        return self.metadata.sample_rate, self.metadata.channels
+
+    def _plan(self) -> _Plan:
+        sr, channels = self._source_shape()
+        stages: list[_Stage] = []
+        history: list[list[str]] = []
+
+        for op in self._ops:
+            p = op.params
+            messages: list[str] = []
+
+            if op.name == "resample":
+                if p["target_sr"] != sr:
+                    stages.append(_Resample(sr, p["target_sr"]))
+                    messages.append(f"Resampled from {sr}Hz to {p['target_sr']}Hz")
+                    sr = p["target_sr"]
+
+            elif op.name == "to_mono":
+                if channels > 1 and self.mono:
+                    stages.append(_Mono())
+                    messages.append("Converted to mono")
+                    channels = 1
+
+            elif op.name == "gain":
+                stages.append(_Scale(factor=10 ** (p["gain_db"] / 20.0)))
+                messages.append(f"Applied {p['gain_db']:+.1f}dB gain")
+
+            elif op.name == "normalize":
+                max_peak = p["max_peak"]
+                limit = 10 ** (max_peak / 20.0) if max_peak < 0 else None
+                stages.append(_Scale(normalize=True, limit=limit))
+                messages.append(
+                    f"Normalized to {p['target_db']} LUFS"
+                    + (f" with peak limiting at {max_peak}dBFS" if max_peak < 0 else "")
+                )
+
+            elif op.name == "filter":
+                sections = []
+                nyquist = 0.5 * sr
+                if 0 < p["low_cut"] < nyquist:
+                    sections.append(
+                        signal.butter(4, p["low_cut"] / nyquist, "high", output="sos")
+                    )
+                    messages.append(f"Applied high-pass filter at {p['low_cut']}Hz")
+                if 0 < p["high_cut"] < nyquist:
+                    sections.append(
+                        signal.butter(4, p["high_cut"] / nyquist, "low", output="sos")
+                    )
+                    messages.append(f"Applied low-pass filter at {p['high_cut']}Hz")
+                if sections:
+                    stages.append(_Filter(np.vstack(sections)))
+
+            elif op.name == "trim_silence":
+                stages.append(_Trim(p["top_db"], p["frame_length"], p["hop_length"]))
+                messages.append(f"Trimmed silence (threshold: {p['top_db']}dB)")
+
+            history.append(messages)
+
+        return _Plan(_fuse(stages), history, sr, channels)
+
+    def _log_history(self, plan: _Plan) -> None:
+        for messages in plan.history[self._logged_ops :]:
+            self.history.extend(messages)
+        self._logged_ops = len(self._ops)
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def execute(self) -> "AudioPipeline":
+        """
+        Run the recorded operations and keep the result in memory.
+
+        Returns:
+            Self for method chaining
+        """
+        if self._y is None and self._handle is None:
+            raise ValueError("No audio loaded. Call load() first.")
+        if self._y is not None and not self._ops:
+            return self
+
+        plan = self._plan()
+        y = self._y if self._y is not None else self._decode()
+        for stage in plan.stages:
+            y = stage.apply(y)
+
+        self._y, self._sr = y, plan.sample_rate
+        self._log_history(plan)
+        self._ops = []
+        self._logged_ops = 0
+        return self
+
+    def _decode(self) -> np.ndarray:
+        """Decode the whole file from the open handle, then close it"""
+        self._handle.seek(0)
+        data = self._handle.read(dtype="float32", always_2d=True)
+        self.close()
+        return data[:, 0] if data.shape[1] == 1 else data.T
+
+    def _streamable(self, plan: _Plan) -> bool:
+        if self._y is not None or self._handle is None:
+            return False
+        if self.metadata.duration <= self.max_in_memory_seconds:
+            return False
+        return all(s.streamable for s in plan.stages if isinstance(s, _Trim))
+
+    def _run_blocks(
+        self, stages: list[_Stage], sink: Callable[[np.ndarray], Any]
+    ) -> None:
+        """Decode the file block by block through ``stages`` into ``sink``"""
+        processors = [stage.stream() for stage in stages]
+        self._handle.seek(0)
+        for data in self._handle.blocks(
+            blocksize=self.block_size, dtype="float32", always_2d=True
+        ):
+            block = data.T
+            for processor in processors:
+                block = processor.push(block)
+            if block.shape[-1]:
+                sink(block)
+
+        tail = _drain(processors)
+        if tail is not None and tail.shape[-1]:
+            sink(tail)
+
+    def _save_blockwise(
+        self, output_path: Path, format: AudioFormat, plan: _Plan
+    ) -> None:
+        stages = list(plan.stages)
+
+        # Steps that depend on the whole signal get a measuring pass over
+        # the stages before them; memory stays bounded by the block size
+        for i, stage in enumerate(stages):
+            if isinstance(stage, _Scale) and stage.normalize:
+                meter = _PeakMeter()
+                self._run_blocks(stages[:i], meter)
+                stages[i] = stage.resolved(meter.peak)
+            elif isinstance(stage, _Trim):
+                meter = _SilenceMeter(stage.hop_length)
+                self._run_blocks(stages[:i], meter)
+                stages[i] = replace(stage, bounds=meter.bounds(stage))
+
+        with sf.SoundFile(
+            str(output_path),
+            "w",
+            samplerate=plan.sample_rate,
+            channels=plan.channels,
+            format=str(format.value).upper(),
+            subtype="PCM_16",
+        ) as out:
+            self._run_blocks(stages, lambda block: out.write(block.T))
+        self.close()
+
     def save(self, output_path: str | Path, format: AudioFormat | None = None) -> None:
         """
         Save processed audio to disk.
 
+        Long files that have not been materialized are processed and written
+        block-wise.
+
         Args:
             output_path: Path to save the output file
             format: Output format (inferred from extension if None)
         """
-        if self.y is None:
+        if self._y is None and self._handle is None:
             raise ValueError("No audio to save. Process audio first.")
 
         output_path = Path(output_path)
 
-        # Determine format from extension if not specified
-        if format is None:
-            ext = output_path.suffix[1:].lower()
-            try:
-                format = AudioFormat(ext)
-            except ValueError:
-                format = AudioFormat.WAV
-                output_path = output_path.with_suffix(f".{AudioFormat.WAV.value}")
+        output_path, format = _output_format(output_path, format)
 
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Save the file
-        sf.write(
-            str(output_path),
-            self.y.T if len(self.y.shape) > 1 else self.y,
-            self.sr,
-            format=str(format.value).upper(),
-            subtype="PCM_16",  # 16-bit depth
-        )
+        plan = self._plan()
+        if self._streamable(plan):
+            self._save_blockwise(output_path, format, plan)
+            self._log_history(plan)
+        else:
+            self.execute()
+            sf.write(
+                str(output_path),
+                self._y.T if len(self._y.shape) > 1 else self._y,
+                self._sr,
+                format=str(format.value).upper(),
+                subtype="PCM_16",  # 16-bit depth
+            )
 
         self.history.append(f"Saved audio to {output_path}")
 
+    def run_batch(
+        self,
+        input_paths: Iterable[str | Path],
+        output_dir: str | Path,
+        format: AudioFormat | None = None,
+        max_workers: int | None = None,
+    ) -> list[PipelineResult]:
+        """
+        Apply the recorded operations to many files in a process pool.
+
+        The pipeline's own audio is left untouched.  Each output is written
+        to ``output_dir`` under the input's stem.
+
+        Args:
+            input_paths: Audio files to process
+            output_dir: Directory for the processed files
+            format: Output format (keeps the input's format if None)
+            max_workers: Worker processes (1 runs in this process)
+
+        Returns:
+            One PipelineResult per input, in input order
+        """
+        config = {
+            "target_sr": self.target_sr,
+            "mono": self.mono,
+            "max_in_memory_seconds": self.max_in_memory_seconds,
+            "block_size": self.block_size,
+        }
+        output_dir = Path(output_dir)
+        jobs = []
+        for path in map(Path, input_paths):
+            output_path, _ = _output_format(output_dir / path.name, format)
+            jobs.append((config, list(self._ops), path, output_path))
+
+        if max_workers == 1 or len(jobs) <= 1:
+            return [_run_plan(*job) for job in jobs]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_run_plan, *zip(*jobs, strict=True)))
+
+    def close(self) -> None:
+        """Close the open input file, if any"""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    @property
+    def y(self) -> np.ndarray | None:
+        """Processed audio (runs pending operations)"""
+        if self._y is None and self._handle is None:
+            return None
+        return self.execute()._y
+
+    @property
+    def sr(self) -> int | None:
+        """Sample rate of the audio once pending operations have run"""
+        if self._y is None and self.metadata is None:
+            return None
+        return self._plan().sample_rate
+
     def get_processing_history(self) -> list:
         """
         Get the processing history for this pipeline.
@@ -371,7 +992,50 @@ class AudioPipeline:
         Returns:
             Tuple of (audio_data, sample_rate)
         """
-        if self.y is None:
+        if self._y is None and self._handle is None:
             raise ValueError("No audio data available. Process audio first.")
 
-        return self.y, self.sr
+        self.execute()
+        return self._y, self._sr
+
+
+def _output_format(
+    output_path: Path, format: AudioFormat | None
+) -> tuple[Path, AudioFormat]:
+    """Resolve the output format; unknown extensions fall back to WAV"""
+    if format is not None:
+        return output_path, format
+    try:
+        return output_path, AudioFormat(output_path.suffix[1:].lower())
+    except ValueError:
+        return output_path.with_suffix(f".{AudioFormat.WAV.value}"), AudioFormat.WAV
+
+
+def _run_plan(
+    config: dict[str, Any], ops: list[_Op], input_path: Path, output_path: Path
+) -> PipelineResult:
+    """Worker entry point for AudioPipeline.run_batch"""
+    started = time.perf_counter()
+    pipeline = AudioPipeline(**config)
+    try:
+        pipeline.load(input_path)
+        pipeline._ops = list(ops)
+        pipeline.save(output_path)
+        return PipelineResult(
+            input_path=str(input_path),
+            output_path=str(output_path),
+            success=True,
+            history=pipeline.get_processing_history(),
+            processing_time=time.perf_counter() - started,
+        )
+    except Exception as e:
+        logger.error(f"Pipeline failed for {input_path}: {e}")
+        return PipelineResult(
+            input_path=str(input_path),
+            output_path=None,
+            success=False,
+            error=str(e),
+            processing_time=time.perf_counter() - started,
+        )
+    finally:
+        pipeline.close()
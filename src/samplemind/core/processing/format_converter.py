@@ -8,15 +8,36 @@ Fallback backend: ``pydub`` (for AIFF, M4A, OPUS, OGG and other formats
                   that require ffmpeg)
 
 Supported output formats: wav, flac, mp3, ogg, aiff, m4a, opus
+
+Batch conversion (``convert_batch``) converts a whole library:
+- files are converted in a process pool, largest first, so neither the GIL
+  nor ffmpeg serializes the run
+- the backend for each source format is chosen once, before any work starts
+- outputs that are already up to date (by mtime, or by source content hash)
+  are skipped, tracked in a manifest in the output directory
+- lossless targets from libsndfile-readable sources go through soundfile;
+  large files are resampled and written block-wise with bounded memory
+- loudness normalization measures the buffer that was decoded for the
+  conversion instead of decoding again, with a block-wise BS.1770 meter
+  that gives the same integrated LUFS for streamed and in-memory files
+- a BatchConversionReport aggregates counts and throughput
 """
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
 import logging
+import math
+import os
 import shutil
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 
@@ -38,6 +59,25 @@ _PEDALBOARD_FORMATS = {"wav", "flac", "mp3", "ogg"}
 # Formats that require pydub + ffmpeg
 _PYDUB_FORMATS = {"aiff", "m4a", "opus", "aac"}
 
+# Extensions libsndfile can decode, and the lossless ones batch conversion
+# writes through soundfile (block-wise for large files)
+_SOUNDFILE_FORMATS = {
+    "wav": "WAV",
+    "flac": "FLAC",
+    "aiff": "AIFF",
+    "aif": "AIFF",
+    "ogg": "OGG",
+    "mp3": "MP3",
+}
+_SOUNDFILE_TARGETS = {"wav", "flac", "aiff", "aif"}
+
+# Sources larger than this are converted block-wise by the soundfile backend
+STREAM_THRESHOLD_BYTES = 64 * 1024 * 1024
+STREAM_BLOCK_FRAMES = 262144
+
+MANIFEST_FILE = ".samplemind-convert.json"
+MANIFEST_VERSION = 1
+
 
 @dataclass
 class ConversionResult:
@@ -51,6 +91,76 @@ class ConversionResult:
     source_format: str = ""
     target_format: str = ""
     file_size_bytes: int = 0
+    source_size_bytes: int = 0
+    skipped: bool = False  # output was already up to date
+    audio_seconds: float = 0.0
+    processing_time: float = 0.0
+    source_hash: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class BatchConversionReport:
+    """Aggregate outcome and throughput of a batch conversion."""
+
+    results: list[ConversionResult] = field(default_factory=list)
+    wall_time: float = 0.0
+    workers: int = 1
+
+    @property
+    def converted(self) -> int:
+        return sum(1 for r in self.results if r.success and not r.skipped)
+
+    @property
+    def skipped(self) -> int:
+        return sum(1 for r in self.results if r.skipped)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for r in self.results if not r.success)
+
+    @property
+    def audio_seconds(self) -> float:
+        """Seconds of audio converted (skipped files excluded)"""
+        return sum(r.audio_seconds for r in self.results if not r.skipped)
+
+    @property
+    def input_bytes(self) -> int:
+        return sum(
+            r.source_size_bytes for r in self.results if r.success and not r.skipped
+        )
+
+    @property
+    def files_per_second(self) -> float:
+        return self.converted / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio converted per wall-clock second"""
+        return self.audio_seconds / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        if self.wall_time <= 0:
+            return 0.0
+        return self.input_bytes / (1024 * 1024) / self.wall_time
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total": len(self.results),
+            "converted": self.converted,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "wall_time": round(self.wall_time, 3),
+            "workers": self.workers,
+            "audio_seconds": round(self.audio_seconds, 3),
+            "files_per_second": round(self.files_per_second, 2),
+            "realtime_factor": round(self.realtime_factor, 2),
+            "megabytes_per_second": round(self.megabytes_per_second, 2),
+            "results": [r.to_dict() for r in self.results],
+        }
 
 
 class AudioFormatConverter:
@@ -180,6 +290,203 @@ class AudioFormatConverter:
             ),
         )
 
+    def convert_batch(
+        self,
+        sources: Iterable[Path],
+        output_dir: Path,
+        target_format: str,
+        quality: str = "high",
+        sample_rate: int | None = None,
+        normalize_loudness: bool = False,
+        skip_unchanged: str = "mtime",
+        max_workers: int | None = None,
+    ) -> BatchConversionReport:
+        """
+        Convert many files into ``output_dir`` using a process pool.
+
+        Each output is named after its source's stem.  Conversions are
+        recorded in a manifest in ``output_dir``; a later run skips sources
+        that have not changed since their output was written.
+
+        Args:
+            sources: Input file paths
+            output_dir: Directory for converted files
+            target_format: Output format extension (e.g. \"flac\")
+            quality: \"low\" | \"medium\" | \"high\" | \"lossless\"
+            sample_rate: Output sample rate (None = preserve each source's SR)
+            normalize_loudness: Apply −14 LUFS normalization before writing
+            skip_unchanged: \"mtime\" (source size and mtime unchanged),
+                \"hash\" (source content unchanged) or \"off\"
+            max_workers: Worker processes (default: CPU count; 1 = in process)
+
+        Returns:
+            BatchConversionReport with per-file results in input order
+        """
+        if skip_unchanged not in ("mtime", "hash", "off"):
+            raise ValueError(f"Unknown skip_unchanged mode: {skip_unchanged}")
+
+        started = time.perf_counter()
+        target_format = target_format.lstrip(".").lower()
+        output_dir = Path(output_dir).expanduser().resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = _load_manifest(output_dir)
+        settings = (
+            f"{target_format}|{quality}|{sample_rate or 'source'}|"
+            f"{int(normalize_loudness)}"
+        )
+        available = _available_backends()
+        backends: dict[str, str | None] = {}  # source format -> backend
+
+        results: list[ConversionResult] = []
+        jobs: list[tuple[int, dict[str, Any]]] = []
+        stats: dict[int, os.stat_result] = {}
+        claimed: set[str] = set()
+
+        for source in sources:
+            source = Path(source).expanduser().resolve()
+            destination = output_dir / f"{source.stem}.{target_format}"
+            src_fmt = source.suffix.lstrip(".").lower()
+            result = ConversionResult(
+                source_path=str(source),
+                destination_path=str(destination),
+                success=False,
+                source_format=src_fmt,
+                target_format=target_format,
+            )
+            index = len(results)
+            results.append(result)
+
+            try:
+                stat = source.stat()
+            except OSError:
+                result.error = f"Source file not found: {source}"
+                continue
+            if destination.name in claimed:
+                result.error = f"Another source already converts to {destination}"
+                continue
+            claimed.add(destination.name)
+            result.source_size_bytes = stat.st_size
+
+            if src_fmt not in backends:
+                backends[src_fmt] = _select_backend(
+                    src_fmt, target_format, sample_rate, normalize_loudness, available
+                )
+            backend = backends[src_fmt]
+            if backend is None:
+                result.error = f"No backend available for {src_fmt} -> {target_format}"
+                continue
+
+            expected_hash = None
+            entry = manifest.get(destination.name)
+            if (
+                skip_unchanged != "off"
+                and entry is not None
+                and entry.get("settings") == settings
+                and entry.get("source") == str(source)
+                and destination.exists()
+            ):
+                unchanged = (
+                    entry.get("size") == stat.st_size
+                    and entry.get("mtime_ns") == stat.st_mtime_ns
+                )
+                if unchanged:
+                    result.success = result.skipped = True
+                    result.backend_used = "skip"
+                    result.source_hash = entry.get("sha256")
+                    result.audio_seconds = entry.get("audio_seconds", 0.0)
+                    result.file_size_bytes = destination.stat().st_size
+                    continue
+                if skip_unchanged == "hash":
+                    expected_hash = entry.get("sha256")  # compared in the worker
+
+            stats[index] = stat
+            jobs.append(
+                (
+                    index,
+                    {
+                        "result": result,
+                        "backend": backend,
+                        "fallback": "pydub" if "pydub" in available else None,
+                        "quality": quality,
+                        "sample_rate": sample_rate,
+                        "normalize_loudness": normalize_loudness,
+                        "hash": skip_unchanged == "hash",
+                        "expected_hash": expected_hash,
+                    },
+                )
+            )
+
+        # Largest first, so a big file does not start last and tail the run
+        jobs.sort(key=lambda job: job[1]["result"].source_size_bytes, reverse=True)
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+
+        if workers == 1:
+            done = [(index, _run_conversion_job(job)) for index, job in jobs]
+        else:
+            done = []
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    (index, job, pool.submit(_run_conversion_job, job))
+                    for index, job in jobs
+                ]
+                for index, job, future in futures:
+                    try:
+                        done.append((index, future.result()))
+                    except Exception as exc:
+                        job["result"].error = f"Worker failed: {exc}"
+                        done.append((index, job["result"]))
+
+        for index, result in done:
+            results[index] = result
+            if result.success:
+                stat = stats[index]
+                manifest[Path(result.destination_path).name] = {
+                    "source": result.source_path,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256": result.source_hash,
+                    "settings": settings,
+                    "audio_seconds": result.audio_seconds,
+                }
+        _save_manifest(output_dir, manifest)
+
+        report = BatchConversionReport(
+            results=results, wall_time=time.perf_counter() - started, workers=workers
+        )
+        logger.info(
+            f"Batch conversion to {target_format}: {report.converted} converted, "
+            f"{report.skipped} up to date, {report.failed} failed in "
+            f"{report.wall_time:.1f}s ({report.files_per_second:.1f} files/s, "
+            f"{report.realtime_factor:.0f}x realtime, "
+            f"{report.megabytes_per_second:.1f} MB/s)"
+        )
+        return report
+
+    async def convert_batch_async(
+        self, sources: Iterable[Path], output_dir: Path, target_format: str, **kwargs
+    ) -> BatchConversionReport:
+        """
+        Async wrapper around convert_batch(). Offloads to thread pool.
+
+        Args:
+            sources: Input file paths
+            output_dir: Directory for converted files
+            target_format: Output format extension
+            **kwargs: Options accepted by convert_batch()
+
+        Returns:
+            BatchConversionReport
+        """
+        import asyncio
+
+        sources = list(sources)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            _EXECUTOR,
+            lambda: self.convert_batch(sources, output_dir, target_format, **kwargs),
+        )
+
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
@@ -190,7 +497,7 @@ class AudioFormatConverter:
         destination: Path,
         result: ConversionResult,
         quality: str,
-        target_sr: int,
+        target_sr: int | None,
         normalize_loudness: bool,
     ) -> ConversionResult:
         """Convert using pedalboard.io."""
@@ -199,9 +506,13 @@ class AudioFormatConverter:
 
             destination.parent.mkdir(parents=True, exist_ok=True)
 
-            with AudioFile(str(source)) as reader:
+            source_file = AudioFile(str(source))
+            if target_sr and target_sr != source_file.samplerate:
+                source_file = source_file.resampled_to(target_sr)
+            with source_file as reader:
                 sr = reader.samplerate
                 audio = reader.read(reader.frames)  # shape: (channels, frames)
+            result.audio_seconds = audio.shape[-1] / sr
 
             if normalize_loudness:
                 audio = _normalize_to_lufs(audio, sr, target_lufs=-14.0)
@@ -211,11 +522,9 @@ class AudioFormatConverter:
                 dst_fmt, 320
             )
 
-            write_kwargs: dict = {"samplerate": target_sr}
-            if dst_fmt == "mp3":
-                write_kwargs["quality"] = quality_kbps / 320.0  # pedalboard uses 0–1
-            elif dst_fmt == "ogg":
-                write_kwargs["quality"] = quality_kbps / 320.0
+            write_kwargs: dict = {"samplerate": sr, "num_channels": audio.shape[0]}
+            if dst_fmt in ("mp3", "ogg"):
+                write_kwargs["quality"] = quality_kbps  # pedalboard takes kbps
 
             with AudioFile(str(destination), "w", **write_kwargs) as writer:
                 writer.write(audio)
@@ -236,7 +545,7 @@ class AudioFormatConverter:
         destination: Path,
         result: ConversionResult,
         quality: str,
-        target_sr: int,
+        target_sr: int | None,
         normalize_loudness: bool,
     ) -> ConversionResult:
         """Convert using pydub (requires ffmpeg on PATH)."""
@@ -246,7 +555,9 @@ class AudioFormatConverter:
             destination.parent.mkdir(parents=True, exist_ok=True)
 
             seg = AudioSegment.from_file(str(source))
-            seg = seg.set_frame_rate(target_sr)
+            if target_sr:
+                seg = seg.set_frame_rate(target_sr)
+            result.audio_seconds = seg.duration_seconds
 
             if normalize_loudness:
                 # pydub dBFS normalization (approximate)
@@ -276,10 +587,401 @@ class AudioFormatConverter:
 
 
 # ---------------------------------------------------------------------------
-# Loudness normalization helper
+# Batch conversion helpers
 # ---------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=1)
+def _available_backends() -> frozenset[str]:
+    """Backends importable in this environment (probed once per process)"""
+    import importlib.util
+
+    available = {"copy"}
+    try:
+        import soundfile  # noqa: F401
+
+        available.add("soundfile")
+    except (ImportError, OSError):
+        pass
+    if importlib.util.find_spec("pedalboard") is not None:
+        available.add("pedalboard")
+    if importlib.util.find_spec("pydub") is not None and (
+        shutil.which("ffmpeg") or shutil.which("avconv")
+    ):
+        available.add("pydub")
+    return frozenset(available)
+
+
+def _select_backend(
+    src_fmt: str,
+    dst_fmt: str,
+    sample_rate: int | None,
+    normalize_loudness: bool,
+    available: frozenset[str],
+) -> str | None:
+    """Backend for one source/target format pair, or None if none can do it"""
+    if src_fmt == dst_fmt and sample_rate is None and not normalize_loudness:
+        return "copy"
+    if (
+        "soundfile" in available
+        and src_fmt in _SOUNDFILE_FORMATS
+        and dst_fmt in _SOUNDFILE_TARGETS
+    ):
+        return "soundfile"
+    if (
+        "pedalboard" in available
+        and src_fmt in _PEDALBOARD_FORMATS
+        and dst_fmt in _PEDALBOARD_FORMATS
+    ):
+        return "pedalboard"
+    if "pydub" in available:
+        return "pydub"
+    return None
+
+
+def _run_conversion_job(job: dict[str, Any]) -> ConversionResult:
+    """Worker entry point for AudioFormatConverter.convert_batch"""
+    started = time.perf_counter()
+    result: ConversionResult = job["result"]
+    source = Path(result.source_path)
+    destination = Path(result.destination_path)
+
+    if job["hash"]:
+        result.source_hash = _file_sha256(source)
+        if result.source_hash == job["expected_hash"] and destination.exists():
+            result.success = result.skipped = True
+            result.backend_used = "skip"
+            result.file_size_bytes = destination.stat().st_size
+            result.processing_time = time.perf_counter() - started
+            return result
+
+    # Written under a temporary name, so an interrupted run never leaves a
+    # partial file that looks up to date
+    partial = destination.with_name(f".{destination.stem}.partial{destination.suffix}")
+    try:
+        backend = job["backend"]
+        args = (
+            source,
+            partial,
+            result,
+            job["quality"],
+            job["sample_rate"],
+            job["normalize_loudness"],
+        )
+        if backend == "copy":
+            partial.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, partial)
+            result.success = True
+            result.backend_used = "copy"
+        elif backend == "soundfile":
+            result = _convert_soundfile(*args)
+        elif backend == "pedalboard":
+            result = AudioFormatConverter._convert_pedalboard(*args)
+            if not result.success and job["fallback"]:
+                result = AudioFormatConverter._convert_pydub(*args)
+        else:
+            result = AudioFormatConverter._convert_pydub(*args)
+
+        if result.success:
+            os.replace(partial, destination)
+            result.file_size_bytes = destination.stat().st_size
+    except Exception as exc:
+        logger.error(f"Conversion failed for {source}: {exc}")
+        result.success = False
+        result.error = str(exc)
+    finally:
+        partial.unlink(missing_ok=True)
+
+    result.processing_time = time.perf_counter() - started
+    return result
+
+
+def _convert_soundfile(
+    source: Path,
+    destination: Path,
+    result: ConversionResult,
+    quality: str,
+    target_sr: int | None,
+    normalize_loudness: bool,
+    stream_threshold: int = STREAM_THRESHOLD_BYTES,
+    block_frames: int = STREAM_BLOCK_FRAMES,
+) -> ConversionResult:
+    """
+    Convert to a lossless format with soundfile.
+
+    Sources above ``stream_threshold`` bytes are processed block-wise:
+    resampling is streamed and loudness is measured in a separate pass, so
+    memory does not grow with the file.  Both paths measure integrated
+    loudness with the same block-wise BS.1770 meter, so the output level
+    does not depend on the file size.
+    """
+    try:
+        import soundfile as sf
+
+        major = _SOUNDFILE_FORMATS[result.target_format]
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        with sf.SoundFile(str(source)) as reader:
+            sr = reader.samplerate
+            out_sr = target_sr or sr
+            subtype = reader.subtype if sf.check_format(major, reader.subtype) else None
+            result.audio_seconds = reader.frames / sr
+
+            if source.stat().st_size > stream_threshold:
+                _stream_soundfile(
+                    reader,
+                    destination,
+                    major,
+                    subtype,
+                    out_sr,
+                    normalize_loudness,
+                    block_frames,
+                )
+            else:
+                audio = reader.read(dtype="float32", always_2d=True)
+                if normalize_loudness:
+                    # Measured on the buffer decoded for the conversion
+                    audio = _normalize_lufs(audio, sr, target_lufs=-14.0)
+                if out_sr != sr:
+                    import soxr
+
+                    audio = soxr.resample(audio, sr, out_sr, quality="HQ")
+                sf.write(str(destination), audio, out_sr, subtype=subtype, format=major)
+
+        result.success = True
+        result.backend_used = "soundfile"
+        result.error = None
+        result.file_size_bytes = destination.stat().st_size
+        return result
+
+    except Exception as exc:
+        logger.error(f"soundfile conversion failed for {source}: {exc}")
+        result.error = str(exc)
+        return result
+
+
+def _stream_soundfile(
+    reader: Any,
+    destination: Path,
+    major: str,
+    subtype: str | None,
+    out_sr: int,
+    normalize_loudness: bool,
+    block_frames: int,
+) -> None:
+    """Block-wise gain, resample and write from an open SoundFile"""
+    import soundfile as sf
+
+    gain = None
+    if normalize_loudness:
+        # Same meter as _normalize_lufs, fed block by block
+        meter = _LoudnessMeter(reader.samplerate, reader.channels)
+        for block in reader.blocks(block_frames, dtype="float32", always_2d=True):
+            meter.add(block)
+        gain = meter.gain(target_lufs=-14.0)
+        reader.seek(0)
+
+    resampler = None
+    if out_sr != reader.samplerate:
+        import soxr
+
+        resampler = soxr.ResampleStream(
+            reader.samplerate, out_sr, reader.channels, dtype="float32", quality="HQ"
+        )
+
+    with sf.SoundFile(
+        str(destination),
+        "w",
+        samplerate=out_sr,
+        channels=reader.channels,
+        subtype=subtype,
+        format=major,
+    ) as writer:
+        reader.seek(0)
+        for block in reader.blocks(block_frames, dtype="float32", always_2d=True):
+            if gain is not None:
+                block = np.clip(block * np.float32(gain), -1.0, 1.0)
+            if resampler is not None:
+                block = resampler.resample_chunk(block)
+            writer.write(block)
+        if resampler is not None:
+            empty = np.zeros((0, reader.channels), dtype=np.float32)
+            writer.write(resampler.resample_chunk(empty, last=True))
+
+
+def _file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _load_manifest(output_dir: Path) -> dict[str, dict[str, Any]]:
+    """Conversion records of ``output_dir``, keyed by output file name"""
+    try:
+        data = json.loads((output_dir / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("entries", {})
+
+
+def _save_manifest(output_dir: Path, entries: dict[str, dict[str, Any]]) -> None:
+    path = output_dir / MANIFEST_FILE
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "entries": entries}, f, indent=2)
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Loudness normalization helpers
+# ---------------------------------------------------------------------------
+
+
+# ITU-R BS.1770-4 integrated loudness
+LOUDNESS_BLOCK_SECONDS = 0.4  # gating block
+LOUDNESS_STEP_SECONDS = 0.1  # gating blocks overlap by 75 %
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+_SURROUND_WEIGHT = 1.41  # channel weight of Ls / Rs (4th and 5th channel)
+
+
+def _k_weighting_sos(sr: int) -> np.ndarray:
+    """K-weighting (high shelf, then ~38 Hz high-pass) as second-order sections"""
+    # High shelf: +4 dB above ~1.5 kHz, Q 1/sqrt(2)
+    a = 10.0 ** (4.0 / 40.0)
+    w0 = 2.0 * math.pi * 1500.0 / sr
+    alpha = math.sin(w0) / math.sqrt(2.0)
+    cos_w0, sqrt_a = math.cos(w0), math.sqrt(a)
+    shelf = [
+        a * ((a + 1) + (a - 1) * cos_w0 + 2 * sqrt_a * alpha),
+        -2 * a * ((a - 1) + (a + 1) * cos_w0),
+        a * ((a + 1) + (a - 1) * cos_w0 - 2 * sqrt_a * alpha),
+        (a + 1) - (a - 1) * cos_w0 + 2 * sqrt_a * alpha,
+        2 * ((a - 1) - (a + 1) * cos_w0),
+        (a + 1) - (a - 1) * cos_w0 - 2 * sqrt_a * alpha,
+    ]
+    # High-pass: Q 0.5 at 38 Hz
+    w0 = 2.0 * math.pi * 38.0 / sr
+    alpha, cos_w0 = math.sin(w0) / (2.0 * 0.5), math.cos(w0)
+    highpass = [
+        (1 + cos_w0) / 2,
+        -(1 + cos_w0),
+        (1 + cos_w0) / 2,
+        1 + alpha,
+        -2 * cos_w0,
+        1 - alpha,
+    ]
+    sos = np.array([shelf, highpass], dtype=np.float64)
+    return sos / sos[:, 3:4]
+
+
+class _LoudnessMeter:
+    """
+    Integrated loudness (ITU-R BS.1770-4) fed block by block.
+
+    Audio is K-weighted with the filter state carried across blocks and
+    reduced to per-channel energy over 100 ms steps; the gated 400 ms
+    blocks are assembled from those steps at the end, so memory grows
+    with duration / 100 ms rather than with the signal.  A signal shorter
+    than one gating block (a one-shot) is measured as a single block.
+    """
+
+    def __init__(self, sr: int, channels: int) -> None:
+        self._sos = _k_weighting_sos(sr)
+        self._zi = np.zeros((len(self._sos), 2, channels))
+        self._step = max(1, round(sr * LOUDNESS_STEP_SECONDS))
+        self._steps_per_block = round(LOUDNESS_BLOCK_SECONDS / LOUDNESS_STEP_SECONDS)
+        self._chunks: list[np.ndarray] = []
+        self._partial = np.zeros(channels)
+        self._partial_frames = 0
+        self._weights = np.array(
+            [_SURROUND_WEIGHT if c in (3, 4) else 1.0 for c in range(channels)]
+        )
+
+    def add(self, block: np.ndarray) -> None:
+        """Measure the next (frames, channels) block"""
+        from scipy.signal import sosfilt
+
+        weighted, self._zi = sosfilt(self._sos, block, axis=0, zi=self._zi)
+        energy = np.square(weighted)
+
+        pos = 0
+        if self._partial_frames:
+            head = energy[: self._step - self._partial_frames]
+            self._partial += head.sum(axis=0)
+            self._partial_frames += len(head)
+            pos = len(head)
+            if self._partial_frames == self._step:
+                self._chunks.append(self._partial[np.newaxis])
+                self._partial = np.zeros_like(self._partial)
+                self._partial_frames = 0
+
+        n_steps = (len(energy) - pos) // self._step
+        if n_steps:
+            full = energy[pos : pos + n_steps * self._step]
+            self._chunks.append(full.reshape(n_steps, self._step, -1).sum(axis=1))
+            pos += n_steps * self._step
+
+        tail = energy[pos:]
+        if len(tail):
+            self._partial += tail.sum(axis=0)
+            self._partial_frames += len(tail)
+
+    def _loudness(self, mean_squares: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore"):
+            return -0.691 + 10.0 * np.log10(mean_squares @ self._weights)
+
+    def integrated_loudness(self) -> float:
+        """Gated loudness in LUFS (``-inf`` for silence)"""
+        steps = (
+            np.concatenate(self._chunks)
+            if self._chunks
+            else np.empty((0, len(self._weights)))
+        )
+        per_block = self._steps_per_block
+        if len(steps) < per_block:
+            frames = len(steps) * self._step + self._partial_frames
+            if frames == 0:
+                return float("-inf")
+            blocks = ((steps.sum(axis=0) + self._partial) / frames)[np.newaxis]
+        else:
+            cumulative = np.vstack([np.zeros_like(steps[:1]), np.cumsum(steps, axis=0)])
+            blocks = (cumulative[per_block:] - cumulative[:-per_block]) / (
+                per_block * self._step
+            )
+
+        levels = self._loudness(blocks)
+        gated = blocks[levels >= ABSOLUTE_GATE_LUFS]
+        if not len(gated):
+            return float("-inf")
+        relative_gate = self._loudness(gated.mean(axis=0)) + RELATIVE_GATE_LU
+        gated = blocks[(levels >= ABSOLUTE_GATE_LUFS) & (levels > relative_gate)]
+        return float(self._loudness(gated.mean(axis=0)))
+
+    def gain(self, target_lufs: float) -> float | None:
+        """Linear gain bringing the measured signal to ``target_lufs``"""
+        current = self.integrated_loudness()
+        if not math.isfinite(current):
+            return None
+        return 10.0 ** ((target_lufs - current) / 20.0)
+
+
+def _normalize_lufs(
+    audio: np.ndarray, sr: int, target_lufs: float = -14.0
+) -> np.ndarray:
+    """Scale (frames, channels) audio to ``target_lufs`` integrated loudness"""
+    meter = _LoudnessMeter(sr, audio.shape[1])
+    meter.add(audio)
+    gain = meter.gain(target_lufs)
+    if gain is not None:
+        return (audio * gain).clip(-1.0, 1.0).astype(audio.dtype)
+    return audio
+
+
 def _normalize_to_lufs(
     audio: np.ndarray,
     sr: int,
@@ -287,7 +989,7 @@ def _normalize_to_lufs(
 ) -> np.ndarray:
     """
     Normalize audio to target LUFS using pyloudnorm if available,
-    otherwise applies simple RMS gain.
+    otherwise with the built-in BS.1770 meter.
 
     Args:
         audio: (channels, frames) float array
@@ -303,8 +1005,7 @@ def _normalize_to_lufs(
         import pyloudnorm as pyln
 
         meter = pyln.Meter(sr)
-        mono = audio[0] if audio.ndim > 1 else audio
-        current = meter.integrated_loudness(mono)
+        current = meter.integrated_loudness(audio.T if audio.ndim > 1 else audio)
         if np.isfinite(current):
             gain_db = target_lufs - current
             gain_linear = 10.0 ** (gain_db / 20.0)
@@ -312,11 +1013,6 @@ def _normalize_to_lufs(
     except (ImportError, Exception):
         pass
 
-    # RMS fallback
-    rms = float(np.sqrt(np.mean(audio**2)))
-    if rms > 1e-9:
-        target_rms = 10.0 ** (target_lufs / 20.0)
-        gain = target_rms / rms
-        return (audio * gain).clip(-1.0, 1.0).astype(audio.dtype)
-
-    return audio
+    if audio.ndim == 1:
+        return _normalize_lufs(audio[:, np.newaxis], sr, target_lufs)[:, 0]
+    return _normalize_lufs(audio.T, sr, target_lufs).T
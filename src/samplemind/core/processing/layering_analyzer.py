@@ -20,6 +20,24 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+
+def window_energy(audio: np.ndarray, window_size: int) -> np.ndarray:
+    """Energy of consecutive full windows (the last partial window is dropped)"""
+    n_windows = max(0, (len(audio) - 1) // window_size) if window_size > 0 else 0
+    frames = audio[: n_windows * window_size].reshape(n_windows, window_size)
+    return np.sum(frames**2, axis=1)
+
+
+def first_onset_window(energy: np.ndarray) -> int | None:
+    """Index of the first significant energy jump, or None"""
+    diff = np.diff(energy)
+    if len(diff) == 0:
+        return None
+    threshold = np.mean(diff) + 2 * np.std(diff)
+    onsets = np.flatnonzero(diff > threshold)
+    return int(onsets[0]) if len(onsets) > 0 else None
+
+
 # ============================================================================
 # LAYERING ANALYSIS RESULTS
 # ============================================================================
@@ -273,19 +291,9 @@ class LayeringAnalyzer:
 
         def get_onsets(audio):
             """Detect onsets in audio signal"""
-            energy = np.array(
-                [
-                    np.sum(audio[i : i + window_size] ** 2)
-                    for i in range(0, len(audio) - window_size, window_size)
-                ]
-            )
-
             # Find significant energy jumps
-            diff = np.diff(energy)
-            threshold = np.mean(diff) + 2 * np.std(diff)
-            onsets = np.where(diff > threshold)[0]
-
-            return onsets[0] * window_size if len(onsets) > 0 else 0
+            onset = first_onset_window(window_energy(audio, window_size))
+            return onset * window_size if onset is not None else 0
 
         onset1 = get_onsets(audio1)
         onset2 = get_onsets(audio2)
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Layering Partner Index
+
+Finds good layering partners for a sample across a whole library without
+running a pairwise LayeringAnalyzer pass against every file.
+
+- Per-sample profiles (band energy, onset envelope, loudness) are computed
+  once and cached on disk, keyed by file size and mtime
+- A vectorized scorer rates one query against every profile at once for
+  spectral masking, transient overlap and loudness balance
+- best_partners() shortlists the top candidates and runs the full
+  LayeringAnalyzer (phase, masking, transients) only on those
+"""
+
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .layering_analyzer import (
+    LayeringAnalysis,
+    LayeringAnalyzer,
+    first_onset_window,
+    window_energy,
+)
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = {".wav", ".flac", ".aiff", ".aif", ".mp3", ".ogg"}
+
+# Fixed log-spaced band edges so profiles at different sample rates compare
+DEFAULT_BANDS = 24
+BAND_RANGE_HZ = (20.0, 20000.0)
+
+ENVELOPE_WINDOW_SECONDS = 0.01  # same 10 ms windows as LayeringAnalyzer
+ENVELOPE_FRAMES = 100  # first second of onset strength
+PROFILE_MAX_SECONDS = 30.0
+
+# ids, band energy (N, bands), onset envelopes (N, frames), loudness (N,)
+_Stacked = tuple[list[str], np.ndarray, np.ndarray, np.ndarray]
+
+
+# ============================================================================
+# PROFILES
+# ============================================================================
+
+
+@dataclass
+class LayeringProfile:
+    """Precomputed layering features of one sample"""
+
+    sample_id: str
+    band_energy: np.ndarray  # share of spectral energy per band, sums to 1
+    onset_envelope: np.ndarray  # onset strength per 10 ms window, sums to 1
+    onset_seconds: float
+    loudness_db: float  # RMS level
+    path: str | None = None
+    signature: tuple[int, int] | None = None  # (size, mtime_ns) of the file
+
+
+def _band_edges(n_bands: int) -> np.ndarray:
+    return np.geomspace(BAND_RANGE_HZ[0], BAND_RANGE_HZ[1], n_bands + 1)
+
+
+def compute_profile(
+    sample_id: str,
+    audio: np.ndarray,
+    sample_rate: int,
+    n_bands: int = DEFAULT_BANDS,
+    fft_size: int = 2048,
+    hop_length: int = 512,
+) -> LayeringProfile:
+    """
+    Compute the layering profile of a signal.
+
+    Args:
+        sample_id: Identifier stored with the profile
+        audio: Audio samples (mono, or channels-last multi-channel)
+        sample_rate: Sample rate in Hz
+        n_bands: Number of log-spaced frequency bands
+        fft_size: STFT size for the band spectrum
+        hop_length: STFT hop
+
+    Returns:
+        LayeringProfile
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = np.mean(audio, axis=1)
+    audio = audio[: int(PROFILE_MAX_SECONDS * sample_rate)]
+
+    # Average power spectrum over all frames
+    padded = np.pad(audio, (0, max(0, fft_size - len(audio))))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, fft_size)[::hop_length]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(fft_size), axis=1)) ** 2
+    power = spectrum.mean(axis=0)
+    freqs = np.fft.rfftfreq(fft_size, 1 / sample_rate)
+
+    band = np.searchsorted(_band_edges(n_bands), freqs, side="right") - 1
+    valid = (band >= 0) & (band < n_bands)
+    band_energy = np.bincount(band[valid], weights=power[valid], minlength=n_bands)
+    total = band_energy.sum()
+    band_energy = band_energy / total if total > 0 else band_energy
+
+    # Onset strength envelope (positive energy jumps in 10 ms windows); the
+    # jump from silence counts so a hit at t=0 registers
+    window_size = max(1, int(ENVELOPE_WINDOW_SECONDS * sample_rate))
+    energy = window_energy(audio, window_size)
+    onset = first_onset_window(energy)
+    strength = np.maximum(np.diff(energy, prepend=0.0), 0)[:ENVELOPE_FRAMES]
+    envelope = np.zeros(ENVELOPE_FRAMES)
+    envelope[: len(strength)] = strength
+    total = envelope.sum()
+    envelope = envelope / total if total > 0 else envelope
+
+    rms = np.sqrt(np.mean(audio**2)) if len(audio) else 0.0
+
+    return LayeringProfile(
+        sample_id=sample_id,
+        band_energy=band_energy.astype(np.float32),
+        onset_envelope=envelope.astype(np.float32),
+        onset_seconds=(onset * window_size / sample_rate) if onset is not None else 0.0,
+        loudness_db=float(20 * np.log10(rms + 1e-10)),
+    )
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+
+
+@dataclass
+class LayeringScores:
+    """Quick compatibility scores of one query against every profile"""
+
+    masking: np.ndarray  # 0 = disjoint spectra, 1 = identical band energy
+    transient_overlap: np.ndarray  # 0 = onsets never coincide, 1 = identical
+    loudness_difference_db: np.ndarray  # query minus candidate
+    score: np.ndarray  # 0-10, same scale as LayeringAnalysis.compatibility_score
+
+
+def score_profiles(
+    query: LayeringProfile,
+    band_energy: np.ndarray,
+    onset_envelope: np.ndarray,
+    loudness_db: np.ndarray,
+) -> LayeringScores:
+    """
+    Score a query profile against stacked candidate profiles.
+
+    Masking and transient overlap are histogram intersections of the
+    normalised band-energy and onset-strength distributions.  Penalties follow
+    LayeringAnalyzer's weighting: masking up to 4 points, transient overlap up
+    to 2, loudness imbalance beyond 3 dB up to 2 (full at 10 dB).
+    """
+    masking = np.minimum(band_energy, query.band_energy).sum(axis=1)
+    transient_overlap = np.minimum(onset_envelope, query.onset_envelope).sum(axis=1)
+    loudness_diff = query.loudness_db - loudness_db
+    loudness_penalty = np.clip((np.abs(loudness_diff) - 3.0) / 7.0, 0.0, 1.0)
+
+    score = 10.0 - 4.0 * masking - 2.0 * transient_overlap - 2.0 * loudness_penalty
+    return LayeringScores(
+        masking=masking,
+        transient_overlap=transient_overlap,
+        loudness_difference_db=loudness_diff,
+        score=np.clip(score, 0.0, 10.0),
+    )
+
+
+@dataclass
+class LayeringPartner:
+    """A candidate layering partner"""
+
+    sample_id: str
+    path: str | None
+    quick_score: float
+    masking: float
+    transient_overlap: float
+    loudness_difference_db: float
+    analysis: LayeringAnalysis | None = None
+
+    @property
+    def score(self) -> float:
+        """Full analysis score when available, quick score otherwise"""
+        return self.analysis.compatibility_score if self.analysis else self.quick_score
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "sample_id": self.sample_id,
+            "path": self.path,
+            "score": round(self.score, 2),
+            "quick_score": round(self.quick_score, 2),
+            "masking": round(self.masking, 3),
+            "transient_overlap": round(self.transient_overlap, 3),
+            "loudness_difference_db": round(self.loudness_difference_db, 2),
+            "analysis": self.analysis.to_dict() if self.analysis else None,
+        }
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+
+class LayeringIndex:
+    """Library of layering profiles with vectorized partner search"""
+
+    def __init__(
+        self,
+        n_bands: int = DEFAULT_BANDS,
+        analyzer: LayeringAnalyzer | None = None,
+    ) -> None:
+        """
+        Args:
+            n_bands: Number of frequency bands per profile
+            analyzer: Analyzer used for full analysis of shortlisted partners
+        """
+        self.n_bands = n_bands
+        self.analyzer = analyzer or LayeringAnalyzer()
+        self.profiles: dict[str, LayeringProfile] = {}
+        self._matrix: _Stacked | None = None
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def __contains__(self, sample_id: str) -> bool:
+        return sample_id in self.profiles
+
+    # -- building ------------------------------------------------------------
+
+    def add(
+        self,
+        sample_id: str,
+        audio: np.ndarray,
+        sample_rate: int,
+        path: str | None = None,
+    ) -> LayeringProfile:
+        """Profile a signal and add it to the index"""
+        profile = compute_profile(sample_id, audio, sample_rate, n_bands=self.n_bands)
+        profile.path = path
+        self.add_profile(profile)
+        return profile
+
+    def add_profile(self, profile: LayeringProfile) -> None:
+        """Add (or replace) a precomputed profile"""
+        if len(profile.band_energy) != self.n_bands:
+            raise ValueError(
+                f"Profile has {len(profile.band_energy)} bands, index uses {self.n_bands}"
+            )
+        self.profiles[profile.sample_id] = profile
+        self._matrix = None
+
+    def remove(self, sample_id: str) -> bool:
+        """Remove a profile"""
+        if self.profiles.pop(sample_id, None) is None:
+            return False
+        self._matrix = None
+        return True
+
+    def add_file(self, path: Path) -> LayeringProfile:
+        """
+        Profile an audio file (keyed by its path).
+
+        Returns the cached profile when the file's size and mtime are unchanged.
+        """
+        path = Path(path)
+        signature = _file_signature(path)
+        cached = self.profiles.get(str(path))
+        if cached is not None and cached.signature == signature:
+            return cached
+
+        audio, sample_rate = _load_audio(path)
+        profile = compute_profile(str(path), audio, sample_rate, n_bands=self.n_bands)
+        profile.path = str(path)
+        profile.signature = signature
+        self.add_profile(profile)
+        return profile
+
+    def add_files(self, paths: Iterable[Path]) -> int:
+        """Profile many files; returns how many were (re)computed"""
+        computed = 0
+        for path in paths:
+            cached = self.profiles.get(str(path))
+            try:
+                if self.add_file(path) is not cached:
+                    computed += 1
+            except Exception as e:
+                logger.warning(f"Skipping {path}: {e}")
+        return computed
+
+    def add_folder(self, folder: Path, recursive: bool = True) -> int:
+        """Profile every audio file in a folder; drops profiles of deleted files"""
+        folder = Path(folder)
+        pattern = "**/*" if recursive else "*"
+        paths = sorted(
+            p for p in folder.glob(pattern) if p.suffix.lower() in AUDIO_EXTENSIONS
+        )
+        present = {str(p) for p in paths}
+        for sample_id, profile in list(self.profiles.items()):
+            if sample_id in present or not profile.path:
+                continue
+            if Path(profile.path).is_relative_to(folder):
+                self.remove(sample_id)
+        return self.add_files(paths)
+
+    # -- scoring -------------------------------------------------------------
+
+    def _stacked(self) -> _Stacked:
+        """Profiles as matrices, rebuilt only after the index changes"""
+        if self._matrix is None:
+            ids = list(self.profiles)
+            profiles = [self.profiles[i] for i in ids]
+            bands = np.array([p.band_energy for p in profiles], dtype=np.float32)
+            envelopes = np.array([p.onset_envelope for p in profiles], dtype=np.float32)
+            self._matrix = (
+                ids,
+                bands.reshape(-1, self.n_bands),
+                envelopes.reshape(-1, ENVELOPE_FRAMES),
+                np.array([p.loudness_db for p in profiles], dtype=np.float32),
+            )
+        return self._matrix
+
+    def score(self, query: LayeringProfile) -> tuple[list[str], LayeringScores]:
+        """Quick-score a query against every indexed profile"""
+        ids, bands, envelopes, loudness = self._stacked()
+        return ids, score_profiles(query, bands, envelopes, loudness)
+
+    def best_partners(
+        self,
+        query: str | Path | LayeringProfile,
+        top_k: int = 10,
+        shortlist: int | None = None,
+        analyze: bool = True,
+    ) -> list[LayeringPartner]:
+        """
+        Find the most compatible layering partners for a sample.
+
+        Args:
+            query: Indexed sample_id, an audio file path, or a profile
+            top_k: Number of partners to return
+            shortlist: Candidates passed to the full analyzer (default 3 * top_k)
+            analyze: Run LayeringAnalyzer on the shortlist (needs file paths)
+
+        Returns:
+            Partners sorted by score (full analysis first, quick score breaks ties)
+        """
+        profile = self._resolve_query(query)
+        ids, scores = self.score(profile)
+        if not ids:
+            return []
+
+        candidates = np.array([i != profile.sample_id for i in ids])
+        order = np.argsort(-np.where(candidates, scores.score, -np.inf), kind="stable")
+        limit = min(int(candidates.sum()), shortlist or 3 * top_k)
+
+        partners = [
+            LayeringPartner(
+                sample_id=ids[i],
+                path=self.profiles[ids[i]].path,
+                quick_score=float(scores.score[i]),
+                masking=float(scores.masking[i]),
+                transient_overlap=float(scores.transient_overlap[i]),
+                loudness_difference_db=float(scores.loudness_difference_db[i]),
+            )
+            for i in order[:limit]
+        ]
+
+        if analyze and profile.path and partners:
+            self._analyze_shortlist(profile, partners)
+            partners.sort(key=lambda p: (p.score, p.quick_score), reverse=True)
+
+        return partners[:top_k]
+
+    def _resolve_query(self, query: str | Path | LayeringProfile) -> LayeringProfile:
+        if isinstance(query, LayeringProfile):
+            return query
+        if str(query) in self.profiles:
+            return self.profiles[str(query)]
+        path = Path(query)
+        if path.exists():
+            audio, sample_rate = _load_audio(path)
+            profile = compute_profile(
+                str(path), audio, sample_rate, n_bands=self.n_bands
+            )
+            profile.path = str(path)
+            return profile
+        raise KeyError(f"Unknown sample: {query}")
+
+    def _analyze_shortlist(
+        self, query: LayeringProfile, partners: list[LayeringPartner]
+    ) -> None:
+        """Full pairwise analysis of the shortlisted partners only"""
+        query_audio, sample_rate = _load_audio(Path(query.path))
+        for partner in partners:
+            if not partner.path:
+                continue
+            try:
+                audio, _ = _load_audio(Path(partner.path), sample_rate)
+                partner.analysis = self.analyzer.analyze(
+                    query_audio, audio, sample_rate
+                )
+            except Exception as e:
+                logger.warning(f"Full layering analysis failed for {partner.path}: {e}")
+
+    # -- persistence ---------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        """Write all profiles to a compressed .npz cache"""
+        ids, bands, envelopes, loudness = self._stacked()
+        profiles = [self.profiles[i] for i in ids]
+        signatures = np.array(
+            [p.signature or (-1, -1) for p in profiles], dtype=np.int64
+        ).reshape(-1, 2)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                n_bands=np.int64(self.n_bands),
+                ids=np.array(ids, dtype=str),
+                paths=np.array([p.path or "" for p in profiles], dtype=str),
+                signatures=signatures,
+                band_energy=bands,
+                onset_envelope=envelopes,
+                onset_seconds=np.array([p.onset_seconds for p in profiles]),
+                loudness_db=loudness,
+            )
+        tmp.replace(path)
+
+    @classmethod
+    def load(
+        cls, path: Path, analyzer: LayeringAnalyzer | None = None
+    ) -> "LayeringIndex":
+        """Read a cache written by save()"""
+        with np.load(Path(path)) as data:
+            index = cls(n_bands=int(data["n_bands"]), analyzer=analyzer)
+            for i, sample_id in enumerate(data["ids"].tolist()):
+                size, mtime = (int(v) for v in data["signatures"][i])
+                index.profiles[sample_id] = LayeringProfile(
+                    sample_id=sample_id,
+                    band_energy=data["band_energy"][i],
+                    onset_envelope=data["onset_envelope"][i],
+                    onset_seconds=float(data["onset_seconds"][i]),
+                    loudness_db=float(data["loudness_db"][i]),
+                    path=str(data["paths"][i]) or None,
+                    signature=(size, mtime) if size >= 0 else None,
+                )
+        return index
+
+
+def _file_signature(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _load_audio(path: Path, sample_rate: int | None = None) -> tuple[np.ndarray, int]:
+    """Load mono audio, resampled when ``sample_rate`` is given"""
+    import librosa
+
+    audio, sr = librosa.load(
+        str(path), sr=sample_rate, mono=True, duration=PROFILE_MAX_SECONDS
+    )
+    return audio, int(sr)
+
+
+# ============================================================================
+# MODULE EXPORTS
+# ============================================================================
+
+__all__ = [
+    "LayeringIndex",
+    "LayeringPartner",
+    "LayeringProfile",
+    "LayeringScores",
+    "compute_profile",
+    "score_profiles",
+]
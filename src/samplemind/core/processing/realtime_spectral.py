@@ -6,11 +6,19 @@ Features:
 - Real-time pitch detection (cent-accurate)
 - Dynamic frequency range adjustment
 - Interactive controls: zoom, pan, frequency readout
+
+The DSP chain is stateful so it can run on a live stream:
+- AudioRingBuffer keeps the most recent samples without reallocating
+- StreamingBandpass caches its SOS design and carries ``sosfilt`` state
+  across chunks (causal, no per-chunk edge artifacts)
+- Spectra use rfft with a precomputed window and preallocated buffers
+- Pitch uses YIN with an FFT-based difference function (O(n log n))
 """
 
 import logging
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 
 import numpy as np
 
@@ -20,11 +28,12 @@ logger = logging.getLogger(__name__)
 librosa = None
 signal = None
 hann = None
+sp_fft = None
 
 
 def _ensure_libs():
     """Lazily import heavy dependencies."""
-    global librosa, signal, hann
+    global librosa, signal, hann, sp_fft
     if librosa is None:
         import librosa as _librosa
 
@@ -37,6 +46,10 @@ def _ensure_libs():
         from scipy.signal.windows import hann as _hann
 
         hann = _hann
+    if sp_fft is None:
+        from scipy import fft as _sp_fft
+
+        sp_fft = _sp_fft
 
 
 class FrequencyScale(Enum):
@@ -60,14 +73,93 @@ class SpectralFrame:
     peak_frequency_hz: float  # Strongest frequency component
 
 
+class AudioRingBuffer:
+    """Fixed-capacity ring buffer holding the most recent mono samples"""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float64)
+        self._write = 0
+        self.total_written = 0
+
+    def __len__(self) -> int:
+        return min(self.total_written, self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, overwriting the oldest ones."""
+        n = len(samples)
+        if n >= self.capacity:
+            self._data[:] = samples[-self.capacity :]
+            self._write = 0
+        else:
+            first = min(n, self.capacity - self._write)
+            self._data[self._write : self._write + first] = samples[:first]
+            self._data[: n - first] = samples[first:]
+            self._write = (self._write + n) % self.capacity
+        self.total_written += n
+
+    def latest(self, n: int, out: np.ndarray | None = None) -> np.ndarray:
+        """Copy the newest *n* samples, oldest first, into *out*."""
+        if n > len(self):
+            raise ValueError(f"Requested {n} samples, only {len(self)} buffered")
+        if out is None:
+            out = np.empty(n, dtype=self._data.dtype)
+        start = (self._write - n) % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._data[start : start + first]
+        out[first:n] = self._data[: n - first]
+        return out
+
+
+@lru_cache(maxsize=32)
+def _design_bandpass_sos(
+    sample_rate: int, low_hz: float, high_hz: float, order: int
+) -> np.ndarray:
+    """Butterworth band-pass in second-order sections (cached per design)."""
+    _ensure_libs()
+    nyquist = sample_rate / 2
+    high = min(high_hz / nyquist, 0.99)
+    return signal.butter(order, [low_hz / nyquist, high], btype="band", output="sos")
+
+
+class StreamingBandpass:
+    """Causal band-pass filter that keeps its state between chunks"""
+
+    def __init__(
+        self, sample_rate: int, low_hz: float, high_hz: float, order: int = 4
+    ) -> None:
+        _ensure_libs()
+        self.sos = _design_bandpass_sos(sample_rate, low_hz, high_hz, order)
+        self._zi_unit = signal.sosfilt_zi(self.sos)
+        self._zi: np.ndarray | None = None
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Filter *chunk* as the continuation of all previous chunks."""
+        if len(chunk) == 0:
+            return np.asarray(chunk, dtype=np.float64)
+        if self._zi is None:
+            # Start in steady state for the first sample to avoid a step transient
+            self._zi = self._zi_unit * chunk[0]
+        filtered, self._zi = signal.sosfilt(self.sos, chunk, zi=self._zi)
+        return filtered
+
+    def reset(self) -> None:
+        self._zi = None
+
+
 class RealtimeSpectral:
     """
     Real-time spectral analysis for interactive frequency monitoring.
 
     Achieves 60 FPS (16.67ms per frame) through:
-    - Optimized FFT computation
-    - Cached frequency bins
-    - Efficient pitch detection
+    - Optimized FFT computation (rfft, preallocated buffers)
+    - Cached frequency bins and window
+    - Efficient, stateful pitch detection
+
+    Two ways to feed audio:
+    - ``process_chunk``: one contiguous ``fft_size`` block per call
+    - ``push``: arbitrary-sized blocks from a live stream; a frame is
+      emitted every ``hop_length`` samples from a ring buffer
     """
 
     def __init__(
@@ -76,6 +168,7 @@ class RealtimeSpectral:
         fft_size: int = 4096,
         hop_length: int = 512,
         target_fps: int = 60,
+        copy_output: bool = True,
     ):
         """
         Initialize spectral analyzer.
@@ -85,6 +178,8 @@ class RealtimeSpectral:
             fft_size: FFT window size (power of 2)
             hop_length: Samples between frames
             target_fps: Target frame rate for real-time display
+            copy_output: If False, frames share preallocated magnitude/phase
+                buffers that are overwritten by the next frame (zero allocation)
         """
         _ensure_libs()
         self.sample_rate = sample_rate
@@ -92,13 +187,28 @@ class RealtimeSpectral:
         self.hop_length = hop_length
         self.target_fps = target_fps
         self.frame_time_ms = 1000.0 / target_fps
+        self.copy_output = copy_output
 
         # Precompute frequency bins
         self.frequencies = librosa.fft_frequencies(sr=sample_rate, n_fft=fft_size)
+        self._n_bins = fft_size // 2
 
         # Window function for better spectral analysis
         self.window = hann(fft_size)
 
+        # Preallocated work buffers
+        self._frame_buf = np.zeros(fft_size)
+        self._filtered_buf = np.zeros(fft_size)
+        self._windowed = np.zeros(fft_size)
+        self._mag_linear = np.zeros(self._n_bins)
+        self._mag_db = np.zeros(self._n_bins)
+        self._phase = np.zeros(self._n_bins)
+
+        # Streaming state
+        self._raw_ring = AudioRingBuffer(fft_size)
+        self._filtered_ring = AudioRingBuffer(fft_size)
+        self._since_last_frame = 0
+
         # State
         self.frame_count = 0
         self.last_frame_time_ms = 0.0
@@ -117,6 +227,9 @@ class RealtimeSpectral:
         """
         Process audio chunk and return spectral frame.
 
+        Consecutive calls are treated as a contiguous stream by the pitch
+        filter; call ``reset()`` when jumping to unrelated audio.
+
         Args:
             audio_chunk: Audio samples (fft_size samples)
             current_time_ms: Timestamp in milliseconds
@@ -130,33 +243,82 @@ class RealtimeSpectral:
                 f"Expected {self.fft_size} samples, got {len(audio_chunk)}"
             )
 
-        # Apply window
-        windowed = audio_chunk * self.window
+        filtered = self.pitch_detector.bandpass.process(audio_chunk)
+        return self._analyze(audio_chunk, filtered, current_time_ms)
 
-        # Compute FFT
-        fft_result = np.fft.fft(windowed)
+    def push(self, samples: np.ndarray) -> list[SpectralFrame]:
+        """
+        Feed a block of a live stream and return any frames it completes
 
-        # Get magnitude and phase
-        magnitude_linear = np.abs(fft_result[: self.fft_size // 2])
-        phase = np.angle(fft_result[: self.fft_size // 2])
+        Each sample is band-pass filtered exactly once; frames are cut from
+        the ring buffers every ``hop_length`` samples once ``fft_size``
+        samples have been buffered.
+        """
+        frames = []
+        pos = 0
+        while pos < len(samples):
+            # Never cross a hop boundary inside one write
+            take = min(len(samples) - pos, self.hop_length - self._since_last_frame)
+            block = samples[pos : pos + take]
+            self._raw_ring.write(block)
+            self._filtered_ring.write(self.pitch_detector.bandpass.process(block))
+            self._since_last_frame += take
+            pos += take
+
+            if (
+                self._since_last_frame >= self.hop_length
+                and len(self._raw_ring) >= self.fft_size
+            ):
+                self._since_last_frame = 0
+                raw = self._raw_ring.latest(self.fft_size, out=self._frame_buf)
+                filtered = self._filtered_ring.latest(
+                    self.fft_size, out=self._filtered_buf
+                )
+                timestamp_ms = 1000.0 * self._raw_ring.total_written / self.sample_rate
+                frames.append(self._analyze(raw, filtered, timestamp_ms))
+            elif self._since_last_frame >= self.hop_length:
+                self._since_last_frame = 0
+        return frames
+
+    def reset(self) -> None:
+        """Forget all stream state (filter memory and ring buffers)."""
+        self.pitch_detector.reset()
+        self._raw_ring = AudioRingBuffer(self.fft_size)
+        self._filtered_ring = AudioRingBuffer(self.fft_size)
+        self._since_last_frame = 0
+
+    def _analyze(
+        self, audio: np.ndarray, filtered: np.ndarray, current_time_ms: float
+    ) -> SpectralFrame:
+        # Apply window and compute the one-sided spectrum
+        np.multiply(audio, self.window, out=self._windowed)
+        spectrum = sp_fft.rfft(self._windowed)[: self._n_bins]
 
-        # Convert magnitude to dB (avoid log of zero)
-        magnitude_db = 20 * np.log10(magnitude_linear + 1e-10)
+        # Get magnitude and phase
+        np.abs(spectrum, out=self._mag_linear)
+        np.arctan2(spectrum.imag, spectrum.real, out=self._phase)
 
-        # Normalize to 0-100 range for display
-        magnitude_db = np.clip(magnitude_db + 100, 0, 100)
+        # Convert magnitude to dB (avoid log of zero), normalized to 0-100
+        np.add(self._mag_linear, 1e-10, out=self._mag_db)
+        np.log10(self._mag_db, out=self._mag_db)
+        self._mag_db *= 20
+        self._mag_db += 100
+        np.clip(self._mag_db, 0, 100, out=self._mag_db)
 
         # Detect pitch
-        pitch_hz, pitch_confidence = self.pitch_detector.detect(audio_chunk)
+        pitch_hz, pitch_confidence = self.pitch_detector.detect_filtered(filtered)
 
         # Find peak frequency
-        peak_idx = np.argmax(magnitude_linear)
-        peak_frequency_hz = float(self.frequencies[peak_idx])
+        peak_frequency_hz = float(self.frequencies[int(np.argmax(self._mag_linear))])
+
+        magnitude, phase = self._mag_db, self._phase
+        if self.copy_output:
+            magnitude, phase = magnitude.copy(), phase.copy()
 
         frame = SpectralFrame(
             timestamp_ms=current_time_ms,
-            frequencies_hz=self.frequencies[: self.fft_size // 2],
-            magnitude=magnitude_db,
+            frequencies_hz=self.frequencies[: self._n_bins],
+            magnitude=magnitude,
             phase=phase,
             pitch_hz=pitch_hz,
             pitch_confidence=pitch_confidence,
@@ -164,6 +326,7 @@ class RealtimeSpectral:
         )
 
         self.frame_count += 1
+        self.last_frame_time_ms = current_time_ms
         return frame
 
     def get_display_data(
@@ -240,17 +403,31 @@ class RealtimeSpectral:
 class PitchDetector:
     """Efficient pitch detection for real-time use"""
 
-    def __init__(self, sample_rate: int) -> None:
+    def __init__(
+        self,
+        sample_rate: int,
+        min_freq: float = 50.0,
+        max_freq: float = 4000.0,
+        threshold: float = 0.15,
+    ) -> None:
         _ensure_libs()
         self.sample_rate = sample_rate
-        self.min_freq = 50.0  # Minimum detectable frequency (Hz)
-        self.max_freq = 4000.0  # Maximum detectable frequency (Hz)
+        self.min_freq = min_freq  # Minimum detectable frequency (Hz)
+        self.max_freq = max_freq  # Maximum detectable frequency (Hz)
+        self.threshold = threshold  # YIN absolute threshold
+
+        # Band-pass designed once; state carries across chunks
+        self.bandpass = StreamingBandpass(sample_rate, min_freq, max_freq)
+
+        # rfft length per frame size (next power of two)
+        self._fft_lengths: dict[int, int] = {}
 
     def detect(self, audio_chunk: np.ndarray) -> tuple[float | None, float]:
         """
         Detect fundamental frequency (pitch) in audio chunk.
 
-        Uses autocorrelation method for fast, real-time performance.
+        The chunk is band-passed with the streaming filter (so consecutive
+        chunks are filtered as one signal) and analysed with YIN.
 
         Args:
             audio_chunk: Audio samples
@@ -258,63 +435,91 @@ class PitchDetector:
         Returns:
             Tuple of (pitch_hz, confidence)
         """
-        # Apply high-pass filter to focus on pitch range
-        nyquist = self.sample_rate / 2
-        normalized_min = self.min_freq / nyquist
-        normalized_max = self.max_freq / nyquist
+        return self.detect_filtered(self.bandpass.process(audio_chunk))
 
-        if normalized_max >= 1.0:
-            normalized_max = 0.99
+    def detect_filtered(self, frame: np.ndarray) -> tuple[float | None, float]:
+        """
+        YIN pitch estimate on an already band-passed frame
 
-        if normalized_min >= normalized_max:
+        The difference function is computed from an FFT cross-correlation,
+        so the cost is O(n log n) rather than O(n^2).
+        """
+        n = len(frame)
+        tau_min = max(2, int(self.sample_rate / self.max_freq))
+        tau_max = min(int(self.sample_rate / self.min_freq), n // 2)
+        if tau_max <= tau_min + 1:
             return None, 0.0
 
-        # Design filter
-        b, a = signal.butter(4, [normalized_min, normalized_max], btype="band")
-        filtered = signal.filtfilt(b, a, audio_chunk)
-
-        # Autocorrelation method
-        autocorr = np.correlate(filtered, filtered, mode="full")
-        autocorr = autocorr[len(autocorr) // 2 :]
-
-        # Guard against division by zero
-        if autocorr[0] == 0:
+        window = n - tau_max
+        energy = np.concatenate(([0.0], np.cumsum(frame * frame)))
+        if energy[-1] < 1e-10:
             return None, 0.0
 
-        autocorr = autocorr / autocorr[0]
-
-        # Find minimum lag (corresponding to pitch)
-        min_lag = int(self.sample_rate / self.max_freq)
-        max_lag = int(self.sample_rate / self.min_freq)
-
-        if max_lag > len(autocorr):
-            max_lag = len(autocorr)
-
-        # Find peaks in autocorrelation
-        peaks, properties = signal.find_peaks(
-            autocorr[min_lag:max_lag], height=0.3, distance=min_lag // 2
+        # r[tau] = sum_{j < window} x[j] * x[j + tau]
+        fft_len = self._fft_length(n + window)
+        spectrum = sp_fft.rfft(frame, fft_len)
+        head = sp_fft.rfft(frame[:window], fft_len)
+        corr = sp_fft.irfft(np.conj(head) * spectrum, fft_len)[: tau_max + 1]
+
+        # Difference function d(tau) = E[0:W] + E[tau:tau+W] - 2 r(tau)
+        taus = np.arange(tau_max + 1)
+        diff = energy[window] + (energy[taus + window] - energy[taus]) - 2 * corr
+        diff[0] = 0.0
+        np.maximum(diff, 0.0, out=diff)
+
+        # Cumulative mean normalized difference
+        cumulative = np.cumsum(diff[1:])
+        cmnd = np.ones_like(diff)
+        np.divide(
+            diff[1:] * taus[1:],
+            cumulative,
+            out=cmnd[1:],
+            where=cumulative > 0,
         )
 
-        if len(peaks) == 0:
-            return None, 0.0
-
-        # Get strongest peak
-        peak_idx = np.argmax(properties["peak_heights"])
-        lag = peaks[peak_idx] + min_lag
-
-        # Convert lag to frequency
-        if lag > 0:
-            frequency = self.sample_rate / lag
-            confidence = min(
-                1.0, autocorr[lag]
-            )  # Confidence based on correlation strength
+        search = cmnd[tau_min:tau_max]
+        below = np.flatnonzero(search < self.threshold)
+        if len(below):
+            tau = tau_min + int(below[0])
+            # Walk down to the local minimum of this dip
+            while tau + 1 < tau_max and cmnd[tau + 1] < cmnd[tau]:
+                tau += 1
+        else:
+            tau = tau_min + int(np.argmin(search))
+            if cmnd[tau] > 0.5:
+                return None, 0.0
 
-            # Clamp to valid range
-            if self.min_freq <= frequency <= self.max_freq:
-                return frequency, confidence
+        refined = self._parabolic(cmnd, tau)
+        frequency = self.sample_rate / refined
+        confidence = float(np.clip(1.0 - cmnd[tau], 0.0, 1.0))
 
+        # Clamp to valid range
+        if self.min_freq <= frequency <= self.max_freq:
+            return float(frequency), confidence
         return None, 0.0
 
+    def reset(self) -> None:
+        """Clear filter state before analysing unrelated audio."""
+        self.bandpass.reset()
+
+    def _fft_length(self, n: int) -> int:
+        length = self._fft_lengths.get(n)
+        if length is None:
+            length = 1 << (n - 1).bit_length()
+            self._fft_lengths[n] = length
+        return length
+
+    @staticmethod
+    def _parabolic(values: np.ndarray, index: int) -> float:
+        """Sub-sample position of the minimum around *index*."""
+        if index <= 0 or index >= len(values) - 1:
+            return float(index)
+        left, centre, right = values[index - 1], values[index], values[index + 1]
+        denominator = left - 2 * centre + right
+        if denominator == 0:
+            return float(index)
+        return index + 0.5 * (left - right) / denominator
+
     def get_pitch_cents(self, frequency: float, reference: float = 440.0) -> float:
         """
         Convert frequency to cents relative to reference (usually A4=440Hz).
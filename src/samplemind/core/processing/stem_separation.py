@@ -6,7 +6,7 @@ import subprocess
 import sys
 import tempfile
 from collections.abc import Callable, Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import StrEnum
 from pathlib import Path
 
@@ -71,20 +71,24 @@ class StemSeparationResult:
 
     output_directory: Path
     stems: dict[str, Path]
-    command: list[str]
+    command: list[str] = field(default_factory=list)  # empty when run in-process
 
 
 class StemSeparationEngine:
     """
-    High-level wrapper around the `demucs` CLI for audio stem separation.
+    High-level wrapper around Demucs for audio stem separation.
 
     Supports both Demucs v3 and v4 models:
     - v3: htdemucs, htdemucs_ft, hdemucs_mmi (classic models)
     - v4: mdx, mdx_extra, mdx_q (modern MDX-based models)
 
-    The engine keeps the dependency optional – if `demucs` is not available in the
-    current Python environment the feature will raise a helpful error rather than
-    crashing at import time.
+    When the `demucs` package is importable, separation runs in-process through
+    a StemSeparationService: the model stays loaded between files and long
+    tracks are processed in bounded-memory chunks.  Otherwise the engine falls
+    back to the external `demucs` CLI (e.g. installed with pipx).
+
+    The engine keeps the dependency optional – if `demucs` is not available at
+    all the feature will raise a helpful error rather than crashing at import time.
     """
 
     # Model categories for version detection
@@ -100,6 +104,11 @@ class StemSeparationEngine:
         shifts: int = 1,  # Number of random shifts for inference stability
         overlap: float = 0.25,  # Overlap between segments (0-1)
         verbose: bool = False,  # Print progress information
+        in_process: (
+            bool | None
+        ) = None,  # None: in-process whenever demucs is importable
+        max_workers: int = 1,  # Worker processes (one warm model each) for batches
+        chunk_seconds: float | None = None,  # In-process chunk length
     ) -> None:
         self.model = model
         self.device = device
@@ -107,6 +116,14 @@ class StemSeparationEngine:
         self.shifts = shifts
         self.overlap = overlap
         self.verbose = verbose
+        self.in_process = (
+            importlib.util.find_spec("demucs") is not None
+            if in_process is None
+            else in_process
+        )
+        self.max_workers = max_workers
+        self.chunk_seconds = chunk_seconds
+        self._service = None
 
         # Detect model version
         if model not in self.ALL_MODELS:
@@ -123,6 +140,7 @@ class StemSeparationEngine:
         quality: StemQuality = StemQuality.STANDARD,
         device: str | None = None,
         verbose: bool = False,
+        max_workers: int = 1,
     ) -> "StemSeparationEngine":
         """
         Create a StemSeparationEngine from a quality preset.
@@ -131,6 +149,7 @@ class StemSeparationEngine:
             quality: Quality preset (FAST, STANDARD, HIGH)
             device: Device to use (cpu, cuda, mps)
             verbose: Enable verbose output
+            max_workers: Worker processes for in-process batch separation
 
         Returns:
             Configured StemSeparationEngine instance
@@ -149,6 +168,7 @@ class StemSeparationEngine:
             shifts=preset.shifts,
             overlap=preset.overlap,
             verbose=verbose,
+            max_workers=max_workers,
         )
 
     @staticmethod
@@ -167,6 +187,29 @@ class StemSeparationEngine:
                 "Demucs is required for stem separation. Please install it externally via 'pipx install demucs' (recommended for Python 3.12+), or 'pip install demucs'.",
             )
 
+    @property
+    def service(self):
+        """The warm-model StemSeparationService (created on first use)."""
+        if self._service is None:
+            from .stem_service import DEFAULT_CHUNK_SECONDS, StemSeparationService
+
+            self._service = StemSeparationService(
+                model_name=self.model,
+                device=self.device,
+                shifts=self.shifts,
+                overlap=self.overlap,
+                segment=self.segment,
+                max_workers=self.max_workers,
+                chunk_seconds=self.chunk_seconds or DEFAULT_CHUNK_SECONDS,
+            )
+        return self._service
+
+    def close(self) -> None:
+        """Release the in-process model and worker processes."""
+        if self._service is not None:
+            self._service.close()
+            self._service = None
+
     def separate(
         self,
         audio_path: Path,
@@ -191,12 +234,20 @@ class StemSeparationEngine:
             StemSeparationResult with separated stems
         """
 
-        self._assert_dependency()
-
         audio_path = Path(audio_path).expanduser().resolve()
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
+        self._assert_dependency()
+
+        if self.in_process:
+            return self.service.separate(
+                audio_path,
+                output_directory=output_directory,
+                stems=stems,
+                two_stems=two_stems if self.is_v4 else None,
+            )
+
         stems = tuple(stems) if stems else _DEFAULT_STEMS
         if set(stems) != set(_DEFAULT_STEMS):
             logger.warning(
@@ -307,10 +358,13 @@ class StemSeparationEngine:
         """
         Separate multiple audio files with optional concurrency control.
 
+        In-process mode hands the whole batch to the StemSeparationService,
+        whose worker processes (``max_workers``) each keep a model loaded.
+
         Args:
             audio_paths: List of paths to audio files
             output_directory: Base output directory for all stems
-            max_concurrent: Maximum concurrent separations (default: 1 for stability)
+            max_concurrent: Maximum concurrent CLI separations (default: 1 for stability)
             progress_callback: Callback function(current, total) for progress tracking
 
         Returns:
@@ -325,6 +379,17 @@ class StemSeparationEngine:
         """
         self._assert_dependency()
 
+        if self.in_process:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                lambda: self.service.separate_batch(
+                    audio_paths,
+                    output_directory,
+                    progress_callback=progress_callback,
+                ),
+            )
+
         results = []
         total = len(audio_paths)
 
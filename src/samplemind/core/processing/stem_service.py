@@ -0,0 +1,556 @@
+"""
+In-process stem separation service with warm models and chunked processing.
+
+StemSeparationEngine used to launch the demucs CLI once per file, paying
+interpreter start-up and a full model load every time.  This service keeps
+the model resident instead:
+
+  - the model is loaded once per process (lazily in-process, or once per
+    worker via the ProcessPoolExecutor initializer) and reused for every file
+  - audio is streamed in overlapping chunks that are cross-faded back
+    together, so memory is bounded by the chunk size, not the track length
+  - stems are written to disk chunk by chunk as they are produced
+  - the worker pool persists across batches until close() is called
+  - throughput (files/s, realtime factor, model load time) is tracked in
+    SeparationStats
+
+Any object implementing the SeparationModel protocol can be plugged in via
+``model_factory``; the default wraps a pretrained Demucs model.  Factories
+must be picklable (a module-level class or functools.partial) when
+``max_workers > 1``.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+import numpy as np
+
+from .exceptions import OptionalDependencyError
+from .stem_separation import StemSeparationResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SECONDS = 30.0
+DEFAULT_CHUNK_OVERLAP = 0.1  # fraction of a chunk shared with its neighbour
+_PENDING_PER_WORKER = 2
+
+
+class SeparationModel(Protocol):
+    """A loaded source-separation model."""
+
+    sources: Sequence[str]
+    samplerate: int
+    audio_channels: int
+
+    def separate(self, mix: np.ndarray) -> np.ndarray:
+        """Map a (channels, frames) mix to (sources, channels, frames)."""
+        ...
+
+
+ModelFactory = Callable[[], SeparationModel]
+
+
+class DemucsModel:
+    """Pretrained Demucs model kept in memory (the default SeparationModel)."""
+
+    def __init__(
+        self,
+        name: str = "mdx_extra",
+        device: str | None = None,
+        shifts: int = 1,
+        overlap: float = 0.25,
+        segment: float | None = None,
+    ) -> None:
+        try:
+            import torch
+            from demucs.apply import apply_model
+            from demucs.pretrained import get_model
+        except ImportError as exc:
+            raise OptionalDependencyError(
+                "demucs",
+                "Demucs and PyTorch are required for in-process stem separation. "
+                "Install them with 'pip install demucs'.",
+            ) from exc
+
+        self._torch = torch
+        self._apply_model = apply_model
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.shifts = shifts
+        self.overlap = overlap
+        self.segment = segment
+
+        self._model = get_model(name)
+        self._model.to(self.device)
+        self._model.eval()
+        self.sources = tuple(self._model.sources)
+        self.samplerate = int(self._model.samplerate)
+        self.audio_channels = int(self._model.audio_channels)
+
+    def separate(self, mix: np.ndarray) -> np.ndarray:
+        torch = self._torch
+        wav = torch.from_numpy(np.ascontiguousarray(mix, dtype=np.float32))
+        # Same normalisation as the demucs CLI
+        ref = wav.mean(0)
+        mean, std = ref.mean(), ref.std() + 1e-8
+        wav = (wav - mean) / std
+        with torch.inference_mode():
+            out = self._apply_model(
+                self._model,
+                wav[None],
+                device=self.device,
+                shifts=self.shifts,
+                split=True,
+                overlap=self.overlap,
+                segment=self.segment,
+                progress=False,
+            )[0]
+        return (out * std + mean).cpu().numpy()
+
+
+@dataclass
+class SeparationStats:
+    """Cumulative throughput of a StemSeparationService"""
+
+    files: int = 0
+    failed: int = 0
+    audio_seconds: float = 0.0
+    processing_seconds: float = 0.0  # time spent separating, summed over workers
+    wall_seconds: float = 0.0
+    model_loads: int = 0
+    model_load_seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio separated per second of wall time."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "files_per_second": round(self.files_per_second, 3),
+            "realtime_factor": round(self.realtime_factor, 2),
+        }
+
+
+# ── Chunked separation ────────────────────────────────────────────────────────
+
+
+def _to_model_input(block: np.ndarray, sr: int, model: SeparationModel) -> np.ndarray:
+    """(frames, channels) file block → (model channels, frames) at model rate."""
+    mix = block.T
+    if mix.shape[0] != model.audio_channels:
+        if mix.shape[0] == 1:
+            mix = np.repeat(mix, model.audio_channels, axis=0)
+        else:
+            mix = np.repeat(
+                mix.mean(axis=0, keepdims=True), model.audio_channels, axis=0
+            )
+    if sr != model.samplerate:
+        import librosa
+
+        mix = librosa.resample(mix, orig_sr=sr, target_sr=model.samplerate)
+    return mix
+
+
+def _from_model_output(
+    out: np.ndarray, frames: int, sr: int, channels: int, model: SeparationModel
+) -> np.ndarray:
+    """(sources, model channels, n) model output → (sources, channels, frames)."""
+    if sr != model.samplerate:
+        import librosa
+
+        out = librosa.resample(out, orig_sr=model.samplerate, target_sr=sr)
+    out = _fit_length(out, frames)
+    if out.shape[1] != channels:
+        out = out.mean(axis=1, keepdims=True) if channels == 1 else out[:, :channels]
+    return out
+
+
+def _fit_length(out: np.ndarray, frames: int) -> np.ndarray:
+    # Resampling can be off by a frame or two
+    if out.shape[-1] > frames:
+        return out[..., :frames]
+    if out.shape[-1] < frames:
+        pad = [(0, 0)] * (out.ndim - 1) + [(0, frames - out.shape[-1])]
+        return np.pad(out, pad)
+    return out
+
+
+def separate_file(
+    model: SeparationModel,
+    audio_path: Path,
+    target_dir: Path,
+    stems: Iterable[str] | None = None,
+    two_stems: str | None = None,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+    overlap: float = DEFAULT_CHUNK_OVERLAP,
+) -> tuple[dict[str, Path], float]:
+    """
+    Separate *audio_path* chunk by chunk, writing ``<stem>.wav`` files into
+    *target_dir*.  Stems keep the input's sample rate and channel count.
+
+    Returns the written stems and the duration of the input in seconds.
+    """
+    import soundfile as sf
+
+    sources = list(model.sources)
+    if two_stems is not None:
+        if two_stems not in sources:
+            raise ValueError(f"Unknown stem {two_stems!r}; model provides {sources}")
+        outputs = [two_stems, f"no_{two_stems}"]
+    else:
+        wanted = set(stems) if stems else set(sources)
+        outputs = [s for s in sources if s in wanted]
+        unknown = wanted - set(sources)
+        if unknown:
+            logger.warning(
+                "Model does not provide stems %s; ignoring them", sorted(unknown)
+            )
+    if not outputs:
+        raise ValueError("No stems to write")
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    paths = {name: target_dir / f"{name}.wav" for name in outputs}
+
+    with sf.SoundFile(str(audio_path)) as source:
+        sr, channels = source.samplerate, source.channels
+        chunk = max(1, int(chunk_seconds * sr))
+        overlap_frames = min(int(chunk * overlap), chunk - 1)
+        writers = {
+            name: sf.SoundFile(str(path), "w", sr, channels, subtype="FLOAT")
+            for name, path in paths.items()
+        }
+        try:
+            tail: np.ndarray | None = None
+            blocks = source.blocks(
+                blocksize=chunk, overlap=overlap_frames, dtype="float32", always_2d=True
+            )
+            block = next(blocks, None)
+            while block is not None:
+                following = next(blocks, None)  # one block of look-ahead
+                frames = len(block)
+                out = model.separate(_to_model_input(block, sr, model))
+                out = _from_model_output(out, frames, sr, channels, model)
+                if two_stems is not None:
+                    keep = out[sources.index(two_stems)]
+                    out = np.stack([keep, out.sum(axis=0) - keep])
+                else:
+                    out = out[[sources.index(name) for name in outputs]]
+
+                if tail is not None:
+                    # Linear cross-fade over the region shared with the last chunk
+                    k = min(tail.shape[-1], frames)
+                    fade = np.linspace(0.0, 1.0, k, dtype=np.float32)
+                    out[..., :k] = tail[..., :k] * (1.0 - fade) + out[..., :k] * fade
+                if following is not None and overlap_frames:
+                    ready, tail = (
+                        out[..., :-overlap_frames],
+                        out[..., -overlap_frames:].copy(),
+                    )
+                else:
+                    ready, tail = out, None
+                for index, name in enumerate(outputs):
+                    writers[name].write(ready[index].T)
+                block = following
+            duration = source.frames / sr if sr else 0.0
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+    return paths, duration
+
+
+# ── Worker process ────────────────────────────────────────────────────────────
+
+_worker_model: SeparationModel | None = None
+# Seconds this worker spent loading its model, until reported to the parent
+_worker_load_seconds: float | None = None
+
+
+def _init_worker(model_factory: ModelFactory) -> None:
+    global _worker_model, _worker_load_seconds
+    start = time.perf_counter()
+    _worker_model = model_factory()
+    _worker_load_seconds = time.perf_counter() - start
+
+
+def _separate_in_worker(
+    audio_path: Path, target_dir: Path, options: dict[str, Any]
+) -> tuple[dict[str, Path], float, float, float | None]:
+    """Separate one file; the model load time rides on the first result."""
+    global _worker_load_seconds
+    load_seconds, _worker_load_seconds = _worker_load_seconds, None
+    start = time.perf_counter()
+    stems, duration = separate_file(_worker_model, audio_path, target_dir, **options)
+    return stems, duration, time.perf_counter() - start, load_seconds
+
+
+# ── Service ───────────────────────────────────────────────────────────────────
+
+
+class StemSeparationService:
+    """Warm-model stem separation; see the module docstring."""
+
+    def __init__(
+        self,
+        model_factory: ModelFactory | None = None,
+        model_name: str = "mdx_extra",
+        device: str | None = None,
+        shifts: int = 1,
+        overlap: float = 0.25,
+        segment: float | None = None,
+        max_workers: int = 1,
+        chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+        chunk_overlap: float = DEFAULT_CHUNK_OVERLAP,
+    ) -> None:
+        if not 0 <= chunk_overlap < 1:
+            raise ValueError("chunk_overlap must be in [0, 1)")
+        self.model_name = model_name
+        self.model_factory: ModelFactory = model_factory or functools.partial(
+            DemucsModel,
+            model_name,
+            device=device,
+            shifts=shifts,
+            overlap=overlap,
+            segment=segment,
+        )
+        self.max_workers = max(1, max_workers)
+        self.chunk_seconds = chunk_seconds
+        self.chunk_overlap = chunk_overlap
+        self.stats = SeparationStats()
+        self._model: SeparationModel | None = None
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def model(self) -> SeparationModel:
+        """The in-process model, loaded on first use."""
+        if self._model is None:
+            start = time.perf_counter()
+            self._model = self.model_factory()
+            elapsed = time.perf_counter() - start
+            self.stats.model_loads += 1
+            self.stats.model_load_seconds += elapsed
+            logger.info("Loaded separation model %s in %.2fs", self.model_name, elapsed)
+        return self._model
+
+    def _target_dir(self, audio_path: Path, output_directory: Path | None) -> Path:
+        base = output_directory or Path(tempfile.mkdtemp(prefix="samplemind-stems-"))
+        # Same layout as the demucs CLI: <out>/<model>/<track>/<stem>.wav
+        return base.expanduser().resolve() / self.model_name / audio_path.stem
+
+    def _options(
+        self, stems: Iterable[str] | None, two_stems: str | None
+    ) -> dict[str, Any]:
+        return {
+            "stems": tuple(stems) if stems else None,
+            "two_stems": two_stems,
+            "chunk_seconds": self.chunk_seconds,
+            "overlap": self.chunk_overlap,
+        }
+
+    def _record(self, audio_path: Path, duration: float, elapsed: float) -> None:
+        self.stats.files += 1
+        self.stats.audio_seconds += duration
+        self.stats.processing_seconds += elapsed
+        logger.info(
+            "Separated %s (%.1fs audio in %.2fs, %.1fx realtime)",
+            audio_path.name,
+            duration,
+            elapsed,
+            duration / elapsed if elapsed > 0 else 0.0,
+        )
+
+    def separate(
+        self,
+        audio_path: Path,
+        output_directory: Path | None = None,
+        stems: Iterable[str] | None = None,
+        two_stems: str | None = None,
+    ) -> StemSeparationResult:
+        """Separate one file in this process with the warm model."""
+        audio_path = Path(audio_path).expanduser().resolve()
+        if not audio_path.exists():
+            self.stats.failed += 1
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        model = self.model
+        target_dir = self._target_dir(audio_path, output_directory)
+        start = time.perf_counter()
+        try:
+            stem_map, duration = separate_file(
+                model, audio_path, target_dir, **self._options(stems, two_stems)
+            )
+        except Exception:
+            self.stats.failed += 1
+            raise
+        elapsed = time.perf_counter() - start
+        self.stats.wall_seconds += elapsed
+        self._record(audio_path, duration, elapsed)
+        return StemSeparationResult(
+            output_directory=target_dir, stems=stem_map, command=[]
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.model_factory,),
+            )
+        return self._pool
+
+    def iter_separate(
+        self,
+        audio_paths: Sequence[Path],
+        output_directory: Path | None = None,
+        stems: Iterable[str] | None = None,
+        two_stems: str | None = None,
+    ) -> Iterator[tuple[int, StemSeparationResult | None, str | None]]:
+        """
+        Separate many files, yielding ``(index, result, error)`` as each
+        finishes (not necessarily in input order).
+
+        With ``max_workers == 1`` files are processed in this process; otherwise
+        they are spread over the persistent worker pool.
+        """
+        options = self._options(stems, two_stems)
+        paths = [Path(p).expanduser().resolve() for p in audio_paths]
+        if output_directory is None:
+            output_directory = Path(tempfile.mkdtemp(prefix="samplemind-stems-"))
+        start = time.perf_counter()
+
+        try:
+            if self.max_workers == 1:
+                for index, path in enumerate(paths):
+                    try:
+                        result = self.separate(path, output_directory, stems, two_stems)
+                    except Exception as e:
+                        yield index, None, str(e)
+                    else:
+                        yield index, result, None
+                return
+
+            pool = self._get_pool()
+            jobs = iter(enumerate(paths))
+            running: dict[Future, int] = {}
+            try:
+                while True:
+                    while len(running) < self.max_workers * _PENDING_PER_WORKER:
+                        job = next(jobs, None)
+                        if job is None:
+                            break
+                        index, path = job
+                        if not path.exists():
+                            self.stats.failed += 1
+                            yield index, None, f"Audio file not found: {path}"
+                            continue
+                        target_dir = self._target_dir(path, output_directory)
+                        future = pool.submit(
+                            _separate_in_worker, path, target_dir, options
+                        )
+                        running[future] = index
+                    if not running:
+                        break
+                    finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        index = running.pop(future)
+                        path = paths[index]
+                        try:
+                            stem_map, duration, elapsed, load = future.result()
+                        except Exception as e:
+                            self.stats.failed += 1
+                            yield index, None, str(e)
+                            continue
+                        if load is not None:
+                            self.stats.model_loads += 1
+                            self.stats.model_load_seconds += load
+                        self._record(path, duration, elapsed)
+                        yield index, StemSeparationResult(
+                            output_directory=self._target_dir(path, output_directory),
+                            stems=stem_map,
+                            command=[],
+                        ), None
+            finally:
+                # Consumer stopped early (or was interrupted): drop queued work
+                for future in running:
+                    future.cancel()
+        finally:
+            if self.max_workers > 1:
+                self.stats.wall_seconds += time.perf_counter() - start
+
+    def separate_batch(
+        self,
+        audio_paths: Sequence[Path],
+        output_directory: Path | None = None,
+        stems: Iterable[str] | None = None,
+        two_stems: str | None = None,
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> list[StemSeparationResult]:
+        """
+        Separate *audio_paths* and return their results in input order.
+
+        Every file is attempted; if any failed, a RuntimeError naming them is
+        raised afterwards (stems of the successful files are already on disk).
+        """
+        total = len(audio_paths)
+        results: list[StemSeparationResult | None] = [None] * total
+        errors: dict[int, str] = {}
+        for done, (index, result, error) in enumerate(
+            self.iter_separate(audio_paths, output_directory, stems, two_stems), start=1
+        ):
+            if error is not None:
+                logger.error(
+                    "Failed to separate %s: %s", Path(audio_paths[index]).name, error
+                )
+                errors[index] = error
+            results[index] = result
+            if progress_callback:
+                progress_callback(done, total)
+
+        logger.info(
+            "Batch separation complete: %d files, %.1fx realtime",
+            total - len(errors),
+            self.stats.realtime_factor,
+        )
+        if errors:
+            failed = ", ".join(Path(audio_paths[i]).name for i in sorted(errors))
+            first = errors[min(errors)]
+            raise RuntimeError(
+                f"Stem separation failed for {len(errors)} of {total} file(s) ({failed}): {first}"
+            )
+        return [r for r in results if r is not None]
+
+    def close(self) -> None:
+        """Shut down the worker pool and drop the in-process model."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        self._model = None
+
+    def __enter__(self) -> StemSeparationService:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+__all__ = [
+    "DemucsModel",
+    "SeparationModel",
+    "SeparationStats",
+    "StemSeparationService",
+    "separate_file",
+]
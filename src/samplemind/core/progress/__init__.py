@@ -0,0 +1,26 @@
+"""
+SampleMind AI - Progress Bus
+Push-based job progress for WebSocket clients
+"""
+
+from .bus import (
+    ProgressBus,
+    ProgressSubscription,
+    agent_topic,
+    batch_topic,
+    get_progress_bus,
+    publish_progress,
+    reset_progress_bus,
+)
+from .redis_bridge import RedisStreamBridge
+
+__all__ = [
+    "ProgressBus",
+    "ProgressSubscription",
+    "RedisStreamBridge",
+    "get_progress_bus",
+    "publish_progress",
+    "reset_progress_bus",
+    "batch_topic",
+    "agent_topic",
+]
@@ -0,0 +1,316 @@
+"""
+In-process Progress Bus
+
+Publishers (batch worker pool, Celery task hooks, the agent graph) call
+``publish(topic, event)`` from any thread.  WebSocket handlers subscribe to
+a topic and receive *coalesced, rate-limited deltas*:
+
+- Events published between two deliveries are merged field by field, so a
+  slow socket only ever holds one pending dict, never a backlog.
+- Each subscription delivers at most once per ``min_interval`` seconds;
+  final events are flushed immediately.
+- Only fields that changed since the previous delivery are sent; the first
+  delivery carries the full snapshot.
+
+The bus keeps the latest merged snapshot per topic so late subscribers start
+from the current state instead of waiting for the next event.
+
+When a RedisStreamBridge is attached (see ``redis_bridge``), every publish is
+also appended to a Redis stream, and events published by other processes are
+fanned out to local subscribers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .redis_bridge import RedisStreamBridge
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 0.1  # seconds between deliveries per subscriber
+MAX_RETAINED_TOPICS = 10_000
+
+
+def batch_topic(job_id: str) -> str:
+    """Topic carrying a batch job's progress."""
+    return f"batch:{job_id}"
+
+
+def agent_topic(task_id: str) -> str:
+    """Topic carrying an agent task's (or session's) progress."""
+    return f"agent:{task_id}"
+
+
+class ProgressSubscription:
+    """One subscriber's view of a topic; iterate with ``async for``."""
+
+    def __init__(
+        self,
+        bus: ProgressBus,
+        topic: str,
+        loop: asyncio.AbstractEventLoop,
+        min_interval: float,
+    ) -> None:
+        self.bus = bus
+        self.topic = topic
+        self.min_interval = min_interval
+        self.delivered = 0
+        self.coalesced = 0
+
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._pending: dict[str, Any] = {}
+        self._final = False
+        self._signalled = False
+        self._last_sent: dict[str, Any] = {}
+        self._last_delivery = 0.0
+        self._closed = False
+
+    # Called by the bus with its lock held (any thread); False if dead
+    def _offer(self, event: dict[str, Any], final: bool) -> bool:
+        if self._signalled:
+            # A wakeup is already scheduled; just merge into the pending delta
+            self.coalesced += 1
+            self._pending.update(event)
+            self._final = self._final or final
+            return True
+        self._pending.update(event)
+        self._final = self._final or final
+        self._signalled = True
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Subscriber's event loop is gone
+            self._closed = True
+            return False
+        return True
+
+    async def next_delta(self) -> dict[str, Any] | None:
+        """
+        Wait for the next delta
+
+        Returns:
+            Changed fields since the last delivery, or None once the topic's
+            final event has been delivered or the subscription is closed
+        """
+        while not self._closed:
+            await self._wakeup.wait()
+
+            # Rate limit: let further events coalesce until the interval passes
+            wait = self._last_delivery + self.min_interval - time.monotonic()
+            if wait > 0 and not self._final:
+                await asyncio.sleep(wait)
+
+            with self.bus._lock:
+                pending, final = self._pending, self._final
+                self._pending = {}
+                self._signalled = False
+                self._wakeup.clear()
+
+            delta = {
+                key: value
+                for key, value in pending.items()
+                if self._last_sent.get(key, _MISSING) != value
+            }
+            self._last_sent.update(pending)
+            if final:
+                self.close()
+            if delta or final:
+                self._last_delivery = time.monotonic()
+                self.delivered += 1
+                return delta
+        return None
+
+    def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[dict[str, Any]]:
+        while (delta := await self.next_delta()) is not None:
+            yield delta
+            if self._closed:
+                return
+
+    def merge(self, event: dict[str, Any], final: bool = False) -> None:
+        """Feed an event into this subscription only (e.g. from a store re-check)."""
+        with self.bus._lock:
+            if not self._offer(event, final):
+                self.bus._discard(self)
+
+    def prime(self, state: dict[str, Any]) -> None:
+        """Mark *state* as already delivered, e.g. after sending an initial snapshot."""
+        self._last_sent.update(state)
+
+    @property
+    def snapshot(self) -> dict[str, Any]:
+        """Everything delivered so far, merged."""
+        return dict(self._last_sent)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self.bus._unsubscribe(self)
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass
+
+
+class _Missing:
+    pass
+
+
+_MISSING = _Missing()
+
+
+class ProgressBus:
+    """Thread-safe topic fan-out with last-value retention"""
+
+    def __init__(self, max_topics: int = MAX_RETAINED_TOPICS) -> None:
+        self.max_topics = max_topics
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[ProgressSubscription]] = {}
+        self._snapshots: OrderedDict[str, tuple[dict[str, Any], bool]] = OrderedDict()
+        self._bridge: RedisStreamBridge | None = None
+        self.published = 0
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(self, topic: str, event: dict[str, Any], final: bool = False) -> None:
+        """Publish *event* to *topic* locally and, if bridged, to Redis."""
+        self.deliver(topic, event, final)
+        bridge = self._bridge
+        if bridge is not None:
+            bridge.forward(topic, event, final)
+
+    def deliver(self, topic: str, event: dict[str, Any], final: bool = False) -> None:
+        """Fan *event* out to local subscribers only (used by the Redis bridge)."""
+        with self._lock:
+            self.published += 1
+            snapshot, was_final = self._snapshots.pop(topic, ({}, False))
+            snapshot.update(event)
+            self._snapshots[topic] = (snapshot, was_final or final)
+            while len(self._snapshots) > self.max_topics:
+                self._snapshots.popitem(last=False)
+
+            dead = [
+                subscription
+                for subscription in self._subscribers.get(topic, ())
+                if not subscription._offer(event, final)
+            ]
+            for subscription in dead:
+                self._discard(subscription)
+
+    # ------------------------------------------------------------------
+    # Subscribing
+    # ------------------------------------------------------------------
+
+    def subscribe(
+        self, topic: str, min_interval: float = DEFAULT_MIN_INTERVAL
+    ) -> ProgressSubscription:
+        """
+        Subscribe from a running event loop
+
+        If the topic has a retained snapshot it is offered immediately, so
+        the first delivery is the current state.
+        """
+        subscription = ProgressSubscription(
+            self, topic, asyncio.get_running_loop(), min_interval
+        )
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+            retained = self._snapshots.get(topic)
+            if retained is not None:
+                snapshot, final = retained
+                subscription._offer(dict(snapshot), final)
+        bridge = self._bridge
+        if bridge is not None:
+            bridge.ensure_consuming()
+        return subscription
+
+    def _unsubscribe(self, subscription: ProgressSubscription) -> None:
+        with self._lock:
+            self._discard(subscription)
+
+    def _discard(self, subscription: ProgressSubscription) -> None:
+        # Caller holds the lock
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.topic]
+
+    def latest(self, topic: str) -> dict[str, Any] | None:
+        """Return the retained snapshot for *topic*, if any."""
+        with self._lock:
+            retained = self._snapshots.get(topic)
+            return dict(retained[0]) if retained else None
+
+    def subscriber_count(self, topic: str | None = None) -> int:
+        with self._lock:
+            if topic is not None:
+                return len(self._subscribers.get(topic, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+    # ------------------------------------------------------------------
+    # Redis
+    # ------------------------------------------------------------------
+
+    def attach_bridge(self, bridge: RedisStreamBridge | None) -> None:
+        """Attach (or detach with None) a Redis stream bridge."""
+        previous, self._bridge = self._bridge, bridge
+        if previous is not None and previous is not bridge:
+            previous.stop()
+
+    @property
+    def bridge(self) -> RedisStreamBridge | None:
+        return self._bridge
+
+
+_bus: ProgressBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """
+    Return the process-wide progress bus
+
+    With ``SAMPLEMIND_PROGRESS_BUS=redis`` the bus is bridged to Redis on
+    first use so API workers and Celery workers share progress events.
+    """
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                bus = ProgressBus()
+                from .redis_bridge import bridge_from_env
+
+                bus.attach_bridge(bridge_from_env(bus))
+                _bus = bus
+    return _bus
+
+
+def reset_progress_bus() -> None:
+    """Drop the process-wide bus (tests only)."""
+    global _bus
+    with _bus_lock:
+        if _bus is not None:
+            _bus.attach_bridge(None)
+        _bus = None
+
+
+def publish_progress(topic: str, event: dict[str, Any], final: bool = False) -> None:
+    """Publish on the process-wide bus, never raising into the caller."""
+    try:
+        get_progress_bus().publish(topic, event, final)
+    except Exception as e:
+        logger.debug(f"Progress publish failed for {topic}: {e}")
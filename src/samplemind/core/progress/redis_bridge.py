@@ -0,0 +1,138 @@
+"""
+Redis Streams bridge for the progress bus
+
+With several API workers (and Celery workers in separate processes) a job's
+progress may be published in a different process than the one holding the
+client's WebSocket.  The bridge appends every local publish to one capped
+Redis stream and runs a single reader thread per process that fans remote
+entries out to local subscribers.
+
+The reader starts lazily on the first subscription, so publish-only
+processes such as Celery workers never block on XREAD.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .bus import ProgressBus
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_STREAM = "samplemind:progress"
+PROGRESS_STREAM_MAXLEN = 10_000
+READ_BLOCK_MS = 1000
+READ_BATCH = 500
+
+
+class RedisStreamBridge:
+    """Mirror progress events through a Redis stream"""
+
+    def __init__(
+        self,
+        bus: ProgressBus,
+        client: Any,
+        stream: str = PROGRESS_STREAM,
+        maxlen: int = PROGRESS_STREAM_MAXLEN,
+    ) -> None:
+        self.bus = bus
+        self.client = client
+        self.stream = stream
+        self.maxlen = maxlen
+        self.node_id = uuid.uuid4().hex
+
+        self._reader: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def forward(self, topic: str, event: dict[str, Any], final: bool) -> None:
+        """Append a locally published event to the stream."""
+        try:
+            self.client.xadd(
+                self.stream,
+                {
+                    "topic": topic,
+                    "origin": self.node_id,
+                    "final": int(final),
+                    "data": json.dumps(event, default=str),
+                },
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+        except Exception as e:
+            logger.debug(f"Progress stream XADD failed: {e}")
+
+    def ensure_consuming(self) -> None:
+        """Start the reader thread if it is not running yet."""
+        if self._reader is not None and self._reader.is_alive():
+            return
+        with self._start_lock:
+            if self._reader is not None and self._reader.is_alive():
+                return
+            self._stop.clear()
+            self._reader = threading.Thread(
+                target=self._read_loop, name="progress-stream-reader", daemon=True
+            )
+            self._reader.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._reader is not None:
+            self._reader.join(timeout=READ_BLOCK_MS / 1000 + 1)
+        self._reader = None
+
+    def _read_loop(self) -> None:
+        last_id = "$"  # only events published after we started listening
+        while not self._stop.is_set():
+            try:
+                response = self.client.xread(
+                    {self.stream: last_id}, count=READ_BATCH, block=READ_BLOCK_MS
+                )
+            except Exception as e:
+                logger.warning(f"Progress stream XREAD failed: {e}")
+                self._stop.wait(1.0)
+                continue
+
+            for _stream, entries in response or ():
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    self._dispatch(fields)
+
+    def _dispatch(self, fields: dict[str, Any]) -> None:
+        if fields.get("origin") == self.node_id:
+            return  # already delivered locally by publish()
+        try:
+            event = json.loads(fields["data"])
+            final = bool(int(fields.get("final", 0)))
+            self.bus.deliver(fields["topic"], event, final)
+        except Exception as e:
+            logger.debug(f"Malformed progress stream entry: {e}")
+
+
+def bridge_from_env(bus: ProgressBus) -> RedisStreamBridge | None:
+    """
+    Build a bridge when ``SAMPLEMIND_PROGRESS_BUS=redis``
+
+    Falls back to an in-process bus (returns None) if Redis is unreachable.
+    """
+    if os.getenv("SAMPLEMIND_PROGRESS_BUS", "local").lower() != "redis":
+        return None
+    try:
+        import redis  # type: ignore
+
+        client = redis.from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            decode_responses=True,
+        )
+        client.ping()
+    except Exception as e:
+        logger.warning(f"Progress bus: Redis unavailable ({e}), staying in-process")
+        return None
+    logger.info("Progress bus bridged to Redis stream %s", PROGRESS_STREAM)
+    return RedisStreamBridge(bus, client)
@@ -36,6 +36,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+from collections.abc import Callable
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import NamedTuple
@@ -57,6 +58,12 @@ FALLBACK_MFCC_N = 20  # MFCCs when CLAP unavailable
 # ── Data types ────────────────────────────────────────────────────────────────
 
 
+# Change listener: (event, entries, vectors). event is "add", "remove",
+# "reset" (build/load) or "save"; vectors is the float32 [n, dim] block for
+# "add", otherwise None.
+IndexListener = Callable[[str, "list[IndexEntry]", "np.ndarray | None"], None]
+
+
 class SearchResult(NamedTuple):
     """A single search result from the FAISS index."""
 
@@ -205,6 +212,25 @@ def _normalize(v: np.ndarray) -> np.ndarray:
 # ── FAISS index ───────────────────────────────────────────────────────────────
 
 
+class _EntryLookup:
+    """id / path / filename → entry maps, rebuilt when the entry list changes."""
+
+    def __init__(self, entries: list[IndexEntry]) -> None:
+        self.entries = entries
+        self.size = len(entries)
+        self.by_id = {e.index_id: e for e in entries}
+        self.by_path = {e.path: e.index_id for e in entries}
+        self.by_filename: dict[str, int] = {}
+        for e in entries:
+            self.by_filename.setdefault(e.filename, e.index_id)
+
+    def add(self, entry: IndexEntry) -> None:
+        self.size += 1
+        self.by_id[entry.index_id] = entry
+        self.by_path[entry.path] = entry.index_id
+        self.by_filename.setdefault(entry.filename, entry.index_id)
+
+
 class FAISSIndex:
     """
     Persistent FAISS index for semantic sample search.
@@ -212,11 +238,21 @@ class FAISSIndex:
     Supports:
     - build(paths): compute embeddings and populate index
     - add(path): add a single sample (incremental)
+    - remove(paths): drop samples by path (incremental)
     - search_text(query): find similar samples by text description
     - search_audio(path): find similar samples by audio example
+    - get_entry(path) / get_vectors(ids): lookups without re-embedding
     - save() / load(): persist to disk
+
+    Listeners registered with add_listener() are told about every change
+    (and every save) so derived structures such as the neighbour graph and
+    library aggregates can update in place.
     """
 
+    # Class-level defaults keep instances created via __new__ usable
+    _listeners: tuple[IndexListener, ...] = ()
+    _lookup: _EntryLookup | None = None
+
     def __init__(
         self,
         index_dir: Path | None = None,
@@ -230,6 +266,88 @@ class FAISSIndex:
         self._index: object | None = None
         self._entries: list[IndexEntry] = []
 
+    # ── Change notification ───────────────────────────────────────────────────
+
+    def add_listener(self, listener: IndexListener) -> None:
+        """Call *listener* after every add / remove / rebuild."""
+        self._listeners = (*self._listeners, listener)
+
+    def remove_listener(self, listener: IndexListener) -> None:
+        self._listeners = tuple(fn for fn in self._listeners if fn is not listener)
+
+    def _notify(
+        self, event: str, entries: list[IndexEntry], vectors: np.ndarray | None
+    ) -> None:
+        if event in ("remove", "reset"):
+            self._lookup = None
+        for listener in self._listeners:
+            try:
+                listener(event, entries, vectors)
+            except Exception as exc:
+                logger.warning("FAISS index listener failed: %s", exc)
+
+    # ── Lookups ───────────────────────────────────────────────────────────────
+
+    def _get_lookup(self) -> _EntryLookup:
+        lookup = self._lookup
+        if (
+            lookup is None
+            or lookup.entries is not self._entries
+            or lookup.size != len(self._entries)
+        ):
+            lookup = _EntryLookup(self._entries)
+            self._lookup = lookup
+        return lookup
+
+    def get_entry(self, key: str | int) -> IndexEntry | None:
+        """Find an entry by index_id, path or filename in O(1)."""
+        lookup = self._get_lookup()
+        if isinstance(key, int):
+            return lookup.by_id.get(key)
+        entry_id = lookup.by_path.get(key)
+        if entry_id is None:
+            entry_id = lookup.by_filename.get(key)
+        return lookup.by_id.get(entry_id) if entry_id is not None else None
+
+    def get_vectors(
+        self, ids: list[int] | np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Reconstruct stored vectors instead of re-embedding audio.
+
+        Args:
+            ids: index_ids to fetch (all vectors when None).
+
+        Returns:
+            (ids, vectors) — int64 [n] and float32 [n, EMBEDDING_DIM], in
+            storage order when *ids* is None, otherwise in the requested order.
+        """
+        empty = (
+            np.empty(0, dtype=np.int64),
+            np.empty((0, EMBEDDING_DIM), dtype=np.float32),
+        )
+        if self._index is None or not self._entries:
+            return empty
+
+        inner = getattr(self._index, "index", self._index)
+        all_vectors = inner.reconstruct_n(0, inner.ntotal)  # type: ignore[union-attr]
+        if len(all_vectors) == len(self._entries):
+            # Flat storage keeps insertion order, which _entries mirrors
+            all_ids = np.array([e.index_id for e in self._entries], dtype=np.int64)
+        else:
+            import faiss
+
+            all_ids = faiss.vector_to_array(self._index.id_map).astype(np.int64)  # type: ignore[union-attr]
+
+        if ids is None:
+            return all_ids, all_vectors.astype(np.float32, copy=False)
+
+        wanted = np.asarray(ids, dtype=np.int64)
+        position = {int(i): p for p, i in enumerate(all_ids)}
+        rows = [position[int(i)] for i in wanted if int(i) in position]
+        found = np.array([i for i in wanted if int(i) in position], dtype=np.int64)
+        return found, all_vectors[rows].astype(np.float32, copy=False)
+
     # ── Index management ──────────────────────────────────────────────────────
 
     def _get_or_create_index(self) -> object:
@@ -305,6 +423,7 @@ class FAISSIndex:
                 EMBEDDING_DIM,
             )
 
+        self._notify("reset", list(self._entries), None)
         return self
 
     def add(
@@ -320,7 +439,7 @@ class FAISSIndex:
         """
 
         index = self._get_or_create_index()
-        index_id = len(self._entries)
+        index_id = self._entries[-1].index_id + 1 if self._entries else 0
         emb = self._embedder.embed_audio(audio_path)
         meta = metadata or {}
 
@@ -335,13 +454,35 @@ class FAISSIndex:
             genre_labels=meta.get("genre_labels", []),
             mood_labels=meta.get("mood_labels", []),
         )
+        lookup = self._lookup
         self._entries.append(entry)
+        if lookup is not None and lookup.entries is self._entries:
+            lookup.add(entry)
 
         vec = emb.reshape(1, -1).astype(np.float32)
         ids = np.array([index_id], dtype=np.int64)
         index.add_with_ids(vec, ids)  # type: ignore[union-attr]
+        self._notify("add", [entry], vec)
         return index_id
 
+    def remove(self, paths: list[str]) -> int:
+        """
+        Remove samples by path.
+
+        Returns:
+            Number of entries removed.
+        """
+        lookup = self._get_lookup()
+        ids = {lookup.by_path[p] for p in paths if p in lookup.by_path}
+        if not ids or self._index is None:
+            return 0
+
+        self._index.remove_ids(np.array(sorted(ids), dtype=np.int64))  # type: ignore[union-attr]
+        removed = [e for e in self._entries if e.index_id in ids]
+        self._entries = [e for e in self._entries if e.index_id not in ids]
+        self._notify("remove", removed, None)
+        return len(removed)
+
     # ── Search ────────────────────────────────────────────────────────────────
 
     def search_text(self, query: str, top_k: int = 20) -> list[SearchResult]:
@@ -368,11 +509,12 @@ class FAISSIndex:
         k = min(top_k, len(self._entries))
 
         scores, ids = self._index.search(vec, k)  # type: ignore[union-attr]
+        by_id = self._get_lookup().by_id
         results = []
         for score, idx in zip(scores[0], ids[0], strict=False):
-            if idx < 0 or idx >= len(self._entries):
+            entry = by_id.get(int(idx))
+            if entry is None:
                 continue
-            entry = self._entries[idx]
             results.append(
                 SearchResult(
                     index_id=entry.index_id,
@@ -408,6 +550,7 @@ class FAISSIndex:
                 self._index_path,
                 len(self._entries),
             )
+            self._notify("save", [], None)
         except Exception as exc:
             logger.error("Failed to save FAISS index: %s", exc)
 
@@ -427,6 +570,7 @@ class FAISSIndex:
             meta = json.loads(self._meta_path.read_text())
             self._entries = [IndexEntry(**e) for e in meta]
             logger.info("✓ FAISS index loaded: %d entries", len(self._entries))
+            self._notify("reset", list(self._entries), None)
             return True
         except Exception as exc:
             logger.error("Failed to load FAISS index: %s", exc)
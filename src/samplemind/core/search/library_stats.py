@@ -0,0 +1,255 @@
+"""
+Library Aggregates — materialized metadata statistics for the FAISS index
+
+Analytics, trends and autopack routes used to walk every IndexEntry on each
+request.  LibraryAggregates keeps the numbers they need up to date instead:
+
+  - counts per key, genre, mood, energy and BPM range
+  - exact BPM value counts (any histogram binning, min/max/mean)
+  - per-bucket sample id sets for filtering without a scan
+  - updated from FAISSIndex add/remove events, rebuilt on index reset
+  - persisted as aggregates.json next to index.bin and reused on startup
+    when it matches the loaded index
+
+Usage::
+
+    from samplemind.core.search.library_stats import get_library_stats
+
+    stats = get_library_stats()
+    stats.total, stats.counts("genre").most_common(5)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from .faiss_index import FAISSIndex, IndexEntry, get_index
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES_FILE = "aggregates.json"
+FORMAT_VERSION = 1
+
+DIMENSIONS = ("key", "genre", "mood", "energy", "bpm_range")
+
+# (upper bound exclusive, label) — shared by trends and gap analysis
+BPM_RANGES: tuple[tuple[float, str], ...] = (
+    (80, "60-80"),
+    (100, "80-100"),
+    (120, "100-120"),
+    (140, "120-140"),
+    (160, "140-160"),
+    (float("inf"), "160+"),
+)
+
+
+def bpm_range(bpm: float) -> str:
+    """Coarse BPM bucket label for *bpm*."""
+    for upper, label in BPM_RANGES:
+        if bpm < upper:
+            return label
+    return BPM_RANGES[-1][1]
+
+
+def _entry_values(entry: IndexEntry) -> dict[str, list[str]]:
+    """Bucket values one entry contributes to, per dimension."""
+    return {
+        "key": [entry.key] if entry.key else [],
+        "genre": list(dict.fromkeys(entry.genre_labels or [])),
+        "mood": list(dict.fromkeys(entry.mood_labels or [])),
+        # "" records samples without an energy label
+        "energy": [entry.energy or ""],
+        "bpm_range": [bpm_range(entry.bpm)] if entry.bpm else [],
+    }
+
+
+class LibraryAggregates:
+    """
+    Incrementally maintained counts and bucket membership for an index.
+
+    Reads return copies, so callers can mutate results freely.  All
+    methods are thread-safe.
+    """
+
+    def __init__(self, index: FAISSIndex, path: Path | None = None) -> None:
+        self.index = index
+        self.path = path or Path(index._dir) / AGGREGATES_FILE
+        self._lock = threading.RLock()
+        self._reset_state()
+        if not self._load():
+            self._rebuild(index._entries)
+        index.add_listener(self._on_index_change)
+
+    def close(self) -> None:
+        self.index.remove_listener(self._on_index_change)
+
+    def _reset_state(self) -> None:
+        self.total = 0
+        self._last_id = -1
+        self._bpm_values: Counter[float] = Counter()
+        self._counts: dict[str, Counter[str]] = {d: Counter() for d in DIMENSIONS}
+        self._members: dict[str, dict[str, set[int]]] = {d: {} for d in DIMENSIONS}
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    def counts(self, dimension: str) -> Counter[str]:
+        """Sample counts per value of *dimension* (see DIMENSIONS)."""
+        with self._lock:
+            return Counter(self._counts[dimension])
+
+    def samples_in(self, dimension: str, value: str) -> set[int]:
+        """index_ids of samples whose *dimension* includes *value*."""
+        with self._lock:
+            return set(self._members[dimension].get(value, ()))
+
+    def bpm_histogram(
+        self, bins: int = 20, low: float = 30, high: float = 250
+    ) -> tuple[np.ndarray, np.ndarray, int]:
+        """(counts, edges, samples in range) for BPMs within [low, high]."""
+        with self._lock:
+            items = [(b, n) for b, n in self._bpm_values.items() if low <= b <= high]
+        values = np.array([b for b, _ in items], dtype=float)
+        weights = np.array([n for _, n in items], dtype=float)
+        counts, edges = np.histogram(
+            values, bins=bins, range=(low, high), weights=weights
+        )
+        return counts.astype(int), edges, int(weights.sum())
+
+    def bpm_summary(self) -> dict[str, float | None]:
+        with self._lock:
+            if not self._bpm_values:
+                return {"min": None, "max": None, "avg": None}
+            n = sum(self._bpm_values.values())
+            total = sum(b * c for b, c in self._bpm_values.items())
+            return {
+                "min": min(self._bpm_values),
+                "max": max(self._bpm_values),
+                "avg": round(total / n, 1),
+            }
+
+    # ── Maintenance ───────────────────────────────────────────────────────────
+
+    def _apply(self, entry: IndexEntry, sign: int) -> None:
+        self.total += sign
+        if entry.bpm:
+            self._bpm_values[entry.bpm] += sign
+            if self._bpm_values[entry.bpm] <= 0:
+                del self._bpm_values[entry.bpm]
+        for dimension, values in _entry_values(entry).items():
+            counts = self._counts[dimension]
+            members = self._members[dimension]
+            for value in values:
+                counts[value] += sign
+                if sign > 0:
+                    members.setdefault(value, set()).add(entry.index_id)
+                    continue
+                bucket = members.get(value)
+                if bucket is not None:
+                    bucket.discard(entry.index_id)
+                    if not bucket:
+                        del members[value]
+                if counts[value] <= 0:
+                    del counts[value]
+
+    def _rebuild(self, entries: list[IndexEntry]) -> None:
+        with self._lock:
+            self._reset_state()
+            for entry in entries:
+                self._apply(entry, +1)
+            self._last_id = entries[-1].index_id if entries else -1
+
+    def _on_index_change(
+        self, event: str, entries: list[IndexEntry], vectors: np.ndarray | None
+    ) -> None:
+        with self._lock:
+            if event == "add":
+                for entry in entries:
+                    self._apply(entry, +1)
+                    self._last_id = max(self._last_id, entry.index_id)
+            elif event == "remove":
+                for entry in entries:
+                    self._apply(entry, -1)
+            elif event == "reset":
+                self._rebuild(entries)
+            elif event == "save":
+                self.save()
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+
+    def _fingerprint(self) -> dict[str, int]:
+        entries = self.index._entries
+        return {
+            "size": len(entries),
+            "last_id": entries[-1].index_id if entries else -1,
+        }
+
+    def save(self) -> None:
+        """Write aggregates next to the index (atomic replace)."""
+        with self._lock:
+            payload = {
+                "version": FORMAT_VERSION,
+                "fingerprint": {"size": self.total, "last_id": self._last_id},
+                "bpm_values": [[b, n] for b, n in self._bpm_values.items()],
+                "counts": {d: dict(c) for d, c in self._counts.items()},
+                "members": {
+                    d: {v: sorted(ids) for v, ids in m.items()}
+                    for d, m in self._members.items()
+                },
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload))
+            tmp.replace(self.path)
+        except OSError as exc:
+            logger.warning("Failed to save library aggregates: %s", exc)
+
+    def _load(self) -> bool:
+        """Adopt the persisted aggregates if they describe the current index."""
+        try:
+            payload = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return False
+        if (
+            payload.get("version") != FORMAT_VERSION
+            or payload.get("fingerprint") != self._fingerprint()
+        ):
+            logger.info("Library aggregates out of date — rebuilding")
+            return False
+
+        with self._lock:
+            self._reset_state()
+            self.total = payload["fingerprint"]["size"]
+            self._last_id = payload["fingerprint"]["last_id"]
+            self._bpm_values = Counter({float(b): n for b, n in payload["bpm_values"]})
+            for dimension in DIMENSIONS:
+                self._counts[dimension] = Counter(payload["counts"].get(dimension, {}))
+                self._members[dimension] = {
+                    value: set(ids)
+                    for value, ids in payload["members"].get(dimension, {}).items()
+                }
+        return True
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+
+_stats: LibraryAggregates | None = None
+_stats_lock = threading.Lock()
+
+
+def get_library_stats(index: FAISSIndex | None = None) -> LibraryAggregates:
+    """Return the shared LibraryAggregates for *index* (default: get_index())."""
+    global _stats
+    index = index or get_index(auto_load=True)
+    with _stats_lock:
+        if _stats is None or _stats.index is not index:
+            if _stats is not None:
+                _stats.close()
+            _stats = LibraryAggregates(index)
+        return _stats
@@ -0,0 +1,280 @@
+"""
+Neighbour Graph — cached k-nearest-neighbour graph over the FAISS index
+
+Serves the sonic map and cluster endpoints without re-embedding audio or
+scanning the entry list:
+
+  - vectors are reconstructed from the FAISS index once and kept as a
+    normalized matrix (row per index_id)
+  - neighbour lists are computed with one batched FAISS query for all
+    requested nodes and cached per node
+  - subgraphs for the map are built with a blocked matrix product and
+    argpartition — top-k per node, no Python pair loop
+  - the graph follows FAISSIndex add/remove events: new vectors are merged
+    into cached neighbour lists, lists that referenced removed nodes are
+    dropped and recomputed on demand
+
+Usage::
+
+    from samplemind.core.search.neighbor_graph import get_neighbor_graph
+
+    graph = get_neighbor_graph()
+    edges = graph.subgraph(node_ids, k=8, min_score=0.6)
+    similar = graph.neighbors(entry.index_id, k=10)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .faiss_index import FAISSIndex, IndexEntry, get_index
+
+logger = logging.getLogger(__name__)
+
+# Rows per block when computing subset similarity (bounds peak memory)
+SUBGRAPH_BLOCK = 1024
+# Subgraph results kept per index version
+MAX_CACHED_SUBGRAPHS = 16
+
+Edge = tuple[int, int, float]
+
+
+class NeighborGraph:
+    """
+    k-NN graph over a FAISSIndex, kept in sync through index listeners.
+
+    All public methods are thread-safe.
+    """
+
+    def __init__(self, index: FAISSIndex) -> None:
+        self.index = index
+        self._lock = threading.RLock()
+        self._ids: np.ndarray | None = None
+        self._buffer: np.ndarray | None = None  # capacity >= len(self._ids)
+        self._row_of: dict[int, int] = {}
+        self._neighbors: dict[int, list[tuple[int, float]]] = {}
+        self._subgraphs: OrderedDict[tuple, list[Edge]] = OrderedDict()
+        self.version = 0
+        index.add_listener(self._on_index_change)
+
+    def close(self) -> None:
+        self.index.remove_listener(self._on_index_change)
+
+    # ── Vector matrix ─────────────────────────────────────────────────────────
+
+    @property
+    def _vectors(self) -> np.ndarray | None:
+        if self._buffer is None:
+            return None
+        return self._buffer[: len(self._ids)]
+
+    def _ensure_vectors(self) -> None:
+        if self._buffer is not None:
+            return
+        ids, vectors = self.index.get_vectors()
+        self._set_vectors(ids, _normalize_rows(vectors))
+
+    def _set_vectors(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        self._ids = ids
+        self._buffer = vectors
+        self._row_of = {int(i): row for row, i in enumerate(ids)}
+
+    def _append_vectors(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        # Grow geometrically so a stream of single adds stays amortized O(1)
+        start = len(self._ids)
+        needed = start + len(ids)
+        if needed > len(self._buffer):
+            grown = np.empty(
+                (max(needed, 2 * len(self._buffer), 64), vectors.shape[1]),
+                dtype=np.float32,
+            )
+            grown[:start] = self._buffer[:start]
+            self._buffer = grown
+        self._buffer[start:needed] = vectors
+        self._ids = np.concatenate([self._ids, ids])
+        for offset, i in enumerate(ids):
+            self._row_of[int(i)] = start + offset
+
+    def vectors_for(self, ids: list[int]) -> np.ndarray:
+        """Normalized stored vectors for *ids* (unknown ids are skipped)."""
+        with self._lock:
+            self._ensure_vectors()
+            rows = [self._row_of[i] for i in ids if i in self._row_of]
+            return self._vectors[rows]
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def neighbors(self, index_id: int, k: int = 10) -> list[tuple[int, float]]:
+        """Top-*k* (index_id, cosine) neighbours of one node, excluding itself."""
+        return self.neighbors_many([index_id], k).get(index_id, [])
+
+    def neighbors_many(
+        self, ids: list[int], k: int = 10
+    ) -> dict[int, list[tuple[int, float]]]:
+        """
+        Top-*k* neighbours for several nodes.
+
+        Cached lists are reused; the rest are fetched with a single batched
+        FAISS search using the stored vectors as queries.
+        """
+        with self._lock:
+            self._ensure_vectors()
+            missing = [
+                i
+                for i in ids
+                if i in self._row_of and len(self._neighbors.get(i, ())) < k
+            ]
+            if missing:
+                self._query(missing, k)
+            return {i: self._neighbors[i][:k] for i in ids if i in self._neighbors}
+
+    def _query(self, ids: list[int], k: int) -> None:
+        queries = self._vectors[[self._row_of[i] for i in ids]]
+        faiss_index = self.index._index
+        n_total = len(self._row_of)
+        # One extra slot because each node finds itself
+        k_search = min(k + 1, n_total)
+        scores, found = faiss_index.search(queries, k_search)  # type: ignore[union-attr]
+        for node, row_scores, row_ids in zip(ids, scores, found, strict=False):
+            self._neighbors[node] = [
+                (int(j), float(s))
+                for s, j in zip(row_scores, row_ids, strict=False)
+                if j >= 0 and j != node
+            ][:k]
+
+    def subgraph(
+        self, ids: list[int], k: int = 8, min_score: float = 0.0
+    ) -> list[Edge]:
+        """
+        Undirected top-*k* edges among *ids* with cosine >= *min_score*.
+
+        Edges are (source, target, weight) with source < target.  Results
+        are cached until the index changes.
+        """
+        key = (self.version, hash(tuple(ids)), len(ids), k, round(min_score, 4))
+        with self._lock:
+            cached = self._subgraphs.get(key)
+            if cached is not None:
+                self._subgraphs.move_to_end(key)
+                return cached
+
+            self._ensure_vectors()
+            present = np.array([i for i in ids if i in self._row_of], dtype=np.int64)
+            edges = _topk_edges(
+                present,
+                self._vectors[[self._row_of[int(i)] for i in present]],
+                k,
+                min_score,
+            )
+
+            self._subgraphs[key] = edges
+            while len(self._subgraphs) > MAX_CACHED_SUBGRAPHS:
+                self._subgraphs.popitem(last=False)
+            return edges
+
+    # ── Incremental maintenance ───────────────────────────────────────────────
+
+    def _on_index_change(
+        self, event: str, entries: list[IndexEntry], vectors: np.ndarray | None
+    ) -> None:
+        if event == "save":
+            return
+        with self._lock:
+            self.version += 1
+            self._subgraphs.clear()
+            if event == "add" and vectors is not None and self._buffer is not None:
+                self._apply_add(entries, _normalize_rows(vectors))
+            elif event == "remove" and self._buffer is not None:
+                self._apply_remove({e.index_id for e in entries})
+            else:
+                # Full rebuild (or nothing materialized yet): start over lazily
+                self._ids = self._buffer = None
+                self._row_of = {}
+                self._neighbors.clear()
+
+    def _apply_add(self, entries: list[IndexEntry], vectors: np.ndarray) -> None:
+        new_ids = np.array([e.index_id for e in entries], dtype=np.int64)
+        self._append_vectors(new_ids, vectors)
+        if not self._neighbors:
+            return
+
+        # Merge the new nodes into every cached list they now belong to
+        cached = list(self._neighbors)
+        sims = (self._vectors @ vectors.T)[[self._row_of[i] for i in cached]]
+        for node, row in zip(cached, sims, strict=False):
+            current = self._neighbors[node]
+            if not current:
+                continue
+            floor = current[-1][1]
+            additions = [
+                (int(j), float(s))
+                for j, s in zip(new_ids, row, strict=False)
+                if int(j) != node and s > floor
+            ]
+            if additions:
+                merged = sorted(current + additions, key=lambda p: -p[1])
+                self._neighbors[node] = merged[: len(current)]
+
+    def _apply_remove(self, removed: set[int]) -> None:
+        keep = ~np.isin(self._ids, np.fromiter(removed, dtype=np.int64))
+        self._set_vectors(self._ids[keep], self._vectors[keep])
+        for node in list(self._neighbors):
+            if node in removed or any(j in removed for j, _ in self._neighbors[node]):
+                # Recomputed on next request
+                del self._neighbors[node]
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _topk_edges(
+    ids: np.ndarray, vectors: np.ndarray, k: int, min_score: float
+) -> list[Edge]:
+    """Blocked top-k cosine edges within one vector set, deduplicated."""
+    n = len(ids)
+    if n < 2:
+        return []
+    k = min(k, n - 1)
+    pairs: dict[tuple[int, int], float] = {}
+    for start in range(0, n, SUBGRAPH_BLOCK):
+        block = vectors[start : start + SUBGRAPH_BLOCK]
+        sims = block @ vectors.T
+        # Exclude self-similarity
+        rows = np.arange(len(block))
+        sims[rows, start + rows] = -np.inf
+
+        top = np.argpartition(sims, -k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        local, slot = np.nonzero(top_scores >= min_score)
+        for r, c in zip(local, slot, strict=False):
+            a, b = int(ids[start + r]), int(ids[top[r, c]])
+            key = (a, b) if a < b else (b, a)
+            pairs[key] = float(top_scores[r, c])
+
+    return [(a, b, min(max(w, 0.0), 1.0)) for (a, b), w in pairs.items()]
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+
+_graph: NeighborGraph | None = None
+_graph_lock = threading.Lock()
+
+
+def get_neighbor_graph(index: FAISSIndex | None = None) -> NeighborGraph:
+    """Return the shared NeighborGraph for *index* (default: get_index())."""
+    global _graph
+    index = index or get_index(auto_load=True)
+    with _graph_lock:
+        if _graph is None or _graph.index is not index:
+            if _graph is not None:
+                _graph.close()
+            _graph = NeighborGraph(index)
+        return _graph
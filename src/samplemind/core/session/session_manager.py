@@ -8,6 +8,9 @@ Allows users to:
 - Export session reports
 - Manage session history
 - Track session analytics
+
+Sessions are stored as a snapshot plus an append-only operation log (see
+samplemind.utils.oplog); status changes, results and notes append one line.
 """
 
 import json
@@ -18,6 +21,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from samplemind.utils.oplog import DEFAULT_COMPACT_EVERY, OpLog, list_records
+
 logger = logging.getLogger(__name__)
 
 
@@ -234,16 +239,23 @@ class SessionManager:
     - Session search
     """
 
-    def __init__(self, storage_dir: str = ".samplemind/sessions") -> None:
+    def __init__(
+        self,
+        storage_dir: str = ".samplemind/sessions",
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+    ) -> None:
         """
         Initialize session manager.
 
         Args:
             storage_dir: Directory for storing sessions
+            compact_every: Logged changes before a session is re-snapshotted
         """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.compact_every = compact_every
         self.sessions: dict[str, Session] = {}
+        self._logs: dict[str, OpLog] = {}
         self.current_session: Session | None = None
         self._load_sessions()
 
@@ -340,7 +352,7 @@ class SessionManager:
 
         session.set_status(SessionStatus.ACTIVE)
         self.current_session = session
-        self._save_session(session)
+        self._record_status(session)
 
         logger.info(f"Activated session: {session.name}")
         return True
@@ -352,7 +364,7 @@ class SessionManager:
             return False
 
         session.set_status(SessionStatus.PAUSED)
-        self._save_session(session)
+        self._record_status(session)
 
         if self.current_session and self.current_session.session_id == session_id:
             self.current_session = None
@@ -366,7 +378,65 @@ class SessionManager:
             return False
 
         session.set_status(SessionStatus.ARCHIVED)
-        self._save_session(session)
+        self._record_status(session)
+        return True
+
+    def add_result(self, session_id: str, result: AnalysisResult) -> bool:
+        """
+        Add an analysis result to a session and persist it.
+
+        Args:
+            session_id: ID of session
+            result: Analysis result to add
+
+        Returns:
+            True if added
+        """
+        session = self.get_session(session_id)
+        if not session or not session.add_result(result):
+            return False
+
+        self._record(
+            session,
+            {
+                "op": "add_result",
+                "result": result.to_dict(),
+                "modified_at": session.modified_at,
+            },
+        )
+        return True
+
+    def remove_result(self, session_id: str, file_id: str) -> bool:
+        """Remove an analysis result from a session and persist it"""
+        session = self.get_session(session_id)
+        if not session or not session.remove_result(file_id):
+            return False
+
+        self._record(
+            session,
+            {
+                "op": "remove_result",
+                "file_id": file_id,
+                "modified_at": session.modified_at,
+            },
+        )
+        return True
+
+    def add_note(self, session_id: str, note: str) -> bool:
+        """Add a note to a session and persist it"""
+        session = self.get_session(session_id)
+        if not session:
+            return False
+
+        session.add_note(note)
+        self._record(
+            session,
+            {
+                "op": "note",
+                "note": session.notes[-1],
+                "modified_at": session.modified_at,
+            },
+        )
         return True
 
     def search_sessions(
@@ -460,38 +530,87 @@ class SessionManager:
             logger.error(f"Failed to import session: {e}")
             return None
 
-    def _save_session(self, session: Session) -> None:
-        """Save session to disk"""
-        file_path = self.storage_dir / f"{session.session_id}.json"
+    def _log(self, session_id: str) -> OpLog:
+        """Operation log backing a session"""
+        if session_id not in self._logs:
+            self._logs[session_id] = OpLog(
+                self.storage_dir / f"{session_id}.json", self.compact_every
+            )
+        return self._logs[session_id]
+
+    def _record(self, session: Session, op: dict) -> None:
+        """Append a change to the session's log, compacting when due"""
+        log = self._log(session.session_id)
+        try:
+            log.append(op)
+            if log.needs_compaction:
+                log.compact(session.to_dict())
+        except Exception as e:
+            logger.error(f"Failed to save session: {e}")
 
+    def _record_status(self, session: Session) -> None:
+        self._record(
+            session,
+            {
+                "op": "status",
+                "status": session.status.value,
+                "modified_at": session.modified_at,
+            },
+        )
+
+    def _save_session(self, session: Session) -> None:
+        """Write a full snapshot of the session"""
         try:
-            with open(file_path, "w") as f:
-                json.dump(session.to_dict(), f, indent=2)
+            self._log(session.session_id).compact(session.to_dict())
             logger.debug(f"Saved session {session.name}")
         except Exception as e:
             logger.error(f"Failed to save session: {e}")
 
+    @staticmethod
+    def _apply(session: Session, op: dict) -> None:
+        """Replay one logged change"""
+        kind = op.get("op")
+        if kind == "status":
+            session.status = SessionStatus(op["status"])
+        elif kind == "add_result":
+            session.add_result(AnalysisResult.from_dict(op["result"]))
+        elif kind == "remove_result":
+            session.remove_result(op["file_id"])
+        elif kind == "note":
+            session.notes.append(op["note"])
+        else:
+            logger.warning(f"Unknown session operation: {kind}")
+            return
+        session.modified_at = op.get("modified_at", session.modified_at)
+
     def _load_sessions(self) -> None:
-        """Load all sessions from disk"""
-        for json_file in self.storage_dir.glob("*.json"):
+        """Load all sessions from disk (snapshot + replayed log)"""
+        for session_id in list_records(self.storage_dir):
+            log = self._log(session_id)
             try:
-                with open(json_file) as f:
-                    data = json.load(f)
-
-                session = Session.from_dict(data)
+                state, ops = log.load()
+                if state is None:
+                    logger.warning(f"Session {session_id} has a log but no snapshot")
+                    continue
+
+                session = Session.from_dict(state)
+                for op in ops:
+                    self._apply(session, op)
                 self.sessions[session.session_id] = session
 
+                if log.needs_compaction:
+                    log.compact(session.to_dict())
+
                 logger.debug(f"Loaded session: {session.name}")
             except Exception as e:
-                logger.warning(f"Failed to load session from {json_file}: {e}")
+                logger.warning(f"Failed to load session {session_id}: {e}")
 
     def _delete_session_file(self, session_id: str) -> None:
-        """Delete session file from disk"""
-        file_path = self.storage_dir / f"{session_id}.json"
-
+        """Delete session snapshot and log from disk"""
         try:
-            file_path.unlink(missing_ok=True)
-            logger.debug(f"Deleted session file: {file_path}")
+            self._log(session_id).delete()
+            self._logs.pop(session_id, None)
+            logger.debug(f"Deleted session files for {session_id}")
         except Exception as e:
             logger.warning(f"Failed to delete session file: {e}")
 
@@ -8,11 +8,12 @@ This module provides audio similarity search capabilities using:
 """
 
 from .embedding_engine import AudioEmbedding, AudioEmbeddingEngine
-from .similarity_db import SimilarityDatabase, SimilarityResult
+from .similarity_db import IndexingStats, SimilarityDatabase, SimilarityResult
 
 __all__ = [
     "AudioEmbeddingEngine",
     "AudioEmbedding",
     "SimilarityDatabase",
     "SimilarityResult",
+    "IndexingStats",
 ]
@@ -7,11 +7,16 @@ The embeddings capture:
 - Harmonic content (chroma features)
 - Rhythmic properties (tempo, onset patterns)
 - Dynamic range and energy
+
+Batches are decoded and embedded in a process pool (librosa feature
+extraction is CPU-bound and holds the GIL).
 """
 
 import hashlib
 import logging
-from collections.abc import Callable
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -23,6 +28,9 @@ logger = logging.getLogger(__name__)
 # Embedding dimension: 128 features total
 EMBEDDING_DIM = 128
 
+# Outstanding files per worker process (bounds memory on huge libraries)
+_PENDING_PER_WORKER = 4
+
 
 @dataclass
 class AudioEmbedding:
@@ -77,6 +85,7 @@ class AudioEmbeddingEngine:
         file_path: Path,
         include_metadata: bool = True,
         use_music2vec: bool = False,
+        file_id: str | None = None,
     ) -> AudioEmbedding:
         """
         Generate embedding for a single audio file.
@@ -88,6 +97,7 @@ class AudioEmbeddingEngine:
                            instead of the default 128-dim feature vector.
                            Requires ``samplemind.ai.embeddings.music_embedder``
                            to be available.
+            file_id: Content hash if already known (skips re-hashing)
 
         Returns:
             AudioEmbedding containing the embedding vector and metadata
@@ -103,9 +113,9 @@ class AudioEmbeddingEngine:
             raise FileNotFoundError(f"Audio file not found: {file_path}")
 
         # Generate file ID from content hash
-        file_id = self._compute_file_hash(file_path)
+        file_id = file_id or self._compute_file_hash(file_path)
 
-        logger.info(f"Generating embedding for: {file_path.name}")
+        logger.debug(f"Generating embedding for: {file_path.name}")
 
         # Load audio
         y, sr = librosa.load(file_path, sr=self.sample_rate, mono=True)
@@ -288,6 +298,7 @@ class AudioEmbeddingEngine:
         self,
         file_paths: list[Path],
         progress_callback: Callable[[int, int, str], None] | None = None,
+        max_workers: int | None = None,
     ) -> list[AudioEmbedding]:
         """
         Generate embeddings for multiple audio files.
@@ -295,25 +306,85 @@ class AudioEmbeddingEngine:
         Args:
             file_paths: List of audio file paths
             progress_callback: Optional callback(current, total, filename)
+            max_workers: Worker processes (default: CPU count; 1 = in-process)
 
         Returns:
-            List of AudioEmbedding objects
+            List of AudioEmbedding objects, in input order (failures skipped)
         """
-        embeddings = []
+        results: dict[int, AudioEmbedding] = {}
         total = len(file_paths)
 
-        for i, file_path in enumerate(file_paths):
+        for done, (index, embedding, error) in enumerate(
+            self.iter_embeddings(file_paths, max_workers=max_workers), start=1
+        ):
+            file_path = file_paths[index]
             if progress_callback:
-                progress_callback(i + 1, total, file_path.name)
+                progress_callback(done, total, Path(file_path).name)
+            if embedding is None:
+                logger.warning(f"Failed to generate embedding for {file_path}: {error}")
+            else:
+                results[index] = embedding
 
-            try:
-                embedding = self.generate_embedding(file_path)
-                embeddings.append(embedding)
-            except Exception as e:
-                logger.warning(f"Failed to generate embedding for {file_path}: {e}")
-                continue
+        return [results[i] for i in sorted(results)]
 
-        return embeddings
+    def iter_embeddings(
+        self,
+        file_paths: list[Path],
+        file_ids: list[str | None] | None = None,
+        max_workers: int | None = None,
+    ) -> Iterator[tuple[int, AudioEmbedding | None, str | None]]:
+        """
+        Embed *file_paths* in a process pool, yielding in completion order.
+
+        Yields ``(index, embedding, None)`` on success and
+        ``(index, None, error)`` on failure, where *index* points into
+        *file_paths*.
+        """
+        file_ids = file_ids or [None] * len(file_paths)
+        workers = max_workers or os.cpu_count() or 1
+
+        if workers <= 1 or len(file_paths) <= 1:
+            for index, (file_path, file_id) in enumerate(
+                zip(file_paths, file_ids, strict=True)
+            ):
+                try:
+                    yield index, self.generate_embedding(
+                        file_path, file_id=file_id
+                    ), None
+                except Exception as e:
+                    yield index, None, str(e)
+            return
+
+        jobs = enumerate(zip(file_paths, file_ids, strict=True))
+        running: dict[Future, int] = {}
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.sample_rate, self.n_mfcc, self.n_chroma),
+        ) as pool:
+            try:
+                while True:
+                    while len(running) < workers * _PENDING_PER_WORKER:
+                        job = next(jobs, None)
+                        if job is None:
+                            break
+                        index, (file_path, file_id) = job
+                        running[pool.submit(_embed_in_worker, file_path, file_id)] = (
+                            index
+                        )
+                    if not running:
+                        break
+                    finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        index = running.pop(future)
+                        try:
+                            yield index, future.result(), None
+                        except Exception as e:
+                            yield index, None, str(e)
+            finally:
+                # Consumer stopped early (or was interrupted): drop queued work
+                for future in running:
+                    future.cancel()
 
     def compute_similarity(
         self,
@@ -394,3 +465,19 @@ class AudioEmbeddingEngine:
             embedding=embedding_vector.astype(np.float32),
             metadata=metadata,
         )
+
+
+# ── Process-pool workers ──────────────────────────────────────────────────────
+
+_worker_engine: AudioEmbeddingEngine | None = None
+
+
+def _init_worker(sample_rate: int, n_mfcc: int, n_chroma: int) -> None:
+    global _worker_engine
+    _worker_engine = AudioEmbeddingEngine(
+        sample_rate=sample_rate, n_mfcc=n_mfcc, n_chroma=n_chroma
+    )
+
+
+def _embed_in_worker(file_path: Path, file_id: str | None) -> AudioEmbedding:
+    return _worker_engine.generate_embedding(file_path, file_id=file_id)
@@ -3,11 +3,22 @@ Similarity Database using ChromaDB
 
 Provides persistent storage and querying of audio embeddings for similarity search.
 Supports filtering by metadata (tempo, key, genre) and batch operations.
+
+Library indexing is a pipeline: a directory scan, content hashing in a
+thread pool (files already in the collection are skipped), decoding and
+embedding in a process pool, and batched Chroma writes.  Progress is
+checkpointed after every write so an interrupted run resumes where it
+stopped.
 """
 
+import hashlib
+import json
 import logging
-from collections.abc import Callable
-from dataclasses import dataclass
+import os
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
@@ -20,6 +31,12 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_COLLECTION_NAME = "samplemind_audio_embeddings"
 DEFAULT_PERSIST_DIR = "./data/similarity"
+DEFAULT_EXTENSIONS = [".wav", ".mp3", ".flac", ".aiff", ".m4a", ".ogg"]
+
+INDEX_BATCH_SIZE = 256  # embeddings per Chroma write (and checkpoint)
+ID_LOOKUP_CHUNK = 1000  # ids per "already indexed?" query
+CHECKPOINT_DIR = "index_checkpoints"
+THROUGHPUT_LOG_INTERVAL = 10.0  # seconds
 
 
 @dataclass
@@ -37,6 +54,97 @@ class SimilarityResult:
         return self.similarity * 100
 
 
+@dataclass
+class IndexingStats:
+    """Outcome of an index_library run"""
+
+    files_found: int = 0
+    indexed: int = 0
+    skipped: int = 0  # already indexed (same content) or done before resume
+    failed: int = 0
+    resumed: bool = False
+    elapsed_seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        processed = self.indexed + self.failed
+        return processed / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "files_per_second": round(self.files_per_second, 2)}
+
+
+class _IndexCheckpoint:
+    """
+    Per-folder record of files already handled by an index run.
+
+    Entries are keyed by path and validated against (size, mtime_ns) so a
+    file changed since the interruption is processed again.  Written
+    atomically after each Chroma batch, removed when the run completes.
+    """
+
+    def __init__(self, path: Path, folder: Path) -> None:
+        self.path = path
+        self.folder = str(folder)
+        self.entries: dict[str, list[int]] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                if data.get("folder") == self.folder:
+                    self.entries = data.get("files", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable index checkpoint {path}: {e}")
+
+    @staticmethod
+    def _signature(file_path: Path) -> list[int]:
+        st = file_path.stat()
+        return [st.st_size, st.st_mtime_ns]
+
+    def is_done(self, file_path: Path) -> bool:
+        entry = self.entries.get(str(file_path))
+        if entry is None:
+            return False
+        try:
+            return entry == self._signature(file_path)
+        except OSError:
+            return False
+
+    def mark_done(self, file_paths: list[Path]) -> None:
+        for file_path in file_paths:
+            try:
+                self.entries[str(file_path)] = self._signature(file_path)
+            except OSError:
+                pass
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"folder": self.folder, "files": self.entries}))
+        os.replace(tmp, self.path)
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _scan_audio_files(
+    folder: Path, extensions: set[str], recursive: bool
+) -> Iterator[Path]:
+    """os.scandir walk (much cheaper than Path.rglob on large trees)."""
+    stack = [folder]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(Path(entry.path))
+                    elif os.path.splitext(entry.name)[1].lower() in extensions:
+                        yield Path(entry.path)
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {e}")
+
+
 class SimilarityDatabase:
     """
     ChromaDB-backed similarity search database for audio samples.
@@ -63,6 +171,7 @@ class SimilarityDatabase:
         self.persist_directory = persist_directory or DEFAULT_PERSIST_DIR
         self.collection_name = collection_name
         self.embedding_engine = AudioEmbeddingEngine()
+        self.last_index_stats: IndexingStats | None = None
 
         # Initialize ChromaDB
         self._init_chromadb()
@@ -156,6 +265,9 @@ class SimilarityDatabase:
         extensions: list[str] = None,
         recursive: bool = True,
         progress_callback: Callable[[int, int, str], None] | None = None,
+        max_workers: int | None = None,
+        batch_size: int = INDEX_BATCH_SIZE,
+        resume: bool = True,
     ) -> int:
         """
         Index all audio files in a folder.
@@ -165,41 +277,142 @@ class SimilarityDatabase:
             extensions: File extensions to include (default: common audio formats)
             recursive: Include subdirectories
             progress_callback: Optional callback(current, total, filename)
+            max_workers: Embedding processes (default: CPU count; 1 = in-process)
+            batch_size: Embeddings per Chroma write / checkpoint
+            resume: Continue from the checkpoint of an interrupted run
 
         Returns:
-            Number of files indexed
+            Number of files indexed (details in ``self.last_index_stats``)
         """
         folder = Path(folder).expanduser().resolve()
         if not folder.is_dir():
             raise NotADirectoryError(f"Not a directory: {folder}")
 
-        extensions = extensions or [".wav", ".mp3", ".flac", ".aiff", ".m4a", ".ogg"]
-
-        # Find all audio files
-        if recursive:
-            files = [f for f in folder.rglob("*") if f.suffix.lower() in extensions]
-        else:
-            files = [f for f in folder.iterdir() if f.suffix.lower() in extensions]
+        extensions = {e.lower() for e in (extensions or DEFAULT_EXTENSIONS)}
+        start = time.perf_counter()
+        stats = IndexingStats()
+        self.last_index_stats = stats
 
+        files = sorted(_scan_audio_files(folder, extensions, recursive))
+        stats.files_found = len(files)
         if not files:
             logger.warning(f"No audio files found in {folder}")
             return 0
 
-        logger.info(f"Indexing {len(files)} files from {folder}")
+        checkpoint = _IndexCheckpoint(self._checkpoint_path(folder), folder)
+        if not resume:
+            checkpoint.entries.clear()
+        pending = [f for f in files if not checkpoint.is_done(f)]
+        stats.skipped = len(files) - len(pending)
+        stats.resumed = stats.skipped > 0
+        if stats.resumed:
+            logger.info(
+                f"Resuming index of {folder}: {stats.skipped} files already done"
+            )
+
+        # ── Skip content that is already indexed ─────────────────────────────
+        file_ids = self._hash_files(pending)
+        existing = self._existing_ids({fid for fid in file_ids if fid})
+        to_embed: list[Path] = []
+        to_embed_ids: list[str] = []
+        seen: set[str] = set()
+        already: list[Path] = []
+        for file_path, file_id in zip(pending, file_ids, strict=True):
+            if file_id is None:
+                stats.failed += 1
+            elif file_id in existing or file_id in seen:
+                already.append(file_path)
+            else:
+                seen.add(file_id)
+                to_embed.append(file_path)
+                to_embed_ids.append(file_id)
+        stats.skipped += len(already)
+        checkpoint.mark_done(already)
+
+        logger.info(
+            f"Indexing {len(to_embed)} of {len(files)} files from {folder} "
+            f"({stats.skipped} already indexed)"
+        )
+
+        # ── Embed in parallel, write in batches ──────────────────────────────
+        batch: list[Any] = []
+        batch_paths: list[Path] = []
+        done = stats.skipped + stats.failed
+        last_report = time.perf_counter()
+
+        def flush() -> None:
+            if batch:
+                self.collection.upsert(
+                    ids=[e.file_id for e in batch],
+                    embeddings=[e.to_list() for e in batch],
+                    metadatas=[self._clean_metadata(e.metadata) for e in batch],
+                )
+                stats.indexed += len(batch)
+            checkpoint.mark_done(batch_paths)
+            checkpoint.save()
+            batch.clear()
+            batch_paths.clear()
+
+        for index, embedding, error in self.embedding_engine.iter_embeddings(
+            to_embed, file_ids=to_embed_ids, max_workers=max_workers
+        ):
+            file_path = to_embed[index]
+            done += 1
+            if embedding is None:
+                logger.warning(f"Failed to index {file_path}: {error}")
+                stats.failed += 1
+            else:
+                batch.append(embedding)
+            # Failed files are checkpointed too: a resume does not retry them
+            batch_paths.append(file_path)
+            if len(batch_paths) >= batch_size:
+                flush()
 
-        indexed = 0
-        for i, file_path in enumerate(files):
             if progress_callback:
-                progress_callback(i + 1, len(files), file_path.name)
+                progress_callback(done, len(files), file_path.name)
+            now = time.perf_counter()
+            if now - last_report >= THROUGHPUT_LOG_INTERVAL:
+                last_report = now
+                rate = (stats.indexed + len(batch) + stats.failed) / (now - start)
+                logger.info(f"Indexed {done}/{len(files)} files ({rate:.1f} files/s)")
+        flush()
+        checkpoint.remove()
+
+        stats.elapsed_seconds = time.perf_counter() - start
+        logger.info(
+            f"Successfully indexed {stats.indexed}/{len(files)} files "
+            f"({stats.skipped} skipped, {stats.failed} failed) "
+            f"in {stats.elapsed_seconds:.1f}s — {stats.files_per_second:.1f} files/s"
+        )
+        return stats.indexed
 
-            try:
-                self.index_file(file_path)
-                indexed += 1
-            except Exception as e:
-                logger.warning(f"Failed to index {file_path}: {e}")
+    def _checkpoint_path(self, folder: Path) -> Path:
+        key = hashlib.sha1(f"{self.collection_name}:{folder}".encode()).hexdigest()[:16]
+        return Path(self.persist_directory) / CHECKPOINT_DIR / f"{key}.json"
+
+    def _hash_files(self, files: list[Path]) -> list[str | None]:
+        """Content ids for *files* (None where unreadable), hashed in threads."""
 
-        logger.info(f"Successfully indexed {indexed}/{len(files)} files")
-        return indexed
+        def file_id(file_path: Path) -> str | None:
+            try:
+                return self.embedding_engine._compute_file_hash(file_path)
+            except OSError as e:
+                logger.warning(f"Cannot read {file_path}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2)) as pool:
+            return list(pool.map(file_id, files))
+
+    def _existing_ids(self, ids: set[str]) -> set[str]:
+        """Subset of *ids* already stored in the collection."""
+        found: set[str] = set()
+        ordered = sorted(ids)
+        for i in range(0, len(ordered), ID_LOOKUP_CHUNK):
+            result = self.collection.get(
+                ids=ordered[i : i + ID_LOOKUP_CHUNK], include=[]
+            )
+            found.update(result["ids"])
+        return found
 
     def find_similar(
         self,
@@ -373,6 +586,11 @@ class SimilarityDatabase:
             name=self.collection_name,
             metadata={"description": "SampleMind audio sample embeddings"},
         )
+        # Checkpoints describe the old contents
+        for checkpoint in (Path(self.persist_directory) / CHECKPOINT_DIR).glob(
+            "*.json"
+        ):
+            checkpoint.unlink(missing_ok=True)
         logger.info("Cleared similarity database")
 
     @staticmethod
@@ -4,8 +4,12 @@ Celery-based asynchronous task processing
 """
 
 from .audio_tasks import (
+    analyze_audio_chunk,
     batch_process_audio_files,
+    build_batch_workflow,
+    finalize_audio_batch,
     generate_audio_embeddings,
+    get_batch_progress,
     process_audio_analysis,
 )
 from .celery_app import celery_app
@@ -14,5 +18,9 @@ __all__ = [
     "celery_app",
     "process_audio_analysis",
     "batch_process_audio_files",
+    "analyze_audio_chunk",
+    "finalize_audio_batch",
+    "build_batch_workflow",
+    "get_batch_progress",
     "generate_audio_embeddings",
 ]
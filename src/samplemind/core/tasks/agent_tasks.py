@@ -4,8 +4,9 @@ SampleMind AI — LangGraph Agent Celery Task (Phase 16)
 Wraps the full LangGraph analysis pipeline in a Celery task so it can run
 as a background job and publish step-by-step progress to Redis.
 
-Progress events are stored at Redis key:  agent_progress:{task_id}
-as a JSON list, enabling the WebSocket endpoint to stream them.
+Progress events are published on the progress bus (topic agent:{task_id})
+and stored at Redis key:  agent_progress:{task_id} as a JSON list, so the
+WebSocket endpoint can push live updates and replay history to late joiners.
 
 Usage::
 
@@ -28,6 +29,7 @@ import time
 from pathlib import Path
 from typing import Any
 
+from samplemind.core.progress import agent_topic, publish_progress
 from samplemind.core.tasks.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
@@ -60,13 +62,15 @@ def _push_progress(
     pct: int,
     message: str,
 ) -> None:
-    """Append a progress event to the Redis list and refresh TTL."""
+    """Publish a progress event and append it to the Redis list (refreshing TTL)."""
+    payload = {"stage": stage, "pct": pct, "message": message, "ts": time.time()}
+    publish_progress(
+        agent_topic(task_id), payload, final=pct >= 100 or stage == "error"
+    )
     if r is None:
         return
     key = PROGRESS_KEY_TEMPLATE.format(task_id=task_id)
-    event = json.dumps(
-        {"stage": stage, "pct": pct, "message": message, "ts": time.time()}
-    )
+    event = json.dumps(payload)
     try:
         r.rpush(key, event)
         r.expire(key, PROGRESS_TTL)
@@ -128,7 +132,7 @@ def run_analysis_agent(
         push("error", 0, f"File not found: {file_path}")
         raise FileNotFoundError(f"Audio file not found: {file_path}")
 
-    push("routing", 10, "Building LangGraph pipeline…")
+    push("routing", 10, "Building agent pipeline…")
 
     try:
         from samplemind.ai.agents.graph import build_graph
@@ -164,11 +168,13 @@ def run_analysis_agent(
 
     # Stream graph execution so we can publish intermediate progress
     final_state: dict[str, Any] = {}
+    pct = 20
     try:
         for chunk in graph.stream(initial_state):
             node_name = list(chunk.keys())[0] if chunk else "unknown"
             state_update = chunk.get(node_name, {})
-            pct = state_update.get("progress_pct", 20)
+            # Independent nodes finish out of order; keep progress monotonic
+            pct = max(pct, state_update.get("progress_pct", pct))
             stage = state_update.get("current_stage", node_name)
             msgs = state_update.get("messages", [])
             msg = msgs[-1] if msgs else f"Running {node_name}…"
@@ -3,15 +3,22 @@ Audio Processing Celery Tasks
 Background tasks for audio analysis, batch processing, and embeddings
 """
 
-import asyncio
 import logging
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, is_dataclass
 from datetime import datetime, timedelta
+from enum import Enum
 from typing import Any
 
-from celery import Task, group
+from celery import Task, chord, group
 from celery.exceptions import SoftTimeLimitExceeded
 
+from samplemind.core.progress import batch_topic, publish_progress
+
 from .celery_app import celery_app
+from .worker_state import get_ai_manager, get_audio_engine, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +43,198 @@ class CallbackTask(Task):
         logger.warning(f"Task {task_id} retrying: {exc}")
 
 
+# ---------------------------------------------------------------------------
+# Shared analysis helpers
+# ---------------------------------------------------------------------------
+
+
+def _serialize_ai_result(result: Any) -> Any:
+    """Convert a UnifiedAnalysisResult into a JSON-serializable dict."""
+    if not is_dataclass(result):
+        return result
+    data = asdict(result)
+    for key, value in data.items():
+        if isinstance(value, Enum):
+            data[key] = value.value
+    return data
+
+
+def _persist_analysis(
+    file_id: str,
+    user_id: str | None,
+    audio_features: dict[str, Any],
+    ai_analysis: Any,
+) -> str:
+    """Store the analysis record and link it to the audio file."""
+    from samplemind.core.database.repositories import (
+        AnalysisRepository,
+        AudioRepository,
+    )
+
+    analysis_id = f"analysis_{file_id}_{int(datetime.utcnow().timestamp())}"
+
+    run_async(
+        AnalysisRepository.create(
+            analysis_id=analysis_id,
+            file_id=file_id,
+            user_id=user_id,
+            audio_features=audio_features,
+            ai_analysis=ai_analysis,
+            analyzed_at=datetime.utcnow(),
+        )
+    )
+    run_async(AudioRepository.update(file_id, analysis_id=analysis_id))
+    return analysis_id
+
+
+def _analyze_file(
+    file_id: str,
+    file_path: str,
+    user_id: str | None = None,
+    analysis_options: dict[str, Any] | None = None,
+    report: Callable[[int, str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Analyze one file with this worker's warm AudioEngine and AI manager
+
+    Args:
+        file_id: Unique file identifier
+        file_path: Path to audio file
+        user_id: User who owns the file
+        analysis_options: Optional analysis configuration
+        report: Optional ``(progress, status)`` callback
+
+    Returns:
+        Completed analysis result dictionary
+    """
+    from samplemind.integrations.ai_manager import AIProvider
+
+    report = report or (lambda progress, status: None)
+    analysis_options = analysis_options or {}
+
+    audio_engine = get_audio_engine()
+    ai_manager = get_ai_manager()
+
+    report(20, "Analyzing audio features...")
+    audio_features = audio_engine.analyze_audio(file_path).to_dict()
+
+    report(50, "Running AI analysis...")
+    provider = analysis_options.get("ai_provider")
+    analysis_result = _serialize_ai_result(
+        run_async(
+            ai_manager.analyze_music(
+                audio_features=audio_features,
+                preferred_provider=AIProvider(provider) if provider else None,
+            )
+        )
+    )
+
+    report(80, "Saving results...")
+    analysis_id = _persist_analysis(file_id, user_id, audio_features, analysis_result)
+
+    return {
+        "file_id": file_id,
+        "analysis_id": analysis_id,
+        "audio_features": audio_features,
+        "ai_analysis": analysis_result,
+        "status": "completed",
+        "completed_at": datetime.utcnow().isoformat(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Batch progress aggregation
+# ---------------------------------------------------------------------------
+
+BATCH_PROGRESS_KEY_TEMPLATE = "batch_progress:{batch_id}"
+BATCH_PROGRESS_TTL = 3600 * 24  # seconds, matches result_expires
+
+# Default number of files analysed per chunk task
+BATCH_CHUNK_SIZE = int(os.getenv("SAMPLEMIND_BATCH_CHUNK_SIZE", "8"))
+
+# In-process fallback when Redis is unavailable (eager mode / tests)
+_local_batch_progress: dict[str, dict[str, int]] = {}
+_local_batch_lock = threading.Lock()
+
+
+def _get_redis():  # type: ignore[return]
+    """Return a redis.Redis client, or None if Redis is unavailable."""
+    try:
+        import redis  # type: ignore
+
+        url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        return redis.from_url(url, decode_responses=True)
+    except Exception:  # pragma: no cover
+        return None
+
+
+def _record_batch_progress(
+    batch_id: str, total: int, processed: int = 0, failed: int = 0
+) -> dict[str, int]:
+    """Atomically add chunk counts to the batch totals and return the new totals."""
+    totals = _increment_batch_progress(batch_id, total, processed, failed)
+    publish_progress(
+        batch_topic(batch_id),
+        {
+            "batch_id": batch_id,
+            "total": totals["total"],
+            "processed": totals["processed"],
+            "failed": totals["failed"],
+            "progress": 100 * totals["processed"] / max(totals["total"], 1),
+        },
+        final=totals["processed"] >= totals["total"],
+    )
+    return totals
+
+
+def _increment_batch_progress(
+    batch_id: str, total: int, processed: int, failed: int
+) -> dict[str, int]:
+    r = _get_redis()
+    if r is not None:
+        key = BATCH_PROGRESS_KEY_TEMPLATE.format(batch_id=batch_id)
+        try:
+            pipe = r.pipeline()
+            pipe.hset(key, "total", total)
+            pipe.hincrby(key, "processed", processed)
+            pipe.hincrby(key, "failed", failed)
+            pipe.expire(key, BATCH_PROGRESS_TTL)
+            _, done, failed_total, _ = pipe.execute()
+            return {"total": total, "processed": int(done), "failed": int(failed_total)}
+        except Exception as exc:
+            logger.debug("Redis batch progress update failed: %s", exc)
+
+    with _local_batch_lock:
+        entry = _local_batch_progress.setdefault(
+            batch_id, {"total": total, "processed": 0, "failed": 0}
+        )
+        entry["total"] = total
+        entry["processed"] += processed
+        entry["failed"] += failed
+        return dict(entry)
+
+
+def get_batch_progress(batch_id: str) -> dict[str, int] | None:
+    """Return ``{"total", "processed", "failed"}`` for a batch, if known."""
+    r = _get_redis()
+    if r is not None:
+        try:
+            data = r.hgetall(BATCH_PROGRESS_KEY_TEMPLATE.format(batch_id=batch_id))
+            if data:
+                return {k: int(v) for k, v in data.items()}
+        except Exception as exc:
+            logger.debug("Redis batch progress read failed: %s", exc)
+
+    with _local_batch_lock:
+        entry = _local_batch_progress.get(batch_id)
+        return dict(entry) if entry else None
+
+
+# ---------------------------------------------------------------------------
+# Tasks
+# ---------------------------------------------------------------------------
+
+
 @celery_app.task(
     bind=True,
     base=CallbackTask,
@@ -75,90 +274,18 @@ def process_audio_analysis(
             },
         )
 
-        # Import here to avoid circular dependencies
-        from samplemind.core.engine.audio_engine import AudioEngine
-        from samplemind.integrations.ai_manager import SampleMindAIManager
-
-        # Initialize components
-        audio_engine = AudioEngine()
-        ai_manager = SampleMindAIManager()
-
-        # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "file_id": file_id,
-                "progress": 20,
-                "status": "Analyzing audio features...",
-            },
-        )
-
-        # Load and analyze audio
-        audio_data, sample_rate = audio_engine.load_audio(file_path)
-        audio_features = audio_engine.extract_features(audio_data, sample_rate)
-
-        # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "file_id": file_id,
-                "progress": 50,
-                "status": "Running AI analysis...",
-            },
-        )
-
-        # Run AI analysis
-        analysis_result = asyncio.run(
-            ai_manager.analyze_audio_with_ai(
-                audio_features=audio_features,
-                provider=(
-                    analysis_options.get("ai_provider") if analysis_options else None
-                ),
+        def report(progress: int, status: str) -> None:
+            self.update_state(
+                state="PROGRESS",
+                meta={"file_id": file_id, "progress": progress, "status": status},
             )
-        )
 
-        # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={"file_id": file_id, "progress": 80, "status": "Saving results..."},
-        )
-
-        # Save to database
-        from samplemind.core.database.repositories import (
-            AnalysisRepository,
-            AudioRepository,
-        )
-
-        # Create analysis record
-        analysis_id = f"analysis_{file_id}_{int(datetime.utcnow().timestamp())}"
-
-        asyncio.run(
-            AnalysisRepository.create(
-                analysis_id=analysis_id,
-                file_id=file_id,
-                user_id=user_id,
-                audio_features=audio_features,
-                ai_analysis=analysis_result,
-                analyzed_at=datetime.utcnow(),
-            )
+        result = _analyze_file(
+            file_id, file_path, user_id, analysis_options, report=report
         )
 
-        # Update audio file record
-        asyncio.run(AudioRepository.update(file_id, analysis_id=analysis_id))
-
-        # Cleanup
-        asyncio.run(ai_manager.close())
-
         logger.info(f"Audio analysis completed for file {file_id}")
-
-        return {
-            "file_id": file_id,
-            "analysis_id": analysis_id,
-            "audio_features": audio_features,
-            "ai_analysis": analysis_result,
-            "status": "completed",
-            "completed_at": datetime.utcnow().isoformat(),
-        }
+        return result
 
     except SoftTimeLimitExceeded:
         logger.error(f"Task {self.request.id} exceeded time limit")
@@ -179,6 +306,160 @@ def process_audio_analysis(
             }
 
 
+@celery_app.task(
+    bind=True,
+    base=CallbackTask,
+    name="samplemind.core.tasks.audio_tasks.analyze_audio_chunk",
+)
+def analyze_audio_chunk(
+    self,
+    batch_id: str,
+    file_infos: list[dict[str, Any]],
+    total_files: int,
+    batch_task_id: str | None = None,
+    user_id: str | None = None,
+    analysis_options: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Analyze one chunk of a batch sequentially on this worker's warm engine
+
+    Failures are recorded per file so a single bad file never fails the
+    whole chord.  After the chunk finishes, the aggregated batch progress
+    is published on the batch task's id for ``GET /tasks/{task_id}``.
+
+    Returns:
+        One result dict per file in the chunk
+    """
+    results = []
+    for info in file_infos:
+        try:
+            results.append(
+                _analyze_file(
+                    info["file_id"], info["file_path"], user_id, analysis_options
+                )
+            )
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"Batch {batch_id}: {info.get('file_id')} failed: {e}")
+            results.append(
+                {
+                    "file_id": info.get("file_id"),
+                    "status": "failed",
+                    "error": str(e),
+                    "failed_at": datetime.utcnow().isoformat(),
+                }
+            )
+
+    failed = sum(1 for r in results if r.get("status") != "completed")
+    totals = _record_batch_progress(
+        batch_id, total_files, processed=len(results), failed=failed
+    )
+
+    if batch_task_id:
+        self.update_state(
+            task_id=batch_task_id,
+            state="PROGRESS",
+            meta={
+                "batch_id": batch_id,
+                "total_files": total_files,
+                "processed": totals["processed"],
+                "failed": totals["failed"],
+                "progress": int(100 * totals["processed"] / max(total_files, 1)),
+                "status": f"Processed {totals['processed']}/{total_files} files",
+            },
+        )
+
+    return results
+
+
+@celery_app.task(
+    bind=True,
+    base=CallbackTask,
+    name="samplemind.core.tasks.audio_tasks.finalize_audio_batch",
+)
+def finalize_audio_batch(
+    self,
+    chunk_results: list[list[dict[str, Any]]],
+    batch_id: str,
+    total_files: int,
+) -> dict[str, Any]:
+    """
+    Chord callback: merge chunk results and record the batch outcome
+
+    Returns:
+        Batch processing results
+    """
+    results = [r for chunk in chunk_results for r in chunk]
+
+    # Count successes and failures
+    successful = sum(1 for r in results if r.get("status") == "completed")
+    failed = len(results) - successful
+    status = "completed" if failed == 0 else "partial"
+
+    # Update batch status in database
+    try:
+        from samplemind.core.database.repositories import BatchRepository
+
+        run_async(
+            BatchRepository.update_status(
+                batch_id, status=status, completed=successful, failed=failed
+            )
+        )
+    except Exception as update_error:
+        logger.error(f"Failed to update batch status: {update_error}")
+
+    logger.info(f"Batch processing completed: {successful} success, {failed} failed")
+
+    return {
+        "batch_id": batch_id,
+        "total_files": total_files,
+        "successful": successful,
+        "failed": failed,
+        "results": results,
+        "status": status,
+        "completed_at": datetime.utcnow().isoformat(),
+    }
+
+
+def build_batch_workflow(
+    batch_id: str,
+    file_infos: list[dict[str, Any]],
+    user_id: str | None = None,
+    analysis_options: dict[str, Any] | None = None,
+    chunk_size: int | None = None,
+    batch_task_id: str | None = None,
+) -> chord:
+    """
+    Build the chunked ``chord(group(chunks), finalize)`` for a batch
+
+    Args:
+        batch_id: Unique batch identifier
+        file_infos: List of ``{"file_id", "file_path"}`` dicts
+        user_id: User who owns the batch
+        analysis_options: Optional analysis configuration
+        chunk_size: Files per chunk task (default ``BATCH_CHUNK_SIZE``)
+        batch_task_id: Task id that progress updates are published under
+
+    Returns:
+        Celery chord signature (not yet applied)
+    """
+    size = max(1, chunk_size or BATCH_CHUNK_SIZE)
+    total = len(file_infos)
+    header = group(
+        analyze_audio_chunk.s(
+            batch_id=batch_id,
+            file_infos=file_infos[i : i + size],
+            total_files=total,
+            batch_task_id=batch_task_id,
+            user_id=user_id,
+            analysis_options=analysis_options,
+        )
+        for i in range(0, total, size)
+    )
+    return chord(header, finalize_audio_batch.s(batch_id=batch_id, total_files=total))
+
+
 @celery_app.task(
     bind=True,
     base=CallbackTask,
@@ -194,18 +475,27 @@ def batch_process_audio_files(
     """
     Process multiple audio files in parallel
 
+    Fans the batch out as a chord of chunk tasks and replaces itself with
+    it, so this task never blocks a worker slot waiting on subtasks.  The
+    chord callback inherits this task's id, so the batch result is still
+    available from ``AsyncResult(<this task id>)``.
+
     Args:
         batch_id: Unique batch identifier
         file_infos: List of file information dicts
         user_id: User who owns the batch
-        analysis_options: Optional analysis configuration
+        analysis_options: Optional analysis configuration (``chunk_size``
+            controls files per chunk task)
 
     Returns:
         Batch processing results
     """
-    try:
-        logger.info(f"Starting batch processing for {len(file_infos)} files")
+    logger.info(f"Starting batch processing for {len(file_infos)} files")
 
+    if not file_infos:
+        return finalize_audio_batch.run([], batch_id=batch_id, total_files=0)
+
+    try:
         self.update_state(
             state="STARTED",
             meta={
@@ -215,62 +505,24 @@ def batch_process_audio_files(
                 "status": "Starting batch processing...",
             },
         )
-
-        # Create analysis tasks for each file
-        job = group(
-            process_audio_analysis.s(
-                file_id=info["file_id"],
-                file_path=info["file_path"],
-                user_id=user_id,
-                analysis_options=analysis_options,
-            )
-            for info in file_infos
-        )
-
-        # Execute tasks in parallel
-        result = job.apply_async()
-
-        # Wait for all tasks to complete
-        results = result.get()
-
-        # Count successes and failures
-        successful = sum(1 for r in results if r.get("status") == "completed")
-        failed = len(results) - successful
-
-        # Update batch status in database
-        from samplemind.core.database.repositories import BatchRepository
-
-        asyncio.run(
-            BatchRepository.update(
-                batch_id,
-                status="completed" if failed == 0 else "partial",
-                total_files=len(file_infos),
-                processed_files=successful,
-                failed_files=failed,
-                completed_at=datetime.utcnow(),
-            )
-        )
-
-        logger.info(
-            f"Batch processing completed: {successful} success, {failed} failed"
+        _record_batch_progress(batch_id, len(file_infos))
+
+        workflow = build_batch_workflow(
+            batch_id,
+            file_infos,
+            user_id=user_id,
+            analysis_options=analysis_options,
+            chunk_size=(analysis_options or {}).get("chunk_size"),
+            batch_task_id=self.request.id,
         )
-
-        return {
-            "batch_id": batch_id,
-            "total_files": len(file_infos),
-            "successful": successful,
-            "failed": failed,
-            "results": results,
-            "status": "completed" if failed == 0 else "partial",
-            "completed_at": datetime.utcnow().isoformat(),
-        }
-
     except Exception as e:
         logger.exception(f"Error in batch processing: {e}")
 
         # Update batch status to failed
         try:
-            asyncio.run(BatchRepository.update(batch_id, status="failed", error=str(e)))
+            from samplemind.core.database.repositories import BatchRepository
+
+            run_async(BatchRepository.update_status(batch_id, status="failed"))
         except Exception as update_error:
             logger.error(f"Failed to update batch status: {update_error}")
 
@@ -281,6 +533,9 @@ def batch_process_audio_files(
             "failed_at": datetime.utcnow().isoformat(),
         }
 
+    # Raises Ignore in a worker; returns the chord result in eager mode
+    return self.replace(workflow)
+
 
 @celery_app.task(
     bind=True,
@@ -365,7 +620,7 @@ def generate_audio_embeddings(
             "duration": audio_features.get("duration"),
         }
 
-        asyncio.run(
+        run_async(
             add_embedding(
                 file_id=file_id, embedding=embedding.tolist(), metadata=metadata
             )
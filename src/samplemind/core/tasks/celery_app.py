@@ -58,6 +58,10 @@ celery_app.conf.update(
             "queue": "audio_processing",
             "routing_key": "audio.process",
         },
+        "samplemind.core.tasks.audio_tasks.analyze_audio_chunk": {
+            "queue": "audio_processing",
+            "routing_key": "audio.process",
+        },
         "samplemind.core.tasks.audio_tasks.generate_audio_embeddings": {
             "queue": "embeddings",
             "routing_key": "embeddings.generate",
@@ -0,0 +1,122 @@
+"""
+Per-process Celery worker state
+
+Heavy components (AudioEngine, SampleMindAIManager) are built once per worker
+process on ``worker_process_init`` and reused by every task that process runs,
+instead of being constructed inside each task.  That keeps the engine's thread
+pool, neural extractor and feature cache warm across tasks.
+
+A single long-lived event loop per process is used to drive async calls from
+sync task bodies, so async provider clients are not bound to a loop that
+``asyncio.run`` has already closed.
+
+Outside a prefork worker (eager mode, tests, ``celery -P solo``) the accessors
+initialise lazily on first use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import TYPE_CHECKING, Any
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+if TYPE_CHECKING:
+    from samplemind.core.engine.audio_engine import AudioEngine
+    from samplemind.integrations.ai_manager import SampleMindAIManager
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_audio_engine: AudioEngine | None = None
+_ai_manager: SampleMindAIManager | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_audio_engine() -> AudioEngine:
+    """Return this process's shared AudioEngine, creating it on first use."""
+    global _audio_engine
+    if _audio_engine is None:
+        with _lock:
+            if _audio_engine is None:
+                from samplemind.core.engine.audio_engine import AudioEngine
+
+                _audio_engine = AudioEngine()
+    return _audio_engine
+
+
+def get_ai_manager() -> SampleMindAIManager:
+    """Return this process's shared SampleMindAIManager."""
+    global _ai_manager
+    if _ai_manager is None:
+        with _lock:
+            if _ai_manager is None:
+                from samplemind.integrations.ai_manager import SampleMindAIManager
+
+                _ai_manager = SampleMindAIManager()
+    return _ai_manager
+
+
+def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Run *coro* to completion on the worker's persistent event loop."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+def set_worker_components(
+    audio_engine: Any | None = None, ai_manager: Any | None = None
+) -> None:
+    """Inject pre-built components (used by tests and custom worker bootstraps)."""
+    global _audio_engine, _ai_manager
+    with _lock:
+        if audio_engine is not None:
+            _audio_engine = audio_engine
+        if ai_manager is not None:
+            _ai_manager = ai_manager
+
+
+def reset_worker_state() -> None:
+    """Drop all cached components without closing them (tests only)."""
+    global _audio_engine, _ai_manager, _loop
+    with _lock:
+        _audio_engine = None
+        _ai_manager = None
+        if _loop is not None and not _loop.is_closed():
+            _loop.close()
+        _loop = None
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs: Any) -> None:
+    """Warm the engine and AI manager as soon as a worker process forks."""
+    try:
+        get_audio_engine()
+        get_ai_manager()
+        logger.info("Worker process initialised with warm AudioEngine + AI manager")
+    except Exception as exc:
+        # Tasks will retry the lazy initialisation on first use
+        logger.error(f"Worker warm-up failed: {exc}")
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs: Any) -> None:
+    """Release provider connections and the engine thread pool."""
+    global _audio_engine, _ai_manager, _loop
+    try:
+        if _ai_manager is not None:
+            run_async(_ai_manager.close())
+        if _audio_engine is not None:
+            _audio_engine.executor.shutdown(wait=False)
+    except Exception as exc:
+        logger.warning(f"Worker shutdown cleanup failed: {exc}")
+    finally:
+        if _loop is not None and not _loop.is_closed():
+            _loop.close()
+        _audio_engine = None
+        _ai_manager = None
+        _loop = None
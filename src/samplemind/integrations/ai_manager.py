@@ -11,9 +11,11 @@ Provider priority (v3.0):
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass, field
 from enum import Enum
@@ -29,6 +31,13 @@ from .openai_integration import MusicAnalysisType as OpenAIMusicAnalysisType
 from .openai_integration import (
     OpenAIMusicAnalysis,
 )
+from .provider_routing import (
+    DEFAULT_EWMA_ALPHA,
+    CircuitBreaker,
+    Clock,
+    ProviderHealth,
+    TokenBucket,
+)
 
 try:
     from .google_ai_integration import (  # noqa: F401
@@ -92,6 +101,7 @@ class AIProviderConfig:
     enabled: bool = True
     priority: int = 1  # Lower number = higher priority
     max_requests_per_minute: int = 60
+    max_tokens_per_minute: int = 100_000
     cost_per_token: float = 0.0001
     features: list[str] = field(default_factory=list)
 
@@ -157,71 +167,185 @@ ANALYSIS_ROUTING = {
 }
 
 
+# Routing tunables
+ERROR_PENALTY = 4.0  # expected latency multiplier per unit of EWMA error rate
+IN_FLIGHT_PENALTY = 0.25  # multiplier per request already outstanding
+SPECIALIST_SLACK = 3.0  # keep the specialist unless it is this much slower
+DEFAULT_COMPLETION_TOKENS = 1024  # assumed response size for token budgets
+
+
 class AILoadBalancer:
-    """Intelligent load balancing across AI providers"""
+    """
+    Health-aware routing across AI providers.
 
-    def __init__(self, providers: list[AIProviderConfig]) -> None:
+    Each provider has request and token budgets (token buckets refilled per
+    minute), EWMA latency/error tracking and a circuit breaker.  Candidates
+    are ordered: explicit preference, then the ANALYSIS_ROUTING specialist
+    (unless unhealthy or much slower than the alternatives), then by
+    expected latency penalised by error rate and outstanding requests.
+    """
+
+    def __init__(
+        self,
+        providers: list[AIProviderConfig],
+        clock: Clock = time.monotonic,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
         self.providers = {p.provider: p for p in providers}
-        self.request_counts = {p.provider: 0 for p in providers}
-        self.last_request_time = {p.provider: 0 for p in providers}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.health: dict[AIProvider, ProviderHealth] = {
+            p.provider: ProviderHealth(
+                requests=TokenBucket(p.max_requests_per_minute, clock=clock),
+                tokens=TokenBucket(p.max_tokens_per_minute, clock=clock),
+                breaker=CircuitBreaker(failure_threshold, reset_timeout, clock=clock),
+                alpha=ewma_alpha,
+            )
+            for p in providers
+        }
+
+    def _admissible(self, provider: AIProvider, estimated_tokens: int) -> bool:
+        config = self.providers.get(provider)
+        if config is None or not config.enabled:
+            return False
+        health = self.health[provider]
+        return (
+            health.breaker.can_pass()
+            and health.requests.can_acquire()
+            and health.tokens.can_acquire(estimated_tokens)
+        )
+
+    def _score(self, provider: AIProvider) -> float:
+        health = self.health[provider]
+        return (
+            health.expected_latency()
+            * (1 + ERROR_PENALTY * health.error_ewma)
+            * (1 + IN_FLIGHT_PENALTY * health.in_flight)
+        )
+
+    def rank_providers(
+        self,
+        analysis_type: AnalysisType,
+        preferred_provider: AIProvider | None = None,
+        estimated_tokens: int = 0,
+    ) -> list[AIProvider]:
+        """Admissible providers for a request, best first."""
+        with self._lock:
+            ranked = sorted(
+                (p for p in self.providers if self._admissible(p, estimated_tokens)),
+                key=lambda p: (self._score(p), self.providers[p].priority),
+            )
+            if not ranked:
+                return []
+
+            specialist = ANALYSIS_ROUTING.get(analysis_type)
+            if specialist in ranked and self._score(specialist) <= (
+                SPECIALIST_SLACK * self._score(ranked[0])
+            ):
+                ranked.remove(specialist)
+                ranked.insert(0, specialist)
+
+            if preferred_provider in ranked:
+                ranked.remove(preferred_provider)
+                ranked.insert(0, preferred_provider)
+            return ranked
+
+    def acquire(self, provider: AIProvider, estimated_tokens: int = 0) -> bool:
+        """Reserve budget (and the half-open probe) for one request."""
+        with self._lock:
+            if not self._admissible(provider, estimated_tokens):
+                return False
+            health = self.health[provider]
+            if not health.breaker.allow():
+                return False
+            if not health.requests.try_acquire():
+                health.breaker.release()
+                return False
+            if not health.tokens.try_acquire(estimated_tokens):
+                health.requests.adjust(-1)
+                health.breaker.release()
+                return False
+            health.in_flight += 1
+            return True
 
     def select_provider(
         self,
         analysis_type: AnalysisType,
         preferred_provider: AIProvider | None = None,
+        estimated_tokens: int = 0,
     ) -> AIProvider:
-        """Select the best provider for a request"""
-
-        # If specific provider requested and available, use it
-        if preferred_provider and preferred_provider in self.providers:
-            if self.providers[preferred_provider].enabled:
-                logger.info(f"🎯 Using preferred provider: {preferred_provider.value}")
-                return preferred_provider
-
-        # Check intelligent routing for analysis type
-        if analysis_type in ANALYSIS_ROUTING:
-            preferred = ANALYSIS_ROUTING[analysis_type]
-            if preferred in self.providers and self.providers[preferred].enabled:
-                logger.info(
-                    f"🎯 Routing {analysis_type.value} to specialist: {preferred.value}"
-                )
-                return preferred
-
-        # Filter available providers
-        available_providers = [
-            p
-            for p in self.providers.values()
-            if p.enabled and self._check_rate_limit(p)
-        ]
-
-        if not available_providers:
-            raise RuntimeError("No AI providers available")
+        """
+        Best provider for a request, without reserving anything.
 
-        # Sort by priority, then by performance
-        available_providers.sort(
-            key=lambda p: (p.priority, -p.success_rate, p.avg_response_time)
+        Callers that go on to send the request reserve it with acquire()
+        and report it with record_result() (or record_cancelled()).
+        """
+        ranked = self.rank_providers(
+            analysis_type, preferred_provider, estimated_tokens
         )
+        if not ranked:
+            raise RuntimeError("No AI providers available")
+        provider = ranked[0]
+        if provider == preferred_provider:
+            logger.info(f"🎯 Using preferred provider: {provider.value}")
+        elif provider == ANALYSIS_ROUTING.get(analysis_type):
+            logger.info(
+                f"🎯 Routing {analysis_type.value} to specialist: {provider.value}"
+            )
+        return provider
 
-        selected = available_providers[0]
-        self._update_request_count(selected.provider)
-
-        return selected.provider
-
-    def _check_rate_limit(self, provider: AIProviderConfig) -> bool:
-        """Check if provider is within rate limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time[provider.provider]
-
-        # Reset count if more than a minute has passed
-        if time_since_last > 60:
-            self.request_counts[provider.provider] = 0
-
-        return self.request_counts[provider.provider] < provider.max_requests_per_minute
-
-    def _update_request_count(self, provider: AIProvider) -> None:
-        """Update request count for rate limiting"""
-        self.request_counts[provider] += 1
-        self.last_request_time[provider] = time.time()
+    def record_result(
+        self,
+        provider: AIProvider,
+        latency: float,
+        success: bool,
+        tokens_used: int = 0,
+        estimated_tokens: int = 0,
+    ) -> None:
+        """Feed a finished request back into latency, error and budget state."""
+        with self._lock:
+            health = self.health[provider]
+            health.in_flight = max(0, health.in_flight - 1)
+            health.observe(latency, success)
+            if success:
+                health.breaker.record_success()
+                health.tokens.adjust(tokens_used - estimated_tokens)
+            else:
+                health.breaker.record_failure()
+                health.tokens.adjust(-estimated_tokens)
+
+    def record_cancelled(self, provider: AIProvider, estimated_tokens: int = 0) -> None:
+        """Release a reservation whose request was abandoned (hedge loser)."""
+        with self._lock:
+            health = self.health[provider]
+            health.in_flight = max(0, health.in_flight - 1)
+            health.breaker.release()
+            health.tokens.adjust(-estimated_tokens)
+
+    def hedge_delay(self, provider: AIProvider) -> float:
+        """How long to wait on *provider* before hedging to another one."""
+        return self.health[provider].hedge_delay()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Routing state per provider."""
+        return {
+            provider.value: {
+                "latency_ewma_ms": (
+                    round(health.latency_ewma * 1000, 1)
+                    if health.latency_ewma is not None
+                    else None
+                ),
+                "hedge_delay_ms": round(health.hedge_delay() * 1000, 1),
+                "error_rate_ewma": round(health.error_ewma, 4),
+                "circuit": health.breaker.state.value,
+                "in_flight": health.in_flight,
+                "requests_available": round(health.requests.available, 2),
+                "tokens_available": round(health.tokens.available),
+            }
+            for provider, health in self.health.items()
+        }
 
 
 class SampleMindAIManager:
@@ -233,15 +357,28 @@ class SampleMindAIManager:
     """
 
     def __init__(self, config_path: Path | None = None) -> None:
-        self.config_path = (
+        self._init_state(
             config_path or Path.home() / ".samplemind" / "config" / "ai_config.json"
         )
+
+        # Initialize from config or environment
+        self._initialize_providers()
+
+        logger.info(
+            f"🤖 SampleMind AI Manager initialized with {len(self.providers)} providers"
+        )
+
+    def _init_state(self, config_path: Path | None) -> None:
+        self.config_path = config_path
         self.providers: dict[AIProvider, Any] = (
             {}
         )  # Will hold actual provider instances
         self.provider_configs: dict[AIProvider, AIProviderConfig] = {}
         self.load_balancer: AILoadBalancer | None = None
 
+        # Identical analyze_music calls currently running (request coalescing)
+        self._inflight: dict[str, asyncio.Task] = {}
+
         # Performance tracking
         self.global_stats = {
             "total_requests": 0,
@@ -250,14 +387,35 @@ class SampleMindAIManager:
             "avg_response_time": 0.0,
             "provider_usage": {},
             "error_count": 0,
+            "coalesced_requests": 0,
+            "hedged_requests": 0,
+            "hedge_wins": 0,
         }
 
-        # Initialize from config or environment
-        self._initialize_providers()
+    @classmethod
+    def from_providers(
+        cls,
+        providers: dict[AIProvider, Any],
+        configs: list[AIProviderConfig] | None = None,
+        **balancer_options: Any,
+    ) -> "SampleMindAIManager":
+        """
+        Build a manager around ready-made provider instances.
 
-        logger.info(
-            f"🤖 SampleMind AI Manager initialized with {len(self.providers)} providers"
-        )
+        Skips the config file and environment (nothing is persisted); used
+        to run the routing logic against local fake providers in tests.
+        """
+        manager = cls.__new__(cls)
+        manager._init_state(config_path=None)
+        manager.providers = dict(providers)
+        if configs is None:
+            configs = [
+                AIProviderConfig(provider=provider, api_key="", priority=priority)
+                for priority, provider in enumerate(providers, start=1)
+            ]
+        manager.provider_configs = {config.provider: config for config in configs}
+        manager.load_balancer = AILoadBalancer(configs, **balancer_options)
+        return manager
 
     def _initialize_providers(self) -> None:
         """Initialize AI providers from config or environment"""
@@ -436,6 +594,8 @@ class SampleMindAIManager:
 
     def _save_config(self) -> None:
         """Save current configuration to JSON file"""
+        if self.config_path is None:
+            return
         try:
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -446,6 +606,7 @@ class SampleMindAIManager:
                         "enabled": config.enabled,
                         "priority": config.priority,
                         "max_requests_per_minute": config.max_requests_per_minute,
+                        "max_tokens_per_minute": config.max_tokens_per_minute,
                         "cost_per_token": config.cost_per_token,
                         "features": config.features,
                         # Note: API keys are not saved for security
@@ -482,31 +643,106 @@ class SampleMindAIManager:
         preferred_provider: AIProvider | None = None,
         user_context: dict[str, Any] | None = None,
         enable_fallback: bool = True,
+        latency_critical: bool = False,
     ) -> UnifiedAnalysisResult:
         """
         Perform music analysis with intelligent provider selection
 
+        Identical requests issued while one is already running share its
+        result instead of calling the provider again.
+
         Args:
             audio_features: Audio features from audio engine
             analysis_type: Type of analysis to perform
             preferred_provider: Preferred AI provider (optional)
             user_context: Additional context for analysis
             enable_fallback: Whether to try backup providers on failure
+            latency_critical: Hedge to a second provider when the first one
+                is slower than its usual (≈p95) latency
 
         Returns:
             UnifiedAnalysisResult with comprehensive analysis
         """
-        from dataclasses import asdict
-
-        start_time = time.time()
-
         if not self.load_balancer:
             raise RuntimeError("No AI providers configured")
 
-        # Select provider
-        selected_provider = self.load_balancer.select_provider(
-            analysis_type, preferred_provider
+        key = self._request_key(
+            audio_features, analysis_type, preferred_provider, user_context
+        )
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.global_stats["coalesced_requests"] += 1
+            return await asyncio.shield(task)
+
+        task = loop.create_task(
+            self._analyze_music(
+                audio_features,
+                analysis_type,
+                preferred_provider,
+                user_context,
+                enable_fallback,
+                latency_critical,
+            )
+        )
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._forget_inflight(key, t))
+        # Shielded: a cancelled caller must not cancel the shared request
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _request_key(
+        audio_features: dict[str, Any],
+        analysis_type: AnalysisType,
+        preferred_provider: AIProvider | None,
+        user_context: dict[str, Any] | None,
+    ) -> str:
+        payload = json.dumps(
+            [
+                audio_features,
+                analysis_type.value,
+                preferred_provider.value if preferred_provider else None,
+                user_context,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _forget_inflight(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    @staticmethod
+    def _estimate_tokens(
+        audio_features: dict[str, Any], user_context: dict[str, Any] | None
+    ) -> int:
+        """Rough prompt + completion size (≈4 characters per token)."""
+        prompt_chars = len(json.dumps(audio_features, default=str)) + len(
+            json.dumps(user_context or {}, default=str)
+        )
+        return prompt_chars // 4 + DEFAULT_COMPLETION_TOKENS
+
+    async def _analyze_music(
+        self,
+        audio_features: dict[str, Any],
+        analysis_type: AnalysisType,
+        preferred_provider: AIProvider | None,
+        user_context: dict[str, Any] | None,
+        enable_fallback: bool,
+        latency_critical: bool,
+    ) -> UnifiedAnalysisResult:
+        from dataclasses import asdict
+
+        estimated_tokens = self._estimate_tokens(audio_features, user_context)
+        candidates = self.load_balancer.rank_providers(
+            analysis_type, preferred_provider, estimated_tokens
         )
+        if not candidates:
+            raise RuntimeError("No AI providers available")
+        selected_provider = candidates[0]
 
         # ── Redis AI response cache check (P1-009) ────────────────────────────
         _ai_cache = None
@@ -549,64 +785,198 @@ class SampleMindAIManager:
                 logger.debug(f"AI cache lookup skipped: {cache_exc}")
         # ─────────────────────────────────────────────────────────────────────
 
+        if not enable_fallback:
+            candidates = candidates[:1]
+        result = await self._route_request(
+            candidates,
+            audio_features,
+            analysis_type,
+            user_context,
+            estimated_tokens,
+            latency_critical,
+        )
+
+        # ── Store successful result in cache (P1-024) ─────────────────────────
+        if _ai_cache is not None and _cache_key and _ai_cache.is_available:
+            try:
+                result_dict = asdict(result)
+                result_dict["provider"] = result.provider.value
+                result_dict["analysis_type"] = result.analysis_type.value
+                await _ai_cache.set(_cache_key, result_dict)
+            except Exception as store_exc:
+                logger.debug(f"AI cache store skipped: {store_exc}")
+        # ─────────────────────────────────────────────────────────────────────
+
+        return result
+
+    async def _route_request(
+        self,
+        candidates: list[AIProvider],
+        audio_features: dict[str, Any],
+        analysis_type: AnalysisType,
+        user_context: dict[str, Any] | None,
+        estimated_tokens: int,
+        latency_critical: bool,
+    ) -> UnifiedAnalysisResult:
+        """Try *candidates* in order (hedging if requested) until one succeeds."""
+        remaining = list(candidates)
+        last_error: Exception | None = None
+        while remaining:
+            provider = remaining.pop(0)
+            if not self.load_balancer.acquire(provider, estimated_tokens):
+                continue
+            if last_error is not None:
+                logger.info(f"🔄 Trying fallback provider: {provider.value}")
+            try:
+                if latency_critical and remaining:
+                    return await self._hedged_call(
+                        provider,
+                        remaining,
+                        audio_features,
+                        analysis_type,
+                        user_context,
+                        estimated_tokens,
+                    )
+                # Fail over quickly while alternatives remain; the last
+                # candidate gets the full retry budget
+                return await self._call_provider(
+                    provider,
+                    audio_features,
+                    analysis_type,
+                    user_context,
+                    estimated_tokens,
+                    max_retries=1 if remaining else 3,
+                )
+            except Exception as e:
+                logger.error(f"❌ Analysis failed with {provider.value}: {e}")
+                last_error = e
+
+        if last_error is None:
+            raise RuntimeError("No AI providers available")
+        # All providers failed
+        raise RuntimeError(f"All AI providers failed. Last error: {last_error}")
+
+    async def _call_provider(
+        self,
+        provider: AIProvider,
+        audio_features: dict[str, Any],
+        analysis_type: AnalysisType,
+        user_context: dict[str, Any] | None,
+        estimated_tokens: int,
+        max_retries: int = 3,
+    ) -> UnifiedAnalysisResult:
+        """Run one request whose budget is already acquired and report its outcome."""
+        start = time.perf_counter()
         try:
-            # Perform analysis with selected provider
             result = await self._analyze_with_provider(
-                selected_provider, audio_features, analysis_type, user_context
+                provider,
+                audio_features,
+                analysis_type,
+                user_context,
+                max_retries=max_retries,
             )
-
-            # ── Store successful result in cache (P1-024) ─────────────────────
-            if _ai_cache is not None and _cache_key and _ai_cache.is_available:
-                try:
-                    result_dict = asdict(result)
-                    result_dict["provider"] = result.provider.value
-                    result_dict["analysis_type"] = result.analysis_type.value
-                    await _ai_cache.set(_cache_key, result_dict)
-                except Exception as store_exc:
-                    logger.debug(f"AI cache store skipped: {store_exc}")
-            # ─────────────────────────────────────────────────────────────────
-
-            # Update success metrics
-            self._update_provider_stats(
-                selected_provider, result.tokens_used, result.processing_time, True
+        except asyncio.CancelledError:
+            self.load_balancer.record_cancelled(provider, estimated_tokens)
+            raise
+        except Exception:
+            elapsed = time.perf_counter() - start
+            self.load_balancer.record_result(
+                provider, elapsed, False, estimated_tokens=estimated_tokens
             )
+            self._update_provider_stats(provider, 0, elapsed, False)
+            raise
+
+        self.load_balancer.record_result(
+            provider,
+            time.perf_counter() - start,
+            True,
+            result.tokens_used,
+            estimated_tokens,
+        )
+        self._update_provider_stats(
+            provider, result.tokens_used, result.processing_time, True
+        )
+        return result
 
-            return result
-
-        except Exception as e:
-            logger.error(f"❌ Analysis failed with {selected_provider.value}: {e}")
-
-            # Update failure metrics
-            self._update_provider_stats(
-                selected_provider, 0, time.time() - start_time, False
+    async def _hedged_call(
+        self,
+        primary: AIProvider,
+        remaining: list[AIProvider],
+        audio_features: dict[str, Any],
+        analysis_type: AnalysisType,
+        user_context: dict[str, Any] | None,
+        estimated_tokens: int,
+    ) -> UnifiedAnalysisResult:
+        """
+        Call *primary*; if it has not answered within its hedge delay, also
+        call the next admissible provider and return whichever succeeds
+        first.  The backup is removed from *remaining*.
+        """
+        delay = self.load_balancer.hedge_delay(primary)
+        tasks = [
+            asyncio.ensure_future(
+                self._call_provider(
+                    primary,
+                    audio_features,
+                    analysis_type,
+                    user_context,
+                    estimated_tokens,
+                    max_retries=1,
+                )
+            )
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return tasks[0].result()
+
+            backup = next(
+                (
+                    p
+                    for p in remaining
+                    if self.load_balancer.acquire(p, estimated_tokens)
+                ),
+                None,
+            )
+            if backup is None:
+                return await tasks[0]
+            remaining.remove(backup)
+            self.global_stats["hedged_requests"] += 1
+            logger.info(
+                f"⏱️ {primary.value} slower than {delay * 1000:.0f} ms — "
+                f"hedging to {backup.value}"
+            )
+            tasks.append(
+                asyncio.ensure_future(
+                    self._call_provider(
+                        backup,
+                        audio_features,
+                        analysis_type,
+                        user_context,
+                        estimated_tokens,
+                        max_retries=1,
+                    )
+                )
             )
 
-            # Try fallback if enabled
-            if enable_fallback:
-                for provider in self.providers:
-                    if provider != selected_provider:
-                        try:
-                            logger.info(
-                                f"🔄 Trying fallback provider: {provider.value}"
-                            )
-                            result = await self._analyze_with_provider(
-                                provider, audio_features, analysis_type, user_context
-                            )
-                            self._update_provider_stats(
-                                provider,
-                                result.tokens_used,
-                                result.processing_time,
-                                True,
-                            )
-                            return result
-                        except Exception as fallback_error:
-                            logger.error(
-                                f"❌ Fallback failed with {provider.value}: {fallback_error}"
-                            )
-                            continue
-
-            # All providers failed
-            raise RuntimeError(f"All AI providers failed. Last error: {e}")
+            pending = set(tasks)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self.global_stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error  # type: ignore[misc]
+        finally:
+            # The slower request is abandoned; its reservation is released
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
     async def analyze_with_audio_file(
         self,
@@ -1070,6 +1440,10 @@ class SampleMindAIManager:
                 "last_error": config.last_error,
                 "estimated_cost": config.total_tokens * config.cost_per_token,
             }
+        if self.load_balancer:
+            for provider, routing in self.load_balancer.get_stats().items():
+                if provider in status:
+                    status[provider]["routing"] = routing
         return status
 
     def get_global_stats(self) -> dict[str, Any]:
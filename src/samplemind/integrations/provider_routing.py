@@ -0,0 +1,213 @@
+"""
+SampleMind AI — provider routing primitives
+
+Building blocks used by AILoadBalancer to route requests by observed
+provider health instead of static priorities:
+
+  - TokenBucket      — continuous-refill budget (requests/min, tokens/min)
+  - CircuitBreaker   — stops sending traffic to a failing provider and
+                       lets a single probe through after a cool-down
+  - ProviderHealth   — EWMA latency / latency deviation / error rate,
+                       in-flight count and the budgets of one provider
+
+All classes take an injectable monotonic clock so they can be driven
+deterministically in tests.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+
+Clock = Callable[[], float]
+
+DEFAULT_EWMA_ALPHA = 0.2
+DEFAULT_LATENCY_S = 2.0  # assumed latency before the first observation
+MIN_HEDGE_DELAY_S = 0.05
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``capacity / period`` per second."""
+
+    def __init__(
+        self, capacity: float, period: float = 60.0, clock: Clock = time.monotonic
+    ) -> None:
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period if period > 0 else float("inf")
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def can_acquire(self, amount: float = 1.0) -> bool:
+        # Requests larger than the whole bucket are admitted when it is full
+        return self.available >= min(amount, self.capacity)
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < min(amount, self.capacity):
+                return False
+            self._tokens -= amount
+            return True
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) *amount* after the fact.
+
+        Charging may drive the bucket negative: a provider that used more
+        tokens than estimated is throttled until the debt is refilled.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+    def time_until(self, amount: float = 1.0) -> float:
+        """Seconds until *amount* could be acquired."""
+        missing = min(amount, self.capacity) - self.available
+        return max(0.0, missing / self.rate) if self.rate else float("inf")
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    CLOSED → OPEN after ``failure_threshold`` failures in a row; OPEN →
+    HALF_OPEN once ``reset_timeout`` has elapsed, admitting one probe whose
+    outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def can_pass(self) -> bool:
+        """Whether a request would be admitted (does not reserve the probe)."""
+        with self._lock:
+            state = self._current_state()
+            return state is CircuitState.CLOSED or (
+                state is CircuitState.HALF_OPEN and not self._probe_in_flight
+            )
+
+    def allow(self) -> bool:
+        """Admit a request, reserving the probe slot when half-open."""
+        with self._lock:
+            state = self._current_state()
+            if state is CircuitState.CLOSED:
+                return True
+            if state is CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if (
+                state is CircuitState.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Give back a probe slot whose request was abandoned (e.g. a hedge loser)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+@dataclass
+class ProviderHealth:
+    """Observed health and budgets of a single provider."""
+
+    requests: TokenBucket
+    tokens: TokenBucket
+    breaker: CircuitBreaker
+    alpha: float = DEFAULT_EWMA_ALPHA
+    latency_ewma: float | None = None
+    latency_dev_ewma: float = 0.0
+    error_ewma: float = 0.0
+    in_flight: int = 0
+    successes: int = 0
+    failures: int = 0
+
+    def observe(self, latency: float, success: bool) -> None:
+        if success:
+            # Failures are often fast (auth/quota errors) and would make a
+            # broken provider look attractive, so only successes feed latency
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+                self.latency_dev_ewma = latency / 2
+            else:
+                deviation = abs(latency - self.latency_ewma)
+                self.latency_dev_ewma += self.alpha * (
+                    deviation - self.latency_dev_ewma
+                )
+                self.latency_ewma += self.alpha * (latency - self.latency_ewma)
+            self.successes += 1
+        else:
+            self.failures += 1
+        self.error_ewma += self.alpha * ((0.0 if success else 1.0) - self.error_ewma)
+
+    def expected_latency(self, default: float = DEFAULT_LATENCY_S) -> float:
+        return default if self.latency_ewma is None else self.latency_ewma
+
+    def hedge_delay(self, default: float = DEFAULT_LATENCY_S) -> float:
+        """Roughly the p95 latency: mean + 2 × mean deviation (as for TCP RTO)."""
+        if self.latency_ewma is None:
+            return default
+        return max(MIN_HEDGE_DELAY_S, self.latency_ewma + 2 * self.latency_dev_ewma)
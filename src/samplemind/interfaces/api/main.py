@@ -241,6 +241,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     except Exception as e:
         logger.warning(f"Analytics initialization warning: {e}")
 
+    # Start the batch pool; the elected worker resumes orphaned jobs
+    try:
+        from .routes.batch import resume_batch_jobs
+
+        resume_batch_jobs()
+    except Exception as e:
+        logger.warning(f"Batch job recovery skipped: {e}")
+
     logger.info(f"✅ SampleMind AI Backend v{__version__} ready!")
     logger.info(f"📊 Environment: {settings.ENVIRONMENT}")
     logger.info(f"🔧 Max workers: {settings.MAX_WORKERS}")
@@ -288,6 +296,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         except Exception as e:
             logger.error(f"Error closing Tortoise ORM: {e}")
 
+    # Stop the shared batch worker pool
+    from .routes.batch import shutdown_batch_pool
+
+    shutdown_batch_pool()
+
     # Close audio engine and AI manager
     audio_engine = get_app_state("audio_engine")
     if audio_engine:
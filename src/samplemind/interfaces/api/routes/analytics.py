@@ -5,7 +5,9 @@ Plotly-based library analytics endpoints for BPM histograms, key heatmaps,
 genre breakdowns, and usage growth charts.
 
 All endpoints return Plotly-compatible JSON (plotly.graph_objs format)
-for direct rendering in the web UI or TUI.
+for direct rendering in the web UI or TUI.  Numbers come from the
+incrementally maintained library aggregates, so request cost does not
+grow with library size.
 
 Endpoints:
   GET /api/v1/analytics/bpm-histogram     — BPM distribution bar chart
@@ -27,26 +29,23 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
-def _get_samples_from_index(limit: int = 5000) -> list[dict]:
-    """Load sample metadata from FAISS index (fast, in-memory)."""
+def _get_library_stats():
+    """Aggregates for the FAISS index, or None if it cannot be loaded."""
     try:
-        from samplemind.core.search.faiss_index import get_index
+        from samplemind.core.search.library_stats import get_library_stats
 
-        idx = get_index()
-        return [
-            {
-                "filename": e.filename,
-                "bpm": e.bpm,
-                "key": e.key,
-                "energy": e.energy,
-                "genre_labels": e.genre_labels,
-                "mood_labels": e.mood_labels,
-            }
-            for e in idx._entries[:limit]
-        ]
+        return get_library_stats()
     except Exception as exc:
         logger.warning("Could not load FAISS index for analytics: %s", exc)
-        return []
+        return None
+
+
+def _energy_counts(stats) -> Counter:
+    """Energy label counts with unlabelled samples as "unknown"."""
+    counts: Counter = Counter()
+    for energy, n in stats.counts("energy").items():
+        counts[(energy or "unknown").lower()] += n
+    return counts
 
 
 @router.get("/bpm-histogram")
@@ -56,56 +55,35 @@ async def bpm_histogram(bins: int = 20) -> JSONResponse:
 
     Returns Plotly bar chart JSON with BPM buckets on x-axis and count on y-axis.
     """
-    samples = _get_samples_from_index()
-    bpms = [s["bpm"] for s in samples if s.get("bpm") and 30 <= s["bpm"] <= 250]
+    stats = _get_library_stats()
+    if stats is None:
+        return JSONResponse({"data": [], "layout": {"title": "No BPM data available"}})
 
-    if not bpms:
+    counts, edges, n_bpms = stats.bpm_histogram(bins=bins, low=30, high=250)
+    if not n_bpms:
         return JSONResponse({"data": [], "layout": {"title": "No BPM data available"}})
 
-    try:
-        import numpy as np
-
-        counts, edges = np.histogram(bpms, bins=bins, range=(30, 250))
-        bin_labels = [
-            f"{int(edges[i])}-{int(edges[i+1])}" for i in range(len(edges) - 1)
-        ]
-
-        chart = {
-            "data": [
-                {
-                    "type": "bar",
-                    "x": bin_labels,
-                    "y": counts.tolist(),
-                    "marker": {"color": "#6366f1"},
-                    "name": "Samples",
-                }
-            ],
-            "layout": {
-                "title": f"BPM Distribution ({len(bpms)} samples)",
-                "xaxis": {"title": "BPM Range"},
-                "yaxis": {"title": "Count"},
-                "bargap": 0.05,
-                "template": "plotly_dark",
-            },
-        }
-        return JSONResponse(chart)
-    except ImportError:
-        # Fallback without numpy
-        bpm_ints = [int(b // 10) * 10 for b in bpms]
-        counts_dict = Counter(bpm_ints)
-        sorted_keys = sorted(counts_dict.keys())
-        chart = {
-            "data": [
-                {
-                    "type": "bar",
-                    "x": [str(k) for k in sorted_keys],
-                    "y": [counts_dict[k] for k in sorted_keys],
-                    "marker": {"color": "#6366f1"},
-                }
-            ],
-            "layout": {"title": "BPM Distribution", "template": "plotly_dark"},
-        }
-        return JSONResponse(chart)
+    bin_labels = [f"{int(edges[i])}-{int(edges[i+1])}" for i in range(len(edges) - 1)]
+
+    chart = {
+        "data": [
+            {
+                "type": "bar",
+                "x": bin_labels,
+                "y": counts.tolist(),
+                "marker": {"color": "#6366f1"},
+                "name": "Samples",
+            }
+        ],
+        "layout": {
+            "title": f"BPM Distribution ({n_bpms} samples)",
+            "xaxis": {"title": "BPM Range"},
+            "yaxis": {"title": "Count"},
+            "bargap": 0.05,
+            "template": "plotly_dark",
+        },
+    }
+    return JSONResponse(chart)
 
 
 @router.get("/key-heatmap")
@@ -115,11 +93,8 @@ async def key_heatmap() -> JSONResponse:
 
     Returns Plotly heatmap with keys on x-axis and major/minor on y-axis.
     """
-    samples = _get_samples_from_index()
-    key_counts: Counter = Counter()
-    for s in samples:
-        if s.get("key"):
-            key_counts[s["key"]] += 1
+    stats = _get_library_stats()
+    key_counts: Counter = stats.counts("key") if stats else Counter()
 
     if not key_counts:
         return JSONResponse({"data": [], "layout": {"title": "No key data available"}})
@@ -155,11 +130,8 @@ async def genre_breakdown(top_n: int = 20) -> JSONResponse:
     """
     Top genre label distribution as a horizontal bar chart.
     """
-    samples = _get_samples_from_index()
-    genre_counter: Counter = Counter()
-    for s in samples:
-        for genre in s.get("genre_labels") or []:
-            genre_counter[genre] += 1
+    stats = _get_library_stats()
+    genre_counter: Counter = stats.counts("genre") if stats else Counter()
 
     if not genre_counter:
         return JSONResponse(
@@ -195,8 +167,8 @@ async def energy_breakdown() -> JSONResponse:
     """
     Energy level distribution as a pie chart.
     """
-    samples = _get_samples_from_index()
-    energy_counts = Counter((s.get("energy") or "unknown").lower() for s in samples)
+    stats = _get_library_stats()
+    energy_counts = _energy_counts(stats) if stats else Counter()
 
     if not energy_counts:
         return JSONResponse(
@@ -237,8 +209,8 @@ async def library_summary() -> JSONResponse:
 
     Returns key metrics without chart data for quick display in dashboards.
     """
-    samples = _get_samples_from_index()
-    n = len(samples)
+    stats = _get_library_stats()
+    n = stats.total if stats else 0
 
     if n == 0:
         return JSONResponse(
@@ -249,27 +221,17 @@ async def library_summary() -> JSONResponse:
             }
         )
 
-    bpms = [s["bpm"] for s in samples if s.get("bpm")]
-    energy_counts = Counter((s.get("energy") or "unknown").lower() for s in samples)
-    genre_counter: Counter = Counter()
-    for s in samples:
-        for g in s.get("genre_labels") or []:
-            genre_counter[g] += 1
-
+    energy_counts = _energy_counts(stats)
+    genre_counter = stats.counts("genre")
     top_genres = [g for g, _ in genre_counter.most_common(5)]
-    keys = [s["key"] for s in samples if s.get("key")]
-    key_counter = Counter(keys)
+    key_counter = stats.counts("key")
     top_keys = [k for k, _ in key_counter.most_common(5)]
 
     return JSONResponse(
         {
             "total_samples": n,
             "indexed": True,
-            "bpm": {
-                "min": min(bpms) if bpms else None,
-                "max": max(bpms) if bpms else None,
-                "avg": round(sum(bpms) / len(bpms), 1) if bpms else None,
-            },
+            "bpm": stats.bpm_summary(),
             "energy_distribution": {
                 "low": energy_counts.get("low", 0),
                 "mid": energy_counts.get("mid", 0),
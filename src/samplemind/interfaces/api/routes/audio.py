@@ -6,7 +6,10 @@ and feature extraction in the SampleMind AI platform.
 """
 
 import asyncio
+import json
 import logging
+import os
+import re
 import uuid
 from dataclasses import asdict
 from datetime import datetime
@@ -28,6 +31,11 @@ from fastapi import (
 from pydantic import BaseModel, Field
 
 from samplemind.core.engine.audio_engine import AdvancedFeatureExtractor
+from samplemind.core.loading.upload_stream import (
+    UnrecognizedAudioError,
+    UploadTooLargeError,
+    stream_upload,
+)
 from samplemind.core.processing.audio_pipeline import AudioFormat, AudioPipeline
 from samplemind.interfaces.api.config import get_settings
 from samplemind.interfaces.api.dependencies import get_app_state
@@ -50,6 +58,11 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_SHA256_RE = re.compile(r"[0-9a-f]{64}")
+
+# content hash -> in-flight analysis task (dedupes concurrent identical uploads)
+_inflight_analyses: dict[str, asyncio.Future] = {}
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helper Functions
@@ -111,42 +124,76 @@ async def upload_audio(
 
     # Generate file ID and save path
     file_id = str(uuid.uuid4())
-    file_path = settings.UPLOAD_DIR / f"{file_id}_{file.filename}"
-
-    # Read and validate file size
-    contents = await file.read()
-    file_size = len(contents)
+    file_path = settings.UPLOAD_DIR / f"{file_id}_{Path(file.filename).name}"
     max_size_mb = getattr(settings, "MAX_UPLOAD_SIZE_MB", 100)
 
-    if file_size > max_size_mb * 1024 * 1024:
+    # Stream to disk: hash, size and header probe are computed as bytes arrive
+    try:
+        upload = await stream_upload(
+            file, file_path, max_bytes=max_size_mb * 1024 * 1024, require_audio=True
+        )
+    except UploadTooLargeError:
         logger.warning(
-            f"Upload rejected: File too large ({file_size / 1024 / 1024:.2f}MB) for file {file.filename}"
+            f"Upload rejected: File too large (>{max_size_mb}MB) for file {file.filename}"
         )
         raise FileValidationError(f"File too large. Max size: {max_size_mb}MB")
+    except UnrecognizedAudioError as e:
+        logger.warning(f"Upload rejected: {e}")
+        raise FileValidationError(
+            str(e),
+            details={"allowed_formats": [f"audio/{fmt.value}" for fmt in AudioFormat]},
+        )
 
-    # Save file
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, "wb") as f:
-        f.write(contents)
-
-    # Process file in background if needed
-    if background_tasks:
+    # Analysis is keyed by content hash, so repeat uploads reuse the result
+    analysis_status = get_analysis_status(upload.sha256)
+    if background_tasks and analysis_status == "queued":
         background_tasks.add_task(
-            process_uploaded_file, file_path=file_path, file_id=file_id
+            process_uploaded_file,
+            file_path=file_path,
+            file_id=file_id,
+            content_hash=upload.sha256,
         )
 
     logger.info(
-        f"✅ Audio uploaded successfully: {file.filename} (ID: {file_id}, Size: {file_size / 1024 / 1024:.2f}MB)"
+        f"✅ Audio uploaded successfully: {file.filename} (ID: {file_id}, Size: {upload.size / 1024 / 1024:.2f}MB, analysis: {analysis_status})"
     )
 
+    probe = upload.probe
     return AudioUploadResponse(
         file_id=file_id,
         filename=file.filename,
-        file_size=file_size,
+        file_size=upload.size,
+        content_hash=upload.sha256,
+        format=probe.format if probe else None,
+        sample_rate=probe.sample_rate if probe else None,
+        channels=probe.channels if probe else None,
+        duration=probe.duration if probe else None,
+        analysis_status=analysis_status,
         message="File uploaded successfully",
     )
 
 
+@router.get(
+    "/analysis/by-hash/{content_hash}",
+    summary="Get cached analysis by content hash",
+    description="""
+           Return the analysis computed for an upload with this SHA-256
+           content hash (as returned by the upload endpoint).
+           """,
+)
+async def get_analysis_by_hash(content_hash: str) -> dict[str, Any]:
+    """Look up the analysis cached for a content hash."""
+    if not _SHA256_RE.fullmatch(content_hash):
+        raise FileValidationError("Invalid content hash")
+
+    cached = await asyncio.to_thread(get_cached_analysis, content_hash)
+    if cached is None:
+        if content_hash in _inflight_analyses:
+            return {"content_hash": content_hash, "analysis_status": "pending"}
+        raise ResourceNotFoundError("analysis", content_hash)
+    return cached
+
+
 @router.post(
     "/process/{file_id}",
     response_model=AudioProcessResponse,
@@ -285,7 +332,7 @@ async def analyze_audio(
         # 1. Audio Engine Analysis
         # Run in thread pool to avoid blocking async event loop
         features = await asyncio.to_thread(
-            audio_engine.analyze_audio, file_path, analysis_level=level_enum
+            audio_engine.analyze_audio, file_path, level=level_enum
         )
 
         # 2. Save Semantic Embedding (Phase 4.5)
@@ -376,22 +423,87 @@ async def analyze_audio(
 
 
 # Helper functions for background processing
-async def process_uploaded_file(file_path: Path, file_id: str):
-    """Background task to process an uploaded file"""
+def _hash_analysis_path(content_hash: str) -> Path:
+    return get_settings().ANALYSIS_DIR / "by_hash" / f"{content_hash}.json"
+
+
+def get_cached_analysis(content_hash: str) -> dict[str, Any] | None:
+    """Return the stored analysis for *content_hash*, if any."""
+    path = _hash_analysis_path(content_hash)
     try:
-        # Here you could add automatic processing of uploaded files
-        # For example, generate waveform images, extract metadata, etc.
-        logger.info(f"Processing uploaded file in background: {file_path}")
+        return json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def get_analysis_status(content_hash: str) -> str:
+    """``cached``, ``pending`` (analysis in flight) or ``queued`` (not started)."""
+    if _hash_analysis_path(content_hash).exists():
+        return "cached"
+    if content_hash in _inflight_analyses:
+        return "pending"
+    return "queued"
 
-        # Example: Generate a waveform preview
-        # generate_waveform_preview(file_path, file_id)
 
+async def process_uploaded_file(file_path: Path, file_id: str, content_hash: str):
+    """
+    Background task to analyse an uploaded file
+
+    Analysis runs once per unique content hash: concurrent uploads of the same
+    bytes share one in-flight analysis, and later uploads find it cached.
+    """
+    task = _inflight_analyses.get(content_hash)
+    if task is None:
+        task = asyncio.ensure_future(
+            _analyze_and_cache(file_path, file_id, content_hash)
+        )
+        _inflight_analyses[content_hash] = task
+        task.add_done_callback(lambda _: _inflight_analyses.pop(content_hash, None))
+
+    try:
+        await task
     except Exception as e:
         logger.error(
             f"Background processing failed for {file_id}: {str(e)}", exc_info=True
         )
 
 
+async def _analyze_and_cache(file_path: Path, file_id: str, content_hash: str):
+    if _hash_analysis_path(content_hash).exists():
+        return
+
+    logger.info(f"Processing uploaded file in background: {file_path}")
+    audio_engine = get_app_state("audio_engine")
+    if audio_engine is None:
+        from samplemind.core.tasks.worker_state import get_audio_engine
+
+        audio_engine = get_audio_engine()
+
+    # The upload already hashed the bytes; don't make the engine re-read them
+    features = await asyncio.to_thread(
+        audio_engine.analyze_audio, file_path, file_hash=content_hash
+    )
+    record = {
+        "content_hash": content_hash,
+        "file_id": file_id,
+        "filename": file_path.name,
+        "analyzed_at": datetime.utcnow().isoformat(),
+        "analysis_status": "cached",
+        "features": features.to_dict(),
+    }
+    await asyncio.to_thread(
+        _write_json_atomic, _hash_analysis_path(content_hash), record
+    )
+    logger.info(f"Analysis cached for {file_id} (sha256 {content_hash[:12]})")
+
+
+def _write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, default=str))
+    os.replace(tmp, path)
+
+
 def process_audio_file(
     input_path: Path, output_path: Path, steps: dict[str, Any]
 ) -> dict[str, Any]:
@@ -70,10 +70,10 @@ async def suggest_pack_themes(request: Request) -> list[PackSuggestion]:
     based on genre clusters, mood distribution, and sample density.
     """
     try:
-        from samplemind.core.search.faiss_index import get_index
+        from samplemind.core.search.library_stats import get_library_stats
 
-        idx = get_index(auto_load=True)
-        if idx.is_empty:
+        stats = get_library_stats()
+        if stats.total == 0:
             return [
                 PackSuggestion(
                     theme="Getting Started",
@@ -82,26 +82,17 @@ async def suggest_pack_themes(request: Request) -> list[PackSuggestion]:
                 )
             ]
 
-        # Analyze library composition
-        entries = idx._entries
-        genre_counts: dict[str, int] = {}
-        mood_counts: dict[str, int] = {}
-        energy_counts: dict[str, int] = {}
-
-        for e in entries:
-            for g in e.genre_labels or []:
-                genre_counts[g] = genre_counts.get(g, 0) + 1
-            for m in e.mood_labels or []:
-                mood_counts[m] = mood_counts.get(m, 0) + 1
-            if e.energy:
-                energy_counts[e.energy] = energy_counts.get(e.energy, 0) + 1
+        # Library composition from the maintained aggregates
+        genre_counts = dict(stats.counts("genre"))
+        mood_counts = dict(stats.counts("mood"))
+        energy_counts = {e: n for e, n in stats.counts("energy").items() if e}
 
         # Use AI to suggest themes
         from samplemind.integrations.litellm_router import chat_completion
 
         prompt = f"""Based on this sample library analysis, suggest 5 themed sample packs:
 
-Library size: {len(entries)} samples
+Library size: {stats.total} samples
 Top genres: {dict(sorted(genre_counts.items(), key=lambda x: x[1], reverse=True)[:10])}
 Mood distribution: {mood_counts}
 Energy distribution: {energy_counts}
@@ -148,9 +139,7 @@ Respond as a JSON array."""
 
 @router.post("/generate")
 @rate_limit("5/minute")
-async def generate_pack(
-    request: Request, body: PackGenerateRequest
-) -> GeneratedPack:
+async def generate_pack(request: Request, body: PackGenerateRequest) -> GeneratedPack:
     """
     AI curates a sample pack: selects best samples matching the theme,
     generates metadata (name, description, tags, cover art prompt).
@@ -165,14 +154,19 @@ async def generate_pack(
         # Search for samples matching the theme
         results = idx.search_text(body.theme, top_k=body.max_samples * 2)
 
-        # Filter by mood/energy if specified
-        filtered = []
-        for r in results:
-            if body.target_mood and body.target_mood not in (r.metadata.get("mood_labels") or []):
-                continue
-            if body.target_energy and r.metadata.get("energy") != body.target_energy:
-                continue
-            filtered.append(r)
+        # Filter by mood/energy if specified, using the per-bucket id sets
+        allowed: set[int] | None = None
+        if body.target_mood or body.target_energy:
+            from samplemind.core.search.library_stats import get_library_stats
+
+            stats = get_library_stats(idx)
+            if body.target_mood:
+                allowed = stats.samples_in("mood", body.target_mood)
+            if body.target_energy:
+                energy_ids = stats.samples_in("energy", body.target_energy)
+                allowed = energy_ids if allowed is None else allowed & energy_ids
+
+        filtered = [r for r in results if allowed is None or r.index_id in allowed]
 
         if not filtered:
             filtered = list(results)
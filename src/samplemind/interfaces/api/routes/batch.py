@@ -1,203 +1,257 @@
 """
 Batch Audio Analysis API
 Analyze multiple audio files in parallel with progress tracking
+
+Jobs are persisted in a durable job store (SQLite or Redis) and executed by
+one shared, long-lived worker pool that schedules files fairly across
+tenants.  Uploads are streamed to disk, results can be paged while a job is
+still running, and cancelling a job stops its queued work.
 """
 
+import logging
+import shutil
+import threading
 import uuid
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, File, HTTPException, UploadFile
+from fastapi import APIRouter, File, Header, HTTPException, Query, UploadFile
 from pydantic import BaseModel
 
-from samplemind.core.engine.audio_engine import AudioEngine
-from samplemind.integrations.ai_manager import AnalysisType, SampleMindAIManager
+from samplemind.core.batch import (
+    BatchJob,
+    BatchJobStore,
+    BatchWorkerPool,
+    UploadTooLargeError,
+    create_job_store,
+    safe_filename,
+    save_upload_to_disk,
+)
+from samplemind.core.progress import batch_topic, publish_progress
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/batch", tags=["Batch Processing"])
 
+BATCH_UPLOAD_ROOT = Path("/tmp/samplemind_batch")
+DEFAULT_TENANT = "default"
+MAX_RESULTS_PAGE = 500
+
 
 # Models
 class BatchAnalysisRequest(BaseModel):
     """Request for batch audio analysis"""
 
     analysis_type: str = "comprehensive"
-    max_workers: int = 4
-    use_cache: bool = True
 
 
 class BatchJobStatus(BaseModel):
     """Status of a batch analysis job"""
 
     job_id: str
-    status: str  # pending, processing, completed, failed
+    status: str  # pending, processing, completed, failed, cancelled
+    tenant_id: str = DEFAULT_TENANT
     total_files: int
     processed_files: int
+    failed_files: int = 0
     progress_percent: float
-    started_at: datetime
+    created_at: datetime
+    started_at: datetime | None = None
     completed_at: datetime | None = None
-    results: list[dict[str, Any]] = []
-    errors: list[dict[str, str]] = []
-
-
-# In-memory job storage (use Redis in production)
-active_jobs: dict[str, BatchJobStatus] = {}
-
-
-@dataclass
-class BatchProcessor:
-    """Process multiple audio files in parallel"""
-
-    audio_engine: AudioEngine = field(default_factory=AudioEngine)
-    ai_manager: SampleMindAIManager = field(default_factory=SampleMindAIManager)
-    max_workers: int = 4
-
-    async def process_batch(
-        self,
-        job_id: str,
-        file_paths: list[Path],
-        analysis_type: AnalysisType = AnalysisType.COMPREHENSIVE_ANALYSIS,
-    ) -> None:
-        """Process batch of audio files"""
-        job = active_jobs[job_id]
-        job.status = "processing"
-
-        try:
-            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {
-                    executor.submit(self._process_single, path): path
-                    for path in file_paths
-                }
-
-                for future in as_completed(futures):
-                    path = futures[future]
-                    try:
-                        result = future.result()
-                        job.results.append(result)
-                        job.processed_files += 1
-                        job.progress_percent = (
-                            job.processed_files / job.total_files
-                        ) * 100
-                    except Exception as e:
-                        job.errors.append({"file": str(path), "error": str(e)})
-
-            job.status = "completed"
-            job.completed_at = datetime.now()
-
-        except Exception as e:
-            job.status = "failed"
-            job.errors.append({"error": str(e)})
-
-    def _process_single(self, file_path: Path) -> dict[str, Any]:
-        """Process single audio file"""
-        features = self.audio_engine.analyze_audio(file_path)
-        return {
-            "file": str(file_path),
-            "features": features.to_dict(),
-            "analyzed_at": datetime.now().isoformat(),
-        }
-
-
-# Global processor instance
-processor = BatchProcessor()
+
+    @classmethod
+    def from_job(cls, job: BatchJob) -> "BatchJobStatus":
+        def _ts(value: float | None) -> datetime | None:
+            return datetime.fromtimestamp(value) if value else None
+
+        return cls(
+            job_id=job.job_id,
+            status=job.status.value,
+            tenant_id=job.tenant_id,
+            total_files=job.total_files,
+            processed_files=job.processed_files,
+            failed_files=job.failed_files,
+            progress_percent=job.progress_percent,
+            created_at=datetime.fromtimestamp(job.created_at),
+            started_at=_ts(job.started_at),
+            completed_at=_ts(job.completed_at),
+        )
+
+
+# Shared store + pool, created on first use so importing this module stays cheap
+_pool: BatchWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def job_progress_event(job: BatchJob) -> dict[str, Any]:
+    """Progress message sent to WebSocket clients for *job*."""
+    return {
+        "job_id": job.job_id,
+        "status": job.status.value,
+        "progress": job.progress_percent,
+        "processed": job.processed_files,
+        "total": job.total_files,
+        "errors": job.failed_files,
+    }
+
+
+def _publish_job_progress(job: BatchJob) -> None:
+    publish_progress(
+        batch_topic(job.job_id), job_progress_event(job), final=job.status.is_terminal
+    )
+
+
+def _cleanup_finished_uploads(job: BatchJob) -> None:
+    """Uploaded files are only needed until the job reaches a terminal state."""
+    if job.status.is_terminal:
+        shutil.rmtree(BATCH_UPLOAD_ROOT / job.job_id, ignore_errors=True)
+
+
+def get_batch_pool() -> BatchWorkerPool:
+    """Return the process-wide batch worker pool (and its job store)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BatchWorkerPool(create_job_store())
+                _pool.add_listener(_publish_job_progress)
+                _pool.add_listener(_cleanup_finished_uploads)
+    return _pool
+
+
+def get_job_store() -> BatchJobStore:
+    return get_batch_pool().store
+
+
+def resume_batch_jobs() -> None:
+    """
+    Start the shared pool so this API worker takes part in job recovery
+
+    Only the pool elected through the job store resumes jobs, and only those
+    whose owner stopped renewing its lease.
+    """
+    get_batch_pool().start()
+
+
+def shutdown_batch_pool() -> None:
+    """Stop the shared pool on application shutdown."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool.store.close()
+            _pool = None
+
+
+def _get_job_or_404(job_id: str) -> BatchJob:
+    job = get_job_store().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @router.post("/analyze", response_model=dict[str, str])
 async def create_batch_analysis(
     files: list[UploadFile] = File(...),
     request: BatchAnalysisRequest = BatchAnalysisRequest(),
-    background_tasks: BackgroundTasks = None,
+    x_tenant_id: str | None = Header(default=None),
 ) -> dict[str, str]:
     """
     Create batch analysis job for multiple audio files
 
+    Uploads are streamed to disk in chunks; the ``X-Tenant-ID`` header
+    selects the fair-share queue the job is scheduled in.
+
     Returns job_id for tracking progress
     """
-    # Generate job ID
     job_id = str(uuid.uuid4())
-
-    # Save uploaded files temporarily
-    temp_dir = Path("/tmp/samplemind_batch") / job_id
-    temp_dir.mkdir(parents=True, exist_ok=True)
-
-    file_paths = []
-    for file in files:
-        file_path = temp_dir / file.filename
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        file_paths.append(file_path)
-
-    # Create job status
-    job = BatchJobStatus(
+    temp_dir = BATCH_UPLOAD_ROOT / job_id
+    max_bytes = get_settings().MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+    file_paths: list[str] = []
+    try:
+        for index, upload in enumerate(files):
+            dest = temp_dir / safe_filename(upload.filename, index)
+            await save_upload_to_disk(upload, dest, max_bytes=max_bytes)
+            file_paths.append(str(dest))
+    except UploadTooLargeError as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=str(e)) from e
+
+    job = BatchJob(
         job_id=job_id,
-        status="pending",
-        total_files=len(files),
-        processed_files=0,
-        progress_percent=0.0,
-        started_at=datetime.now(),
+        total_files=len(file_paths),
+        tenant_id=x_tenant_id or DEFAULT_TENANT,
+        analysis_type=request.analysis_type,
     )
-    active_jobs[job_id] = job
-
-    # Start processing in background
-    background_tasks.add_task(
-        processor.process_batch,
-        job_id,
-        file_paths,
-        AnalysisType[request.analysis_type.upper()],
+    get_batch_pool().submit_job(job, file_paths)
+    logger.info(
+        f"Batch job {job_id} queued: {len(file_paths)} files (tenant {job.tenant_id})"
     )
 
-    return {"job_id": job_id, "status": "pending"}
+    return {"job_id": job_id, "status": job.status.value}
 
 
 @router.get("/status/{job_id}", response_model=BatchJobStatus)
 async def get_batch_status(job_id: str) -> BatchJobStatus:
     """Get status of batch analysis job"""
-    if job_id not in active_jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    return active_jobs[job_id]
+    return BatchJobStatus.from_job(_get_job_or_404(job_id))
 
 
 @router.get("/results/{job_id}")
-async def get_batch_results(job_id: str) -> dict[str, Any]:
-    """Get results of completed batch analysis"""
-    if job_id not in active_jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
+async def get_batch_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_RESULTS_PAGE),
+) -> dict[str, Any]:
+    """
+    Get a page of batch analysis results
 
-    job = active_jobs[job_id]
+    Results are available incrementally while the job is still running;
+    keep requesting with ``next_offset`` until it is ``None`` and the job
+    status is terminal.
+    """
+    job = _get_job_or_404(job_id)
+    entries = get_job_store().list_results(job_id, offset=offset, limit=limit)
 
-    if job.status != "completed":
-        raise HTTPException(
-            status_code=400, detail=f"Job not completed. Current status: {job.status}"
-        )
+    results = [e for e in entries if e["status"] == "completed"]
+    errors = [
+        {"file": e["file"], "error": e["error"]}
+        for e in entries
+        if e["status"] == "failed"
+    ]
+    next_offset = offset + len(entries)
 
     return {
         "job_id": job_id,
+        "status": job.status.value,
         "total_files": job.total_files,
-        "successful": len(job.results),
-        "failed": len(job.errors),
-        "results": job.results,
-        "errors": job.errors,
+        "successful": job.processed_files,
+        "failed": job.failed_files,
+        "offset": offset,
+        "next_offset": next_offset if next_offset < job.finished_files else None,
+        "results": results,
+        "errors": errors,
     }
 
 
 @router.delete("/jobs/{job_id}")
-async def cancel_batch_job(job_id: str) -> dict[str, str]:
-    """Cancel and delete batch analysis job"""
-    if job_id not in active_jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    # Clean up temp files
-    temp_dir = Path("/tmp/samplemind_batch") / job_id
-    if temp_dir.exists():
-        import shutil
+async def cancel_batch_job(job_id: str) -> dict[str, Any]:
+    """Cancel a batch analysis job and remove its uploaded files"""
+    job = _get_job_or_404(job_id)
 
-        shutil.rmtree(temp_dir)
+    cancelled_files = 0
+    if not job.status.is_terminal:
+        cancelled_files = get_batch_pool().cancel_job(job_id)
+        job = _get_job_or_404(job_id)
 
-    # Remove job
-    del active_jobs[job_id]
+    shutil.rmtree(BATCH_UPLOAD_ROOT / job_id, ignore_errors=True)
 
-    return {"status": "deleted", "job_id": job_id}
+    return {
+        "status": job.status.value,
+        "job_id": job_id,
+        "cancelled_files": cancelled_files,
+    }
@@ -8,6 +8,7 @@ Endpoints:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -51,6 +52,16 @@ class SonicMapResponse(BaseModel):
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 
+def _entry_metadata(entry) -> dict[str, Any]:
+    return {
+        "bpm": entry.bpm,
+        "key": entry.key,
+        "energy": entry.energy,
+        "genre": entry.genre_labels or [],
+        "mood": entry.mood_labels or [],
+    }
+
+
 @router.get("/sonic-map")
 @rate_limit("30/minute")
 async def get_sonic_map(
@@ -59,65 +70,47 @@ async def get_sonic_map(
     similarity_threshold: float = Query(
         0.6, ge=0.1, le=0.99, description="Min similarity for edges"
     ),
+    max_neighbors: int = Query(8, ge=1, le=50, description="Edges per node"),
 ) -> SonicMapResponse:
     """
     Build a force-directed graph of sonic relationships between samples.
-    Nodes are samples, edges represent FAISS cosine similarity above threshold.
+    Nodes are samples, edges link each node to its most similar neighbours
+    (FAISS cosine similarity above threshold), served from the cached
+    neighbour graph.
     """
     try:
         from samplemind.core.search.faiss_index import get_index
+        from samplemind.core.search.neighbor_graph import get_neighbor_graph
 
         idx = get_index(auto_load=True)
         if idx.is_empty:
             return SonicMapResponse(nodes=[], edges=[], clusters=[])
 
         entries = idx._entries[:limit]
-        nodes: list[GraphNode] = []
-        edges: list[GraphEdge] = []
-
-        # Build nodes
-        for i, entry in enumerate(entries):
-            nodes.append(
-                GraphNode(
-                    id=str(i),
-                    filename=entry.filename,
-                    bpm=entry.bpm,
-                    key=entry.key,
-                    energy=entry.energy,
-                    genre=entry.genre_labels or [],
-                    mood=entry.mood_labels or [],
-                )
+        nodes = [
+            GraphNode(
+                id=str(entry.index_id),
+                filename=entry.filename,
+                bpm=entry.bpm,
+                key=entry.key,
+                energy=entry.energy,
+                genre=entry.genre_labels or [],
+                mood=entry.mood_labels or [],
             )
+            for entry in entries
+        ]
 
-        # Build edges from pairwise similarity (sampled for performance)
-        # For each node, find its top-K similar nodes
-        import numpy as np
-
-        if hasattr(idx, "_index") and idx._index is not None and len(entries) > 1:
-            vectors = idx._index.reconstruct_n(0, min(len(entries), limit))
-            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
-            norms[norms == 0] = 1
-            normalized = vectors / norms
-
-            # Compute similarity matrix in batches to limit memory
-            batch_size = 50
-            for start in range(0, len(normalized), batch_size):
-                end = min(start + batch_size, len(normalized))
-                batch = normalized[start:end]
-                sim_matrix = batch @ normalized.T
-
-                for i_local in range(len(batch)):
-                    i_global = start + i_local
-                    for j in range(i_global + 1, len(normalized)):
-                        score = float(sim_matrix[i_local, j])
-                        if score >= similarity_threshold:
-                            edges.append(
-                                GraphEdge(
-                                    source=str(i_global),
-                                    target=str(j),
-                                    weight=round(score, 3),
-                                )
-                            )
+        graph = get_neighbor_graph(idx)
+        pairs = await asyncio.to_thread(
+            graph.subgraph,
+            [entry.index_id for entry in entries],
+            max_neighbors,
+            similarity_threshold,
+        )
+        edges = [
+            GraphEdge(source=str(a), target=str(b), weight=round(w, 3))
+            for a, b, w in pairs
+        ]
 
         # Auto-detect clusters via genre grouping
         genre_groups: dict[str, list[str]] = {}
@@ -148,41 +141,44 @@ async def get_cluster(
 ) -> dict[str, Any]:
     """
     Get the N most similar samples to a specific sample with relationship explanations.
+
+    The source is looked up by path, filename or sonic-map node id (the
+    index id) and its stored vector is used as the query — the audio is
+    not re-embedded.
     """
     try:
         from samplemind.core.search.faiss_index import get_index
+        from samplemind.core.search.neighbor_graph import get_neighbor_graph
 
         idx = get_index(auto_load=True)
         if idx.is_empty:
             raise HTTPException(status_code=404, detail="No samples indexed")
 
-        # Find the source entry
-        source_entry = None
-        for entry in idx._entries:
-            if entry.filename == sample_id or entry.path == sample_id:
-                source_entry = entry
-                break
-
-        if not source_entry:
-            raise HTTPException(status_code=404, detail=f"Sample '{sample_id}' not found")
-
-        # Search for similar samples using audio embedding
-        results = idx.search_audio(source_entry.path, top_k=top_k + 1)
-
-        # Filter out the source itself
-        similar = [
-            {
-                "filename": r.filename,
-                "score": round(r.score, 3),
-                "bpm": r.metadata.get("bpm"),
-                "key": r.metadata.get("key"),
-                "energy": r.metadata.get("energy"),
-                "genre": r.metadata.get("genre_labels", []),
-                "mood": r.metadata.get("mood_labels", []),
-            }
-            for r in results
-            if r.filename != source_entry.filename
-        ][:top_k]
+        source_entry = idx.get_entry(sample_id)
+        if source_entry is None and sample_id.isdigit():
+            source_entry = idx.get_entry(int(sample_id))
+        if source_entry is None:
+            raise HTTPException(
+                status_code=404, detail=f"Sample '{sample_id}' not found"
+            )
+
+        graph = get_neighbor_graph(idx)
+        neighbours = await asyncio.to_thread(
+            graph.neighbors, source_entry.index_id, top_k
+        )
+
+        similar = []
+        for neighbour_id, score in neighbours:
+            entry = idx.get_entry(neighbour_id)
+            if entry is None:
+                continue
+            similar.append(
+                {
+                    "filename": entry.filename,
+                    "score": round(score, 3),
+                    **_entry_metadata(entry),
+                }
+            )
 
         return {
             "source": {
@@ -9,6 +9,7 @@ Endpoints:
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Query, Request
@@ -69,19 +70,26 @@ class GapAnalysis(BaseModel):
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 
+# Display labels for library_stats.BPM_RANGES buckets
+BPM_RANGE_LABELS = {
+    "60-80": "60-80 (Slow)",
+    "80-100": "80-100 (Moderate)",
+    "100-120": "100-120 (Medium)",
+    "120-140": "120-140 (Fast)",
+    "140-160": "140-160 (High)",
+    "160+": "160+ (Very Fast)",
+}
+
+
 def _compute_distribution(
-    values: list[str], total: int
+    counts: Mapping[str, int], total: int, category: str = "distribution"
 ) -> list[TrendItem]:
-    """Count values and return sorted trend items."""
-    counts: dict[str, int] = {}
-    for v in values:
-        counts[v] = counts.get(v, 0) + 1
-
+    """Return the top counted values as sorted trend items."""
     items = []
     for value, count in sorted(counts.items(), key=lambda x: x[1], reverse=True)[:15]:
         items.append(
             TrendItem(
-                category="distribution",
+                category=category,
                 value=value,
                 count=count,
                 percentage=round((count / total) * 100, 1) if total else 0,
@@ -106,10 +114,10 @@ async def get_trend_analysis(
     Optionally includes AI-powered forecasts.
     """
     try:
-        from samplemind.core.search.faiss_index import get_index
+        from samplemind.core.search.library_stats import get_library_stats
 
-        idx = get_index(auto_load=True)
-        if idx.is_empty:
+        stats = get_library_stats()
+        if stats.total == 0:
             return TrendAnalysis(
                 generated_at=datetime.now().isoformat(),
                 library_size=0,
@@ -120,56 +128,19 @@ async def get_trend_analysis(
                 energy_distribution=[],
             )
 
-        entries = idx._entries
-        total = len(entries)
-
-        # Collect distributions
-        bpm_ranges: list[str] = []
-        keys: list[str] = []
-        genres: list[str] = []
-        moods: list[str] = []
-        energies: list[str] = []
-
-        for e in entries:
-            if e.bpm:
-                if e.bpm < 80:
-                    bpm_ranges.append("60-80 (Slow)")
-                elif e.bpm < 100:
-                    bpm_ranges.append("80-100 (Moderate)")
-                elif e.bpm < 120:
-                    bpm_ranges.append("100-120 (Medium)")
-                elif e.bpm < 140:
-                    bpm_ranges.append("120-140 (Fast)")
-                elif e.bpm < 160:
-                    bpm_ranges.append("140-160 (High)")
-                else:
-                    bpm_ranges.append("160+ (Very Fast)")
-            if e.key:
-                keys.append(e.key)
-            for g in e.genre_labels or []:
-                genres.append(g)
-            for m in e.mood_labels or []:
-                moods.append(m)
-            if e.energy:
-                energies.append(e.energy)
-
-        bpm_trends = _compute_distribution(bpm_ranges, total)
-        key_trends = _compute_distribution(keys, total)
-        genre_trends = _compute_distribution(genres, total)
-        mood_trends = _compute_distribution(moods, total)
-        energy_dist = _compute_distribution(energies, total)
-
-        # For trends, update category names
-        for t in bpm_trends:
-            t.category = "bpm"
-        for t in key_trends:
-            t.category = "key"
-        for t in genre_trends:
-            t.category = "genre"
-        for t in mood_trends:
-            t.category = "mood"
-        for t in energy_dist:
-            t.category = "energy"
+        total = stats.total
+
+        bpm_ranges = {
+            BPM_RANGE_LABELS[label]: count
+            for label, count in stats.counts("bpm_range").items()
+        }
+        energies = {e: n for e, n in stats.counts("energy").items() if e}
+
+        bpm_trends = _compute_distribution(bpm_ranges, total, "bpm")
+        key_trends = _compute_distribution(stats.counts("key"), total, "key")
+        genre_trends = _compute_distribution(stats.counts("genre"), total, "genre")
+        mood_trends = _compute_distribution(stats.counts("mood"), total, "mood")
+        energy_dist = _compute_distribution(energies, total, "energy")
 
         forecasts: list[TrendForecast] = []
         if include_forecasts:
@@ -201,10 +172,10 @@ async def get_gap_analysis(request: Request) -> GapAnalysis:
     standard distributions for genres, BPM ranges, keys, and moods.
     """
     try:
-        from samplemind.core.search.faiss_index import get_index
+        from samplemind.core.search.library_stats import get_library_stats
 
-        idx = get_index(auto_load=True)
-        if idx.is_empty:
+        stats = get_library_stats()
+        if stats.total == 0:
             return GapAnalysis(
                 total_gaps=1,
                 gaps=[
@@ -220,8 +191,7 @@ async def get_gap_analysis(request: Request) -> GapAnalysis:
                 ai_summary="No samples indexed yet.",
             )
 
-        entries = idx._entries
-        total = len(entries)
+        total = stats.total
 
         # Industry standard BPM distribution targets
         bpm_targets = {
@@ -236,30 +206,10 @@ async def get_gap_analysis(request: Request) -> GapAnalysis:
         # Key targets (roughly equal for all 12 keys * 2 modes)
         key_target = 1.0 / 24  # ~4.2% per key
 
-        # Count actual distributions
-        bpm_counts: dict[str, int] = {}
-        key_counts: dict[str, int] = {}
-        genre_counts: dict[str, int] = {}
-
-        for e in entries:
-            if e.bpm:
-                if e.bpm < 80:
-                    bpm_counts["60-80"] = bpm_counts.get("60-80", 0) + 1
-                elif e.bpm < 100:
-                    bpm_counts["80-100"] = bpm_counts.get("80-100", 0) + 1
-                elif e.bpm < 120:
-                    bpm_counts["100-120"] = bpm_counts.get("100-120", 0) + 1
-                elif e.bpm < 140:
-                    bpm_counts["120-140"] = bpm_counts.get("120-140", 0) + 1
-                elif e.bpm < 160:
-                    bpm_counts["140-160"] = bpm_counts.get("140-160", 0) + 1
-                else:
-                    bpm_counts["160+"] = bpm_counts.get("160+", 0) + 1
-
-            if e.key:
-                key_counts[e.key] = key_counts.get(e.key, 0) + 1
-            for g in e.genre_labels or []:
-                genre_counts[g] = genre_counts.get(g, 0) + 1
+        # Actual distributions
+        bpm_counts = stats.counts("bpm_range")
+        key_counts = stats.counts("key")
+        genre_counts = stats.counts("genre")
 
         gaps: list[GapItem] = []
 
@@ -9,6 +9,9 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# How often a subscribed socket re-reads durable state when no event arrives
+STORE_RECHECK_SECONDS = 5.0
+
 
 # Connection manager
 class ConnectionManager:
@@ -71,45 +74,57 @@ async def progress_websocket(websocket: WebSocket, job_id: str):
     """
     WebSocket endpoint for real-time batch job progress updates
 
-    Sends progress updates every second while job is processing
+    Sends the current job state on connect, then pushes coalesced deltas
+    from the progress bus (at most one message per 100 ms) until the job
+    reaches a terminal state.
     """
     await manager.connect(job_id, websocket)
 
-    try:
-        # Import here to avoid circular dependency
-        from .batch import active_jobs
+    # Import here to avoid circular dependency
+    from samplemind.core.progress import batch_topic, get_progress_bus
 
-        while True:
-            if job_id not in active_jobs:
-                await websocket.send_json({"error": "Job not found", "job_id": job_id})
-                break
+    from .batch import get_job_store, job_progress_event
 
-            job = active_jobs[job_id]
+    # Subscribe before reading the store so no event can slip between the two
+    subscription = get_progress_bus().subscribe(batch_topic(job_id))
+    try:
+        store = get_job_store()
+        job = store.get_job(job_id)
+        if job is None:
+            await websocket.send_json({"error": "Job not found", "job_id": job_id})
+            return
 
-            # Send progress update
-            await websocket.send_json(
-                {
-                    "job_id": job_id,
-                    "status": job.status,
-                    "progress": job.progress_percent,
-                    "processed": job.processed_files,
-                    "total": job.total_files,
-                    "errors": len(job.errors),
-                }
-            )
+        snapshot = job_progress_event(job)
+        await websocket.send_json(snapshot)
+        if job.status.is_terminal:
+            return
+        subscription.prime(snapshot)
 
-            # Stop if job is completed or failed
-            if job.status in ["completed", "failed"]:
-                break
+        while True:
+            try:
+                delta = await asyncio.wait_for(
+                    subscription.next_delta(), STORE_RECHECK_SECONDS
+                )
+            except TimeoutError:
+                # Safety net for jobs progressing in a process we are not bridged to
+                job = store.get_job(job_id)
+                if job is not None:
+                    subscription.merge(
+                        job_progress_event(job), final=job.status.is_terminal
+                    )
+                continue
 
-            # Wait before next update
-            await asyncio.sleep(1)
+            if delta is None:
+                break
+            if delta:
+                await websocket.send_json({"job_id": job_id, **delta})
 
     except WebSocketDisconnect:
-        manager.disconnect(job_id)
         logger.info(f"Client {job_id} disconnected")
     except Exception as e:
         logger.error(f"WebSocket error for {job_id}: {e}")
+    finally:
+        subscription.close()
         manager.disconnect(job_id)
 
 
@@ -212,13 +227,37 @@ def _get_redis_sync():  # type: ignore[return]
         return None
 
 
+def _load_agent_events(r, redis_key: str, start: int) -> list[dict]:
+    """Read stored agent progress events from *start* onwards."""
+    if r is None:
+        return []
+    try:
+        raw_events = r.lrange(redis_key, start, -1)
+    except Exception as redis_exc:
+        logger.debug("Redis lrange failed: %s", redis_exc)
+        return []
+
+    events = []
+    for raw in raw_events:
+        try:
+            events.append(json.loads(raw))
+        except json.JSONDecodeError:
+            events.append({"stage": "unknown", "pct": 0, "message": raw})
+    return events
+
+
+def _is_agent_final(event: dict) -> bool:
+    return event.get("pct", 0) >= 100 or event.get("stage") == "error"
+
+
 @router.websocket("/ws/agent/{task_id}")
 async def agent_task_progress(websocket: WebSocket, task_id: str):
     """
     Stream Celery agent-task progress events over WebSocket.
 
-    Polls the Redis list ``agent_progress:{task_id}`` every 500 ms and
-    forwards every new JSON event to the client.
+    Replays the events already stored in the Redis list
+    ``agent_progress:{task_id}``, then forwards live updates pushed on the
+    progress bus as coalesced deltas.
 
     Event schema::
 
@@ -234,44 +273,44 @@ async def agent_task_progress(websocket: WebSocket, task_id: str):
     await websocket.accept()
     logger.info("Agent progress stream opened for task %s", task_id)
 
-    redis_key = f"agent_progress:{task_id}"
-    r = await asyncio.get_event_loop().run_in_executor(None, _get_redis_sync)
+    from samplemind.core.progress import agent_topic, get_progress_bus
 
-    # Index of the next event to read from the Redis list
-    cursor = 0
+    redis_key = f"agent_progress:{task_id}"
+    loop = asyncio.get_running_loop()
+    r = await loop.run_in_executor(None, _get_redis_sync)
 
+    subscription = get_progress_bus().subscribe(agent_topic(task_id))
     try:
-        while True:
-            if r is not None:
-                try:
-                    # Fetch all events from cursor onwards (non-blocking)
-                    raw_events = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda: r.lrange(redis_key, cursor, -1)
-                    )
-                except Exception as redis_exc:
-                    logger.debug("Redis lrange failed: %s", redis_exc)
-                    raw_events = []
-            else:
-                raw_events = []
-
-            for raw in raw_events:
-                try:
-                    event = json.loads(raw)
-                except json.JSONDecodeError:
-                    event = {"stage": "unknown", "pct": 0, "message": raw}
-
-                await websocket.send_json(event)
-                cursor += 1
+        # Replay history for late joiners
+        history = await loop.run_in_executor(None, _load_agent_events, r, redis_key, 0)
+        cursor = len(history)
+        for event in history:
+            await websocket.send_json(event)
+            subscription.prime(event)
+            if _is_agent_final(event):
+                logger.info("Agent task %s already finished", task_id)
+                return
 
-                pct = event.get("pct", 0)
-                stage = event.get("stage", "")
-                if pct >= 100 or stage == "error":
-                    logger.info(
-                        "Agent task %s finished (stage=%s pct=%s)", task_id, stage, pct
-                    )
-                    return
-
-            await asyncio.sleep(0.5)
+        while True:
+            try:
+                delta = await asyncio.wait_for(
+                    subscription.next_delta(), STORE_RECHECK_SECONDS
+                )
+            except TimeoutError:
+                # Safety net when the Celery worker is not bridged to this process
+                events = await loop.run_in_executor(
+                    None, _load_agent_events, r, redis_key, cursor
+                )
+                cursor += len(events)
+                for event in events:
+                    subscription.merge(event, final=_is_agent_final(event))
+                continue
+
+            if delta is None:
+                logger.info("Agent task %s finished", task_id)
+                return
+            if delta:
+                await websocket.send_json(delta)
 
     except WebSocketDisconnect:
         logger.info("Agent progress client disconnected for task %s", task_id)
@@ -281,3 +320,5 @@ async def agent_task_progress(websocket: WebSocket, task_id: str):
             await websocket.send_json({"stage": "error", "pct": 0, "message": str(exc)})
         except Exception:
             pass
+    finally:
+        subscription.close()
@@ -25,6 +25,12 @@ class AudioUploadResponse(BaseModel):
     file_id: str
     filename: str
     file_size: int
+    content_hash: str | None = Field(None, description="SHA-256 of the uploaded bytes")
+    format: str | None = Field(None, description="Format detected from the header")
+    sample_rate: int | None = None
+    channels: int | None = None
+    duration: float | None = Field(None, description="Duration in seconds, if known")
+    analysis_status: str | None = Field(None, description="cached, pending or queued")
     message: str = "File uploaded successfully"
 
 
@@ -18,29 +18,45 @@ Total: 215+ commands - COMPLETE ✅
 
 __version__ = "2.1.0-beta"
 
-# Import all command groups
-from . import (
-    ai,
-    analyze,
-    audio,
-    daw,  # Phase 10: DAW Integration
-    effects,  # Phase 13: Audio Effects & Presets
-    groove,  # Phase 10: Groove Template Extraction
-    layering,  # Phase 10: Sample Layering & Phase Analysis
-    library,
-    mastering,  # Phase 10: Professional Mastering Assistant
-    metadata,
-    midi,  # Phase 13: MIDI Extraction
-    pack,  # Phase 13: Sample Pack Creator
-    recent,  # Phase 10: Quick Access to Recent Files
-    reporting,
-    similarity,  # Phase 10: Sample Similarity Engine
-    stems,  # Phase 13: AI Stem Separation
-    tagging,  # Phase 10: AI-powered Sample Tagging
-    theory,  # Phase 10: Music Theory Analysis
-    visualization,
+import importlib
+from types import ModuleType
+
+# Command group modules are imported on first attribute access so that
+# importing this package (e.g. for `samplemind --version`) stays cheap.
+_COMMAND_MODULES = frozenset(
+    {
+        "ai",
+        "analyze",
+        "audio",
+        "daw",  # Phase 10: DAW Integration
+        "effects",  # Phase 13: Audio Effects & Presets
+        "groove",  # Phase 10: Groove Template Extraction
+        "layering",  # Phase 10: Sample Layering & Phase Analysis
+        "library",
+        "mastering",  # Phase 10: Professional Mastering Assistant
+        "metadata",
+        "midi",  # Phase 13: MIDI Extraction
+        "pack",  # Phase 13: Sample Pack Creator
+        "recent",  # Phase 10: Quick Access to Recent Files
+        "reporting",
+        "search",  # Phase 11: Semantic Search (FAISS + CLAP)
+        "similarity",  # Phase 10: Sample Similarity Engine
+        "stems",  # Phase 13: AI Stem Separation
+        "sync",
+        "tagging",  # Phase 10: AI-powered Sample Tagging
+        "theory",  # Phase 10: Music Theory Analysis
+        "visualization",
+    }
 )
 
+
+def __getattr__(name: str) -> ModuleType:
+    """Lazy load command group modules on demand"""
+    if name in _COMMAND_MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
 __all__ = [
     "analyze",  # 40 commands ✅
     "library",  # 50 commands ✅
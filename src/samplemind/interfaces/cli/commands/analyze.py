@@ -15,19 +15,17 @@ Usage:
 
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import numpy as np
-import soundfile as sf
 import typer
-from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 
-from samplemind.core.processing.realtime_spectral import RealtimeSpectral, SpectralFrame
-from samplemind.utils.file_picker import select_audio_file
-
 from . import utils
 
+if TYPE_CHECKING:
+    from samplemind.core.processing.realtime_spectral import SpectralFrame
+
 # Create analyze app group
 app = typer.Typer(
     help="🎵 Audio analysis & feature extraction (40 commands)",
@@ -60,6 +58,8 @@ async def analyze_full(
         # Handle file selection
         if not file or interactive:
             console.print("[cyan]📁 Opening file picker...[/cyan]")
+            from samplemind.utils.file_picker import select_audio_file
+
             selected_file = select_audio_file(
                 title="Select Audio File for Full Analysis"
             )
@@ -186,6 +186,8 @@ async def analyze_quick(
         # Handle file selection
         if not file or interactive:
             console.print("[cyan]📁 Opening file picker...[/cyan]")
+            from samplemind.utils.file_picker import select_audio_file
+
             selected_file = select_audio_file(
                 title="Select Audio File for Quick Analysis"
             )
@@ -754,6 +756,13 @@ def analyze_monitor(
     fps: int = typer.Option(30, "--fps", help="Target FPS"),
 ) -> None:
     """Real-time spectral monitoring visualization"""
+    # Heavy DSP imports are deferred so the analyze group loads quickly
+    import numpy as np
+    import soundfile as sf
+    from rich.live import Live
+
+    from samplemind.core.processing.realtime_spectral import RealtimeSpectral
+
     try:
         if not file.exists():
             raise FileNotFoundError(f"File not found: {file}")
@@ -762,19 +771,19 @@ def analyze_monitor(
         info = sf.info(file)
         sr = info.samplerate
 
-        analyzer = RealtimeSpectral(sample_rate=sr, target_fps=fps, fft_size=2048)
-
-        # Generator for blocks
-        blocks = sf.blocks(
-            str(file), blocksize=analyzer.fft_size, overlap=0, fill_value=0
+        analyzer = RealtimeSpectral(
+            sample_rate=sr, target_fps=fps, fft_size=2048, copy_output=False
         )
 
+        # Stream hop-sized blocks; the analyzer keeps its own ring buffer
+        blocks = sf.blocks(str(file), blocksize=analyzer.hop_length, fill_value=0)
+
         console.print(
             f"[cyan]Starting Real-time Monitor for {file.name} ({sr} Hz)[/cyan]"
         )
         console.print("[dim]Press Ctrl+C to stop[/dim]")
 
-        def generate_table(frame: SpectralFrame) -> Panel:
+        def generate_table(frame: "SpectralFrame") -> Panel:
             table = Table(show_header=False, box=None, expand=True)
             table.add_column("Metric", style="cyan", width=15)
             table.add_column("Value", style="bold green", justify="left")
@@ -795,20 +804,22 @@ def analyze_monitor(
 
         with Live(console=console, refresh_per_second=fps) as live:
             start_time = time.time()
-            for i, block in enumerate(blocks):
+            for block in blocks:
                 # If stereo, mix to mono
                 if len(block.shape) > 1:
                     block = np.mean(block, axis=1)
 
                 # Process
-                current_time = (i * analyzer.fft_size / sr) * 1000
-                frame = analyzer.process_chunk(block, current_time_ms=current_time)
+                frames = analyzer.push(block)
+                if not frames:
+                    continue
+                frame = frames[-1]
 
                 live.update(generate_table(frame))
 
                 # Sync to realtime
                 elapsed = time.time() - start_time
-                expected = current_time / 1000.0
+                expected = frame.timestamp_ms / 1000.0
                 if expected > elapsed:
                     time.sleep(expected - elapsed)
 
@@ -124,4 +124,60 @@ async def analyze_layering(
         raise typer.Exit(1)
 
 
+@app.command("partners")
+@utils.with_error_handling
+@utils.async_command
+async def find_partners(
+    sample: Path = typer.Argument(..., help="Sample to find layering partners for"),
+    library: Path = typer.Argument(..., help="Folder of candidate samples"),
+    top: int = typer.Option(10, "--top", "-k", help="Number of partners to show"),
+    cache: Path = typer.Option(
+        Path.home() / ".samplemind" / "layering_index.npz",
+        "--cache",
+        help="Profile cache (profiles are only recomputed for changed files)",
+    ),
+) -> None:
+    """Find the best layering partners for a sample across a library"""
+    try:
+        from samplemind.core.processing.layering_index import LayeringIndex
+
+        index = LayeringIndex.load(cache) if cache.exists() else LayeringIndex()
+        with console.status("[cyan]Profiling library...[/cyan]"):
+            computed = index.add_folder(library.resolve())
+            index.save(cache)
+        console.print(
+            f"[dim]{len(index)} profiles ({computed} computed, "
+            f"{len(index) - computed} cached)[/dim]\n"
+        )
+
+        with console.status("[cyan]Analyzing shortlist...[/cyan]"):
+            partners = index.best_partners(sample.resolve(), top_k=top)
+
+        table = Table(
+            title=f"🔀 Layering partners for {sample.name}",
+            show_header=True,
+            header_style="bold cyan",
+        )
+        table.add_column("#", justify="right", style="dim")
+        table.add_column("Sample", style="cyan")
+        table.add_column("Score", justify="right", style="green")
+        table.add_column("Masking", justify="right")
+        table.add_column("Transients", justify="right")
+        table.add_column("Level Diff", justify="right")
+        for rank, partner in enumerate(partners, 1):
+            table.add_row(
+                str(rank),
+                Path(partner.path or partner.sample_id).name,
+                f"{partner.score:.1f}",
+                f"{partner.masking:.0%}",
+                f"{partner.transient_overlap:.0%}",
+                f"{partner.loudness_difference_db:+.1f} dB",
+            )
+        console.print(table)
+
+    except utils.CLIError as e:
+        utils.handle_error(e, "layer:partners")
+        raise typer.Exit(1)
+
+
 __all__ = ["app"]
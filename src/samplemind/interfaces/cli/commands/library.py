@@ -18,11 +18,6 @@ from pathlib import Path
 import typer
 from rich.table import Table
 
-from samplemind.ai.classification.classifier import AIClassifier
-from samplemind.core.engine.audio_engine import AudioEngine
-from samplemind.services.organizer import OrganizationEngine
-from samplemind.utils.file_picker import select_directory
-
 from . import utils
 
 # Create library app group
@@ -56,6 +51,11 @@ def library_organize(
     """Auto-organize library by metadata (BPM, key, genre)"""
     import asyncio
 
+    from samplemind.ai.classification.classifier import AIClassifier
+    from samplemind.core.engine.audio_engine import AudioEngine
+    from samplemind.services.organizer import OrganizationEngine
+    from samplemind.utils.file_picker import select_directory
+
     # Handle folder selection
     if not folder or interactive:
         console.print("[cyan]📁 Opening folder picker...[/cyan]")
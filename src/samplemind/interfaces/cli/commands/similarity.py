@@ -149,8 +149,11 @@ def similar_index(
     rebuild: bool = typer.Option(
         False, "--rebuild", help="Clear and rebuild entire index"
     ),
+    workers: int | None = typer.Option(
+        None, "--workers", "-w", help="Embedding processes (default: CPU count)"
+    ),
 ) -> None:
-    """Build similarity index for a folder of audio files"""
+    """Build similarity index for a folder of audio files (resumable)"""
     try:
         folder = Path(folder).expanduser().resolve()
         if not folder.is_dir():
@@ -192,12 +195,19 @@ def similar_index(
                 extensions=ext_list,
                 recursive=recursive,
                 progress_callback=progress_callback,
+                max_workers=workers,
             )
 
             progress.update(task, completed=100)
 
         console.print()
         console.print(f"[green]✓ Indexed {indexed} audio files[/green]")
+        run = db.last_index_stats
+        if run is not None:
+            console.print(
+                f"[cyan]Throughput:[/cyan] {run.files_per_second:.1f} files/s "
+                f"({run.skipped} already indexed, {run.failed} failed)"
+            )
 
         # Show stats
         stats = db.get_stats()
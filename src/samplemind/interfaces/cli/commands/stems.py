@@ -163,6 +163,9 @@ async def batch_separate(
         "-e",
         help="File extensions to process (comma-separated)",
     ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Worker processes, each keeping a model loaded"
+    ),
 ) -> None:
     """
     Batch separate multiple audio files from a folder.
@@ -207,7 +210,7 @@ async def batch_separate(
 
         quality_enum = StemQuality[quality_lower.upper()]
         engine = StemSeparationEngine.from_quality(
-            quality=quality_enum, device=None, verbose=False
+            quality=quality_enum, device=None, verbose=False, max_workers=workers
         )
 
         # Process with progress
@@ -245,6 +248,13 @@ async def batch_separate(
         # Summary
         console.print()
         console.print(f"[green]✓ Batch complete in {elapsed:.1f}s[/green]")
+        if engine.in_process:
+            stats = engine.service.stats
+            console.print(
+                f"[dim]{stats.audio_seconds:.0f}s of audio at "
+                f"{stats.realtime_factor:.1f}x realtime[/dim]"
+            )
+            engine.close()
         console.print()
 
         # Results table
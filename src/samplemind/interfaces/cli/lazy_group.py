@@ -0,0 +1,137 @@
+"""
+SampleMind AI - Lazy Command Group Loading
+
+Builds the top-level Typer command tree from lightweight metadata and imports
+each command group module only when that group is actually invoked.
+
+Command modules pull in numpy, soundfile, librosa, scipy and the AI SDKs at
+import time.  Resolving them eagerly made ``samplemind --version``, ``--help``
+and shell completion pay for every one of those imports.  With lazy loading:
+
+- ``samplemind --help`` / completion list groups from metadata only
+- ``samplemind <group> ...`` imports just ``commands/<group>.py``
+- Loaded groups are cached for the lifetime of the process
+
+Usage:
+    class SampleMindGroup(LazyTyperGroup):
+        lazy_subcommands = {
+            "analyze": LazyCommandSpec(
+                "analyze", "samplemind.interfaces.cli.commands.analyze", help="..."
+            ),
+        }
+
+    app = typer.Typer(cls=SampleMindGroup)
+"""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+@dataclass(frozen=True)
+class LazyCommandSpec:
+    """Import-free description of a command group"""
+
+    name: str
+    module: str
+    attr: str = "app"
+    help: str = ""
+
+    def load(self) -> click.Command:
+        """Import the command module and build its Click command"""
+        module = importlib.import_module(self.module)
+        target = getattr(module, self.attr)
+
+        if isinstance(target, typer.Typer):
+            # Same as app.add_typer(): sub-apps always become groups
+            command = typer.main.get_group(target)
+        elif isinstance(target, click.Command):
+            command = target
+        else:
+            raise TypeError(
+                f"{self.module}:{self.attr} is not a Typer app or Click command"
+            )
+
+        command.name = self.name
+        if self.help:
+            command.help = self.help
+        return command
+
+
+class LazyCommandPlaceholder(click.Command):
+    """Stand-in used for help listings and completion of group names.
+
+    Carries only the metadata needed to render ``--help`` rows; the real
+    command is swapped in by :meth:`LazyTyperGroup.resolve_command`.
+    """
+
+    def __init__(self, spec: LazyCommandSpec) -> None:
+        super().__init__(name=spec.name, help=spec.help, short_help=spec.help)
+        self.spec = spec
+
+
+class LazyTyperGroup(TyperGroup):
+    """TyperGroup that resolves registered subcommand groups on first use"""
+
+    lazy_subcommands: ClassVar[dict[str, LazyCommandSpec]] = {}
+    _loaded: ClassVar[dict[str, click.Command]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Each subclass gets its own registry and load cache
+        cls.lazy_subcommands = dict(cls.__dict__.get("lazy_subcommands", {}))
+        cls._loaded = {}
+
+    @classmethod
+    def register(cls, spec: LazyCommandSpec) -> None:
+        """Add (or replace) a lazily loaded command group"""
+        cls.lazy_subcommands[spec.name] = spec
+        cls._loaded.pop(spec.name, None)
+
+    @classmethod
+    def load_command(cls, name: str) -> click.Command:
+        """Import and cache the command group registered under *name*"""
+        command = cls._loaded.get(name)
+        if command is None:
+            command = cls.lazy_subcommands[name].load()
+            cls._loaded[name] = command
+        return command
+
+    @classmethod
+    def loaded_commands(cls) -> list[str]:
+        """Names of command groups that have been imported so far"""
+        return list(cls._loaded)
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        eager = super().list_commands(ctx)
+        return eager + [name for name in self.lazy_subcommands if name not in eager]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        command = super().get_command(ctx, cmd_name)
+        if command is not None:
+            return command
+
+        if cmd_name in self._loaded:
+            return self._loaded[cmd_name]
+
+        spec = self.lazy_subcommands.get(cmd_name)
+        if spec is None:
+            return None
+        return LazyCommandPlaceholder(spec)
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        cmd_name, command, rest = super().resolve_command(ctx, args)
+        if isinstance(command, LazyCommandPlaceholder):
+            command = self.load_command(command.spec.name)
+        return cmd_name, command, rest
+
+
+__all__ = ["LazyCommandSpec", "LazyCommandPlaceholder", "LazyTyperGroup"]
@@ -13,6 +13,7 @@ Features:
 - Parallel processing support
 - Offline-first architecture
 - Full backward compatibility with menu system
+- Lazy command groups: modules are imported only when their group runs
 
 Usage:
     samplemind analyze:full <file>              # Full analysis
@@ -28,42 +29,130 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
+from .lazy_group import LazyCommandSpec, LazyTyperGroup
+
+_COMMANDS_PKG = "samplemind.interfaces.cli.commands"
+
+
+class SampleMindGroup(LazyTyperGroup):
+    """Root command group — subcommand groups are imported on first use"""
+
+
 # Create main app
 app = typer.Typer(
     name="samplemind",
     help="🎵 SampleMind AI v2.1 - Professional Audio Analysis & Management",
     no_args_is_help=True,
     rich_markup_mode="rich",
+    cls=SampleMindGroup,
 )
 
 console = Console()
 
 # ============================================================================
-# COMMAND GROUP IMPORTS
+# COMMAND GROUP METADATA
 # ============================================================================
-
-from .commands import (
-    ai,
-    analyze,
-    audio,
-    daw,
-    effects,
-    groove,
-    layering,
-    library,
-    mastering,
-    metadata,
-    midi,
-    pack,
-    recent,
-    reporting,
-    search,
-    similarity,
-    stems,
-    sync,
-    tagging,
-    theory,
-    visualization,
+# Command modules are NOT imported here. Each entry maps a group name to the
+# module that defines it; the module is imported only when the group is run.
+
+COMMAND_GROUPS: tuple[LazyCommandSpec, ...] = (
+    # Core (215+ original)
+    LazyCommandSpec(
+        "analyze",
+        f"{_COMMANDS_PKG}.analyze",
+        help="🎵 Audio analysis & feature extraction (40 commands)",
+    ),
+    LazyCommandSpec(
+        "library",
+        f"{_COMMANDS_PKG}.library",
+        help="📁 Sample library management (50 commands)",
+    ),
+    LazyCommandSpec(
+        "ai", f"{_COMMANDS_PKG}.ai", help="🤖 AI-powered features (30 commands)"
+    ),
+    LazyCommandSpec("sync", f"{_COMMANDS_PKG}.sync", help="☁️  Sync & Cloud"),
+    LazyCommandSpec(
+        "meta", f"{_COMMANDS_PKG}.metadata", help="📝 Metadata operations (30 commands)"
+    ),
+    LazyCommandSpec(
+        "audio",
+        f"{_COMMANDS_PKG}.audio",
+        help="🎙️  Audio processing & conversion (25 commands)",
+    ),
+    LazyCommandSpec(
+        "viz",
+        f"{_COMMANDS_PKG}.visualization",
+        help="📊 Visualizations & charts (15 commands)",
+    ),
+    LazyCommandSpec(
+        "report",
+        f"{_COMMANDS_PKG}.reporting",
+        help="📋 Reports & data export (10 commands)",
+    ),
+    LazyCommandSpec(
+        "similar",
+        f"{_COMMANDS_PKG}.similarity",
+        help="🔍 Sample similarity search (5 commands)",
+    ),
+    LazyCommandSpec(
+        "theory",
+        f"{_COMMANDS_PKG}.theory",
+        help="🎼 Music theory analysis (4 commands)",
+    ),
+    LazyCommandSpec(
+        "daw", f"{_COMMANDS_PKG}.daw", help="🎹 DAW integration (4 commands)"
+    ),
+    # Phase 10+ Premium Features
+    LazyCommandSpec(
+        "tag", f"{_COMMANDS_PKG}.tagging", help="🏷️  AI-powered sample tagging"
+    ),
+    LazyCommandSpec(
+        "mastering",
+        f"{_COMMANDS_PKG}.mastering",
+        help="🎚️  Professional mastering assistant",
+    ),
+    LazyCommandSpec(
+        "layer", f"{_COMMANDS_PKG}.layering", help="🔀 Sample layering & phase analysis"
+    ),
+    LazyCommandSpec(
+        "groove", f"{_COMMANDS_PKG}.groove", help="🎵 Groove template extraction"
+    ),
+    LazyCommandSpec(
+        "recent", f"{_COMMANDS_PKG}.recent", help="📁 Quick access to recent files"
+    ),
+    # Phase 13 Advanced Features
+    LazyCommandSpec(
+        "stems",
+        f"{_COMMANDS_PKG}.stems",
+        help="🎼 AI Stem Separation - Split audio into stems",
+    ),
+    LazyCommandSpec(
+        "midi",
+        f"{_COMMANDS_PKG}.midi",
+        help="🎼 MIDI Extraction - Convert audio to MIDI",
+    ),
+    LazyCommandSpec(
+        "pack",
+        f"{_COMMANDS_PKG}.pack",
+        help="📦 Sample Pack Creator - Organize professional packs",
+    ),
+    LazyCommandSpec(
+        "effects",
+        f"{_COMMANDS_PKG}.effects",
+        help="🎛️  Audio Effects - Professional effects & presets",
+    ),
+    # Phase 11 Semantic Search (FAISS + CLAP)
+    LazyCommandSpec(
+        "semantic",
+        f"{_COMMANDS_PKG}.search",
+        help="🔎 Semantic search — natural language + audio query (FAISS/CLAP)",
+    ),
+    LazyCommandSpec(
+        "index",
+        f"{_COMMANDS_PKG}.search",
+        attr="index_app",
+        help="🗂️  FAISS index management — rebuild, stats, add",
+    ),
 )
 
 # ============================================================================
@@ -71,6 +160,13 @@ from .commands import (
 # ============================================================================
 
 
+def _version_callback(value: bool) -> None:
+    """Print the version and exit before any command group is resolved"""
+    if value:
+        console.print("[bold cyan]SampleMind AI[/bold cyan] v2.1.0-beta")
+        raise typer.Exit()
+
+
 @app.callback()
 def main_callback(
     version: bool = typer.Option(
@@ -78,12 +174,11 @@ def main_callback(
         "--version",
         "-v",
         help="Show version and exit",
+        callback=_version_callback,
+        is_eager=True,
     ),
 ) -> None:
     """SampleMind AI - Professional Audio Analysis & Library Management"""
-    if version:
-        console.print("[bold cyan]SampleMind AI[/bold cyan] v2.1.0-beta")
-        raise typer.Exit()
 
 
 # ============================================================================
@@ -194,79 +289,9 @@ def version():
 
 
 def register_command_groups():
-    """Register all command groups with the main app"""
-
-    # Register command groups - Core (215+ original)
-    app.add_typer(
-        analyze.app,
-        name="analyze",
-        help="🎵 Audio analysis & feature extraction (40 commands)",
-    )
-    app.add_typer(
-        library.app, name="library", help="📁 Sample library management (50 commands)"
-    )
-    app.add_typer(ai.app, name="ai", help="🤖 AI-powered features (30 commands)")
-    app.add_typer(sync.app, name="sync", help="☁️  Sync & Cloud")
-    app.add_typer(
-        metadata.app, name="meta", help="📝 Metadata operations (30 commands)"
-    )
-    app.add_typer(
-        audio.app, name="audio", help="🎙️  Audio processing & conversion (25 commands)"
-    )
-    app.add_typer(
-        visualization.app, name="viz", help="📊 Visualizations & charts (15 commands)"
-    )
-    app.add_typer(
-        reporting.app, name="report", help="📋 Reports & data export (10 commands)"
-    )
-    app.add_typer(
-        similarity.app, name="similar", help="🔍 Sample similarity search (5 commands)"
-    )
-    app.add_typer(
-        theory.app, name="theory", help="🎼 Music theory analysis (4 commands)"
-    )
-    app.add_typer(daw.app, name="daw", help="🎹 DAW integration (4 commands)")
-
-    # Register Phase 10+ Premium Features
-    app.add_typer(tagging.app, name="tag", help="🏷️  AI-powered sample tagging")
-    app.add_typer(
-        mastering.app, name="mastering", help="🎚️  Professional mastering assistant"
-    )
-    app.add_typer(
-        layering.app, name="layer", help="🔀 Sample layering & phase analysis"
-    )
-    app.add_typer(groove.app, name="groove", help="🎵 Groove template extraction")
-    app.add_typer(recent.app, name="recent", help="📁 Quick access to recent files")
-
-    # Register Phase 13 Advanced Features
-    app.add_typer(
-        stems.app, name="stems", help="🎼 AI Stem Separation - Split audio into stems"
-    )
-    app.add_typer(
-        midi.app, name="midi", help="🎼 MIDI Extraction - Convert audio to MIDI"
-    )
-    app.add_typer(
-        pack.app,
-        name="pack",
-        help="📦 Sample Pack Creator - Organize professional packs",
-    )
-    app.add_typer(
-        effects.app,
-        name="effects",
-        help="🎛️  Audio Effects - Professional effects & presets",
-    )
-
-    # Register Phase 11 Semantic Search (FAISS + CLAP)
-    app.add_typer(
-        search.app,
-        name="semantic",
-        help="🔎 Semantic search — natural language + audio query (FAISS/CLAP)",
-    )
-    app.add_typer(
-        search.index_app,
-        name="index",
-        help="🗂️  FAISS index management — rebuild, stats, add",
-    )
+    """Register all command groups with the main app (lazily, by metadata)"""
+    for spec in COMMAND_GROUPS:
+        SampleMindGroup.register(spec)
 
 
 # Register command groups at module load
@@ -463,6 +488,8 @@ def list_commands():
 __all__ = [
     "app",
     "console",
+    "COMMAND_GROUPS",
+    "SampleMindGroup",
     "register_command_groups",
     "create_progress_spinner",
     "run_command_async",
@@ -18,6 +18,8 @@ from textual.widgets import (
     RichLog,
 )
 
+from samplemind.interfaces.tui.search import get_search_engine, to_search_item
+
 
 class LibraryScreen(Screen):
     """Browse the full sample library with filter and search."""
@@ -117,19 +119,37 @@ class LibraryScreen(Screen):
         query = self.query_one("#filter_input", Input).value.strip()
         self._load_library(query)
 
-    @work(thread=True)
-    def _load_library(self, query: str = "") -> None:
+    def _fetch_library(self, query: str = "") -> list[dict]:
+        """Filter through the search index; (re)load and index it otherwise."""
         import asyncio
 
+        engine = get_search_engine()
+        if query and engine.index is not None:
+            return engine.search(None, query, limit=500)
+
+        from samplemind.services.library_service import (  # type: ignore[import]
+            get_library_service,
+        )
+
+        svc = get_library_service()
+        loop = asyncio.new_event_loop()
         try:
-            from samplemind.services.library_service import (  # type: ignore[import]
-                get_library_service,
+            # Unfiltered loads fetch the whole library so the index covers it
+            raw = loop.run_until_complete(
+                svc.list(query=query, limit=500 if query else None)
             )
-
-            svc = get_library_service()
-            loop = asyncio.new_event_loop()
-            items = loop.run_until_complete(svc.list(query=query, limit=500))
+        finally:
             loop.close()
+        items = [to_search_item(item) for item in raw]
+        if not query:
+            engine.build_index(items)
+            items = items[:500]
+        return items
+
+    @work(thread=True)
+    def _load_library(self, query: str = "") -> None:
+        try:
+            items = self._fetch_library(query)
             self.app.call_from_thread(self._populate, items)
         except Exception as exc:
             self.app.call_from_thread(
@@ -139,18 +159,18 @@ class LibraryScreen(Screen):
                 self.query_one("#count_label", Label).update, "Library not available"
             )
 
-    def _populate(self, items: list) -> None:
+    def _populate(self, items: list[dict]) -> None:
         table = self.query_one("#lib_table", DataTable)
         table.clear()
         for item in items:
-            fp = getattr(item, "file_path", str(item))
-            bpm = getattr(item, "tempo", "-")
-            key = getattr(item, "key", "-")
-            genre = getattr(item, "genre", "-")
-            dur = getattr(item, "duration", "-")
+            fp = item.get("file_path", "")
+            bpm = item.get("tempo", "-")
+            key = item.get("key", "-")
+            genre = item.get("genre", "-")
+            dur = item.get("duration", "-")
             if isinstance(dur, float):
                 dur = f"{dur:.1f}s"
-            tags = ", ".join(getattr(item, "tags", []) or [])
+            tags = ", ".join(item.get("tags") or [])
             table.add_row(
                 str(fp)[:60], str(bpm), str(key), str(genre), str(dur), tags[:30]
             )
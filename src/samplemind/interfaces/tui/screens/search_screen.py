@@ -19,6 +19,8 @@ from textual.widgets import (
     Select,
 )
 
+from samplemind.interfaces.tui.search import get_search_engine, to_search_item
+
 _SEARCH_TYPES = [
     ("semantic", "Semantic (AI similarity)"),
     ("bpm", "By BPM range"),
@@ -28,6 +30,17 @@ _SEARCH_TYPES = [
 ]
 
 
+def _index_query(query: str, search_type: str) -> str:
+    """Translate a search-type + query pair into SearchEngine query syntax."""
+    if ":" in query:
+        return query
+    if search_type == "bpm":
+        return f"tempo:{query.replace(' ', '')}"
+    if search_type == "key":
+        return f"key:{query}"
+    return query
+
+
 class SearchScreen(Screen):
     """Vector + metadata based search across the sample library."""
 
@@ -130,6 +143,11 @@ class SearchScreen(Screen):
                         strict=False,
                     )
                 ]
+            elif (engine := get_search_engine()).index is not None:
+                # Library loaded: answer from the in-memory index
+                results = engine.search(
+                    None, _index_query(query, search_type), limit=20
+                )
             else:
                 from samplemind.services.library_service import (  # type: ignore[import]
                     get_library_service,
@@ -147,15 +165,13 @@ class SearchScreen(Screen):
     def _populate_results(self, results: list) -> None:
         table = self.query_one("#results_table", DataTable)
         table.clear()
-        for r in results:
-            fp = getattr(r, "file_path", None) or (
-                r.get("file_path") if isinstance(r, dict) else str(r)
-            )
-            bpm = getattr(r, "tempo", getattr(r, "bpm", "-"))
-            key = getattr(r, "key", "-")
-            genre = getattr(r, "genre", "-")
-            dur = getattr(r, "duration", "-")
-            score = getattr(r, "score", getattr(r, "distance", "-"))
+        for r in map(to_search_item, results):
+            fp = r.get("file_path")
+            bpm = r.get("tempo", "-")
+            key = r.get("key", "-")
+            genre = r.get("genre", "-")
+            dur = r.get("duration", "-")
+            score = r.get("score", r.get("distance", "-"))
             if isinstance(score, float):
                 score = f"{score:.3f}"
             table.add_row(
@@ -7,13 +7,17 @@ from samplemind.interfaces.tui.search.search_engine import (
     SearchFilter,
     SearchQuery,
     get_search_engine,
+    to_search_item,
 )
+from samplemind.interfaces.tui.search.search_index import SearchIndex
 
 __all__ = [
     "SearchEngine",
+    "SearchIndex",
     "SearchQuery",
     "QueryBuilder",
     "SearchFilter",
     "FilterOperator",
     "get_search_engine",
+    "to_search_item",
 ]
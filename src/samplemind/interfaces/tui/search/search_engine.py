@@ -1,13 +1,22 @@
 """
 Advanced Search and Filter Engine for SampleMind TUI
 Support for complex queries with filters and fuzzy matching
+
+The library is searched through a SearchIndex (see search_index.py) built
+with build_index() when it loads and kept current with add_item() /
+remove_item(); passing an explicit item list scans that list instead.
 """
 
+from __future__ import annotations
+
 import logging
 import re
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from samplemind.interfaces.tui.search.search_index import SearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -153,30 +162,73 @@ class SearchEngine:
     def __init__(self) -> None:
         """Initialize search engine"""
         self.saved_searches: dict[str, SearchQuery] = {}
+        self.index: SearchIndex | None = None
+
+    def build_index(
+        self, items: list[dict[str, Any]], key_field: str = "file_path"
+    ) -> SearchIndex:
+        """Index the library; later search(None, query) calls use it"""
+        from samplemind.interfaces.tui.search.search_index import SearchIndex
+
+        index = SearchIndex(key_field=key_field)
+        index.build(items)
+        self.index = index
+        return index
+
+    def add_item(self, item: dict[str, Any]) -> None:
+        """Add or replace one library item in the index"""
+        if self.index is not None:
+            self.index.add(item)
+
+    def update_item(self, item: dict[str, Any]) -> None:
+        """Re-index a changed library item"""
+        self.add_item(item)
+
+    def remove_item(self, key: Any) -> bool:
+        """Remove a library item from the index by its key field"""
+        return self.index.remove(key) if self.index is not None else False
 
     def search(
         self,
-        items: list[dict[str, Any]],
+        items: list[dict[str, Any]] | None,
         query: str,
         fields: list[str] | None = None,
         fuzzy: bool = False,
         threshold: float = 0.8,
+        limit: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search items with query and optional fuzzy matching
 
         Args:
-            items: List of items to search
+            items: List of items to search, or None for the indexed library
             query: Query string
             fields: Fields to search in (for text search)
             fuzzy: Enable fuzzy matching
             threshold: Fuzzy match threshold (0-1)
+            limit: Maximum number of results
 
         Returns:
-            List of matching items
+            List of matching items (ranked by relevance when using the index)
         """
+        if items is None:
+            if self.index is None:
+                raise RuntimeError("No search index built. Call build_index() first.")
+            if fields is None:
+                if not query:
+                    return self.index.items[:limit]
+                return self.index.search(
+                    query,
+                    fuzzy=fuzzy,
+                    threshold=threshold,
+                    limit=limit,
+                    fuzzy_scorer=self._calculate_fuzzy_score,
+                )
+            # Field-restricted text search is not indexed: scan the library
+            items = self.index.items
+
         if not query:
-            return items
+            return items if limit is None else items[:limit]
 
         search_query = SearchQuery(query)
         results = []
@@ -199,6 +251,8 @@ class SearchEngine:
                     continue
 
             results.append(item)
+            if limit is not None and len(results) >= limit:
+                break
 
         return results
 
@@ -285,22 +339,22 @@ class QueryBuilder:
         """Initialize query builder"""
         self.conditions: list[str] = []
 
-    def add_tempo_range(self, min_tempo: float, max_tempo: float) -> "QueryBuilder":
+    def add_tempo_range(self, min_tempo: float, max_tempo: float) -> QueryBuilder:
         """Add tempo range filter"""
         self.conditions.append(f"tempo:{min_tempo}-{max_tempo}")
         return self
 
-    def add_key(self, key: str) -> "QueryBuilder":
+    def add_key(self, key: str) -> QueryBuilder:
         """Add key filter"""
         self.conditions.append(f"key:{key}")
         return self
 
-    def add_duration_range(self, min_sec: float, max_sec: float) -> "QueryBuilder":
+    def add_duration_range(self, min_sec: float, max_sec: float) -> QueryBuilder:
         """Add duration range filter"""
         self.conditions.append(f"duration:{min_sec}-{max_sec}")
         return self
 
-    def add_text(self, text: str) -> "QueryBuilder":
+    def add_text(self, text: str) -> QueryBuilder:
         """Add text search"""
         self.conditions.append(text)
         return self
@@ -314,6 +368,42 @@ class QueryBuilder:
         self.conditions = []
 
 
+# Library fields copied from service objects into indexable items
+LIBRARY_FIELDS = (
+    "file_path",
+    "filename",
+    "name",
+    "tempo",
+    "bpm",
+    "duration",
+    "key",
+    "genre",
+    "mood",
+    "instrument",
+    "category",
+    "tags",
+    "score",
+)
+
+
+def to_search_item(item: Any) -> dict[str, Any]:
+    """Plain dict view of a library sample, as build_index() expects"""
+    if isinstance(item, dict):
+        data = dict(item)
+    else:
+        data = {
+            name: getattr(item, name)
+            for name in LIBRARY_FIELDS
+            if getattr(item, name, None) is not None
+        }
+    file_path = data.get("file_path")
+    if file_path and not data.get("filename"):
+        data["filename"] = re.split(r"[\\/]", str(file_path))[-1]
+    if data.get("tempo") is None and data.get("bpm") is not None:
+        data["tempo"] = data["bpm"]
+    return data
+
+
 # Global singleton instance
 _search_engine: SearchEngine | None = None
 
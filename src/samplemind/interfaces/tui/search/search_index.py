@@ -0,0 +1,546 @@
+"""
+Search Index for the SampleMind TUI library
+
+Built once when the library loads and updated per sample afterwards, so
+search-as-you-type does not rescan the library on every keystroke:
+
+  - inverted index: token -> (doc ids, field weights), with prefix
+    expansion through a sorted vocabulary
+  - trigram index over the vocabulary: substring and typo-tolerant
+    candidates without comparing against every token
+  - numeric range indexes (tempo/bpm, duration) answered with searchsorted
+  - categorical index for musical key
+  - ranked scoring: exact > prefix > substring > fuzzy, weighted by field
+
+Removed samples are tombstoned and compacted away once they pile up.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import logging
+import re
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import numpy as np
+
+from samplemind.interfaces.tui.search.search_engine import (
+    FilterOperator,
+    SearchFilter,
+    SearchQuery,
+)
+
+logger = logging.getLogger(__name__)
+
+# Text fields and their ranking weights
+DEFAULT_TEXT_FIELDS: dict[str, float] = {
+    "filename": 1.0,
+    "name": 1.0,
+    "title": 1.0,
+    "tags": 0.8,
+    "genre": 0.7,
+    "category": 0.7,
+    "instrument": 0.7,
+    "mood": 0.6,
+    "key": 0.5,
+    "file_path": 0.3,
+}
+NUMERIC_FIELDS = ("tempo", "bpm", "duration")
+CATEGORICAL_FIELDS = ("key",)
+
+# Match-kind multipliers
+EXACT_WEIGHT = 3.0
+PREFIX_WEIGHT = 2.0
+SUBSTRING_WEIGHT = 1.0
+FUZZY_WEIGHT = 1.0
+
+# Vocabulary tokens considered per query term (most frequent first)
+MAX_EXPANSIONS = 512
+# Trigram similarity needed before the fuzzy scorer is consulted
+MIN_TRIGRAM_SIMILARITY = 0.2
+# Pending numeric values merged into the sorted arrays beyond this size
+NUMERIC_MERGE_THRESHOLD = 1024
+# Compact when this fraction of doc slots are tombstones
+COMPACT_RATIO = 0.25
+
+_TOKEN_RE = re.compile(r"[a-z0-9#]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens of *text* ('#' kept for keys like F#)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(token: str) -> set[str]:
+    padded = f"${token}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _inner_trigrams(token: str) -> set[str]:
+    return {token[i : i + 3] for i in range(len(token) - 2)}
+
+
+class _NumericIndex:
+    """Sorted (value, doc) arrays plus a small unsorted tail for new docs."""
+
+    def __init__(self) -> None:
+        self._values = np.empty(0, dtype=np.float64)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._pending: list[tuple[float, int]] = []
+
+    def add(self, value: float, doc_id: int) -> None:
+        self._pending.append((value, doc_id))
+        if len(self._pending) > NUMERIC_MERGE_THRESHOLD:
+            self.merge()
+
+    def merge(self) -> None:
+        if not self._pending:
+            return
+        values = np.concatenate([self._values, [v for v, _ in self._pending]])
+        ids = np.concatenate([self._ids, [i for _, i in self._pending]])
+        order = np.argsort(values, kind="stable")
+        self._values, self._ids = values[order], ids[order].astype(np.int64)
+        self._pending = []
+
+    def remap(self, new_ids: np.ndarray) -> None:
+        """Apply a compaction mapping (old id -> new id, -1 = dropped)."""
+        self.merge()
+        mapped = new_ids[self._ids]
+        keep = mapped >= 0
+        self._values, self._ids = self._values[keep], mapped[keep]
+
+    def select(self, operator: FilterOperator, value: float, n_docs: int) -> np.ndarray:
+        """Boolean doc mask for `field <operator> value`."""
+        lo, hi = {
+            FilterOperator.GREATER_EQUAL: ("left", None),
+            FilterOperator.GREATER_THAN: ("right", None),
+            FilterOperator.LESS_EQUAL: (None, "right"),
+            FilterOperator.LESS_THAN: (None, "left"),
+            FilterOperator.EQUALS: ("left", "right"),
+            FilterOperator.NOT_EQUALS: ("left", "right"),
+        }[operator]
+        start = np.searchsorted(self._values, value, side=lo) if lo else 0
+        stop = (
+            np.searchsorted(self._values, value, side=hi) if hi else len(self._values)
+        )
+
+        mask = np.zeros(n_docs, dtype=bool)
+        mask[self._ids[start:stop]] = True
+        if self._pending:
+            # The range above is for equality when negating
+            tail_operator = (
+                FilterOperator.EQUALS
+                if operator is FilterOperator.NOT_EQUALS
+                else operator
+            )
+            probe = SearchFilter("", tail_operator, value)
+            mask[[i for v, i in self._pending if probe.matches(v)]] = True
+        if operator is FilterOperator.NOT_EQUALS:
+            # Docs without a value never match (as with SearchFilter.matches)
+            present = np.zeros(n_docs, dtype=bool)
+            present[self._ids] = True
+            present[[i for _, i in self._pending]] = True
+            return present & ~mask
+        return mask
+
+
+def _as_number(value: Any) -> float | None:
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(number) else number
+
+
+class SearchIndex:
+    """
+    Incrementally maintained search index over library items (dicts).
+
+    Items are identified by ``key_field`` (default: file_path) for update
+    and removal.  Not thread-safe: build and mutate from one thread.
+    """
+
+    def __init__(
+        self,
+        key_field: str = "file_path",
+        text_fields: dict[str, float] | None = None,
+    ) -> None:
+        self.key_field = key_field
+        self.text_fields = dict(text_fields or DEFAULT_TEXT_FIELDS)
+        self._items: list[dict[str, Any] | None] = []
+        self._doc_of: dict[Any, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._removed = 0
+        # token -> (doc ids, weights); arrays cached until the token changes
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._posting_arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._vocabulary: list[str] = []
+        self._new_tokens: list[str] = []
+        self._trigram_index: dict[str, set[str]] = {}
+        self._numeric = {field: _NumericIndex() for field in NUMERIC_FIELDS}
+        self._categorical: dict[str, dict[Any, set[int]]] = {
+            field: {} for field in CATEGORICAL_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    @property
+    def items(self) -> list[dict[str, Any]]:
+        """Indexed items in insertion order."""
+        return [item for item in self._items if item is not None]
+
+    # ── Building / maintenance ───────────────────────────────────────────────
+
+    def build(self, items: Iterable[dict[str, Any]]) -> None:
+        """Index *items* (appended to anything already indexed)."""
+        for item in items:
+            key = item.get(self.key_field)
+            if key is not None and key in self._doc_of:
+                self._alive = self._grow_alive()
+                self.remove(key)
+            self._add(item)
+        self._alive = self._grow_alive()
+        self._merge_vocabulary()
+        for numeric in self._numeric.values():
+            numeric.merge()
+        # Materialize posting arrays now rather than on the first keystroke
+        for token in self._postings:
+            self._arrays(token)
+        logger.info(
+            f"Search index built: {len(self)} items, {len(self._vocabulary)} tokens"
+        )
+
+    def add(self, item: dict[str, Any]) -> int:
+        """Index one item, replacing any item with the same key."""
+        key = item.get(self.key_field)
+        if key is not None and key in self._doc_of:
+            self.remove(key)
+        doc_id = self._add(item)
+        self._alive = self._grow_alive()
+        self._merge_vocabulary()
+        return doc_id
+
+    def update(self, item: dict[str, Any]) -> int:
+        return self.add(item)
+
+    def remove(self, key: Any) -> bool:
+        """Drop the item with *key*; returns False if it is not indexed."""
+        doc_id = self._doc_of.pop(key, None)
+        if doc_id is None:
+            return False
+        item = self._items[doc_id]
+        self._items[doc_id] = None
+        self._alive[doc_id] = False
+        self._removed += 1
+        for field, index in self._categorical.items():
+            for value in self._values_of(item, field):
+                members = index.get(value)
+                if members is not None:
+                    members.discard(doc_id)
+                    if not members:
+                        del index[value]
+        if self._removed > COMPACT_RATIO * len(self._items):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Drop tombstoned slots and renumber docs."""
+        if not self._removed:
+            return
+        alive = self._grow_alive()
+        new_ids = np.full(len(self._items), -1, dtype=np.int64)
+        new_ids[alive] = np.arange(int(alive.sum()))
+
+        self._items = [item for item in self._items if item is not None]
+        self._doc_of = {k: int(new_ids[d]) for k, d in self._doc_of.items()}
+        for token, (ids, weights) in list(self._postings.items()):
+            old = np.frombuffer(ids, dtype=np.int32)
+            mapped = new_ids[old]
+            keep = mapped >= 0
+            if not keep.any():
+                self._drop_token(token)
+                continue
+            self._postings[token] = (
+                array("i", mapped[keep].astype(np.int32).tobytes()),
+                array("f", np.frombuffer(weights, dtype=np.float32)[keep].tobytes()),
+            )
+        self._posting_arrays.clear()
+        for numeric in self._numeric.values():
+            numeric.remap(new_ids)
+        for index in self._categorical.values():
+            for value, members in index.items():
+                index[value] = {int(new_ids[d]) for d in members}
+        self._removed = 0
+        self._alive = np.ones(len(self._items), dtype=bool)
+
+    def _grow_alive(self) -> np.ndarray:
+        n = len(self._items)
+        if len(self._alive) == n:
+            return self._alive
+        alive = np.zeros(n, dtype=bool)
+        alive[: len(self._alive)] = self._alive
+        alive[len(self._alive) :] = [
+            it is not None for it in self._items[len(self._alive) :]
+        ]
+        return alive
+
+    def _add(self, item: dict[str, Any]) -> int:
+        doc_id = len(self._items)
+        self._items.append(item)
+        key = item.get(self.key_field)
+        self._doc_of[key if key is not None else ("__doc__", doc_id)] = doc_id
+
+        weights: dict[str, float] = {}
+        for field, field_weight in self.text_fields.items():
+            for value in self._values_of(item, field):
+                for token in tokenize(str(value)):
+                    if field_weight > weights.get(token, 0.0):
+                        weights[token] = field_weight
+        for token, weight in weights.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = (array("i"), array("f"))
+                self._new_tokens.append(token)
+                for gram in _trigrams(token):
+                    self._trigram_index.setdefault(gram, set()).add(token)
+            posting[0].append(doc_id)
+            posting[1].append(weight)
+            self._posting_arrays.pop(token, None)
+
+        for field, numeric in self._numeric.items():
+            number = _as_number(item.get(field))
+            if number is not None:
+                numeric.add(number, doc_id)
+        for field, index in self._categorical.items():
+            for value in self._values_of(item, field):
+                index.setdefault(value, set()).add(doc_id)
+        return doc_id
+
+    def _merge_vocabulary(self) -> None:
+        if len(self._new_tokens) > 64:
+            self._vocabulary = sorted(self._vocabulary + self._new_tokens)
+        else:
+            for token in self._new_tokens:
+                bisect.insort(self._vocabulary, token)
+        self._new_tokens = []
+
+    def _drop_token(self, token: str) -> None:
+        del self._postings[token]
+        self._posting_arrays.pop(token, None)
+        position = bisect.bisect_left(self._vocabulary, token)
+        if position < len(self._vocabulary) and self._vocabulary[position] == token:
+            del self._vocabulary[position]
+        elif token in self._new_tokens:
+            # Added and dropped within one batch, before the vocabulary merge
+            self._new_tokens.remove(token)
+        for gram in _trigrams(token):
+            tokens = self._trigram_index.get(gram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._trigram_index[gram]
+
+    @staticmethod
+    def _values_of(item: dict[str, Any], field: str) -> list[Any]:
+        value = item.get(field)
+        if value is None or value == "":
+            return []
+        if isinstance(value, (list, tuple, set)):
+            return [v for v in value if v is not None and v != ""]
+        return [value]
+
+    def _arrays(self, token: str) -> tuple[np.ndarray, np.ndarray]:
+        cached = self._posting_arrays.get(token)
+        if cached is None:
+            ids, weights = self._postings[token]
+            cached = (
+                np.array(ids, dtype=np.int64),
+                np.array(weights, dtype=np.float32),
+            )
+            self._posting_arrays[token] = cached
+        return cached
+
+    # ── Querying ─────────────────────────────────────────────────────────────
+
+    def search(
+        self,
+        query: str | SearchQuery,
+        fuzzy: bool = False,
+        threshold: float = 0.8,
+        limit: int | None = None,
+        fuzzy_scorer: Callable[[str, str], float] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Ranked items matching *query* (filters plus free text).
+
+        Every text term must match some token of an item (as a prefix,
+        substring or — with *fuzzy* — a typo within *threshold* of the
+        fuzzy scorer).  Without free text, results keep insertion order.
+        """
+        parsed = query if isinstance(query, SearchQuery) else SearchQuery(query)
+        n_docs = len(self._items)
+        mask = self._alive.copy()
+
+        deferred: list[SearchFilter] = []
+        for search_filter in parsed.filters:
+            field_mask = self._filter_mask(search_filter, n_docs)
+            if field_mask is None:
+                deferred.append(search_filter)
+            else:
+                mask &= field_mask
+
+        scores: np.ndarray | None = None
+        terms = tokenize(parsed.text_search or "")
+        if terms:
+            scores = np.zeros(n_docs, dtype=np.float32)
+            for term in terms:
+                term_scores = self._term_scores(
+                    term, n_docs, fuzzy, threshold, fuzzy_scorer
+                )
+                mask &= term_scores > 0
+                scores += term_scores
+        elif parsed.text_search:
+            # Text made only of separators: nothing can match
+            return []
+
+        doc_ids = np.flatnonzero(mask)
+        if scores is not None and len(doc_ids):
+            # Stable sort keeps insertion order among equal scores
+            doc_ids = doc_ids[np.argsort(-scores[doc_ids], kind="stable")]
+
+        results: list[dict[str, Any]] = []
+        for doc_id in doc_ids:
+            item = self._items[doc_id]
+            if deferred and not all(f.matches(item.get(f.field)) for f in deferred):
+                continue
+            results.append(item)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def _filter_mask(
+        self, search_filter: SearchFilter, n_docs: int
+    ) -> np.ndarray | None:
+        """Index-backed mask for one filter, or None if it needs a per-item check."""
+        field, operator, value = (
+            search_filter.field,
+            search_filter.operator,
+            search_filter.value,
+        )
+        numeric = self._numeric.get(field)
+        if numeric is not None:
+            number = _as_number(value)
+            if number is None and operator is FilterOperator.EQUALS:
+                # Incomplete input such as "tempo:120-" equals no number
+                return np.zeros(n_docs, dtype=bool)
+            if number is not None and operator in (
+                FilterOperator.EQUALS,
+                FilterOperator.NOT_EQUALS,
+                FilterOperator.GREATER_THAN,
+                FilterOperator.GREATER_EQUAL,
+                FilterOperator.LESS_THAN,
+                FilterOperator.LESS_EQUAL,
+            ):
+                return numeric.select(operator, number, n_docs)
+            return None
+
+        index = self._categorical.get(field)
+        if index is None:
+            return None
+        if operator in (FilterOperator.EQUALS, FilterOperator.NOT_EQUALS):
+            wanted = [value]
+        elif operator in (FilterOperator.IN, FilterOperator.NOT_IN):
+            wanted = list(value)
+        else:
+            return None
+        mask = np.zeros(n_docs, dtype=bool)
+        for v in wanted:
+            members = index.get(v)
+            if members:
+                mask[list(members)] = True
+        if operator in (FilterOperator.NOT_EQUALS, FilterOperator.NOT_IN):
+            present = np.zeros(n_docs, dtype=bool)
+            for members in index.values():
+                present[list(members)] = True
+            mask = present & ~mask
+        return mask
+
+    def _term_scores(
+        self,
+        term: str,
+        n_docs: int,
+        fuzzy: bool,
+        threshold: float,
+        fuzzy_scorer: Callable[[str, str], float] | None,
+    ) -> np.ndarray:
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for token, weight in self._expand(term, fuzzy, threshold, fuzzy_scorer).items():
+            ids, field_weights = self._arrays(token)
+            # A doc scores its best-matching token (ids are unique per token)
+            scores[ids] = np.maximum(scores[ids], field_weights * weight)
+        return scores
+
+    def _expand(
+        self,
+        term: str,
+        fuzzy: bool,
+        threshold: float,
+        fuzzy_scorer: Callable[[str, str], float] | None,
+    ) -> dict[str, float]:
+        """Vocabulary tokens matching *term*, with match-kind weights."""
+        matches: dict[str, float] = {}
+
+        # Prefix (covers exact): contiguous range of the sorted vocabulary
+        start = bisect.bisect_left(self._vocabulary, term)
+        stop = bisect.bisect_left(self._vocabulary, term + "\uffff")
+        prefixed = self._vocabulary[start:stop]
+        if len(prefixed) > MAX_EXPANSIONS:
+            # Short prefixes ("1", "s"): keep the closest (shortest) tokens
+            prefixed = heapq.nsmallest(MAX_EXPANSIONS, prefixed, key=len)
+        for token in prefixed:
+            matches[token] = (
+                EXACT_WEIGHT
+                if token == term
+                else PREFIX_WEIGHT * (0.5 + 0.5 * len(term) / len(token))
+            )
+
+        # Substring: tokens holding every inner trigram of the term
+        if len(term) >= 3:
+            gram_sets = sorted(
+                (self._trigram_index.get(g, set()) for g in _inner_trigrams(term)),
+                key=len,
+            )
+            candidates = set(gram_sets[0]).intersection(*gram_sets[1:])
+            for token in candidates:
+                if token not in matches and term in token:
+                    matches[token] = SUBSTRING_WEIGHT
+
+        # Fuzzy: trigram overlap, then the fuzzy scorer decides
+        if fuzzy and len(term) >= 3 and fuzzy_scorer is not None:
+            term_grams = _trigrams(term)
+            shared = Counter(
+                token for g in term_grams for token in self._trigram_index.get(g, ())
+            )
+            for token, n_shared in shared.items():
+                if token in matches:
+                    continue
+                similarity = n_shared / (len(term_grams) + len(token) - n_shared)
+                if similarity < MIN_TRIGRAM_SIMILARITY:
+                    continue
+                score = fuzzy_scorer(term, token)
+                if score >= threshold:
+                    matches[token] = FUZZY_WEIGHT * score
+
+        if len(matches) > MAX_EXPANSIONS:
+            ranked = sorted(
+                matches, key=lambda t: (-matches[t], -len(self._postings[t][0]))
+            )
+            matches = {t: matches[t] for t in ranked[:MAX_EXPANSIONS]}
+        return matches
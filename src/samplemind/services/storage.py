@@ -1,14 +1,26 @@
 """
 Storage Service
 Handles file operations across different storage providers (Local, Cloud, etc.)
+
+Besides single-file operations, providers expose the bulk/transfer
+capabilities the sync engine relies on:
+- list_manifest(): metadata for a whole prefix in one listing
+- multipart uploads (create / upload_part / list_parts / complete / abort)
+  so large files are sent in chunks and can resume after an interruption
+- read_range(): ranged reads for chunked, resumable downloads
 """
 
 import abc
 import asyncio
+import hashlib
 import logging
+import os
 import shutil
+import time
+import uuid
+from collections import Counter
 from pathlib import Path
-from typing import BinaryIO, TypedDict
+from typing import Any, BinaryIO, TypedDict
 
 logger = logging.getLogger(__name__)
 
@@ -51,10 +63,62 @@ class StorageProvider(abc.ABC):
         """Delete file from storage"""
         pass
 
+    # -- Bulk listing ------------------------------------------------------
+
+    async def list_manifest(self, prefix: str = "") -> dict[str, FileMetadata]:
+        """
+        Metadata for every file under *prefix*, keyed by remote path.
+
+        The default costs one get_metadata round trip per file; providers
+        override it with a single listing.
+        """
+        paths = await self.list_files(prefix)
+        metadata = await asyncio.gather(*(self.get_metadata(p) for p in paths))
+        return {p: m for p, m in zip(paths, metadata, strict=False) if m is not None}
+
+    # -- Chunked transfers (optional) --------------------------------------
+
+    supports_multipart: bool = False
+    supports_range_reads: bool = False
+
+    async def create_multipart_upload(self, remote_path: str) -> str:
+        """Start a multipart upload and return its upload id"""
+        raise NotImplementedError
+
+    async def upload_part(
+        self, remote_path: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        """Upload one part (1-based) and return its ETag"""
+        raise NotImplementedError
+
+    async def list_parts(self, remote_path: str, upload_id: str) -> dict[int, str]:
+        """Parts already stored for an upload: part number -> ETag"""
+        raise NotImplementedError
+
+    async def complete_multipart_upload(
+        self, remote_path: str, upload_id: str, parts: dict[int, str]
+    ) -> None:
+        """Assemble uploaded parts into the final object"""
+        raise NotImplementedError
+
+    async def abort_multipart_upload(self, remote_path: str, upload_id: str) -> None:
+        """Discard an unfinished multipart upload"""
+        raise NotImplementedError
+
+    async def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        """Read *length* bytes of a stored file starting at *start*"""
+        raise NotImplementedError
+
 
 class LocalStorageProvider(StorageProvider):
     """Local filesystem 'cloud' storage (for testing/dev)"""
 
+    supports_multipart = True
+    supports_range_reads = True
+
+    # Staging area for multipart uploads, excluded from listings
+    MULTIPART_DIR = ".multipart"
+
     def __init__(self, root_dir: Path) -> None:
         self.root_dir = Path(root_dir).resolve()
         self.root_dir.mkdir(parents=True, exist_ok=True)
@@ -75,8 +139,13 @@ class LocalStorageProvider(StorageProvider):
         self, content: BinaryIO | bytes | Path, remote_path: str
     ) -> str:
         dest_path = self.root_dir / remote_path
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self._write, content, dest_path)
+        logger.info(f"Uploaded to local storage: {remote_path}")
+        return str(dest_path)
 
+    @staticmethod
+    def _write(content: BinaryIO | bytes | Path, dest_path: Path) -> None:
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
         if isinstance(content, Path) or isinstance(content, str):
             shutil.copy2(content, dest_path)
         elif isinstance(content, bytes):
@@ -87,29 +156,37 @@ class LocalStorageProvider(StorageProvider):
             with open(dest_path, "wb") as f:
                 shutil.copyfileobj(content, f)
 
-        logger.info(f"Uploaded to local storage: {remote_path}")
-        return str(dest_path)
-
     async def download_file(self, remote_path: str, local_path: Path) -> bool:
         src_path = self.root_dir / remote_path
         if not src_path.exists():
             return False
 
         local_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src_path, local_path)
+        await asyncio.to_thread(shutil.copy2, src_path, local_path)
         return True
 
     async def list_files(self, prefix: str = "") -> list[str]:
-        files = []
+        return list(await self.list_manifest(prefix))
+
+    async def list_manifest(self, prefix: str = "") -> dict[str, FileMetadata]:
+        return await asyncio.to_thread(self._scan, prefix)
+
+    def _scan(self, prefix: str) -> dict[str, FileMetadata]:
         search_dir = self.root_dir / prefix
         if not search_dir.exists():
-            return []
-
-        for path in search_dir.rglob("*"):
-            if path.is_file():
-                rel_path = path.relative_to(self.root_dir)
-                files.append(str(rel_path))
-        return files
+            return {}
+
+        manifest: dict[str, FileMetadata] = {}
+        for dirpath, dirnames, filenames in os.walk(search_dir):
+            dirnames[:] = [d for d in dirnames if d != self.MULTIPART_DIR]
+            for name in filenames:
+                path = Path(dirpath) / name
+                stat = path.stat()
+                rel_path = path.relative_to(self.root_dir).as_posix()
+                manifest[rel_path] = FileMetadata(
+                    size=stat.st_size, mtime=stat.st_mtime, hash=None
+                )
+        return manifest
 
     async def delete_file(self, remote_path: str) -> bool:
         path = self.root_dir / remote_path
@@ -118,35 +195,170 @@ class LocalStorageProvider(StorageProvider):
             return True
         return False
 
+    # -- Multipart / ranged reads -------------------------------------------
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        return self.root_dir / self.MULTIPART_DIR / upload_id
+
+    async def create_multipart_upload(self, remote_path: str) -> str:
+        upload_id = uuid.uuid4().hex
+        self._upload_dir(upload_id).mkdir(parents=True)
+        return upload_id
+
+    async def upload_part(
+        self, remote_path: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        part = self._upload_dir(upload_id) / f"{part_number:05d}"
+        await asyncio.to_thread(part.write_bytes, data)
+        return hashlib.md5(data).hexdigest()
+
+    async def list_parts(self, remote_path: str, upload_id: str) -> dict[int, str]:
+        upload_dir = self._upload_dir(upload_id)
+        if not upload_dir.exists():
+            raise KeyError(f"Unknown upload id: {upload_id}")
+        return {
+            int(part.name): hashlib.md5(part.read_bytes()).hexdigest()
+            for part in upload_dir.iterdir()
+        }
+
+    async def complete_multipart_upload(
+        self, remote_path: str, upload_id: str, parts: dict[int, str]
+    ) -> None:
+        await asyncio.to_thread(self._assemble, remote_path, upload_id, parts)
+
+    def _assemble(
+        self, remote_path: str, upload_id: str, parts: dict[int, str]
+    ) -> None:
+        upload_dir = self._upload_dir(upload_id)
+        dest_path = self.root_dir / remote_path
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest_path.with_name(dest_path.name + f".{upload_id}")
+        with open(tmp_path, "wb") as out:
+            for number in sorted(parts):
+                with open(upload_dir / f"{number:05d}", "rb") as part:
+                    shutil.copyfileobj(part, out)
+        os.replace(tmp_path, dest_path)
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+    async def abort_multipart_upload(self, remote_path: str, upload_id: str) -> None:
+        shutil.rmtree(self._upload_dir(upload_id), ignore_errors=True)
+
+    async def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        def _read() -> bytes:
+            with open(self.root_dir / remote_path, "rb") as f:
+                f.seek(start)
+                return f.read(length)
+
+        return await asyncio.to_thread(_read)
+
 
 class MockS3StorageProvider(StorageProvider):
-    """Mock S3 Provider (Skeleton)"""
+    """
+    In-memory S3 stand-in for development and tests
+
+    Objects live in a dict; ``calls`` counts requests per operation so
+    callers can check how many round trips an operation costs.
+    """
+
+    supports_multipart = True
+    supports_range_reads = True
 
     def __init__(self, bucket_name: str, region: str = "us-east-1") -> None:
         self.bucket = bucket_name
         self.region = region
+        self._objects: dict[str, bytes] = {}
+        self._mtimes: dict[str, float] = {}
+        self._uploads: dict[str, dict[int, bytes]] = {}
+        self.calls: Counter[str] = Counter()
         logger.info(f"Initialized Mock S3 Provider: {bucket_name}")
 
+    def _metadata(self, remote_path: str) -> FileMetadata:
+        data = self._objects[remote_path]
+        return FileMetadata(
+            size=len(data),
+            mtime=self._mtimes[remote_path],
+            hash=hashlib.sha256(data).hexdigest(),
+        )
+
+    def _put(self, remote_path: str, data: bytes) -> None:
+        self._objects[remote_path] = data
+        self._mtimes[remote_path] = time.time()
+
     async def get_metadata(self, remote_path: str) -> FileMetadata | None:
-        # In a real mock, this would check an internal dict
-        return None
+        self.calls["get_metadata"] += 1
+        if remote_path not in self._objects:
+            return None
+        return self._metadata(remote_path)
 
     async def upload_file(
         self, content: BinaryIO | bytes | Path, remote_path: str
     ) -> str:
-        logger.info(f"[MOCK] Uploading to S3://{self.bucket}/{remote_path}")
+        self.calls["upload_file"] += 1
+        if isinstance(content, Path) or isinstance(content, str):
+            data = await asyncio.to_thread(Path(content).read_bytes)
+        elif isinstance(content, bytes):
+            data = content
+        else:
+            data = content.read()
+        self._put(remote_path, data)
+        logger.debug(f"[MOCK] Uploaded to S3://{self.bucket}/{remote_path}")
         return f"s3://{self.bucket}/{remote_path}"
 
     async def download_file(self, remote_path: str, local_path: Path) -> bool:
-        logger.info(f"[MOCK] Downloading from S3://{self.bucket}/{remote_path}")
+        self.calls["download_file"] += 1
+        if remote_path not in self._objects:
+            return False
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(local_path.write_bytes, self._objects[remote_path])
         return True
 
     async def list_files(self, prefix: str = "") -> list[str]:
-        return []
+        self.calls["list"] += 1
+        return [p for p in self._objects if p.startswith(prefix)]
+
+    async def list_manifest(self, prefix: str = "") -> dict[str, FileMetadata]:
+        self.calls["list"] += 1
+        return {p: self._metadata(p) for p in self._objects if p.startswith(prefix)}
 
     async def delete_file(self, remote_path: str) -> bool:
-        logger.info(f"[MOCK] Deleting s3://{self.bucket}/{remote_path}")
-        return True
+        self.calls["delete_file"] += 1
+        self._mtimes.pop(remote_path, None)
+        return self._objects.pop(remote_path, None) is not None
+
+    async def create_multipart_upload(self, remote_path: str) -> str:
+        self.calls["create_multipart_upload"] += 1
+        upload_id = uuid.uuid4().hex
+        self._uploads[upload_id] = {}
+        return upload_id
+
+    async def upload_part(
+        self, remote_path: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        self.calls["upload_part"] += 1
+        self._uploads[upload_id][part_number] = bytes(data)
+        return hashlib.md5(data).hexdigest()
+
+    async def list_parts(self, remote_path: str, upload_id: str) -> dict[int, str]:
+        self.calls["list_parts"] += 1
+        return {
+            n: hashlib.md5(data).hexdigest()
+            for n, data in self._uploads[upload_id].items()
+        }
+
+    async def complete_multipart_upload(
+        self, remote_path: str, upload_id: str, parts: dict[int, str]
+    ) -> None:
+        self.calls["complete_multipart_upload"] += 1
+        stored = self._uploads.pop(upload_id)
+        self._put(remote_path, b"".join(stored[n] for n in sorted(parts)))
+
+    async def abort_multipart_upload(self, remote_path: str, upload_id: str) -> None:
+        self.calls["abort_multipart_upload"] += 1
+        self._uploads.pop(upload_id, None)
+
+    async def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        self.calls["read_range"] += 1
+        return self._objects[remote_path][start : start + length]
 
 
 class S3StorageProvider(StorageProvider):
@@ -260,3 +472,99 @@ class S3StorageProvider(StorageProvider):
         except self.ClientError as e:
             logger.error(f"S3 Delete Error: {e}")
             return False
+
+    async def list_manifest(self, prefix: str = "") -> dict[str, FileMetadata]:
+        try:
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+
+            def _list() -> dict[str, FileMetadata]:
+                manifest: dict[str, FileMetadata] = {}
+                for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+                    for obj in page.get("Contents", []):
+                        manifest[obj["Key"]] = FileMetadata(
+                            size=obj["Size"],
+                            mtime=obj["LastModified"].timestamp(),
+                            hash=obj.get("ETag", "").strip('"'),
+                        )
+                return manifest
+
+            return await asyncio.to_thread(_list)
+
+        except self.ClientError as e:
+            logger.error(f"S3 List Error: {e}")
+            return {}
+
+    # -- Multipart / ranged reads -------------------------------------------
+
+    supports_multipart = True
+    supports_range_reads = True
+
+    async def create_multipart_upload(self, remote_path: str) -> str:
+        response = await asyncio.to_thread(
+            self.s3_client.create_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=remote_path,
+        )
+        return response["UploadId"]
+
+    async def upload_part(
+        self, remote_path: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        response = await asyncio.to_thread(
+            self.s3_client.upload_part,
+            Bucket=self.bucket_name,
+            Key=remote_path,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return response["ETag"]
+
+    async def list_parts(self, remote_path: str, upload_id: str) -> dict[int, str]:
+        paginator = self.s3_client.get_paginator("list_parts")
+
+        def _list() -> dict[int, str]:
+            parts: dict[int, str] = {}
+            for page in paginator.paginate(
+                Bucket=self.bucket_name, Key=remote_path, UploadId=upload_id
+            ):
+                for part in page.get("Parts", []):
+                    parts[part["PartNumber"]] = part["ETag"]
+            return parts
+
+        return await asyncio.to_thread(_list)
+
+    async def complete_multipart_upload(
+        self, remote_path: str, upload_id: str, parts: dict[int, str]
+    ) -> None:
+        await asyncio.to_thread(
+            self.s3_client.complete_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=remote_path,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [{"PartNumber": n, "ETag": parts[n]} for n in sorted(parts)]
+            },
+        )
+
+    async def abort_multipart_upload(self, remote_path: str, upload_id: str) -> None:
+        try:
+            await asyncio.to_thread(
+                self.s3_client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=remote_path,
+                UploadId=upload_id,
+            )
+        except self.ClientError as e:
+            logger.warning(f"S3 Abort Multipart Error: {e}")
+
+    async def read_range(self, remote_path: str, start: int, length: int) -> bytes:
+        def _read() -> bytes:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=remote_path,
+                Range=f"bytes={start}-{start + length - 1}",
+            )
+            return response["Body"].read()
+
+        return await asyncio.to_thread(_read)
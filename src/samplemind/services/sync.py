@@ -1,16 +1,48 @@
 """
 Sync Service
 Manages synchronization between local library and cloud storage.
+
+A sync run is a manifest diff rather than a per-file conversation with the
+provider:
+- the local manifest (size, mtime, sha256) is built in one walk, reusing
+  hashes of files whose size and mtime have not changed since last sync
+- the remote manifest comes from a single listing (list_manifest)
+- both are compared in memory against the baseline recorded by the last
+  successful sync, so only files changed on one side are transferred
+- transfers run concurrently up to a bound; large files go through
+  multipart uploads / ranged downloads that resume after an interruption
+
+Sync state lives in ``<library>/.samplemind-sync/`` (skipped by the walk).
 """
 
+import asyncio
 import hashlib
+import json
 import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 from .storage import FileMetadata, StorageProvider
 
 logger = logging.getLogger(__name__)
 
+REMOTE_PREFIX = "library"
+SYNC_DIR = ".samplemind-sync"
+STATE_FILE = "state.json"
+TRANSFERS_FILE = "transfers.json"
+STATE_VERSION = 1
+
+DEFAULT_CONCURRENCY = 8
+MULTIPART_THRESHOLD = 64 * 1024 * 1024
+PART_SIZE = 8 * 1024 * 1024
+HASH_WORKERS = 4
+# Providers round mtimes differently (S3 to the second)
+MTIME_TOLERANCE = 1.0
+
 
 def calculate_file_hash(
     file_path: Path, algorithm: str = "sha256", chunk_size: int = 65536
@@ -69,15 +101,174 @@ def files_differ(
     return False
 
 
+def scan_library(
+    root: Path, previous: dict[str, FileMetadata] | None = None
+) -> dict[str, FileMetadata]:
+    """
+    Build the local manifest for *root*, keyed by POSIX relative path.
+
+    Hidden files and directories (including the sync state directory) are
+    skipped.  Hashes from *previous* are reused when size and mtime match;
+    the rest are computed on a small thread pool.
+    """
+    previous = previous or {}
+    manifest: dict[str, FileMetadata] = {}
+    to_hash: list[str] = []
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            if name.startswith("."):
+                continue
+            path = Path(dirpath) / name
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            rel_path = path.relative_to(root).as_posix()
+            known = previous.get(rel_path)
+            if (
+                known
+                and known.get("hash")
+                and known["size"] == stat.st_size
+                and known["mtime"] == stat.st_mtime
+            ):
+                manifest[rel_path] = known
+                continue
+            manifest[rel_path] = FileMetadata(
+                size=stat.st_size, mtime=stat.st_mtime, hash=None
+            )
+            to_hash.append(rel_path)
+
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+            hashes = pool.map(lambda rel: calculate_file_hash(root / rel), to_hash)
+            for rel_path, digest in zip(to_hash, hashes, strict=False):
+                manifest[rel_path]["hash"] = digest or None
+    return manifest
+
+
+def _same(a: FileMetadata, b: FileMetadata) -> bool:
+    """Whether two metadata records describe the same content."""
+    if a["size"] != b["size"]:
+        return False
+    hash_a, hash_b = a.get("hash"), b.get("hash")
+    # Only compare hashes of the same kind (sha256 vs. S3 MD5 ETag)
+    if hash_a and hash_b and len(hash_a) == len(hash_b):
+        return hash_a == hash_b
+    return abs(a["mtime"] - b["mtime"]) <= MTIME_TOLERANCE
+
+
+@dataclass
+class SyncPlan:
+    """Outcome of diffing local and remote manifests against the baseline."""
+
+    uploads: list[str] = field(default_factory=list)
+    downloads: list[str] = field(default_factory=list)
+    # In sync on both sides; recorded in the new baseline as-is
+    unchanged: list[str] = field(default_factory=list)
+    # Changed on both sides since the last sync (newer mtime wins)
+    conflicts: list[str] = field(default_factory=list)
+
+
+def plan_sync(
+    local: dict[str, FileMetadata],
+    remote: dict[str, FileMetadata],
+    baseline: dict[str, dict[str, FileMetadata]],
+    direction: str = "both",
+) -> SyncPlan:
+    """
+    Decide what to transfer, keyed by relative path.
+
+    With a baseline entry, a side counts as changed when it no longer
+    matches what was recorded at the last sync.  Without one (first sync),
+    files of equal size whose local copy is not newer are left alone, as
+    files_differ() does.
+    """
+    plan = SyncPlan()
+    for rel_path in sorted(local.keys() | remote.keys()):
+        loc, rem = local.get(rel_path), remote.get(rel_path)
+        if rem is None:
+            action = "up"
+        elif loc is None:
+            action = "down"
+        else:
+            base = baseline.get(rel_path)
+            if base is not None:
+                local_changed = not _same(loc, base["local"])
+                remote_changed = not _same(rem, base["remote"])
+            else:
+                local_changed = remote_changed = not (
+                    loc["size"] == rem["size"]
+                    and loc["mtime"] <= rem["mtime"] + MTIME_TOLERANCE
+                )
+            if local_changed and remote_changed and _same(loc, rem):
+                local_changed = remote_changed = False
+
+            if not local_changed and not remote_changed:
+                action = "skip"
+            elif local_changed and remote_changed:
+                if base is not None:
+                    plan.conflicts.append(rel_path)
+                action = "up" if loc["mtime"] >= rem["mtime"] else "down"
+            else:
+                action = "up" if local_changed else "down"
+
+        if action == "skip":
+            plan.unchanged.append(rel_path)
+        elif action == "up" and direction in ("up", "both"):
+            plan.uploads.append(rel_path)
+        elif action == "down" and direction in ("down", "both"):
+            plan.downloads.append(rel_path)
+    return plan
+
+
+class _TransferJournal:
+    """Resume records for in-flight multipart uploads and ranged downloads."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            self._entries: dict[str, dict[str, Any]] = json.loads(path.read_text())
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        return self._entries.get(key)
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._save()
+
+    def drop(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._entries))
+        tmp.replace(self.path)
+
+
 class SyncManager:
     """
     Manages synchronization tasks.
     """
 
-    def __init__(self, storage_provider: StorageProvider) -> None:
+    def __init__(
+        self,
+        storage_provider: StorageProvider,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        multipart_threshold: int = MULTIPART_THRESHOLD,
+        part_size: int = PART_SIZE,
+    ) -> None:
         self.storage = storage_provider
         self.is_syncing = False
         self._sync_enabled = False
+        self.max_concurrency = max_concurrency
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
 
     async def enable_sync(self, user_id: str) -> bool:
         """Enable sync for a user"""
@@ -95,6 +286,9 @@ class SyncManager:
         Args:
             library_path: Local path to library
             direction: 'up' (local->cloud), 'down' (cloud->local), 'both'
+
+        Returns:
+            Counts for uploaded, downloaded, skipped, conflicts and errors
         """
         if not self._sync_enabled:
             logger.warning("Attempted to sync but sync is disabled")
@@ -102,27 +296,54 @@ class SyncManager:
             pass
 
         self.is_syncing = True
-        stats = {"uploaded": 0, "downloaded": 0, "errors": 0}
+        stats = {
+            "uploaded": 0,
+            "downloaded": 0,
+            "skipped": 0,
+            "conflicts": 0,
+            "errors": 0,
+        }
 
         try:
-            library_path = Path(library_path)
-
-            # Fetch remote state once for optimization
-            # In a real heavy production system, we'd use pagination or differencing
-            remote_files_list = await self.storage.list_files("library")
-            remote_files_set = set(
-                remote_files_list
-            )  # e.g., {'library/subdir/file.wav'}
-
-            # 1. Sync Up (Upload)
-            if direction in ["up", "both"]:
-                stats["uploaded"] = await self._sync_up(library_path, remote_files_set)
-
-            # 2. Sync Down (Download)
-            if direction in ["down", "both"]:
-                stats["downloaded"] = await self._sync_down(
-                    library_path, remote_files_list
-                )
+            root = Path(library_path)
+            root.mkdir(parents=True, exist_ok=True)
+            state_dir = root / SYNC_DIR
+            baseline = self._load_state(state_dir)
+            journal = _TransferJournal(state_dir / TRANSFERS_FILE)
+
+            previous_local = {rel: entry["local"] for rel, entry in baseline.items()}
+            local, remote = await asyncio.gather(
+                asyncio.to_thread(scan_library, root, previous_local),
+                self._remote_manifest(),
+            )
+
+            plan = plan_sync(local, remote, baseline, direction)
+            stats["skipped"] = len(plan.unchanged)
+            stats["conflicts"] = len(plan.conflicts)
+            logger.info(
+                f"Sync plan: {len(plan.uploads)} up, {len(plan.downloads)} down, "
+                f"{len(plan.unchanged)} unchanged"
+            )
+
+            done = await self._transfer(root, plan, local, remote, journal, stats)
+
+            # Refresh the baseline from one more listing (uploads change remote
+            # mtimes/ETags; downloads change local files)
+            if done:
+                remote = await self._remote_manifest()
+                downloaded = {rel for rel in done if rel in plan.downloads}
+                if downloaded:
+                    fresh = await asyncio.to_thread(scan_library, root, local)
+                    local.update(
+                        {rel: fresh[rel] for rel in downloaded if rel in fresh}
+                    )
+            for rel_path in [*plan.unchanged, *done]:
+                if rel_path in local and rel_path in remote:
+                    baseline[rel_path] = {
+                        "local": local[rel_path],
+                        "remote": remote[rel_path],
+                    }
+            self._save_state(state_dir, baseline)
 
         except Exception as e:
             logger.error(f"Sync failed: {e}")
@@ -132,70 +353,177 @@ class SyncManager:
 
         return stats
 
-    async def _sync_up(self, root: Path, remote_files_set: set) -> int:
-        count = 0
-        cwd = Path(root)
+    async def _remote_manifest(self) -> dict[str, FileMetadata]:
+        prefix = f"{REMOTE_PREFIX}/"
+        manifest = await self.storage.list_manifest(REMOTE_PREFIX)
+        return {
+            path[len(prefix) :]: meta
+            for path, meta in manifest.items()
+            if path.startswith(prefix) and len(path) > len(prefix)
+        }
+
+    # -- State ----------------------------------------------------------------
 
-        # Walk through directory
-        for file_path in cwd.rglob("*"):
-            if file_path.is_file() and not file_path.name.startswith(
-                "."
-            ):  # Ignore hidden files
+    @staticmethod
+    def _load_state(state_dir: Path) -> dict[str, dict[str, FileMetadata]]:
+        try:
+            payload = json.loads((state_dir / STATE_FILE).read_text())
+        except (OSError, ValueError):
+            return {}
+        if payload.get("version") != STATE_VERSION:
+            return {}
+        return payload.get("files", {})
+
+    @staticmethod
+    def _save_state(
+        state_dir: Path, baseline: dict[str, dict[str, FileMetadata]]
+    ) -> None:
+        state_dir.mkdir(parents=True, exist_ok=True)
+        tmp = state_dir / (STATE_FILE + ".tmp")
+        tmp.write_text(json.dumps({"version": STATE_VERSION, "files": baseline}))
+        tmp.replace(state_dir / STATE_FILE)
+
+    # -- Transfers ------------------------------------------------------------
+
+    async def _transfer(
+        self,
+        root: Path,
+        plan: SyncPlan,
+        local: dict[str, FileMetadata],
+        remote: dict[str, FileMetadata],
+        journal: _TransferJournal,
+        stats: dict[str, int],
+    ) -> list[str]:
+        """Run the planned transfers concurrently; return the paths that succeeded."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        done: list[str] = []
+
+        async def run(rel_path: str, upload: bool) -> None:
+            remote_path = f"{REMOTE_PREFIX}/{rel_path}"
+            async with semaphore:
                 try:
-                    rel_path = file_path.relative_to(root)
-                    remote_path = f"library/{rel_path}"
-
-                    # Check if already exists remotely
-                    if remote_path in remote_files_set:
-                        # Check if it differs
-                        metadata = await self.storage.get_metadata(remote_path)
-                        if not files_differ(file_path, metadata):
-                            continue
-
-                    await self.storage.upload_file(file_path, remote_path)
-                    count += 1
+                    if upload:
+                        await self._upload(
+                            root / rel_path, remote_path, local[rel_path], journal
+                        )
+                        stats["uploaded"] += 1
+                    else:
+                        dest = root / rel_path
+                        await self._download(
+                            remote_path, dest, remote[rel_path], root, journal
+                        )
+                        stats["downloaded"] += 1
+                        # Hydrate Analysis if JSON, e.g. loop.wav.json
+                        if dest.suffix == ".json" and dest.name.count(".") >= 2:
+                            await self._hydrate_analysis(dest)
+                    done.append(rel_path)
                 except Exception as e:
-                    logger.error(f"Failed to upload {file_path}: {e}")
-
-        return count
-
-    async def _sync_down(self, root: Path, remote_files: list[str]) -> int:
-        count = 0
-
-        for remote_path in remote_files:
-            # remote_path looks like "library/subfolder/file.wav"
-            if not remote_path.startswith("library/"):
+                    action = "upload" if upload else "download"
+                    logger.error(f"Failed to {action} {rel_path}: {e}")
+                    stats["errors"] += 1
+
+        await asyncio.gather(
+            *(run(rel, True) for rel in plan.uploads),
+            *(run(rel, False) for rel in plan.downloads),
+        )
+        return done
+
+    async def _upload(
+        self,
+        path: Path,
+        remote_path: str,
+        meta: FileMetadata,
+        journal: _TransferJournal,
+    ) -> None:
+        if (
+            not self.storage.supports_multipart
+            or meta["size"] < self.multipart_threshold
+        ):
+            await self.storage.upload_file(path, remote_path)
+            return
+
+        key = f"up:{remote_path}"
+        entry = journal.get(key)
+        parts: dict[int, str] = {}
+        if entry is not None:
+            if entry["size"] == meta["size"] and entry["mtime"] == meta["mtime"]:
+                try:
+                    parts = await self.storage.list_parts(
+                        remote_path, entry["upload_id"]
+                    )
+                except Exception as e:
+                    logger.info(f"Cannot resume upload of {remote_path}: {e}")
+                    entry = None
+            else:
+                # File changed since the interrupted upload: start over
+                await self.storage.abort_multipart_upload(
+                    remote_path, entry["upload_id"]
+                )
+                entry = None
+        if entry is None:
+            entry = {
+                "upload_id": await self.storage.create_multipart_upload(remote_path),
+                "size": meta["size"],
+                "mtime": meta["mtime"],
+            }
+            journal.put(key, entry)
+        elif parts:
+            logger.info(f"Resuming upload of {remote_path} ({len(parts)} parts done)")
+
+        upload_id = entry["upload_id"]
+        for number in range(1, math.ceil(meta["size"] / self.part_size) + 1):
+            if number in parts:
                 continue
-
-            try:
-                # Determine relative path from "library/"
-                # e.g. "library/foo.wav" -> "foo.wav"
-                rel_parts = Path(remote_path).parts[1:]
-                if not rel_parts:
-                    continue
-
-                rel_path = Path(*rel_parts)
-                local_dest = root / rel_path
-
-                # Check if exists locally
-                if local_dest.exists():
-                    metadata = await self.storage.get_metadata(remote_path)
-                    if not files_differ(local_dest, metadata):
-                        continue
-
-                # Download
-                success = await self.storage.download_file(remote_path, local_dest)
-                if success:
-                    count += 1
-                    # Hydrate Analysis if JSON
-                    if local_dest.suffix == ".json" and local_dest.name.count(".") >= 2:
-                        # e.g. .wav.json
-                        await self._hydrate_analysis(local_dest)
-
-            except Exception as e:
-                logger.error(f"Failed to download {remote_path}: {e}")
-
-        return count
+            data = await asyncio.to_thread(
+                _read_chunk, path, (number - 1) * self.part_size, self.part_size
+            )
+            parts[number] = await self.storage.upload_part(
+                remote_path, upload_id, number, data
+            )
+        await self.storage.complete_multipart_upload(remote_path, upload_id, parts)
+        journal.drop(key)
+
+    async def _download(
+        self,
+        remote_path: str,
+        dest: Path,
+        meta: FileMetadata,
+        root: Path,
+        journal: _TransferJournal,
+    ) -> None:
+        # Download beside the state file, then move into place atomically
+        partial_dir = root / SYNC_DIR / "partial"
+        partial_dir.mkdir(parents=True, exist_ok=True)
+        partial = partial_dir / hashlib.sha1(remote_path.encode()).hexdigest()
+
+        if (
+            not self.storage.supports_range_reads
+            or meta["size"] < self.multipart_threshold
+        ):
+            if not await self.storage.download_file(remote_path, partial):
+                raise FileNotFoundError(remote_path)
+        else:
+            key = f"down:{remote_path}"
+            entry = {"size": meta["size"], "mtime": meta["mtime"]}
+            offset = 0
+            if journal.get(key) == entry and partial.exists():
+                offset = partial.stat().st_size
+                logger.info(f"Resuming download of {remote_path} at byte {offset}")
+            else:
+                partial.unlink(missing_ok=True)
+                journal.put(key, entry)
+
+            while offset < meta["size"]:
+                length = min(self.part_size, meta["size"] - offset)
+                data = await self.storage.read_range(remote_path, offset, length)
+                if not data:
+                    raise OSError(f"Short read from {remote_path} at byte {offset}")
+                await asyncio.to_thread(_append_chunk, partial, data)
+                offset += len(data)
+            journal.drop(key)
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(partial, dest)
 
     async def _hydrate_analysis(self, json_path: Path):
         """
@@ -241,3 +569,14 @@ class SyncManager:
 
         except Exception as e:
             logger.warning(f"Failed to hydrate analysis from {json_path}: {e}")
+
+
+def _read_chunk(path: Path, offset: int, length: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+def _append_chunk(path: Path, data: bytes) -> None:
+    with open(path, "ab") as f:
+        f.write(data)
@@ -0,0 +1,563 @@
+"""
+SampleMind AI — reproducible micro-benchmark suite
+
+Times the hot paths on deterministic, locally generated audio so results
+from two runs (or two commits) can be compared:
+
+  - Fixtures     — seeded synthetic WAVs (drum loop, chord pad, noise burst),
+                   byte-identical on every run, no downloads
+  - Timing       — perf_counter_ns, warm-up rounds, GC paused while timing,
+                   median / p95 over repeated rounds
+  - Benchmarks   — feature extraction, L1 cache get/set, FAISS search,
+                   fingerprinting, the API analyze route, ensemble inference
+                   (per-row vs batched);
+                   a benchmark whose optional dependency is missing is
+                   reported as skipped instead of failing the run
+  - Baseline     — results are written as JSON; compare_reports() flags
+                   every tracked metric whose median regressed beyond a
+                   relative threshold
+
+Entry point: ``python scripts/benchmark.py run|compare``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Generator
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REPORT_SCHEMA = 1
+DEFAULT_THRESHOLD = 0.20  # fail when the median is >20% slower than baseline
+FIXTURE_SR = 22050
+FIXTURE_SEED = 1234
+
+
+class BenchmarkSkipped(Exception):
+    """Raised by a benchmark setup when it cannot run here (missing extra)."""
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────────────
+
+
+def _drum_loop(
+    rng: np.random.Generator, seconds: float, sr: int, bpm: float = 120.0
+) -> np.ndarray:
+    n = int(seconds * sr)
+    audio = np.zeros(n, dtype=np.float64)
+    beat = int(60.0 / bpm * sr)
+    kick_len = int(0.25 * sr)
+    t = np.arange(kick_len) / sr
+    kick = np.sin(2 * np.pi * (50 + 100 * np.exp(-t * 30)) * t) * np.exp(-t * 12)
+    hat_len = int(0.05 * sr)
+    hat = rng.standard_normal(hat_len) * np.exp(-np.arange(hat_len) / sr * 80) * 0.3
+    for start in range(0, n, beat):
+        end = min(n, start + kick_len)
+        audio[start:end] += kick[: end - start]
+        off = start + beat // 2
+        if off < n:
+            end = min(n, off + hat_len)
+            audio[off:end] += hat[: end - off]
+    return audio
+
+
+def _chord_pad(rng: np.random.Generator, seconds: float, sr: int) -> np.ndarray:
+    t = np.arange(int(seconds * sr)) / sr
+    freqs = (220.0, 261.63, 329.63)  # A minor
+    audio = sum(np.sin(2 * np.pi * f * t + rng.uniform(0, 2 * np.pi)) for f in freqs)
+    envelope = np.minimum(1.0, t / 0.2) * np.minimum(1.0, (t[-1] - t) / 0.2 + 1e-3)
+    return audio / len(freqs) * envelope * 0.6
+
+
+def _noise_burst(rng: np.random.Generator, seconds: float, sr: int) -> np.ndarray:
+    n = int(seconds * sr)
+    return rng.standard_normal(n) * np.exp(-np.arange(n) / sr * 4) * 0.3
+
+
+FIXTURES: dict[str, tuple[Callable[..., np.ndarray], float]] = {
+    "drum_loop": (_drum_loop, 4.0),
+    "chord_pad": (_chord_pad, 4.0),
+    "noise_burst": (_noise_burst, 1.0),
+}
+
+
+def generate_fixtures(directory: Path, sr: int = FIXTURE_SR) -> dict[str, Path]:
+    """Write the synthetic fixtures into *directory* (deterministic bytes)."""
+    import soundfile as sf
+
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for index, (name, (generator, seconds)) in enumerate(sorted(FIXTURES.items())):
+        rng = np.random.default_rng(FIXTURE_SEED + index)
+        audio = np.clip(generator(rng, seconds, sr), -1.0, 1.0).astype(np.float32)
+        path = directory / f"{name}.wav"
+        sf.write(path, audio, sr, subtype="PCM_16")
+        paths[name] = path
+    return paths
+
+
+# ── Timing ────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Measurement:
+    """Timing of one benchmark; times are per operation in milliseconds."""
+
+    name: str
+    median_ms: float = 0.0
+    p95_ms: float = 0.0
+    mean_ms: float = 0.0
+    stdev_ms: float = 0.0
+    min_ms: float = 0.0
+    rounds: int = 0
+    ops_per_round: int = 0
+    skipped: str | None = None
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1000.0 / self.median_ms if self.median_ms > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "ops_per_second": round(self.ops_per_second, 3)}
+
+
+def measure(
+    name: str,
+    operation: Callable[[], Any],
+    rounds: int = 7,
+    warmup: int = 2,
+    min_round_ms: float = 20.0,
+) -> Measurement:
+    """
+    Time *operation*: warm up, calibrate how many calls fill ``min_round_ms``
+    (so sub-microsecond operations are not dominated by timer overhead), then
+    time ``rounds`` rounds with the garbage collector paused.
+    """
+    for _ in range(warmup):
+        operation()
+
+    ops = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(ops):
+            operation()
+        elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+        if elapsed_ms >= min_round_ms or ops >= 1 << 20:
+            break
+        ops *= (
+            2
+            if elapsed_ms <= 0
+            else max(2, min(10, int(min_round_ms / elapsed_ms) + 1))
+        )
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter_ns()
+            for _ in range(ops):
+                operation()
+            samples.append((time.perf_counter_ns() - start) / 1e6 / ops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    ordered = sorted(samples)
+    return Measurement(
+        name=name,
+        median_ms=statistics.median(ordered),
+        p95_ms=ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+        mean_ms=statistics.fmean(ordered),
+        stdev_ms=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        min_ms=ordered[0],
+        rounds=rounds,
+        ops_per_round=ops,
+    )
+
+
+# ── Benchmarks ────────────────────────────────────────────────────────────────
+
+# A benchmark's setup receives the fixture paths and returns the operation to
+# time (raising BenchmarkSkipped if it cannot run in this environment).  Setups
+# that hold resources are generators: they yield the operation and release
+# it in a ``with`` block or ``finally`` once the measurement is done.
+Operation = Callable[[], Any]
+BenchmarkSetup = Callable[
+    [dict[str, Path]], Operation | Generator[Operation, None, None]
+]
+
+BENCHMARKS: dict[str, BenchmarkSetup] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchmarkSetup], BenchmarkSetup]:
+    def register(setup: BenchmarkSetup) -> BenchmarkSetup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _require(module: str) -> None:
+    import importlib.util
+
+    if importlib.util.find_spec(module) is None:
+        raise BenchmarkSkipped(f"{module} not installed")
+
+
+def _import_route(name: str) -> Any:
+    """Import one API route module without running the routes package.
+
+    ``routes/__init__`` imports every router, and with them the optional AI
+    provider SDKs; the route under test does not need those.
+    """
+    import importlib.util
+    import sys
+
+    qualified = f"samplemind.interfaces.api.routes.{name}"
+    if qualified in sys.modules:
+        return sys.modules[qualified]
+
+    package = importlib.util.find_spec("samplemind.interfaces.api.routes")
+    assert package is not None and package.submodule_search_locations
+    spec = importlib.util.spec_from_file_location(
+        qualified, Path(package.submodule_search_locations[0]) / f"{name}.py"
+    )
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[qualified] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[qualified]
+        raise
+    return module
+
+
+def _feature_extraction(level: str) -> BenchmarkSetup:
+    def setup(fixtures: dict[str, Path]) -> Callable[[], Any]:
+        from samplemind.core.engine.audio_engine import AnalysisLevel, AudioEngine
+
+        engine = AudioEngine(max_workers=1)
+        path = fixtures["drum_loop"]
+        return lambda: engine.analyze_audio(
+            path, level=AnalysisLevel[level], use_cache=False
+        )
+
+    return setup
+
+
+benchmark("feature_extraction.basic")(_feature_extraction("BASIC"))
+benchmark("feature_extraction.standard")(_feature_extraction("STANDARD"))
+
+
+@benchmark("cache.l1_get")
+def _cache_get(fixtures: dict[str, Path]) -> Callable[[], Any]:
+    from samplemind.core.cache.lru_cache import L1LRUCache
+
+    cache = L1LRUCache(max_entries=20_000)
+    keys = [f"features:{i:05d}" for i in range(10_000)]
+    for key in keys:
+        cache.set(key, {"tempo": 120.0, "key": "A"}, size_bytes=256)
+    cursor = iter(range(1 << 62))
+
+    return lambda: cache.get(keys[next(cursor) % len(keys)])
+
+
+@benchmark("cache.l1_set")
+def _cache_set(fixtures: dict[str, Path]) -> Callable[[], Any]:
+    from samplemind.core.cache.lru_cache import L1LRUCache
+
+    cache = L1LRUCache(max_entries=5_000)
+    value = {"tempo": 120.0, "key": "A"}
+    cursor = iter(range(1 << 62))
+
+    # Keys cycle over twice the capacity so steady-state sets also evict
+    return lambda: cache.set(
+        f"features:{next(cursor) % 10_000:05d}", value, size_bytes=256
+    )
+
+
+@benchmark("faiss.search")
+def _faiss_search(fixtures: dict[str, Path]) -> Generator[Operation, None, None]:
+    _require("faiss")
+    from samplemind.core.search.faiss_index import EMBEDDING_DIM, FAISSIndex
+
+    rng = np.random.default_rng(FIXTURE_SEED)
+    vectors = rng.standard_normal((5_000, EMBEDDING_DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    class _VectorEmbedder:
+        def embed_audio(self, audio_path: str) -> np.ndarray:
+            return vectors[int(Path(audio_path).stem)]
+
+    with tempfile.TemporaryDirectory(prefix="samplemind-bench-") as index_dir:
+        index = FAISSIndex(index_dir=Path(index_dir), embedder=_VectorEmbedder())  # type: ignore[arg-type]
+        for i in range(len(vectors)):
+            index.add(f"{i}.wav")
+        query = vectors[42]
+        yield lambda: index.search_by_embedding(query, top_k=20)
+
+
+@benchmark("fingerprint")
+def _fingerprint(fixtures: dict[str, Path]) -> Callable[[], Any]:
+    import soundfile as sf
+
+    from samplemind.core.analysis.fingerprinter import AudioFingerprinter
+
+    y, sr = sf.read(fixtures["drum_loop"], dtype="float32")
+    fingerprinter = AudioFingerprinter()
+    return lambda: fingerprinter.fingerprint(y, sr)
+
+
+@benchmark("api.analyze")
+def _api_analyze(fixtures: dict[str, Path]) -> Generator[Operation, None, None]:
+    _require("fastapi")
+    import shutil
+    from types import SimpleNamespace
+    from unittest.mock import patch
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from samplemind.core.engine.audio_engine import AudioEngine, AudioFeatures
+    from samplemind.interfaces.api.dependencies import set_app_state
+
+    audio_routes = _import_route("audio")
+
+    def analyze() -> None:
+        response = client.post("/analyze/bench", params={"analysis_level": "basic"})
+        response.raise_for_status()
+
+    with tempfile.TemporaryDirectory(prefix="samplemind-bench-") as upload_dir:
+        shutil.copy(fixtures["chord_pad"], Path(upload_dir) / "bench_chord_pad.wav")
+        settings = SimpleNamespace(
+            UPLOAD_DIR=Path(upload_dir), ANALYSIS_DIR=Path(upload_dir)
+        )
+
+        # Measures the route itself (request parsing, dispatch to the engine's
+        # cache, response model) rather than the DSP, which is timed above
+        set_app_state("audio_engine", AudioEngine(max_workers=1))
+        app = FastAPI()
+        app.include_router(audio_routes.router)
+        client = TestClient(app)
+        try:
+            # The route writes an analysis sidecar next to the upload, which the
+            # next request's "<file_id>_*" lookup would then pick up
+            with (
+                patch.object(audio_routes, "get_settings", return_value=settings),
+                patch.object(AudioFeatures, "save", return_value=True),
+            ):
+                yield analyze
+        finally:
+            set_app_state("audio_engine", None)
+
+
+def _ensemble_fixture() -> tuple[Any, np.ndarray]:
+    _require("sklearn")
+    from samplemind.ai.classification.ensemble import EnsembleClassifier
+
+    rng = np.random.default_rng(FIXTURE_SEED)
+    X_train = rng.standard_normal((600, 32)).astype(np.float32)
+    y_train = np.array(["low", "mid", "high"])[np.argmax(X_train[:, :3], axis=1)]
+    clf = EnsembleClassifier().fit(X_train, y_train.tolist(), task="energy")
+    return clf, rng.standard_normal((1_000, 32)).astype(np.float32)
+
+
+# The per-row / batched pair runs over the same 1,000 rows; the ratio of the
+# two medians is the batching speed-up
+@benchmark("ensemble.predict_per_row")
+def _ensemble_predict_per_row(fixtures: dict[str, Path]) -> Callable[[], Any]:
+    clf, X = _ensemble_fixture()
+    return lambda: [clf.predict_one(row, task="energy") for row in X]
+
+
+@benchmark("ensemble.predict_batch")
+def _ensemble_predict_batch(fixtures: dict[str, Path]) -> Callable[[], Any]:
+    clf, X = _ensemble_fixture()
+    return lambda: clf.predict_batch(X, task="energy").labels
+
+
+# ── Running and reporting ─────────────────────────────────────────────────────
+
+
+def environment_info() -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+
+
+def run_suite(
+    names: list[str] | None = None,
+    fixtures_dir: Path | None = None,
+    rounds: int = 7,
+    warmup: int = 2,
+    progress: Callable[[Measurement], None] | None = None,
+) -> dict[str, Any]:
+    """Run the selected benchmarks (all by default) and return a report."""
+    selected = names or sorted(BENCHMARKS)
+    unknown = [n for n in selected if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmarks: {unknown}; available: {sorted(BENCHMARKS)}"
+        )
+
+    fixtures_dir = fixtures_dir or Path(tempfile.mkdtemp(prefix="samplemind-fixtures-"))
+    fixtures = generate_fixtures(fixtures_dir)
+
+    results: dict[str, dict[str, Any]] = {}
+    for name in selected:
+        try:
+            operation = BENCHMARKS[name](fixtures)
+            if isinstance(operation, Generator):
+                with contextlib.closing(operation):
+                    result = measure(
+                        name, next(operation), rounds=rounds, warmup=warmup
+                    )
+            else:
+                result = measure(name, operation, rounds=rounds, warmup=warmup)
+        except BenchmarkSkipped as e:
+            result = Measurement(name=name, skipped=str(e))
+        except ImportError as e:
+            result = Measurement(name=name, skipped=f"import failed: {e}")
+        results[name] = result.to_dict()
+        if progress:
+            progress(result)
+
+    return {
+        "schema": REPORT_SCHEMA,
+        "created_at": datetime.now(UTC).isoformat(),
+        "environment": environment_info(),
+        "settings": {"rounds": rounds, "warmup": warmup},
+        "results": results,
+    }
+
+
+def save_report(report: dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def load_report(path: Path) -> dict[str, Any]:
+    report = json.loads(path.read_text())
+    if report.get("schema") != REPORT_SCHEMA:
+        raise ValueError(
+            f"{path}: unsupported benchmark report schema {report.get('schema')}"
+        )
+    return report
+
+
+@dataclass
+class Comparison:
+    """Baseline vs current median of one benchmark"""
+
+    name: str
+    status: str  # "ok", "regressed", "improved", "skipped", "new", "missing"
+    baseline_ms: float | None = None
+    current_ms: float | None = None
+    change: float | None = None  # relative change of the median (+0.25 = 25% slower)
+    notes: list[str] = field(default_factory=list)
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    thresholds: dict[str, float] | None = None,
+) -> list[Comparison]:
+    """
+    Compare the medians of *current* against *baseline*.
+
+    A benchmark regresses when its median grew by more than its threshold
+    (``thresholds[name]`` or *threshold*) and even its fastest current round
+    is slower than the baseline median, so a single noisy run on a shared
+    machine does not fail the gate.  Benchmarks skipped in either run are
+    reported but never fail the comparison.
+    """
+    thresholds = thresholds or {}
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    comparisons = []
+
+    for name in sorted(set(base_results) | set(current_results)):
+        base, cur = base_results.get(name), current_results.get(name)
+        if cur is None:
+            comparisons.append(
+                Comparison(name, "missing", baseline_ms=base.get("median_ms"))
+            )
+            continue
+        if base is None:
+            comparisons.append(Comparison(name, "new", current_ms=cur.get("median_ms")))
+            continue
+        if base.get("skipped") or cur.get("skipped"):
+            comparisons.append(
+                Comparison(
+                    name, "skipped", notes=[cur.get("skipped") or base.get("skipped")]
+                )
+            )
+            continue
+
+        base_ms, cur_ms = base["median_ms"], cur["median_ms"]
+        change = (cur_ms - base_ms) / base_ms if base_ms > 0 else 0.0
+        limit = thresholds.get(name, threshold)
+        if change > limit and cur.get("min_ms", cur_ms) > base_ms:
+            status = "regressed"
+        elif change < -limit:
+            status = "improved"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(name, status, base_ms, cur_ms, change))
+    return comparisons
+
+
+def has_regressions(comparisons: list[Comparison]) -> bool:
+    return any(c.status == "regressed" for c in comparisons)
+
+
+def format_comparison(comparisons: list[Comparison]) -> str:
+    lines = [f"{'benchmark':32} {'baseline':>12} {'current':>12} {'change':>9}  status"]
+    for c in comparisons:
+        base = f"{c.baseline_ms:.4f}ms" if c.baseline_ms is not None else "-"
+        cur = f"{c.current_ms:.4f}ms" if c.current_ms is not None else "-"
+        change = f"{c.change:+.1%}" if c.change is not None else "-"
+        note = f"  ({'; '.join(c.notes)})" if c.notes else ""
+        lines.append(f"{c.name:32} {base:>12} {cur:>12} {change:>9}  {c.status}{note}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "BENCHMARKS",
+    "BenchmarkSkipped",
+    "Comparison",
+    "DEFAULT_THRESHOLD",
+    "Measurement",
+    "benchmark",
+    "compare_reports",
+    "format_comparison",
+    "generate_fixtures",
+    "has_regressions",
+    "load_report",
+    "measure",
+    "run_suite",
+    "save_report",
+]
@@ -0,0 +1,221 @@
+"""
+Append-only record persistence
+
+Small shared storage layer for JSON-backed managers (collections, recent
+files, sessions) that used to rewrite a whole file on every change:
+
+- OpLog: snapshot file plus an append-only log of operations per record.
+  Each change appends one JSON line; every ``compact_every`` operations the
+  current state is written as a new snapshot (temp file + atomic rename)
+  and the log is truncated.
+- SubstringIndex: in-memory trigram index for case-insensitive substring
+  search, so searches don't rescan every entry.
+
+Crash safety: a snapshot is either the old or the new file, never a partial
+one.  A torn final log line (crash mid-append) is dropped and trimmed on the
+next load.  Operations carry a sequence number and the snapshot records the
+last one it includes, so a crash between the rename and the log truncation
+cannot apply an operation twice.
+"""
+
+import json
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "samplemind-oplog-snapshot"
+DEFAULT_COMPACT_EVERY = 200
+
+
+class OpLog:
+    """
+    Snapshot + operation log for one record.
+
+    ``<name>.json`` holds the snapshot and ``<name>.log`` the operations
+    appended since.  Plain JSON files written before this format existed are
+    read as a snapshot with sequence number 0.
+    """
+
+    def __init__(
+        self, snapshot_path: Path, compact_every: int = DEFAULT_COMPACT_EVERY
+    ) -> None:
+        """
+        Args:
+            snapshot_path: Snapshot file; the log sits beside it as ``.log``
+            compact_every: Operations appended before compaction is due
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.log_path = self.snapshot_path.with_suffix(".log")
+        self.compact_every = compact_every
+        self.seq = 0
+        self.ops_since_snapshot = 0
+
+    @property
+    def needs_compaction(self) -> bool:
+        """True once enough operations have accumulated in the log"""
+        return self.ops_since_snapshot >= self.compact_every
+
+    def exists(self) -> bool:
+        return self.snapshot_path.exists() or self.log_path.exists()
+
+    def load(self) -> tuple[Any | None, list[dict]]:
+        """
+        Read the record.
+
+        Returns:
+            (snapshot state or None, operations to replay on top of it)
+        """
+        state, snapshot_seq = self._read_snapshot()
+        self.seq = snapshot_seq
+
+        ops = []
+        for op in self._read_log():
+            seq = op.get("seq", 0)
+            if seq <= snapshot_seq:
+                continue  # already folded into the snapshot
+            ops.append(op)
+            self.seq = max(self.seq, seq)
+
+        self.ops_since_snapshot = len(ops)
+        return state, ops
+
+    def append(self, op: dict) -> dict:
+        """Append one operation; returns it with its sequence number"""
+        self.seq += 1
+        op = {**op, "seq": self.seq}
+        line = json.dumps(op, separators=(",", ":"), default=str) + "\n"
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(line)
+        self.ops_since_snapshot += 1
+        return op
+
+    def compact(self, state: Any) -> None:
+        """Write ``state`` as the new snapshot and truncate the log"""
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot_path.with_suffix(".json.tmp")
+        document = {"format": SNAPSHOT_FORMAT, "seq": self.seq, "state": state}
+
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+
+        # Ops up to self.seq are now in the snapshot; stale ones are skipped
+        # by sequence number if we crash before this unlink.
+        self.log_path.unlink(missing_ok=True)
+        self.ops_since_snapshot = 0
+
+    def delete(self) -> None:
+        """Remove the snapshot and log"""
+        self.snapshot_path.unlink(missing_ok=True)
+        self.log_path.unlink(missing_ok=True)
+        self.seq = 0
+        self.ops_since_snapshot = 0
+
+    def _read_snapshot(self) -> tuple[Any | None, int]:
+        if not self.snapshot_path.exists():
+            return None, 0
+        with open(self.snapshot_path, encoding="utf-8") as f:
+            document = json.load(f)
+        if isinstance(document, dict) and document.get("format") == SNAPSHOT_FORMAT:
+            return document["state"], int(document.get("seq", 0))
+        return document, 0  # pre-oplog file
+
+    def _read_log(self) -> Iterable[dict]:
+        if not self.log_path.exists():
+            return []
+
+        data = self.log_path.read_bytes()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            # Crash mid-append: drop the partial line so new appends start clean
+            logger.warning(f"Discarding torn entry at end of {self.log_path}")
+            with open(self.log_path, "r+b") as f:
+                f.truncate(complete)
+
+        ops = []
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Skipping unreadable entry in {self.log_path}")
+        return ops
+
+
+def list_records(directory: Path) -> list[str]:
+    """Names of the records (snapshot and/or log) stored in ``directory``"""
+    if not directory.exists():
+        return []
+    names = {p.stem for p in directory.glob("*.json")}
+    names.update(p.stem for p in directory.glob("*.log"))
+    return sorted(names)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SubstringIndex:
+    """
+    Case-insensitive substring search over keyed text fields.
+
+    Queries of three or more characters are narrowed with trigram postings
+    and then verified; shorter queries scan the lower-cased fields.  Results
+    come back in the order keys were (re-)added.
+    """
+
+    def __init__(self) -> None:
+        self._fields: dict[str, tuple[str, ...]] = {}
+        self._postings: dict[str, dict[str, None]] = defaultdict(dict)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def add(self, key: str, texts: Iterable[str]) -> None:
+        """Index (or re-index) ``key`` under the given text fields"""
+        self.remove(key)
+        fields = tuple(t.lower() for t in texts if t)
+        self._fields[key] = fields
+        for gram in set().union(*(_trigrams(f) for f in fields)):
+            self._postings[gram][key] = None
+
+    def remove(self, key: str) -> None:
+        fields = self._fields.pop(key, None)
+        if fields is None:
+            return
+        for gram in set().union(*(_trigrams(f) for f in fields)):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self._postings[gram]
+
+    def clear(self) -> None:
+        self._fields.clear()
+        self._postings.clear()
+
+    def search(self, query: str) -> list[str]:
+        """Keys with at least one field containing ``query``"""
+        needle = query.lower()
+
+        if len(needle) < 3:
+            candidates: Iterable[str] = self._fields
+        else:
+            postings = [self._postings.get(g) for g in _trigrams(needle)]
+            if any(p is None for p in postings):
+                return []
+            postings.sort(key=len)
+            smallest, rest = postings[0], postings[1:]
+            candidates = (k for k in smallest if all(k in p for p in rest))
+
+        return [k for k in candidates if any(needle in f for f in self._fields[k])]
@@ -303,6 +303,17 @@ async def test_chromadb():
 # ============================================================================
 
 
+@pytest.fixture(scope="session", autouse=True)
+def semantic_cache_dir(tmp_path_factory):
+    """Keep the global semantic cache's .npy files out of the working tree"""
+    from samplemind.core.caching import semantic_cache
+
+    cache_dir = tmp_path_factory.mktemp("semantic_cache")
+    semantic_cache.init_semantic_cache(cache_dir=str(cache_dir))
+    yield cache_dir
+    semantic_cache._semantic_cache = None
+
+
 @pytest.fixture
 def temp_directory():
     """Provide temporary directory for tests"""
@@ -44,19 +44,21 @@ def test_audio_files():
     shutil.rmtree(temp_dir)
 
 
-def test_distributed_processor_init():
+def test_distributed_processor_init(tmp_path):
     """Test initialization of DistributedAudioProcessor."""
-    with DistributedAudioProcessor(n_workers=2, memory_limit="1GB") as processor:
+    with DistributedAudioProcessor(
+        n_workers=2, memory_limit="1GB", local_dir=str(tmp_path)
+    ) as processor:
         assert processor.n_workers == 2
         assert processor.use_cache is True
 
 
-def test_process_audio_files(test_audio_files):
+def test_process_audio_files(test_audio_files, tmp_path):
     """Test processing of multiple audio files."""
     temp_dir, filenames = test_audio_files
     file_paths = [str(Path(temp_dir) / f) for f in filenames]
 
-    with DistributedAudioProcessor(n_workers=2) as processor:
+    with DistributedAudioProcessor(n_workers=2, local_dir=str(tmp_path)) as processor:
         results = processor.process_audio_files(
             file_paths=file_paths, feature_type="rhythm", level="basic"
         )
@@ -72,12 +74,12 @@ def test_process_audio_files(test_audio_files):
             assert "onset_times" in features
 
 
-def test_feature_extraction_levels(test_audio_files):
+def test_feature_extraction_levels(test_audio_files, tmp_path):
     """Test different feature extraction levels."""
     temp_dir, filenames = test_audio_files
     file_path = str(Path(temp_dir) / filenames[0])  # Just test with one file
 
-    with DistributedAudioProcessor(n_workers=1) as processor:
+    with DistributedAudioProcessor(n_workers=1, local_dir=str(tmp_path)) as processor:
         # Test basic level
         basic = processor.process_audio_files(
             file_paths=[file_path], feature_type="all", level="basic"
@@ -97,9 +99,9 @@ def test_feature_extraction_levels(test_audio_files):
         assert "chroma_cqt" in advanced[file_path]  # Chroma features in advanced
 
 
-def test_error_handling():
+def test_error_handling(tmp_path):
     """Test error handling for invalid inputs."""
-    with DistributedAudioProcessor(n_workers=1) as processor:
+    with DistributedAudioProcessor(n_workers=1, local_dir=str(tmp_path)) as processor:
         # Test with non-existent file
         results = processor.process_audio_files(
             file_paths=["/path/to/nonexistent/file.wav"], feature_type="rhythm"
@@ -113,7 +115,7 @@ def test_error_handling():
             )
 
 
-def test_parallel_performance(test_audio_files, benchmark):
+def test_parallel_performance(test_audio_files, benchmark, tmp_path):
     """Test performance with different numbers of workers."""
     temp_dir, filenames = test_audio_files
     file_paths = [
@@ -121,7 +123,9 @@ def test_parallel_performance(test_audio_files, benchmark):
     ]  # Repeat to get more files
 
     def run_with_workers(n_workers):
-        with DistributedAudioProcessor(n_workers=n_workers) as processor:
+        with DistributedAudioProcessor(
+            n_workers=n_workers, local_dir=str(tmp_path)
+        ) as processor:
             return processor.process_audio_files(
                 file_paths=file_paths, feature_type="rhythm", level="basic"
             )
@@ -144,12 +148,12 @@ def test_parallel_performance(test_audio_files, benchmark):
     assert time_2 < time_1 * 0.8  # At least 20% faster with 2 workers
 
 
-def test_batch_processing(test_audio_files):
+def test_batch_processing(test_audio_files, tmp_path):
     """Test processing files in batches."""
     temp_dir, filenames = test_audio_files
     file_paths = [str(Path(temp_dir) / f) for f in filenames * 3]  # 9 files total
 
-    with DistributedAudioProcessor(n_workers=2) as processor:
+    with DistributedAudioProcessor(n_workers=2, local_dir=str(tmp_path)) as processor:
         # Process with batch size of 2
         results = processor.process_audio_files(
             file_paths=file_paths, feature_type="spectral", level="basic", batch_size=2
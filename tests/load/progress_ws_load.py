@@ -0,0 +1,80 @@
+"""
+WebSocket progress load test for SampleMind AI API
+Opens many concurrent /ws/progress sockets against one batch job and reports
+connect latency, message counts and time-to-final-state.
+
+Run against a live server:
+    python tests/load/progress_ws_load.py --host ws://localhost:8000 \\
+        --http http://localhost:8000 --sockets 1000 --files 50 --audio sample.wav
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+import websockets
+
+TERMINAL = {"completed", "failed", "cancelled"}
+
+
+async def create_job(http: str, audio: Path, files: int) -> str:
+    data = audio.read_bytes()
+    payload = [
+        ("files", (f"{i}_{audio.name}", data, "audio/wav")) for i in range(files)
+    ]
+    async with httpx.AsyncClient(base_url=http, timeout=120) as client:
+        response = await client.post("/api/v1/batch/analyze", files=payload)
+        response.raise_for_status()
+        return response.json()["job_id"]
+
+
+async def watch(url: str, stats: dict) -> None:
+    start = time.perf_counter()
+    async with websockets.connect(url, open_timeout=30) as ws:
+        stats["connect"].append(time.perf_counter() - start)
+        messages = 0
+        async for raw in ws:
+            messages += 1
+            if any(f'"{status}"' in raw for status in TERMINAL):
+                break
+        stats["messages"].append(messages)
+        stats["done"].append(time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="ws://localhost:8000")
+    parser.add_argument("--http", default="http://localhost:8000")
+    parser.add_argument("--sockets", type=int, default=1000)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--audio", type=Path, required=True)
+    args = parser.parse_args()
+
+    job_id = await create_job(args.http, args.audio, args.files)
+    url = f"{args.host}/api/v1/ws/progress/{job_id}"
+    stats: dict[str, list[float]] = {"connect": [], "messages": [], "done": []}
+
+    results = await asyncio.gather(
+        *(watch(url, stats) for _ in range(args.sockets)), return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, Exception)]
+
+    print(f"job {job_id}: {args.sockets} sockets, {len(errors)} errors")
+    if stats["connect"]:
+        connect = sorted(stats["connect"])
+        p99 = connect[max(int(len(connect) * 0.99) - 1, 0)]
+        print(
+            f"connect p50={statistics.median(connect) * 1000:.0f}ms "
+            f"p99={p99 * 1000:.0f}ms"
+        )
+        print(f"messages/socket mean={statistics.mean(stats['messages']):.1f}")
+        print(f"time to final state max={max(stats['done']):.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
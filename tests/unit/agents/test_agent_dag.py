@@ -0,0 +1,311 @@
+"""
+Unit tests for the concurrent agent DAG executor.
+
+Covers:
+- merge_update reducer semantics
+- independent nodes overlap (latency follows the critical path)
+- build_graph topology end-to-end with fake agents
+- node result cache keyed by file content
+- failing nodes are isolated
+- shared resources are injected into nodes
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from samplemind.ai.agents.dag import AgentDAG, AgentNode, NodeResultCache
+from samplemind.ai.agents.resources import AgentResources
+from samplemind.ai.agents.state import merge_update
+
+AGENT_DELAY = 0.1
+FIXTURES = Path(__file__).parents[2] / "fixtures"
+
+
+def _sleeper(name: str, delay: float = AGENT_DELAY, calls: list | None = None):
+    def node(state, resources=None):
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        return {"messages": [name], "current_stage": name}
+
+    return node
+
+
+@pytest.fixture
+def wav(tmp_path):
+    path = tmp_path / "kick.wav"
+    path.write_bytes(b"RIFF" + b"\x00" * 64)
+    return path
+
+
+@pytest.fixture
+def fake_agents():
+    """Replace the six agents with sleeping fakes; yields the call log."""
+    calls: list[str] = []
+    targets = {
+        "analysis_agent.features_agent": "features",
+        "analysis_agent.analysis_agent": "analysis",
+        "tagging_agent.tagging_agent": "tagging",
+        "mixing_agent.mixing_agent": "mixing",
+        "quality_agent.quality_agent": "quality",
+        "recommendation_agent.recommendation_agent": "recommendations",
+        "pack_builder_agent.pack_builder_agent": "pack_builder",
+    }
+    with ExitStack() as stack:
+        for target, name in targets.items():
+            stack.enter_context(
+                patch(f"samplemind.ai.agents.{target}", _sleeper(name, calls=calls))
+            )
+        yield calls
+
+
+# ── merge_update ──────────────────────────────────────────────────────────────
+
+
+def test_merge_update_appends_lists_and_keeps_max_progress():
+    state = {
+        "messages": ["a"],
+        "errors": [],
+        "progress_pct": 55,
+        "node_timings": {"x": 1.0},
+    }
+    merge_update(
+        state,
+        {
+            "messages": ["b"],
+            "errors": ["oops"],
+            "progress_pct": 40,
+            "node_timings": {"y": 2.0},
+        },
+    )
+    assert state["messages"] == ["a", "b"]
+    assert state["errors"] == ["oops"]
+    assert state["progress_pct"] == 55
+    assert state["node_timings"] == {"x": 1.0, "y": 2.0}
+
+
+# ── Executor ──────────────────────────────────────────────────────────────────
+
+
+def test_independent_nodes_run_concurrently():
+    dag = AgentDAG(
+        [
+            AgentNode("a", _sleeper("a", 0.0)),
+            AgentNode("b", _sleeper("b"), ("a",)),
+            AgentNode("c", _sleeper("c"), ("a",)),
+            AgentNode("d", _sleeper("d"), ("a",)),
+            AgentNode("e", _sleeper("e", 0.0), ("b", "c", "d")),
+        ]
+    )
+    start = time.perf_counter()
+    result = dag.invoke({"messages": []})
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2 * AGENT_DELAY
+    assert result["messages"][0] == "a"
+    assert result["messages"][-1] == "e"
+    assert sorted(result["messages"][1:4]) == ["b", "c", "d"]
+
+
+def test_dependencies_see_upstream_state():
+    seen = {}
+
+    def consumer(state):
+        seen.update(state)
+        return {}
+
+    dag = AgentDAG(
+        [
+            AgentNode("producer", lambda state: {"tags": {"genre": ["trap"]}}),
+            AgentNode("consumer", consumer, ("producer",)),
+        ]
+    )
+    dag.invoke({})
+    assert seen["tags"] == {"genre": ["trap"]}
+
+
+def test_unknown_dependency_and_cycle_are_rejected():
+    with pytest.raises(ValueError):
+        AgentDAG([AgentNode("a", _sleeper("a"), ("missing",))])
+    with pytest.raises(ValueError):
+        AgentDAG(
+            [
+                AgentNode("a", _sleeper("a"), ("b",)),
+                AgentNode("b", _sleeper("b"), ("a",)),
+            ]
+        )
+
+
+def test_failing_node_is_isolated():
+    def broken(state):
+        raise RuntimeError("model exploded")
+
+    dag = AgentDAG(
+        [
+            AgentNode("a", broken),
+            AgentNode("b", lambda state: {"messages": ["b ran"]}, ("a",)),
+        ]
+    )
+    result = dag.invoke({"messages": [], "errors": []})
+    assert result["errors"] == ["a: model exploded"]
+    assert result["messages"] == ["b ran"]
+
+
+# ── Full pipeline ─────────────────────────────────────────────────────────────
+
+
+def test_pipeline_latency_follows_critical_path(fake_agents, wav):
+    from samplemind.ai.agents.graph import build_graph
+
+    app = build_graph(resources=AgentResources(), cache=None)
+    start = time.perf_counter()
+    result = app.invoke({"file_path": str(wav), "messages": [], "errors": []})
+    elapsed = time.perf_counter() - start
+
+    timings = result["node_timings"]
+    assert set(timings) == {
+        "router",
+        "features",
+        "quality",
+        "analysis",
+        "tagging",
+        "mixing",
+        "recommendations",
+        "pack_builder",
+        "aggregator",
+    }
+    assert result["current_stage"] == "done"
+    assert (
+        result["final_report"]["node_timings"]["pack_builder"]
+        >= AGENT_DELAY * 1000 * 0.9
+    )
+    # features → tagging → mixing → pack_builder; the other three overlap
+    assert app.critical_path(timings) < sum(timings.values()) * 0.7
+    assert elapsed < 6 * AGENT_DELAY
+
+
+def test_unchanged_file_is_served_from_cache(fake_agents, wav):
+    from samplemind.ai.agents.graph import build_graph
+
+    app = build_graph(resources=AgentResources(), cache=NodeResultCache())
+    state = {"file_path": str(wav), "messages": [], "errors": []}
+    first = app.invoke(dict(state))
+    first_calls = len(fake_agents)
+
+    second = app.invoke(dict(state))
+    # Only the library-dependent recommendations node runs again
+    assert fake_agents[first_calls:] == ["recommendations"]
+    assert second["final_report"]["tags"] == first["final_report"]["tags"]
+    assert second["node_timings"]["analysis"] == 0.0
+
+    wav.write_bytes(b"RIFF" + b"\x01" * 64)
+    app.invoke(dict(state))
+    assert "analysis" in fake_agents[first_calls + 1 :]
+
+
+def test_stream_yields_each_node_once(fake_agents, wav):
+    from samplemind.ai.agents.graph import build_graph
+
+    chunks = list(
+        build_graph(resources=AgentResources(), cache=None).stream(
+            {"file_path": str(wav), "messages": [], "errors": []}
+        )
+    )
+    names = [name for chunk in chunks for name in chunk]
+    assert names[0] == "router"
+    assert names[-1] == "aggregator"
+    assert len(names) == len(set(names)) == 9
+
+
+async def test_astream_runs_off_the_event_loop(fake_agents, wav):
+    from samplemind.ai.agents.graph import build_graph
+
+    app = build_graph(resources=AgentResources(), cache=None)
+    names = [
+        name
+        async for chunk in app.astream({"file_path": str(wav), "messages": []})
+        for name in chunk
+    ]
+    assert names[-1] == "aggregator"
+
+
+# ── Resources ─────────────────────────────────────────────────────────────────
+
+
+def test_features_agent_uses_injected_engine(wav):
+    from samplemind.ai.agents.analysis_agent import features_agent
+
+    engine = MagicMock()
+    engine.analyze_file.return_value = SimpleNamespace(
+        bpm=128.0,
+        key="A",
+        scale="minor",
+        duration=1.5,
+        sample_rate=44100,
+        rms_energy=0.2,
+        spectral_centroid=2500.0,
+        spectral_bandwidth=1800.0,
+        zero_crossing_rate=0.05,
+        mfcc_mean=[1.0] * 13,
+    )
+    resources = AgentResources(audio_engine=engine)
+
+    result = features_agent({"file_path": str(wav)}, resources=resources)
+
+    engine.analyze_file.assert_called_once()
+    assert result["audio_features"]["bpm"] == 128.0
+    assert result["audio_features"]["mfcc_mean"] == [1.0] * 5
+
+
+def test_resources_are_created_once():
+    from samplemind.ai.agents import resources as resources_mod
+
+    factory = MagicMock(side_effect=lambda: object())
+    with patch.dict(resources_mod._FACTORIES, {"audio_engine": factory}):
+        shared = AgentResources()
+        assert shared.audio_engine is shared.audio_engine
+    factory.assert_called_once()
+
+    with pytest.raises(TypeError):
+        AgentResources(unknown_engine=object())
+
+
+def test_embedding_engine_resource_builds_the_real_engine():
+    from samplemind.core.similarity.embedding_engine import (
+        EMBEDDING_DIM,
+        AudioEmbeddingEngine,
+    )
+
+    engine = AgentResources().embedding_engine
+
+    assert isinstance(engine, AudioEmbeddingEngine)
+    embedding = engine.generate_embedding(FIXTURES / "test_120bpm_c_major.wav")
+    assert embedding.embedding.shape == (EMBEDDING_DIM,)
+
+
+def test_recommendation_agent_queries_the_similarity_db():
+    from samplemind.ai.agents.recommendation_agent import recommendation_agent
+
+    db = MagicMock()
+    db.find_similar.return_value = [
+        SimpleNamespace(
+            file_path="/lib/kick.wav", similarity=0.91234, metadata={"tempo": 128.0}
+        )
+    ]
+    query = FIXTURES / "test_120bpm_c_major.wav"
+
+    result = recommendation_agent(
+        {"file_path": str(query)}, resources=AgentResources(similarity_db=db)
+    )
+
+    db.find_similar.assert_called_once_with(query, n_results=5)
+    assert result["similar_samples"] == [
+        {"path": "/lib/kick.wav", "score": 0.9123, "bpm": 128.0, "key": None}
+    ]
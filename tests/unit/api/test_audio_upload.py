@@ -0,0 +1,184 @@
+"""
+Tests for the streaming audio upload path
+
+Covers header probing, the chunked upload writer (incremental hash, size
+limit, early rejection) and the /upload route's hash-keyed analysis cache.
+"""
+
+import asyncio
+import hashlib
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from samplemind.core.loading import (
+    UnrecognizedAudioError,
+    UploadTooLargeError,
+    probe_header,
+    stream_upload,
+)
+from samplemind.interfaces.api.dependencies import set_app_state
+from samplemind.interfaces.api.exceptions import FileValidationError
+from samplemind.interfaces.api.routes import audio as audio_routes
+
+
+def _encode(fmt: str, subtype: str | None = None, sr: int = 22050, seconds=1.0, ch=2):
+    data = np.zeros((int(sr * seconds), ch), dtype=np.float32)
+    buf = io.BytesIO()
+    sf.write(buf, data, sr, format=fmt, subtype=subtype)
+    return buf.getvalue()
+
+
+class ChunkedUpload:
+    """Minimal UploadFile stand-in that records how much was read."""
+
+    def __init__(self, data: bytes, filename: str = "clip.wav") -> None:
+        self.filename = filename
+        self._stream = io.BytesIO(data)
+        self.bytes_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+# ---------------------------------------------------------------------------
+# Header probe
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "fmt,subtype,expected",
+    [
+        ("WAV", "PCM_16", "wav"),
+        ("AIFF", "PCM_16", "aiff"),
+        ("FLAC", "PCM_16", "flac"),
+    ],
+)
+def test_probe_lossless_headers(fmt, subtype, expected):
+    data = _encode(fmt, subtype, sr=22050, seconds=1.5)
+    probe = probe_header(data[:4096])
+
+    assert probe.format == expected
+    assert probe.sample_rate == 22050
+    assert probe.channels == 2
+    assert probe.bits_per_sample == 16
+    assert probe.duration == pytest.approx(1.5, abs=1e-3)
+
+
+def test_probe_ogg_and_unknown():
+    probe = probe_header(_encode("OGG", "VORBIS", sr=44100)[:4096])
+    assert (probe.format, probe.sample_rate, probe.channels) == ("ogg", 44100, 2)
+
+    assert probe_header(b"<html><body>not audio</body></html>") is None
+
+
+# ---------------------------------------------------------------------------
+# Streaming writer
+# ---------------------------------------------------------------------------
+
+
+def test_stream_upload_hashes_while_writing(tmp_path):
+    data = _encode("WAV", "PCM_16", seconds=3.0)
+    upload = ChunkedUpload(data)
+
+    result = asyncio.run(stream_upload(upload, tmp_path / "a.wav", chunk_size=8192))
+
+    assert result.size == len(data)
+    assert result.sha256 == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / "a.wav").read_bytes() == data
+    assert result.probe.duration == pytest.approx(3.0, abs=1e-3)
+
+
+def test_stream_upload_enforces_limit_without_buffering(tmp_path):
+    upload = ChunkedUpload(b"RIFF" + b"\0" * (5 * 1024 * 1024))
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(stream_upload(upload, tmp_path / "big.wav", max_bytes=1024 * 1024))
+
+    assert not (tmp_path / "big.wav").exists()
+    # Stopped after the first chunk past the limit
+    assert upload.bytes_read <= 2 * 1024 * 1024
+
+
+def test_stream_upload_rejects_non_audio_early(tmp_path):
+    upload = ChunkedUpload(b"MZ" + b"\0" * (4 * 1024 * 1024), filename="evil.wav")
+
+    with pytest.raises(UnrecognizedAudioError):
+        asyncio.run(
+            stream_upload(
+                upload, tmp_path / "evil.wav", chunk_size=65536, require_audio=True
+            )
+        )
+
+    assert upload.bytes_read == 65536
+    assert not (tmp_path / "evil.wav").exists()
+
+
+# ---------------------------------------------------------------------------
+# Route
+# ---------------------------------------------------------------------------
+
+
+class FakeEngine:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def analyze_audio(self, file_path, file_hash=None):
+        self.calls.append((file_path, file_hash))
+        return SimpleNamespace(to_dict=lambda: {"tempo": 120.0})
+
+
+@pytest.fixture
+def upload_client(tmp_path):
+    settings = SimpleNamespace(
+        UPLOAD_DIR=tmp_path / "uploads",
+        ANALYSIS_DIR=tmp_path / "analysis",
+        MAX_UPLOAD_SIZE_MB=10,
+    )
+    engine = FakeEngine()
+    set_app_state("audio_engine", engine)
+    app = FastAPI()
+    app.include_router(audio_routes.router)
+    with patch.object(audio_routes, "get_settings", return_value=settings):
+        yield TestClient(app), engine
+    set_app_state("audio_engine", None)
+
+
+def test_repeat_upload_hits_hash_cache(upload_client):
+    client, engine = upload_client
+    data = _encode("WAV", "PCM_16", seconds=0.5)
+    files = {"file": ("loop.wav", data, "audio/wav")}
+
+    first = client.post("/upload", files=files).json()
+    assert first["analysis_status"] == "queued"
+    assert first["content_hash"] == hashlib.sha256(data).hexdigest()
+    assert (first["format"], first["sample_rate"]) == ("wav", 22050)
+
+    second = client.post("/upload", files=files).json()
+    assert second["analysis_status"] == "cached"
+    assert second["file_id"] != first["file_id"]
+
+    # Analysed once, reusing the upload's hash instead of re-reading the file
+    assert len(engine.calls) == 1
+    assert engine.calls[0][1] == first["content_hash"]
+
+    cached = client.get(f"/analysis/by-hash/{first['content_hash']}").json()
+    assert cached["features"] == {"tempo": 120.0}
+
+
+def test_upload_rejects_mislabelled_file(upload_client):
+    client, engine = upload_client
+    files = {"file": ("fake.wav", b"not really a wav file", "audio/wav")}
+
+    with pytest.raises(FileValidationError):
+        client.post("/upload", files=files)
+
+    assert engine.calls == []
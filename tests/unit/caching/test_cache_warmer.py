@@ -0,0 +1,178 @@
+"""Unit tests for the event-driven cache warmer."""
+
+import asyncio
+import random
+
+import pytest
+
+from samplemind.core.caching.cache_manager import AdvancedCacheManager
+from samplemind.core.caching.cache_warmer import CacheWarmer, WarmupPriority
+from samplemind.core.caching.markov_predictor import MarkovPredictor
+from samplemind.core.caching.usage_patterns import UsageEvent, UsagePatternTracker
+
+
+class FakeAudioEngine:
+    """Stands in for AudioEngine; records which files were analyzed"""
+
+    def __init__(self, delay: float = 0.001):
+        self.delay = delay
+        self.analyzed: list[str] = []
+
+    async def analyze_audio_async(self, file_path, analysis_level="standard"):
+        self.analyzed.append(file_path.stem)
+        await asyncio.sleep(self.delay)
+        return {"file": file_path.name, "level": analysis_level}
+
+
+def _event(file_id: str, cache_hit: bool) -> UsageEvent:
+    return UsageEvent(
+        timestamp=0.0,
+        file_id=file_id,
+        file_name=f"{file_id}.wav",
+        feature_type="features",
+        analysis_level="standard",
+        processing_time_ms=1.0,
+        cache_hit=cache_hit,
+    )
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Three projects, each a fixed sequence of eight samples"""
+    projects = [[f"p{p}_s{i}" for i in range(8)] for p in range(3)]
+    paths = {}
+    for file_id in (f for project in projects for f in project):
+        paths[file_id] = tmp_path / f"{file_id}.wav"
+        paths[file_id].write_bytes(b"\0" * 64)
+    return projects, paths
+
+
+class TestCacheWarmer:
+    """Test CacheWarmer scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_simulated_workload_hit_rate(self, library):
+        """Predicted preloading turns sequential first visits into cache hits"""
+        projects, paths = library
+        rng = random.Random(7)
+
+        tracker = UsagePatternTracker(max_events=10_000)
+        predictor = MarkovPredictor(tracker, confidence_threshold=0.5)
+        for file_id, path in paths.items():
+            predictor.register_file(file_id, path.name, 64, 1.0, file_path=str(path))
+
+        cache = AdvancedCacheManager()
+        engine = FakeAudioEngine()
+        warmer = CacheWarmer(
+            audio_engine=engine,
+            cache=cache,
+            markov_predictor=predictor,
+            max_concurrent_tasks=4,
+            load_sampler=lambda: (0.0, 0.0),
+        )
+        runner = asyncio.create_task(warmer.start())
+
+        async def session(walks: int) -> float:
+            hits = total = 0
+            for _ in range(walks):
+                for file_id in rng.choice(projects):
+                    key = f"audio:{file_id}:features:standard"
+                    hit = await cache.contains(key)
+                    if not hit:
+                        await cache.set(key, {"file": file_id})  # analyzed on demand
+                    hits += hit
+                    total += 1
+                    tracker.record_event(_event(file_id, hit))
+                    await asyncio.sleep(0.005)  # user think time
+            return hits / total
+
+        await session(walks=12)  # learn the workflows
+
+        cache.clear()
+        engine.analyzed.clear()
+        hit_rate = await session(walks=6)
+
+        await warmer.stop()
+        await runner
+
+        # Only the first sample of each walk is unpredictable: 7 of 8 can hit
+        assert hit_rate >= 0.75, f"hit rate {hit_rate:.0%}"
+        # Nothing was analyzed twice: cached or pending work is deduplicated
+        assert len(engine.analyzed) == len(set(engine.analyzed))
+        assert warmer.get_stats()["skipped_tasks"] > 0
+
+    @pytest.mark.asyncio
+    async def test_add_task_deduplicates_pending_work(self, tmp_path):
+        """The same state is queued once until it has been processed"""
+        warmer = CacheWarmer(cache=AdvancedCacheManager())
+        path = tmp_path / "a.wav"
+
+        assert await warmer.add_task("a", path, "tempo", "basic")
+        assert not await warmer.add_task(
+            "a", path, "tempo", "basic", priority=WarmupPriority.CRITICAL
+        )
+        assert warmer.get_queue_size() == 1
+
+        warmer.clear_queue()
+        assert await warmer.add_task("a", path, "tempo", "basic")
+
+    @pytest.mark.asyncio
+    async def test_concurrency_follows_cpu_headroom(self, tmp_path):
+        """Concurrency scales with CPU headroom and pauses above thresholds"""
+        load = {"cpu": 0.0, "memory": 0.2}
+        engine = FakeAudioEngine(delay=0.05)
+        warmer = CacheWarmer(
+            audio_engine=engine,
+            max_concurrent_tasks=4,
+            cpu_threshold=0.8,
+            sample_interval=3600,
+            load_sampler=lambda: (load["cpu"], load["memory"]),
+        )
+
+        assert warmer._adjust_concurrency() == 4
+        load["cpu"] = 0.6
+        assert warmer._adjust_concurrency() == 2  # 1 + round(3 * 0.25)
+        load["memory"] = 0.9
+        assert warmer._adjust_concurrency() == 0
+
+        # Paused by load: queued work waits rather than spinning
+        for i in range(3):
+            path = tmp_path / f"{i}.wav"
+            path.write_bytes(b"\0")
+            await warmer.add_task(str(i), path, "tempo", "basic")
+        runner = asyncio.create_task(warmer.start())
+        await asyncio.sleep(0.05)
+        assert engine.analyzed == []
+
+        load["cpu"], load["memory"] = 0.0, 0.2
+        warmer._adjust_concurrency()
+        await asyncio.sleep(0.2)
+        assert sorted(engine.analyzed) == ["0", "1", "2"]
+        assert warmer.get_stats()["resume_count"] == 1
+
+        await warmer.stop()
+        await runner
+
+    @pytest.mark.asyncio
+    async def test_stop_while_paused_releases_dequeued_task(self, tmp_path):
+        """A task taken off the queue but never started can be queued again"""
+        engine = FakeAudioEngine()
+        warmer = CacheWarmer(
+            audio_engine=engine,
+            cache=AdvancedCacheManager(),
+            sample_interval=3600,
+            load_sampler=lambda: (0.0, 0.2),
+        )
+        path = tmp_path / "a.wav"
+        path.write_bytes(b"\0")
+
+        await warmer.pause()
+        assert await warmer.add_task("a", path, "tempo", "basic")
+        runner = asyncio.create_task(warmer.start())
+        await asyncio.sleep(0.05)
+        assert warmer.get_queue_size() == 0  # dequeued, waiting on the pause
+
+        await warmer.stop()
+        await runner
+        assert engine.analyzed == []
+        assert await warmer.add_task("a", path, "tempo", "basic")
@@ -0,0 +1,165 @@
+"""
+Unit tests for lazy CLI command loading
+
+Tests cover:
+- Importing the Typer app does not import any command group module
+- --help / --version render without importing command groups
+- Invoking a group imports only that group's module
+- Cold-start import time budget (python -X importtime)
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from samplemind.interfaces.cli.lazy_group import (
+    LazyCommandPlaceholder,
+    LazyCommandSpec,
+    LazyTyperGroup,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.cli]
+
+SRC_DIR = Path(__file__).resolve().parents[3] / "src"
+
+# Cumulative import budget for samplemind.interfaces.cli.typer_app
+IMPORT_BUDGET_US = int(os.environ.get("SAMPLEMIND_CLI_IMPORT_BUDGET_MS", "750")) * 1000
+
+HEAVY_MODULES = ("numpy", "soundfile", "librosa", "scipy", "anthropic", "openai")
+
+
+def _run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+
+
+class TestColdStart:
+    """Run in a fresh interpreter so sys.modules is not polluted by other tests"""
+
+    def test_import_does_not_load_command_modules(self):
+        """Importing typer_app must not import commands/* or heavy deps"""
+        code = (
+            "import sys\n"
+            "import samplemind.interfaces.cli.typer_app\n"
+            "mods = [m for m in sys.modules\n"
+            "        if m.startswith('samplemind.interfaces.cli.commands.')\n"
+            f"        or m.split('.')[0] in {HEAVY_MODULES!r}]\n"
+            "print(','.join(sorted(mods)))\n"
+        )
+        result = _run_python(code)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == ""
+
+    def test_version_flag_is_cheap(self):
+        """--version exits before any command group is resolved"""
+        code = (
+            "import sys\n"
+            "from samplemind.interfaces.cli.typer_app import app\n"
+            "try:\n"
+            "    app(['--version'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('numpy' in sys.modules)\n"
+        )
+        result = _run_python(code)
+        assert result.returncode == 0, result.stderr
+        assert "v2.1.0-beta" in result.stdout
+        assert result.stdout.strip().endswith("False")
+
+    @pytest.mark.performance
+    def test_import_time_budget(self):
+        """Cumulative import time of the CLI entrypoint stays under budget"""
+        result = _run_python(
+            "import samplemind.interfaces.cli.typer_app", "-X", "importtime"
+        )
+        assert result.returncode == 0, result.stderr
+
+        cumulative_us = None
+        for line in result.stderr.splitlines():
+            if line.rstrip().endswith("| samplemind.interfaces.cli.typer_app"):
+                cumulative_us = int(line.split("|")[1])
+        assert cumulative_us is not None, result.stderr
+        assert cumulative_us < IMPORT_BUDGET_US, (
+            f"CLI import took {cumulative_us / 1000:.1f} ms "
+            f"(budget {IMPORT_BUDGET_US / 1000:.0f} ms)"
+        )
+
+
+class TestLazyTyperGroup:
+    """Test group resolution through the lazy registry"""
+
+    def test_help_lists_lazy_groups(self):
+        """Top-level --help shows every registered group from metadata"""
+        from samplemind.interfaces.cli.typer_app import COMMAND_GROUPS, app
+
+        result = CliRunner().invoke(app, ["--help"])
+
+        assert result.exit_code == 0
+        for spec in COMMAND_GROUPS:
+            assert spec.name in result.stdout
+
+    def test_placeholder_returned_for_unloaded_group(self):
+        """get_command returns a placeholder until the group is resolved"""
+
+        class Group(LazyTyperGroup):
+            pass
+
+        Group.register(
+            LazyCommandSpec("x", "samplemind.interfaces.cli.commands.sync", help="X")
+        )
+        group = Group(name="root")
+
+        command = group.get_command(None, "x")
+
+        assert isinstance(command, LazyCommandPlaceholder)
+        assert command.get_short_help_str() == "X"
+        assert Group.loaded_commands() == []
+
+    def test_resolve_loads_only_invoked_group(self):
+        """Resolving a group imports and caches just that group"""
+        import click
+        from typer.core import TyperGroup
+
+        class Group(LazyTyperGroup):
+            pass
+
+        Group.register(
+            LazyCommandSpec(
+                "index",
+                "samplemind.interfaces.cli.commands.search",
+                attr="index_app",
+                help="Index",
+            )
+        )
+        Group.register(
+            LazyCommandSpec("never", "samplemind.does_not_exist", help="Never")
+        )
+        group = Group(name="root")
+        ctx = click.Context(group)
+
+        name, command, rest = group.resolve_command(ctx, ["index", "stats"])
+
+        assert name == "index"
+        assert isinstance(command, TyperGroup)
+        assert "stats" in command.list_commands(ctx)
+        assert rest == ["stats"]
+        assert Group.loaded_commands() == ["index"]
+        assert group.get_command(ctx, "index") is command
+
+    def test_unknown_command_fails(self):
+        """Unknown group names still produce a usage error"""
+        from samplemind.interfaces.cli.typer_app import app
+
+        result = CliRunner().invoke(app, ["definitely-not-a-group"])
+
+        assert result.exit_code != 0
@@ -0,0 +1,186 @@
+"""Unit tests for partitioned, disk-spilling distributed processing."""
+
+import json
+import sys
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+pytest.importorskip("dask.distributed")
+pytest.importorskip("pyarrow")
+
+from samplemind.core.engine import distributed_processor
+from samplemind.core.engine.audio_engine import AdvancedFeatureExtractor
+from samplemind.core.engine.distributed_processor import (
+    MANIFEST_FILE,
+    DistributedAudioProcessor,
+    ProcessingManifest,
+    partition_files,
+    read_partition,
+    write_partition,
+)
+
+SR = 22050
+
+
+@pytest.fixture
+def audio_files(tmp_path):
+    paths = []
+    for i in range(8):
+        seconds = 0.5 + 0.25 * (i % 4)
+        t = np.arange(int(seconds * SR)) / SR
+        path = tmp_path / f"tone_{i}.wav"
+        sf.write(path, 0.3 * np.sin(2 * np.pi * (220 + 40 * i) * t), SR)
+        paths.append(str(path))
+    return paths
+
+
+def _local_processor(tmp_path) -> DistributedAudioProcessor:
+    return DistributedAudioProcessor(
+        n_workers=2,
+        local_dir=str(tmp_path / "dask"),
+        use_cache=False,
+        processes=False,
+        sample_rate=SR,
+    )
+
+
+class TestDistributedProcessor:
+    """Test partitioning, worker extractors and on-disk results"""
+
+    def test_partitions_balance_total_size(self):
+        """Largest files are spread out first; order is kept within a partition"""
+        paths = [f"f{i}" for i in range(8)]
+        sizes = [900, 100, 100, 800, 100, 100, 100, 100]
+        partitions = partition_files(paths, batch_size=4, sizes=sizes)
+
+        assert sorted(p for part in partitions for p in part) == sorted(paths)
+        totals = [sum(sizes[paths.index(p)] for p in part) for part in partitions]
+        assert totals == [1200, 1100]
+        assert all(part == sorted(part, key=paths.index) for part in partitions)
+        assert len(partition_files(paths, 4, partition_bytes=300, sizes=sizes)) == 8
+        assert partition_files([], 4) == []
+
+    def test_partition_files_round_trip(self, tmp_path):
+        """Arrays, nested dicts and missing keys survive the Parquet round trip"""
+        rows = [
+            {
+                "_file_path": "a.wav",
+                "tempo": np.float64(120.0),
+                "mfccs": np.ones((2, 3), dtype=np.float32),
+                "rhythm_pattern": {"density": 0.5, "hist": [1, 2]},
+                "beats": [],
+            },
+            {"_file_path": "b.wav", "_error": "File not found", "beats": [1, 2]},
+        ]
+        restored = read_partition(write_partition(rows, tmp_path / "part.parquet"))
+
+        assert restored[0]["mfccs"] == [[1.0] * 3] * 2
+        assert restored[0]["rhythm_pattern"] == {"density": 0.5, "hist": [1, 2]}
+        assert restored[0]["beats"] == [] and "_error" not in restored[0]
+        assert restored[1] == rows[1]
+
+    def test_partitions_need_pyarrow(self, tmp_path, monkeypatch):
+        """Without pyarrow, writing a partition names the missing extra"""
+        from samplemind.core.processing.exceptions import OptionalDependencyError
+
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with pytest.raises(OptionalDependencyError, match=r"\[distributed\]"):
+            write_partition([{"tempo": 120.0}], tmp_path / "part.parquet")
+
+    def test_process_to_disk_writes_partitions_and_manifest(
+        self, audio_files, tmp_path, monkeypatch
+    ):
+        """Workers write Parquet partitions with one extractor each"""
+        built = []
+
+        class CountingExtractor(AdvancedFeatureExtractor):
+            def __init__(self, *args, **kwargs):
+                built.append(self)
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(
+            distributed_processor, "AdvancedFeatureExtractor", CountingExtractor
+        )
+
+        progress = []
+        paths = audio_files + [str(tmp_path / "missing.wav")]
+        out = tmp_path / "features"
+        with _local_processor(tmp_path) as processor:
+            manifest = processor.process_to_disk(
+                paths,
+                out,
+                feature_type="spectral",
+                batch_size=2,
+                progress_callback=lambda done, total: progress.append((done, total)),
+            )
+
+        assert len(manifest.partitions) == 5
+        assert (manifest.total_files, manifest.succeeded, manifest.failed) == (9, 8, 1)
+        assert "File not found" in manifest.errors[paths[-1]]
+        assert progress[-1] == (9, 9)
+        assert 1 <= len(built) <= processor.max_workers
+        assert sorted(f.name for f in out.iterdir()) == [MANIFEST_FILE] + [
+            f"part-{i:05d}.parquet" for i in range(5)
+        ]
+
+        # Only manifests come back; features are read from disk on demand
+        reopened = ProcessingManifest.load(out)
+        assert json.loads((out / MANIFEST_FILE).read_text())["succeeded"] == 8
+        features = reopened.load_features()
+        assert sorted(features) == sorted(paths)
+
+        reference = AdvancedFeatureExtractor(sample_rate=SR, use_cache=False)
+        y, _ = sf.read(audio_files[3])
+        expected = reference.extract_spectral_features(y.astype(np.float32))
+        np.testing.assert_allclose(
+            features[audio_files[3]]["spectral_centroid"],
+            expected["spectral_centroid"],
+            rtol=1e-4,
+        )
+
+    def test_process_audio_files_returns_features_in_memory(
+        self, audio_files, tmp_path, monkeypatch
+    ):
+        """Rows come back over the network: no scratch files, no pyarrow"""
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with _local_processor(tmp_path) as processor:
+            assert processor._adaptive.minimum == 1
+            assert processor._adaptive.maximum == 2
+
+            paths = audio_files[:3] + [str(tmp_path / "missing.wav")]
+            results = processor.process_audio_files(paths, "mfcc", batch_size=2)
+            assert list(results) == paths
+            assert all(len(r["mfcc"]) == 20 for r in results.values() if "mfcc" in r)
+            assert "File not found" in results[paths[-1]]["_error"]
+            assert not list(processor.local_dir.rglob("*.parquet"))
+
+            with pytest.raises(ValueError):
+                processor.process_audio_files(audio_files, "invalid_feature")
+
+    def test_process_audio_files_on_an_external_client(self, audio_files, tmp_path):
+        """An external client gets the same rows as a spill to a shared dir"""
+        from dask.distributed import Client
+
+        with (
+            Client(n_workers=1, processes=False, dashboard_address=None) as client,
+            DistributedAudioProcessor(
+                client=client,
+                local_dir=str(tmp_path / "dask"),
+                use_cache=False,
+                sample_rate=SR,
+            ) as processor,
+        ):
+            in_memory = processor.process_audio_files(audio_files[:2], "spectral")
+            spilled = processor.process_audio_files(
+                audio_files[:2], "spectral", output_dir=tmp_path / "shared"
+            )
+
+        assert (tmp_path / "shared" / MANIFEST_FILE).exists()
+        assert sorted(in_memory) == sorted(spilled)
+        for path, row in in_memory.items():
+            assert row.keys() == spilled[path].keys()
+            np.testing.assert_allclose(
+                row["spectral_centroid"], spilled[path]["spectral_centroid"]
+            )
@@ -0,0 +1,127 @@
+"""
+Unit tests for the bounded-memory monitoring metrics core.
+
+Tests:
+- Quantile sketch accuracy, merging and bounded bins
+- Histogram buckets and per-thread accumulation merged at scrape time
+- Cardinality guard folds excess series into an overflow series
+- AudioProcessingMetrics record_* calls and Prometheus export
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from samplemind.core.monitoring.metrics import (
+    OVERFLOW_LABEL,
+    MetricsRegistry,
+    QuantileSketch,
+)
+
+
+def test_quantile_sketch_is_accurate_and_bounded():
+    values = np.random.default_rng(0).lognormal(mean=-2, sigma=1.5, size=50_000)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(float(v))
+
+    for q in (0.5, 0.9, 0.99):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.02)
+    assert len(sketch.bins) < 2048
+
+    spread = np.geomspace(1e-6, 1e6, 1000)
+    small = QuantileSketch(max_bins=16)
+    for v in spread:
+        small.add(float(v))
+    assert len(small.bins) == 16
+    # Collapsing only costs accuracy at the low end
+    assert small.quantile(0.999) == pytest.approx(np.quantile(spread, 0.999), rel=0.02)
+
+
+def test_sketches_merge():
+    a, b, both = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for v in range(1, 1001):
+        (a if v % 2 else b).add(float(v))
+        both.add(float(v))
+    a.merge(b)
+    assert a.count == 1000
+    assert a.quantile(0.5) == both.quantile(0.5)
+
+
+def test_histogram_accumulates_per_thread_and_merges_on_collect():
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "job_seconds", "Job time", ("kind",), buckets=(0.1, 1.0)
+    )
+
+    def work(kind: str) -> None:
+        for _ in range(1000):
+            histogram.observe(0.05, kind=kind)
+            histogram.observe(0.5, kind=kind)
+            histogram.observe(5.0, kind=kind)
+
+    threads = [threading.Thread(target=work, args=(k,)) for k in ("a", "b", "a", "b")]
+    for t in threads:
+        t.start()
+    histogram.observe(0.5, "a")  # the scraping thread writes too
+    for t in threads:
+        t.join()
+
+    metrics = {m.labels["kind"]: m.value for m in registry.collect()}
+    assert metrics["a"]["count"] == 6001
+    assert metrics["a"]["buckets"] == {0.1: 2000, 1.0: 4001, float("inf"): 6001}
+    assert metrics["b"]["max"] == 5.0
+    # Finished threads were folded away; data is kept
+    assert len(histogram._shards) == 1
+    assert {m.labels["kind"]: m.value["count"] for m in registry.collect()} == {
+        "a": 6001,
+        "b": 6000,
+    }
+
+
+def test_cardinality_guard_folds_new_series_into_overflow():
+    registry = MetricsRegistry(max_series=3)
+    counter = registry.counter("requests_total", labelnames=("path",))
+    for i in range(100):
+        counter.inc(1, path=f"/file/{i}")
+
+    series = {m.labels["path"]: m.value for m in registry.collect()}
+    assert len(series) == 4
+    assert series[OVERFLOW_LABEL] == 97
+    assert counter.overflowed == 97
+
+    with pytest.raises(ValueError):
+        counter.inc(1, wrong="x")
+
+
+def test_audio_metrics_feed_prometheus_export():
+    pytest.importorskip("psutil")
+    from samplemind.core.monitoring.monitor import Monitor
+
+    monitor = Monitor(service_name="test")
+    metrics = monitor.audio_metrics
+    for i in range(500):
+        metrics.record_processing_time(f"/tmp/{i}.wav", 0.2, "mfcc", success=True)
+        metrics.record_file_size(f"/tmp/{i}.wav", 2_000_000)
+        metrics.record_feature_extraction("tempo", 0.01 * (i % 10 + 1))
+    metrics.record_processing_time("/tmp/x.wav", 3.0, "mfcc", success=False)
+
+    text = monitor.export_prometheus()
+
+    assert text.count("# TYPE audio_processing_duration_seconds histogram") == 1
+    assert (
+        'audio_processing_duration_seconds_count{feature_type="mfcc",success="true",'
+        'service="test"} 500'
+    ) in text
+    assert (
+        'audio_processing_duration_seconds_bucket{feature_type="mfcc",success="false",'
+        'service="test",le="+Inf"} 1'
+    ) in text
+    assert "/tmp/" not in text  # no per-file series
+    assert 'audio_file_size_bytes_count{service="test"} 500' in text
+    assert (
+        'feature_extraction_duration_seconds{feature="tempo",service="test",quantile="0.5"}'
+        in text
+    )
+    assert "# TYPE feature_extraction_duration_seconds summary" in text
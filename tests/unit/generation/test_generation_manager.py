@@ -16,7 +16,11 @@ from samplemind.core.generation.generation_manager import (
 
 
 @pytest.fixture
-def manager():
+def manager(tmp_path, monkeypatch):
+    # Text-to-sample opens the default similarity database; keep it out of ./data
+    from samplemind.core.similarity import similarity_db
+
+    monkeypatch.setattr(similarity_db, "DEFAULT_PERSIST_DIR", str(tmp_path / "db"))
     return GenerationManager()
 
 
@@ -0,0 +1,262 @@
+"""
+Unit tests for latency-aware AI provider routing.
+
+Providers are local fakes that simulate latency and failures, so the
+token budgets, EWMA tracking, circuit breaking, hedging and request
+coalescing run fully offline.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from samplemind.integrations.ai_manager import (
+    AILoadBalancer,
+    AIProvider,
+    AIProviderConfig,
+    AnalysisType,
+    SampleMindAIManager,
+)
+from samplemind.integrations.ollama_integration import OllamaMusicAnalysis
+from samplemind.integrations.openai_integration import (
+    MusicAnalysisType,
+    OpenAIMusicAnalysis,
+)
+from samplemind.integrations.provider_routing import (
+    CircuitBreaker,
+    CircuitState,
+    TokenBucket,
+)
+
+FEATURES = {"tempo": 128.0, "key": "A", "mode": "minor"}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeProvider:
+    """Stands in for a provider SDK wrapper: fixed latency, optional failure."""
+
+    def __init__(self, name: str, latency: float = 0.0, fail: bool = False) -> None:
+        self.name = name
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+
+    async def analyze_music_comprehensive(self, audio_features, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise ConnectionError(f"{self.name} unavailable")
+        if self.name == "ollama":
+            return OllamaMusicAnalysis(summary=self.name)
+        return OpenAIMusicAnalysis(
+            analysis_type=MusicAnalysisType.COMPREHENSIVE_ANALYSIS,
+            model_used=self.name,
+            summary=self.name,
+            tokens_used=500,
+        )
+
+
+def _manager(openai: FakeProvider, ollama: FakeProvider, **options):
+    return SampleMindAIManager.from_providers(
+        {AIProvider.OPENAI: openai, AIProvider.OLLAMA: ollama}, **options
+    )
+
+
+# ── Primitives ────────────────────────────────────────────────────────────────
+
+
+def test_token_bucket_refills_and_carries_debt():
+    clock = FakeClock()
+    bucket = TokenBucket(60, period=60, clock=clock)  # 1 token / second
+
+    assert all(bucket.try_acquire() for _ in range(60))
+    assert not bucket.try_acquire()
+    clock.now += 2
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    bucket.adjust(10)  # used more than reserved
+    clock.now += 5
+    assert bucket.available == pytest.approx(-5)
+    assert bucket.time_until(1) == pytest.approx(6)
+
+
+def test_circuit_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow()
+
+    clock.now += 10
+    assert breaker.allow()  # the single half-open probe
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+
+# ── Load balancer ─────────────────────────────────────────────────────────────
+
+
+def test_balancer_prefers_observed_fast_and_healthy_providers():
+    configs = [
+        AIProviderConfig(provider=AIProvider.OPENAI, api_key="", priority=1),
+        AIProviderConfig(provider=AIProvider.GOOGLE_AI, api_key="", priority=2),
+    ]
+    balancer = AILoadBalancer(configs, clock=FakeClock())
+    comprehensive = AnalysisType.COMPREHENSIVE_ANALYSIS
+
+    # No observations yet: static priority decides
+    assert balancer.rank_providers(comprehensive) == [
+        AIProvider.OPENAI,
+        AIProvider.GOOGLE_AI,
+    ]
+
+    for _ in range(5):
+        balancer.record_result(AIProvider.OPENAI, 1.0, True)
+        balancer.record_result(AIProvider.GOOGLE_AI, 0.5, True)
+    assert balancer.rank_providers(comprehensive)[0] == AIProvider.GOOGLE_AI
+
+    # Errors outweigh raw speed
+    for _ in range(4):
+        balancer.record_result(AIProvider.GOOGLE_AI, 0.1, False)
+    assert balancer.rank_providers(comprehensive)[0] == AIProvider.OPENAI
+
+    # The genre specialist keeps its traffic unless it is far slower
+    assert (
+        balancer.rank_providers(AnalysisType.GENRE_CLASSIFICATION)[0]
+        == AIProvider.GOOGLE_AI
+    )
+
+
+def test_balancer_enforces_request_and_token_budgets():
+    clock = FakeClock()
+    balancer = AILoadBalancer(
+        [
+            AIProviderConfig(
+                provider=AIProvider.OPENAI,
+                api_key="",
+                max_requests_per_minute=2,
+                max_tokens_per_minute=10_000,
+            ),
+            AIProviderConfig(provider=AIProvider.OLLAMA, api_key="", priority=5),
+        ],
+        clock=clock,
+    )
+    genre = AnalysisType.GENRE_CLASSIFICATION
+
+    def run(tokens: int = 0) -> AIProvider:
+        for provider in balancer.rank_providers(genre, estimated_tokens=tokens):
+            if balancer.acquire(provider, tokens):
+                balancer.record_result(provider, 0.5, True, tokens, tokens)
+                return provider
+        raise AssertionError("no provider admitted the request")
+
+    assert [run(), run(), run()] == [
+        AIProvider.OPENAI,
+        AIProvider.OPENAI,
+        AIProvider.OLLAMA,
+    ]
+
+    clock.now += 60  # request budget refilled
+    assert run(9_000) == AIProvider.OPENAI
+    assert run(9_000) == AIProvider.OLLAMA  # token budget spent
+    assert balancer.get_stats()["openai"]["tokens_available"] == 1_000
+
+
+def test_select_provider_reserves_nothing():
+    balancer = AILoadBalancer(
+        [
+            AIProviderConfig(
+                provider=AIProvider.OPENAI, api_key="", max_requests_per_minute=1
+            )
+        ],
+        clock=FakeClock(),
+    )
+    genre = AnalysisType.GENRE_CLASSIFICATION
+
+    picks = [balancer.select_provider(genre, estimated_tokens=100) for _ in range(3)]
+    assert picks == [AIProvider.OPENAI] * 3
+    stats = balancer.get_stats()["openai"]
+    assert stats["in_flight"] == 0
+    assert stats["requests_available"] == 1
+
+
+# ── Manager with fake providers ───────────────────────────────────────────────
+
+
+async def test_failing_provider_is_circuit_broken():
+    broken = FakeProvider("gpt-broken", fail=True)
+    ollama = FakeProvider("ollama")
+    manager = _manager(broken, ollama, failure_threshold=2, reset_timeout=60)
+
+    for i in range(5):
+        result = await manager.analyze_music(
+            {**FEATURES, "n": i}, preferred_provider=AIProvider.OPENAI
+        )
+        assert result.summary == "ollama"
+
+    assert broken.calls == 2  # then the circuit opened
+    status = manager.get_provider_status()
+    assert status["openai"]["routing"]["circuit"] == "open"
+
+
+async def test_latency_critical_requests_are_hedged():
+    openai = FakeProvider("gpt", latency=0.01)
+    ollama = FakeProvider("ollama", latency=0.01)
+    manager = _manager(openai, ollama)
+
+    # Learn OpenAI's normal latency, then make it stall
+    for i in range(5):
+        await manager.analyze_music(
+            {**FEATURES, "n": i}, preferred_provider=AIProvider.OPENAI
+        )
+    openai.latency = 1.0
+
+    start = time.perf_counter()
+    result = await manager.analyze_music(
+        FEATURES, preferred_provider=AIProvider.OPENAI, latency_critical=True
+    )
+    elapsed = time.perf_counter() - start
+
+    assert result.summary == "ollama"
+    assert elapsed < 0.5
+    stats = manager.get_global_stats()
+    assert stats["hedged_requests"] == 1
+    assert stats["hedge_wins"] == 1
+    # The abandoned request released its reservation
+    assert manager.load_balancer.health[AIProvider.OPENAI].in_flight == 0
+
+
+async def test_identical_in_flight_requests_are_coalesced():
+    openai = FakeProvider("gpt", latency=0.05)
+    manager = _manager(openai, FakeProvider("ollama"))
+
+    results = await asyncio.gather(
+        *[
+            manager.analyze_music(dict(FEATURES), preferred_provider=AIProvider.OPENAI)
+            for _ in range(5)
+        ]
+    )
+    assert openai.calls == 1
+    assert {r.summary for r in results} == {"gpt"}
+    assert manager.get_global_stats()["coalesced_requests"] == 4
+
+    # Once finished, the next identical request goes to the provider again
+    await manager.analyze_music(dict(FEATURES), preferred_provider=AIProvider.OPENAI)
+    assert openai.calls == 2
@@ -0,0 +1,250 @@
+"""
+Tests for the TUI library search index.
+
+Indexed results are checked against the linear SearchEngine scan on a
+random library, plus incremental updates, ranking, the library/search
+screen wiring and a keystroke latency budget on 100k samples.
+"""
+
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from samplemind.interfaces.tui.search import (
+    SearchEngine,
+    SearchIndex,
+    search_engine,
+    to_search_item,
+)
+
+WORDS = [
+    "kick",
+    "snare",
+    "hihat",
+    "clap",
+    "bass",
+    "pad",
+    "lead",
+    "vocal",
+    "loop",
+    "shot",
+    "dark",
+    "warm",
+    "punchy",
+    "808",
+    "vinyl",
+    "crunchy",
+    "soft",
+    "deep",
+]
+KEYS = ["C", "Am", "F#m", "G", "Dm", "E"]
+GENRES = ["trap", "house", "techno", "lofi", "dnb"]
+
+
+def _library(n: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        words = rng.sample(WORDS, 3)
+        items.append(
+            {
+                "file_path": f"/lib/{i}/{'_'.join(words)}_{i}.wav",
+                "filename": f"{'_'.join(words)}_{i}.wav",
+                "tempo": float(rng.randrange(70, 180)),
+                "duration": round(rng.uniform(0.1, 30.0), 2),
+                "key": rng.choice(KEYS),
+                "genre": rng.choice(GENRES),
+                "tags": rng.sample(WORDS, 2),
+            }
+        )
+    return items
+
+
+def _paths(items):
+    return sorted(item["file_path"] for item in items)
+
+
+@pytest.fixture
+def library():
+    return _library(2000)
+
+
+@pytest.fixture
+def engine(library):
+    engine = SearchEngine()
+    engine.build_index(library)
+    return engine
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "tempo:120-130",
+        "duration:<5 key:Am",
+        "key:F#m tempo:>=150",
+        "genre:trap duration:>=10",
+        "tempo:!=120",
+    ],
+)
+def test_filters_match_linear_scan(engine, library, query):
+    expected = SearchEngine().search(library, query)
+    assert _paths(engine.search(None, query)) == _paths(expected)
+
+
+def test_text_terms_match_tokens_and_substrings(engine, library):
+    results = engine.search(None, "kick tempo:100-140")
+    assert results
+    assert all(100 <= r["tempo"] <= 140 for r in results)
+    expected = [
+        r
+        for r in library
+        if 100 <= r["tempo"] <= 140
+        and any("kick" in str(r[f]).lower() for f in ("filename", "tags", "file_path"))
+    ]
+    assert _paths(results) == _paths(expected)
+
+    # Substring of a token ("unch" in "punchy", "crunchy")
+    assert all(
+        "unch" in r["file_path"] or any("unch" in t for t in r["tags"])
+        for r in engine.search(None, "unch")
+    )
+
+
+def test_ranking_prefers_exact_filename_matches():
+    engine = SearchEngine()
+    engine.build_index(
+        [
+            {"file_path": "/a", "filename": "kickstart_pad.wav"},
+            {"file_path": "/b", "filename": "pad.wav", "tags": ["kick"]},
+            {"file_path": "/c", "filename": "kick.wav"},
+        ]
+    )
+    assert [r["file_path"] for r in engine.search(None, "kick")] == ["/c", "/b", "/a"]
+
+
+def test_fuzzy_matches_typos(engine):
+    assert not engine.search(None, "snaer")
+    results = engine.search(None, "snaer", fuzzy=True, threshold=0.7)
+    assert results
+    assert all("snare" in r["file_path"] or "snare" in r["tags"] for r in results)
+
+
+def test_incremental_add_update_remove(engine, library):
+    engine.add_item(
+        {"file_path": "/new/zither.wav", "filename": "zither.wav", "tempo": 97.0}
+    )
+    assert [r["file_path"] for r in engine.search(None, "zith")] == ["/new/zither.wav"]
+    assert engine.search(None, "zither tempo:97")
+
+    engine.update_item(
+        {"file_path": "/new/zither.wav", "filename": "zither.wav", "tempo": 101.0}
+    )
+    assert not engine.search(None, "zither tempo:97")
+    assert engine.search(None, "zither tempo:>100")
+
+    assert engine.remove_item("/new/zither.wav")
+    assert not engine.search(None, "zither")
+
+    # Removing enough items triggers compaction; results stay correct
+    for item in library[:800]:
+        engine.remove_item(item["file_path"])
+    assert len(engine.index) == 1200
+    expected = SearchEngine().search(library[800:], "tempo:120-130 key:G")
+    assert _paths(engine.search(None, "tempo:120-130 key:G")) == _paths(expected)
+
+
+def test_duplicate_keys_in_one_build_keep_the_last_item():
+    """A replaced item's tokens are dropped before the vocabulary is merged."""
+    index = SearchIndex()
+    index.build(
+        [
+            {"file_path": "a", "name": "zzz kick"},
+            {"file_path": "a", "name": "yyy snare"},
+        ]
+    )
+    assert len(index) == 1
+    assert index.search("zz") == []
+    assert [r["name"] for r in index.search("yy")] == ["yyy snare"]
+
+
+def test_to_search_item_reads_library_objects():
+    sample = SimpleNamespace(
+        file_path="/lib/kick_01.wav", bpm=128.0, key="Am", tags=["punchy"]
+    )
+    item = to_search_item(sample)
+    assert item["filename"] == "kick_01.wav"
+    assert item["tempo"] == 128.0
+    assert item["tags"] == ["punchy"]
+    assert to_search_item({"file_path": "a/b.wav"})["filename"] == "b.wav"
+
+
+class FakeLibraryService:
+    def __init__(self, samples):
+        self.samples = samples
+        self.calls = []
+
+    async def list(self, query="", limit=None):
+        self.calls.append(query)
+        return self.samples[:limit]
+
+
+@pytest.fixture
+def library_service(monkeypatch, library):
+    samples = [SimpleNamespace(**item) for item in library]
+    service = FakeLibraryService(samples)
+    module = SimpleNamespace(get_library_service=lambda: service)
+    monkeypatch.setitem(sys.modules, "samplemind.services.library_service", module)
+    monkeypatch.setattr(search_engine, "_search_engine", None)
+    return service
+
+
+def test_library_load_builds_the_search_index(library_service, library):
+    from samplemind.interfaces.tui.screens.library_screen import LibraryScreen
+
+    screen = LibraryScreen()
+    assert len(screen._fetch_library()) == 500
+
+    engine = search_engine.get_search_engine()
+    assert len(engine.index) == len(library)
+    filtered = screen._fetch_library("tempo:120-130 key:G")
+    assert library_service.calls == [""]
+    expected = SearchEngine().search(library, "tempo:120-130 key:G")
+    assert _paths(filtered) == _paths(expected)
+
+
+def test_search_screen_queries_the_index(library_service, library):
+    from samplemind.interfaces.tui.screens.library_screen import LibraryScreen
+    from samplemind.interfaces.tui.screens.search_screen import _index_query
+
+    LibraryScreen()._fetch_library()
+    engine = search_engine.get_search_engine()
+
+    assert _index_query("120 - 130", "bpm") == "tempo:120-130"
+    assert _index_query("Am", "key") == "key:Am"
+    assert _index_query("tempo:90-100", "bpm") == "tempo:90-100"
+    results = engine.search(None, _index_query("Dm", "key"))
+    assert results
+    assert {r["key"] for r in results} == {"Dm"}
+
+
+@pytest.mark.performance
+def test_keystroke_latency_on_100k_library():
+    index = SearchIndex()
+    index.build(_library(100_000, seed=2))
+    engine = SearchEngine()
+    engine.index = index
+
+    typed = "punchy kick tempo:120-140"
+    timings = []
+    for _ in range(3):
+        for end in range(1, len(typed) + 1):
+            start = time.perf_counter()
+            engine.search(None, typed[:end], limit=200)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95)]
+    assert p95 < 16
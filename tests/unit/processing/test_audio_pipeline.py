@@ -0,0 +1,155 @@
+"""Unit tests for the lazy, fused audio pipeline."""
+
+import librosa
+import numpy as np
+import pytest
+import soundfile as sf
+from scipy import signal
+
+from samplemind.core.processing.audio_pipeline import (
+    AudioPipeline,
+    _Filter,
+    _Mono,
+    _Resample,
+    _Scale,
+    _Trim,
+)
+
+SR = 48000
+
+
+def _stereo_take(seconds: float = 6.0) -> np.ndarray:
+    """Two tones with a second of silence at each end, channels-first"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SR)) / SR
+    audio = np.stack(
+        [
+            0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t)),
+            0.2 * np.sin(2 * np.pi * 330 * t),
+        ]
+    ).astype(np.float32)
+    audio[:, :SR] = 0
+    audio[:, -SR:] = 0
+    return audio
+
+
+@pytest.fixture
+def take(tmp_path):
+    path = tmp_path / "take.wav"
+    sf.write(path, _stereo_take().T, SR, subtype="FLOAT")
+    return path
+
+
+def _eager_reference(audio: np.ndarray, target_sr: int) -> np.ndarray:
+    """The default process() chain, one materialized step at a time"""
+    y = np.array([librosa.resample(c, orig_sr=SR, target_sr=target_sr) for c in audio])
+    y = librosa.to_mono(y)
+    y = np.clip(y / np.max(np.abs(y)) * 0.95, -(10 ** (-1 / 20)), 10 ** (-1 / 20))
+    nyquist = target_sr / 2
+    y = signal.filtfilt(*signal.butter(4, 20 / nyquist, "high"), y)
+    y = signal.filtfilt(*signal.butter(4, 20000 / nyquist, "low"), y)
+    return librosa.effects.trim(y, top_db=30)[0]
+
+
+class TestAudioPipeline:
+    """Test lazy recording, plan fusion and execution modes"""
+
+    def test_operations_are_recorded_until_needed(self, take):
+        """Chained calls decode nothing; metadata and rate are known up front"""
+        pipeline = AudioPipeline(target_sr=22050).load(take).resample().to_mono()
+
+        assert pipeline._y is None
+        assert pipeline.metadata.channels == 2
+        assert pipeline.metadata.duration == pytest.approx(6.0)
+        assert pipeline.sr == 22050
+        assert pipeline.get_processing_history() == [f"Loaded audio from {take}"]
+
+        y, sr = pipeline.get_audio_data()
+        assert (y.ndim, sr) == (1, 22050)
+        assert pipeline._handle is None  # decoded once, then closed
+        assert pipeline.get_processing_history()[1:] == [
+            "Resampled from 48000Hz to 22050Hz",
+            "Converted to mono",
+        ]
+
+    def test_plan_fuses_adjacent_steps(self, take):
+        """Downmix moves first; scales and filters merge into single stages"""
+        pipeline = AudioPipeline(target_sr=44100).process(take)
+        stages = pipeline._plan().stages
+        assert [type(s) for s in stages] == [_Mono, _Resample, _Scale, _Filter, _Trim]
+        assert len(stages[3].sos) == 4  # high-pass and low-pass in one cascade
+
+        pipeline = (
+            AudioPipeline()
+            .load(take)
+            .gain(6)
+            .normalize()
+            .gain(-6)
+            .filter(low_cut=40, high_cut=0)
+            .filter(low_cut=0, high_cut=8000)
+        )
+        scale, filt = pipeline._plan().stages
+        assert scale.normalize and scale.factor == pytest.approx(10 ** (-6 / 20))
+        assert len(filt.sos) == 4
+
+        # Clipping before a normalize cannot be folded into it
+        assert _Scale(normalize=True, limit=0.5).then(_Scale(normalize=True)) is None
+
+    def test_fused_plan_matches_eager_processing(self, take):
+        """The optimized plan gives the same audio as step-by-step processing"""
+        y, sr = AudioPipeline(target_sr=44100).process(take).get_audio_data()
+
+        reference = _eager_reference(_stereo_take(), 44100)
+        assert sr == 44100
+        assert y.shape == reference.shape
+        np.testing.assert_allclose(y, reference, atol=1e-5)
+
+    def test_long_files_are_saved_blockwise(self, take, tmp_path, monkeypatch):
+        """Block-wise saving writes the same file as in-memory saving"""
+        blockwise = AudioPipeline(
+            target_sr=44100, max_in_memory_seconds=1.0, block_size=8192
+        )
+        monkeypatch.setattr(
+            blockwise, "execute", lambda: pytest.fail("materialized the whole file")
+        )
+
+        for steps in ({}, {"to_mono": False, "trim_silence": False}):
+            in_memory = AudioPipeline(target_sr=44100).process(take, **steps)
+            in_memory.save(tmp_path / "memory.wav")
+            blockwise.process(take, **steps).save(tmp_path / "blocks.wav")
+            assert blockwise._handle is None
+
+            expected, _ = sf.read(tmp_path / "memory.wav")
+            actual, sr = sf.read(tmp_path / "blocks.wav")
+            assert sr == 44100
+            assert actual.shape == expected.shape
+            np.testing.assert_allclose(actual, expected, atol=2 / 32768)
+            assert blockwise.get_processing_history()[-6:] == (
+                in_memory.get_processing_history()[-6:-1]
+                + [f"Saved audio to {tmp_path / 'blocks.wav'}"]
+            )
+
+    def test_run_batch_applies_plan_in_worker_pool(self, take, tmp_path):
+        """One recorded plan runs over many files; failures are reported"""
+        inputs = []
+        for i in range(3):
+            path = tmp_path / f"in_{i}.wav"
+            sf.write(path, _stereo_take(3.0).T * (i + 1) / 4, SR)
+            inputs.append(path)
+        # save() writes unknown extensions as WAV; the result must say so
+        sf.write(tmp_path / "in_3.aif", _stereo_take(3.0).T / 4, SR, format="AIFF")
+        inputs.append(tmp_path / "in_3.aif")
+        inputs.append(tmp_path / "missing.wav")
+
+        plan = AudioPipeline(target_sr=22050).resample().to_mono().normalize()
+        results = plan.run_batch(inputs, tmp_path / "out", max_workers=2)
+
+        assert [r.success for r in results] == [True, True, True, True, False]
+        assert results[-1].error
+        assert results[3].output_path == str(tmp_path / "out" / "in_3.wav")
+        for result in results[:4]:
+            audio, sr = sf.read(result.output_path)
+            assert sr == 22050 and audio.ndim == 1
+            assert np.max(np.abs(audio)) == pytest.approx(0.95, abs=1e-3)
+            assert "Converted to mono" in result.history
+        assert plan._y is None and plan._handle is None
@@ -0,0 +1,187 @@
+"""Unit tests for batch audio format conversion."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from samplemind.core.processing import format_converter
+from samplemind.core.processing.format_converter import (
+    MANIFEST_FILE,
+    AudioFormatConverter,
+    ConversionResult,
+    _convert_soundfile,
+    _LoudnessMeter,
+)
+
+SR = 48000
+
+
+def _tone(seconds: float, freq: float = 440.0, channels: int = 2) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    mono = 0.25 * np.sin(2 * np.pi * freq * t)
+    return np.stack([mono * (c + 1) / channels for c in range(channels)], axis=1)
+
+
+@pytest.fixture
+def library(tmp_path):
+    folder = tmp_path / "library"
+    folder.mkdir()
+    paths = []
+    for i in range(4):
+        path = folder / f"take_{i}.wav"
+        sf.write(path, _tone(0.5 + i * 0.25, 220 * (i + 1)), SR, subtype="PCM_24")
+        paths.append(path)
+    return paths
+
+
+class TestBatchConversion:
+    """Test AudioFormatConverter.convert_batch"""
+
+    def test_batch_converts_in_worker_pool(self, library, tmp_path):
+        """Files are resampled and converted in parallel; throughput is reported"""
+        out = tmp_path / "flac"
+        report = AudioFormatConverter().convert_batch(
+            library, out, "flac", sample_rate=44100, max_workers=2
+        )
+
+        assert (report.converted, report.skipped, report.failed) == (4, 0, 0)
+        assert report.workers == 2
+        assert [r.destination_path for r in report.results] == [
+            str(out / f"take_{i}.flac") for i in range(4)
+        ]
+        for result, source in zip(report.results, library, strict=True):
+            info = sf.info(result.destination_path)
+            assert (info.samplerate, info.channels) == (44100, 2)
+            assert info.subtype == "PCM_24"
+            assert info.duration == pytest.approx(sf.info(source).duration, abs=1e-3)
+            assert result.backend_used == "soundfile"
+
+        assert report.audio_seconds == pytest.approx(0.5 + 0.75 + 1.0 + 1.25)
+        summary = report.to_dict()
+        assert summary["realtime_factor"] > 0 and summary["files_per_second"] > 0
+        assert not list(out.glob(".*.partial*"))
+
+    def test_unchanged_sources_are_skipped(self, library, tmp_path):
+        """Up-to-date outputs are skipped by mtime, or by content hash"""
+        converter = AudioFormatConverter()
+        out = tmp_path / "flac"
+        first = converter.convert_batch(library, out, "flac", skip_unchanged="hash")
+        assert first.converted == 4
+        entries = json.loads((out / MANIFEST_FILE).read_text())["entries"]
+        assert sorted(entries) == [f"take_{i}.flac" for i in range(4)]
+        assert all(len(entry["sha256"]) == 64 for entry in entries.values())
+
+        again = converter.convert_batch(library, out, "flac", max_workers=1)
+        assert (again.converted, again.skipped) == (0, 4)
+        assert again.audio_seconds == 0
+
+        # Touched but identical: mtime mode reconverts, hash mode does not
+        touched = ((library[0], 1, "mtime"), (library[1], 0, "hash"))
+        for source, converted, mode in touched:
+            stat = source.stat()
+            os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            report = converter.convert_batch(library, out, "flac", skip_unchanged=mode)
+            assert (report.converted, report.skipped) == (converted, 4 - converted)
+
+        sf.write(library[2], _tone(0.1), SR)
+        report = converter.convert_batch(library, out, "flac", skip_unchanged="hash")
+        assert [r.skipped for r in report.results] == [True, True, False, True]
+        assert sf.info(out / "take_2.flac").duration == pytest.approx(0.1)
+
+        # Different settings never reuse an output
+        resampled = converter.convert_batch(library, out, "flac", sample_rate=22050)
+        assert resampled.converted == 4
+
+    def test_backend_chosen_once_per_source_format(
+        self, library, tmp_path, monkeypatch
+    ):
+        """Backends are selected up front, not per file"""
+        calls = []
+        select = format_converter._select_backend
+
+        def counting_select(src_fmt, *args):
+            calls.append(src_fmt)
+            return select(src_fmt, *args)
+
+        monkeypatch.setattr(format_converter, "_select_backend", counting_select)
+        sources = library + [tmp_path / "missing.wav", library[0]]
+        report = AudioFormatConverter().convert_batch(
+            sources, tmp_path / "wav", "wav", max_workers=1
+        )
+
+        assert calls == ["wav"]
+        assert [r.backend_used for r in report.results[:4]] == ["copy"] * 4
+        assert "not found" in report.results[4].error
+        assert "already converts" in report.results[5].error
+        assert report.failed == 2
+
+    def test_blockwise_conversion_matches_in_memory(self, tmp_path):
+        """Large files stream through resample, gain and write with the same result"""
+        source = tmp_path / "long.wav"
+        sf.write(source, _tone(3.0, channels=2), SR, subtype="FLOAT")
+
+        outputs = {}
+        for name, threshold in (("memory", 1 << 40), ("blocks", 0)):
+            destination = tmp_path / f"{name}.wav"
+            result = ConversionResult(
+                str(source), str(destination), False, target_format="wav"
+            )
+            result = _convert_soundfile(
+                source,
+                destination,
+                result,
+                "high",
+                44100,
+                True,
+                stream_threshold=threshold,
+                block_frames=4096,
+            )
+            assert result.success, result.error
+            outputs[name], sr = sf.read(destination)
+            assert sr == 44100
+
+        assert outputs["blocks"].shape == outputs["memory"].shape
+        np.testing.assert_allclose(outputs["blocks"], outputs["memory"], atol=1e-6)
+        meter = _LoudnessMeter(44100, 2)
+        meter.add(outputs["memory"])
+        assert meter.integrated_loudness() == pytest.approx(-14.0, abs=0.1)
+
+
+class TestLoudnessMeter:
+    """Test the block-wise BS.1770 meter behind loudness normalization"""
+
+    @staticmethod
+    def _sine(dbfs: float, seconds: float) -> np.ndarray:
+        t = np.arange(int(seconds * SR)) / SR
+        mono = 10 ** (dbfs / 20) * np.sin(2 * np.pi * 1000.0 * t)
+        return np.stack([mono, mono], axis=1)
+
+    @staticmethod
+    def _measure(audio: np.ndarray, block_frames: int | None = None) -> float:
+        meter = _LoudnessMeter(SR, audio.shape[1])
+        step = block_frames or len(audio)
+        for start in range(0, len(audio), step):
+            meter.add(audio[start : start + step])
+        return meter.integrated_loudness()
+
+    def test_reference_sine_reads_its_level(self):
+        """EBU Tech 3341: stereo 1 kHz sine at -23 dBFS reads -23 LUFS"""
+        audio = self._sine(-23.0, 5.0)
+        assert self._measure(audio) == pytest.approx(-23.0, abs=0.1)
+        assert self._measure(audio, block_frames=4097) == pytest.approx(
+            self._measure(audio), abs=1e-9
+        )
+
+    def test_quiet_passages_are_gated(self):
+        """EBU Tech 3341 case 3: -36 / -23 / -36 dBFS for 10 / 60 / 10 s"""
+        audio = np.concatenate(
+            [self._sine(-36.0, 10.0), self._sine(-23.0, 60.0), self._sine(-36.0, 10.0)]
+        )
+        assert self._measure(audio, block_frames=65536) == pytest.approx(-23.0, abs=0.1)
+
+    def test_one_shot_shorter_than_a_gating_block(self):
+        assert self._measure(self._sine(-20.0, 0.2)) == pytest.approx(-20.0, abs=0.1)
+        assert self._measure(np.zeros((SR, 2))) == float("-inf")
@@ -0,0 +1,141 @@
+"""Unit tests for the layering partner index."""
+
+import numpy as np
+import pytest
+
+from samplemind.core.processing.layering_analyzer import LayeringAnalyzer, window_energy
+from samplemind.core.processing.layering_index import (
+    LayeringIndex,
+    compute_profile,
+    score_profiles,
+)
+
+SR = 22050
+
+
+def _decaying_tone(freq: float, onset: float = 0.0, level: float = 0.8) -> np.ndarray:
+    t = np.arange(SR) / SR
+    env = np.where(t >= onset, np.exp(-(t - onset) * 12), 0.0)
+    return (level * env * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _noise_hit(onset: float, highpass: bool, level: float = 0.5) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    noise = rng.standard_normal(SR)
+    if highpass:
+        noise = np.diff(noise, prepend=0.0)  # tilt towards the top end
+    t = np.arange(SR) / SR
+    env = np.where(t >= onset, np.exp(-(t - onset) * 30), 0.0)
+    return (level * env * noise / noise.std()).astype(np.float32)
+
+
+@pytest.fixture
+def library():
+    return {
+        "kick": _decaying_tone(55),
+        "sub": _decaying_tone(50),
+        "hat": _noise_hit(onset=0.25, highpass=True),
+        "clap": _noise_hit(onset=0.0, highpass=False),
+        "quiet_pad": _decaying_tone(880, level=0.02),
+    }
+
+
+class TestLayeringIndex:
+    """Test layering profiles and partner search"""
+
+    def test_window_energy_matches_loop(self):
+        """Vectorized window energy matches the original per-window loop"""
+        audio = np.random.default_rng(1).standard_normal(1005)
+        loop = [
+            np.sum(audio[i : i + 100] ** 2) for i in range(0, len(audio) - 100, 100)
+        ]
+        np.testing.assert_allclose(window_energy(audio, 100), loop)
+        assert len(window_energy(audio[:50], 100)) == 0
+
+    def test_vectorized_scores_match_single_profile_scoring(self, library):
+        """Scoring all profiles at once equals scoring them one by one"""
+        index = LayeringIndex()
+        for name, audio in library.items():
+            index.add(name, audio, SR)
+
+        query = index.profiles["kick"]
+        ids, scores = index.score(query)
+        for i, name in enumerate(ids):
+            p = index.profiles[name]
+            single = score_profiles(
+                query,
+                p.band_energy[None, :],
+                p.onset_envelope[None, :],
+                np.array([p.loudness_db]),
+            )
+            assert scores.score[i] == pytest.approx(single.score[0], abs=1e-5)
+
+        assert scores.masking[ids.index("kick")] == pytest.approx(1.0, abs=1e-4)
+
+    def test_best_partners_ranks_complementary_samples_first(self, library):
+        """A kick pairs best with a hat, worst with an overlapping sub"""
+        index = LayeringIndex()
+        for name, audio in library.items():
+            index.add(name, audio, SR)
+
+        partners = index.best_partners("kick", top_k=4, analyze=False)
+        names = [p.sample_id for p in partners]
+
+        assert "kick" not in names
+        assert names[0] == "hat"
+        assert names[-1] in {"sub", "quiet_pad"}
+        sub = next(p for p in partners if p.sample_id == "sub")
+        hat = next(p for p in partners if p.sample_id == "hat")
+        assert sub.masking > 0.5 > hat.masking
+        assert hat.transient_overlap < sub.transient_overlap
+
+    def test_profile_cache_and_shortlisted_analysis(self, library, tmp_path):
+        """Files are profiled once; full analysis runs only on the shortlist"""
+        sf = pytest.importorskip("soundfile")
+        pytest.importorskip("librosa")
+        folder = tmp_path / "lib"
+        folder.mkdir()
+        for name, audio in library.items():
+            sf.write(folder / f"{name}.wav", audio, SR)
+        for i in range(10):
+            sf.write(folder / f"extra_{i}.wav", _decaying_tone(100 + 40 * i), SR)
+
+        analyzed = []
+
+        class CountingAnalyzer(LayeringAnalyzer):
+            def analyze(self, audio1, audio2, sample_rate=44100):
+                analyzed.append(len(audio2))
+                return super().analyze(audio1, audio2, sample_rate)
+
+        index = LayeringIndex(analyzer=CountingAnalyzer())
+        assert index.add_folder(folder) == 15
+        assert index.add_folder(folder) == 0
+
+        cache = tmp_path / "profiles.npz"
+        index.save(cache)
+        restored = LayeringIndex.load(cache, analyzer=CountingAnalyzer())
+        assert restored.add_folder(folder) == 0
+        np.testing.assert_allclose(
+            restored.profiles[str(folder / "hat.wav")].band_energy,
+            index.profiles[str(folder / "hat.wav")].band_energy,
+        )
+
+        sf.write(folder / "hat.wav", library["hat"] * 0.5, SR)
+        (folder / "extra_0.wav").unlink()
+        assert restored.add_folder(folder) == 1
+        assert len(restored) == 14
+
+        partners = restored.best_partners(
+            str(folder / "kick.wav"), top_k=3, shortlist=5
+        )
+        assert len(partners) == 3
+        assert len(analyzed) == 5
+        assert all(p.analysis is not None for p in partners)
+        assert partners[0].score >= partners[-1].score
+
+    def test_profile_of_short_and_stereo_audio(self):
+        """Short clips are padded and stereo is folded to mono"""
+        stereo = np.stack([_decaying_tone(200)[:500]] * 2, axis=1)
+        profile = compute_profile("short", stereo, SR)
+        assert profile.band_energy.sum() == pytest.approx(1.0, abs=1e-5)
+        assert profile.onset_envelope.shape == (100,)
@@ -0,0 +1,142 @@
+"""
+Unit tests for samplemind.core.search.library_stats
+
+The FAISS index is backed by a MagicMock (faiss is stubbed for unit tests),
+since the aggregates only depend on entry metadata and index events.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from samplemind.core.search import library_stats
+from samplemind.core.search.faiss_index import EMBEDDING_DIM, CLAPEmbedder, FAISSIndex
+from samplemind.core.search.library_stats import LibraryAggregates, bpm_range
+
+KEYS = ["C", "Am", "F#m", "G"]
+GENRES = ["trap", "house", "lofi", "dnb"]
+MOODS = ["dark", "chill", "uplifting"]
+ENERGIES = ["low", "mid", "high", None]
+
+
+def _metadata(rng: random.Random) -> dict:
+    return {
+        "bpm": rng.choice([None, 70.0, 90.0, 120.0, 128.0, 140.0, 174.0]),
+        "key": rng.choice(KEYS + [None]),
+        "energy": rng.choice(ENERGIES),
+        "genre_labels": rng.sample(GENRES, rng.randint(0, 2)),
+        "mood_labels": rng.sample(MOODS, rng.randint(0, 2)),
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    rng = random.Random(5)
+    embedder = MagicMock(spec=CLAPEmbedder)
+    embedder.embed_audio.return_value = np.ones(EMBEDDING_DIM, dtype=np.float32)
+    idx = FAISSIndex(index_dir=tmp_path, embedder=embedder)
+    idx._index = MagicMock()
+    paths = [f"/lib/s{i}.wav" for i in range(200)]
+    idx.build(paths, [_metadata(rng) for _ in paths], show_progress=False)
+    return idx
+
+
+def _brute_force(entries) -> dict[str, Counter]:
+    counts = {d: Counter() for d in library_stats.DIMENSIONS}
+    for e in entries:
+        if e.key:
+            counts["key"][e.key] += 1
+        counts["genre"].update(e.genre_labels)
+        counts["mood"].update(e.mood_labels)
+        counts["energy"][e.energy or ""] += 1
+        if e.bpm:
+            counts["bpm_range"][bpm_range(e.bpm)] += 1
+    return counts
+
+
+def test_counts_match_full_scan(index):
+    stats = LibraryAggregates(index)
+
+    expected = _brute_force(index._entries)
+    for dimension in library_stats.DIMENSIONS:
+        assert stats.counts(dimension) == expected[dimension]
+
+    bpms = [e.bpm for e in index._entries if e.bpm]
+    counts, _, n = stats.bpm_histogram(bins=20, low=30, high=250)
+    np.testing.assert_array_equal(
+        counts, np.histogram(bpms, bins=20, range=(30, 250))[0]
+    )
+    assert n == len(bpms)
+    assert stats.bpm_summary()["avg"] == round(sum(bpms) / len(bpms), 1)
+
+    trap = {e.index_id for e in index._entries if "trap" in e.genre_labels}
+    assert stats.samples_in("genre", "trap") == trap
+
+
+def test_add_and_remove_are_incremental(index):
+    stats = LibraryAggregates(index)
+    removed_energy = index._entries[0].energy or ""
+    with patch.object(LibraryAggregates, "_rebuild") as rebuild:
+        new_id = index.add("/lib/new.wav", {"bpm": 150.0, "genre_labels": ["trap"]})
+        index.remove(["/lib/s0.wav", "/lib/s1.wav"])
+    rebuild.assert_not_called()
+
+    assert stats.total == 199
+    assert new_id in stats.samples_in("genre", "trap")
+    assert 0 not in stats.samples_in("energy", removed_energy)
+    expected = _brute_force(index._entries)
+    for dimension in library_stats.DIMENSIONS:
+        assert stats.counts(dimension) == expected[dimension]
+
+
+def test_persisted_aggregates_are_reused(index):
+    stats = LibraryAggregates(index)
+    index.save()
+    assert stats.path.exists()
+    stats.close()
+
+    with patch.object(LibraryAggregates, "_rebuild") as rebuild:
+        reloaded = LibraryAggregates(index)
+    rebuild.assert_not_called()
+    assert reloaded.counts("genre") == stats.counts("genre")
+    assert reloaded.samples_in("mood", "dark") == stats.samples_in("mood", "dark")
+
+    # A stale file (index changed since save) is ignored
+    reloaded.close()
+    index._entries.pop()
+    assert LibraryAggregates(index).total == 199
+
+
+def test_routes_read_from_aggregates(index):
+    from samplemind.interfaces.api.routes import analytics, trends
+
+    app = FastAPI()
+    app.include_router(analytics.router)
+    app.include_router(trends.router)
+
+    with (
+        patch("samplemind.core.search.faiss_index.get_index", return_value=index),
+        patch.object(library_stats, "get_index", return_value=index),
+        patch.object(library_stats, "_stats", None),
+    ):
+        client = TestClient(app)
+        summary = client.get("/analytics/summary").json()
+        analysis = client.get(
+            "/trends/analysis", params={"include_forecasts": False}
+        ).json()
+
+    expected = _brute_force(index._entries)
+    assert summary["total_samples"] == 200
+    assert summary["unique_genres"] == len(expected["genre"])
+    assert analysis["library_size"] == 200
+    assert {t["value"]: t["count"] for t in analysis["key_trends"]} == dict(
+        expected["key"]
+    )
+    assert all(t["category"] == "bpm" for t in analysis["bpm_trends"])
@@ -0,0 +1,182 @@
+"""
+Unit tests for samplemind.core.search.neighbor_graph
+
+faiss is stubbed for unit tests (see tests/unit/conftest.py), so a small
+numpy IndexIDMap stand-in backs the FAISSIndex; stored-vector reconstruction
+and incremental add/remove are exercised end to end.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from samplemind.core.search.faiss_index import (
+    EMBEDDING_DIM,
+    CLAPEmbedder,
+    FAISSIndex,
+)
+from samplemind.core.search.neighbor_graph import NeighborGraph, _topk_edges
+
+
+class NumpyFlat:
+    def __init__(self) -> None:
+        self.vectors = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+
+    @property
+    def ntotal(self) -> int:
+        return len(self.vectors)
+
+    def reconstruct_n(self, start: int, n: int) -> np.ndarray:
+        return self.vectors[start : start + n].copy()
+
+
+class NumpyIDMap:
+    """Exact inner-product IndexIDMap with the methods FAISSIndex uses."""
+
+    def __init__(self) -> None:
+        self.index = NumpyFlat()
+        self.ids = np.empty(0, dtype=np.int64)
+        self.searches = 0
+
+    def add_with_ids(self, vectors, ids) -> None:
+        self.index.vectors = np.vstack([self.index.vectors, vectors])
+        self.ids = np.concatenate([self.ids, ids])
+
+    def remove_ids(self, ids) -> None:
+        keep = ~np.isin(self.ids, ids)
+        self.index.vectors, self.ids = self.index.vectors[keep], self.ids[keep]
+
+    def search(self, queries, k):
+        self.searches += 1
+        sims = queries @ self.index.vectors.T
+        order = np.argsort(-sims, axis=1)[:, :k]
+        return np.take_along_axis(sims, order, axis=1), self.ids[order]
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    return (v / np.linalg.norm(v)).astype(np.float32)
+
+
+def _build_index(tmp_path, vectors: dict[str, np.ndarray]) -> FAISSIndex:
+    embedder = MagicMock(spec=CLAPEmbedder)
+    embedder.embed_audio.side_effect = lambda path: vectors[path]
+    index = FAISSIndex(index_dir=tmp_path, embedder=embedder)
+    index._index = NumpyIDMap()
+    index.build(list(vectors), show_progress=False)
+    return index
+
+
+@pytest.fixture
+def clustered(tmp_path):
+    """Two tight clusters of five samples each."""
+    rng = np.random.default_rng(7)
+    centres = [rng.standard_normal(EMBEDDING_DIM) for _ in range(2)]
+    vectors = {
+        f"/lib/{c}_{i}.wav": _unit(
+            centres[c] + 0.05 * rng.standard_normal(EMBEDDING_DIM)
+        )
+        for c in range(2)
+        for i in range(5)
+    }
+    return _build_index(tmp_path, vectors), vectors
+
+
+def test_neighbors_use_stored_vectors(clustered):
+    index, _ = clustered
+    graph = NeighborGraph(index)
+    source = index.get_entry("0_0.wav")
+
+    neighbours = graph.neighbors(source.index_id, k=4)
+
+    assert [index.get_entry(j).filename[0] for j, _ in neighbours] == ["0"] * 4
+    assert all(score > 0.9 for _, score in neighbours)
+    # Only the build embedded audio; the query reused the stored vector
+    assert index._embedder.embed_audio.call_count == 10
+    assert index._index.searches == 1
+    graph.neighbors(source.index_id, k=3)
+    assert index._index.searches == 1
+
+
+def test_subgraph_edges_stay_within_clusters(clustered):
+    index, _ = clustered
+    graph = NeighborGraph(index)
+    ids = [e.index_id for e in index._entries]
+
+    edges = graph.subgraph(ids, k=4, min_score=0.5)
+
+    assert len(edges) == 20  # complete graph on each 5-node cluster
+    for a, b, weight in edges:
+        assert a < b
+        assert index.get_entry(a).filename[0] == index.get_entry(b).filename[0]
+        assert 0.5 <= weight <= 1.0
+    assert graph.subgraph(ids, k=4, min_score=0.5) is edges
+
+
+def test_add_and_remove_update_cached_neighbours(clustered):
+    index, vectors = clustered
+    graph = NeighborGraph(index)
+    source = index.get_entry("/lib/0_0.wav").index_id
+    before = graph.neighbors(source, k=2)
+
+    # A near-duplicate of the source becomes its nearest neighbour in place
+    twin = _unit(vectors["/lib/0_0.wav"] + 0.001)
+    index._embedder.embed_audio.side_effect = lambda path: twin
+    twin_id = index.add("/lib/0_twin.wav")
+    after = graph.neighbors(source, k=2)
+    assert after[0][0] == twin_id
+    assert after[1] == before[0]
+
+    index.remove(["/lib/0_twin.wav"])
+    assert twin_id not in [j for j, _ in graph.neighbors(source, k=2)]
+    assert index.get_entry("/lib/0_twin.wav") is None
+    assert len(graph.vectors_for([e.index_id for e in index._entries])) == 10
+
+
+def test_topk_edges_matches_bruteforce():
+    rng = np.random.default_rng(3)
+    vectors = rng.standard_normal((300, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = np.arange(300, dtype=np.int64)
+
+    edges = {(a, b) for a, b, _ in _topk_edges(ids, vectors, k=3, min_score=-1.0)}
+
+    sims = vectors @ vectors.T
+    np.fill_diagonal(sims, -np.inf)
+    expected = set()
+    for i, row in enumerate(sims):
+        for j in np.argsort(row)[-3:]:
+            expected.add((min(i, int(j)), max(i, int(j))))
+    assert edges == expected
+
+
+def test_cluster_route_does_not_reembed(clustered):
+    from samplemind.core.search import neighbor_graph
+    from samplemind.interfaces.api.routes import graph as graph_routes
+
+    index, _ = clustered
+    app = FastAPI()
+    app.include_router(graph_routes.router)
+
+    with (
+        patch("samplemind.core.search.faiss_index.get_index", return_value=index),
+        patch.object(neighbor_graph, "_graph", None),
+    ):
+        client = TestClient(app)
+        cluster = client.get("/graph/cluster/1_0.wav", params={"top_k": 3}).json()
+        sonic = client.get("/graph/sonic-map", params={"limit": 10}).json()
+        node = next(n for n in sonic["nodes"] if n["filename"] == "1_0.wav")
+        by_node = client.get(f"/graph/cluster/{node['id']}", params={"top_k": 3})
+        missing = client.get("/graph/cluster/9999")
+
+    assert cluster["source"]["filename"] == "1_0.wav"
+    assert [s["filename"][0] for s in cluster["similar"]] == ["1"] * 3
+    assert by_node.json() == cluster
+    assert missing.status_code == 404
+    assert len(sonic["nodes"]) == 10
+    assert sonic["edges"]
+    assert index._embedder.embed_audio.call_count == 10
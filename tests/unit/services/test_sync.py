@@ -0,0 +1,151 @@
+"""
+Unit tests for samplemind.services.sync
+
+Round trips run against LocalStorageProvider (a directory) and the in-memory
+MockS3StorageProvider, whose call counter shows how many requests a sync
+costs.  Multipart resume is checked by failing an upload part-way through.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from samplemind.services.storage import LocalStorageProvider, MockS3StorageProvider
+from samplemind.services.sync import SYNC_DIR, SyncManager, plan_sync
+
+
+def _write(path, data: bytes, mtime: float | None = None) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / "library"
+    for i in range(20):
+        _write(root / f"kit{i % 3}" / f"hit{i}.wav", os.urandom(1000 + i))
+    _write(root / ".DS_Store", b"ignored")
+    return root
+
+
+async def test_round_trip_through_local_provider(tmp_path, library):
+    provider = LocalStorageProvider(tmp_path / "cloud")
+    up = await SyncManager(provider).sync_library(library, direction="up")
+    assert up["uploaded"] == 20
+    assert up["errors"] == 0
+
+    # Second run transfers nothing
+    again = await SyncManager(provider).sync_library(library)
+    assert again == {
+        "uploaded": 0,
+        "downloaded": 0,
+        "skipped": 20,
+        "conflicts": 0,
+        "errors": 0,
+    }
+
+    clone = tmp_path / "clone"
+    down = await SyncManager(provider).sync_library(clone, direction="down")
+    assert down["downloaded"] == 20
+    for src in library.rglob("*.wav"):
+        assert (clone / src.relative_to(library)).read_bytes() == src.read_bytes()
+    assert not (tmp_path / "cloud" / "library" / ".DS_Store").exists()
+    assert not list((clone / SYNC_DIR / "partial").iterdir())
+
+
+async def test_only_changed_files_move(tmp_path, library):
+    provider = MockS3StorageProvider("bucket")
+    manager = SyncManager(provider)
+    await manager.sync_library(library)
+
+    _write(library / "kit0" / "hit0.wav", b"edited locally")
+    provider._put("library/kit1/hit1.wav", b"edited remotely")
+    provider.calls.clear()
+
+    stats = await manager.sync_library(library)
+
+    assert stats["uploaded"] == 1
+    assert stats["downloaded"] == 1
+    assert (library / "kit1" / "hit1.wav").read_bytes() == b"edited remotely"
+    assert provider._objects["library/kit0/hit0.wav"] == b"edited locally"
+    # One listing to plan, one to refresh the baseline; no per-file lookups
+    assert provider.calls["list"] == 2
+    assert provider.calls["get_metadata"] == 0
+
+
+def test_conflicts_prefer_newer_side():
+    now = time.time()
+    base = {"size": 1, "mtime": now - 100, "hash": "a" * 64}
+    local = {"x": {"size": 2, "mtime": now, "hash": "b" * 64}}
+    remote = {"x": {"size": 3, "mtime": now - 50, "hash": "c" * 64}}
+
+    plan = plan_sync(local, remote, {"x": {"local": base, "remote": base}})
+    assert plan.uploads == ["x"]
+    assert plan.conflicts == ["x"]
+
+    # Identical content on both sides is not a conflict
+    remote["x"] = dict(local["x"], mtime=now + 10)
+    plan = plan_sync(local, remote, {"x": {"local": base, "remote": base}})
+    assert plan.unchanged == ["x"]
+
+    assert plan_sync(local, remote, {}, direction="down").uploads == []
+
+
+async def test_multipart_upload_resumes_after_failure(tmp_path):
+    root = tmp_path / "library"
+    payload = os.urandom(10 * 1024)
+    _write(root / "long.wav", payload)
+
+    provider = MockS3StorageProvider("bucket")
+    original_upload_part = provider.upload_part
+
+    async def flaky_upload_part(remote_path, upload_id, part_number, data):
+        if part_number == 4:
+            raise ConnectionError("connection reset")
+        return await original_upload_part(remote_path, upload_id, part_number, data)
+
+    provider.upload_part = flaky_upload_part
+    manager = SyncManager(provider, multipart_threshold=4096, part_size=1024)
+    assert (await manager.sync_library(root))["errors"] == 1
+    assert "library/long.wav" not in provider._objects
+
+    provider.upload_part = original_upload_part
+    provider.calls.clear()
+    stats = await manager.sync_library(root)
+
+    assert stats["uploaded"] == 1
+    assert provider._objects["library/long.wav"] == payload
+    assert provider.calls["create_multipart_upload"] == 0
+    assert provider.calls["upload_part"] == 7  # parts 4-10 only
+
+
+async def test_ranged_download_resumes(tmp_path):
+    provider = MockS3StorageProvider("bucket")
+    payload = os.urandom(10 * 1024)
+    await provider.upload_file(payload, "library/long.wav")
+    root = tmp_path / "library"
+
+    original_read_range = provider.read_range
+    reads = 0
+
+    async def flaky_read_range(remote_path, start, length):
+        nonlocal reads
+        reads += 1
+        if reads == 6:
+            raise ConnectionError("connection reset")
+        return await original_read_range(remote_path, start, length)
+
+    provider.read_range = flaky_read_range
+    manager = SyncManager(provider, multipart_threshold=4096, part_size=1024)
+    assert (await manager.sync_library(root))["errors"] == 1
+    assert not (root / "long.wav").exists()
+
+    stats = await manager.sync_library(root)
+    assert stats["downloaded"] == 1
+    assert (root / "long.wav").read_bytes() == payload
+    assert reads == 11  # 5 before the failure + the failed one + 5 after
@@ -0,0 +1,245 @@
+"""
+Unit tests for samplemind.core.tasks.audio_tasks
+
+Tests the warm per-process worker state and the chunked chord batch
+workflow.  Celery runs eagerly against an in-memory broker/backend, and
+the AudioEngine / AI manager are replaced with cheap fakes injected
+through worker_state, so no broker, Redis, MongoDB or audio is needed.
+"""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from samplemind.core.tasks import audio_tasks, worker_state
+from samplemind.core.tasks.audio_tasks import (
+    analyze_audio_chunk,
+    batch_process_audio_files,
+    build_batch_workflow,
+    get_batch_progress,
+    process_audio_analysis,
+)
+from samplemind.core.tasks.celery_app import celery_app
+
+
+class _FakeFeatures:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def to_dict(self) -> dict:
+        return {"file_path": self.path, "tempo": 120.0}
+
+
+class FakeAudioEngine:
+    """Counts constructions and analyses; optional per-file latency."""
+
+    instances = 0
+
+    def __init__(self, latency: float = 0.0) -> None:
+        FakeAudioEngine.instances += 1
+        self.latency = latency
+        self.calls: list[str] = []
+
+    def analyze_audio(self, file_path):
+        if "bad" in str(file_path):
+            raise ValueError("corrupt audio")
+        if self.latency:
+            time.sleep(self.latency)
+        self.calls.append(str(file_path))
+        return _FakeFeatures(str(file_path))
+
+
+class FakeAIManager:
+    async def analyze_music(self, audio_features, preferred_provider=None):
+        return {"summary": f"{audio_features['tempo']:.0f} bpm"}
+
+    async def close(self):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True)
+def celery_memory_config():
+    """Configure Celery to run synchronously with in-memory backend."""
+    prev_backend = celery_app.conf.result_backend
+    prev_broker = celery_app.conf.broker_url
+    celery_app.conf.update(
+        task_always_eager=True,
+        task_eager_propagates=True,
+        result_backend="cache+memory://",
+        broker_url="memory://",
+    )
+    yield
+    celery_app.conf.update(
+        task_always_eager=False,
+        task_eager_propagates=True,
+        result_backend=prev_backend,
+        broker_url=prev_broker,
+    )
+
+
+@pytest.fixture
+def fake_worker():
+    """Inject fake components and stub out Redis + persistence."""
+    FakeAudioEngine.instances = 0
+    worker_state.reset_worker_state()
+    engine = FakeAudioEngine()
+    worker_state.set_worker_components(audio_engine=engine, ai_manager=FakeAIManager())
+    with (
+        patch.object(audio_tasks, "_get_redis", return_value=None),
+        patch.object(audio_tasks, "_persist_analysis", return_value="analysis_x"),
+    ):
+        yield engine
+    worker_state.reset_worker_state()
+
+
+def _file_infos(n: int, bad: set[int] = frozenset()) -> list[dict]:
+    return [
+        {
+            "file_id": f"f{i}",
+            "file_path": f"/audio/{'bad' if i in bad else 'ok'}{i}.wav",
+        }
+        for i in range(n)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# worker_state
+# ---------------------------------------------------------------------------
+
+
+def test_worker_process_init_warms_singletons():
+    """worker_process_init builds the engine and AI manager exactly once."""
+    worker_state.reset_worker_state()
+    FakeAudioEngine.instances = 0
+    with (
+        patch("samplemind.core.engine.audio_engine.AudioEngine", FakeAudioEngine),
+        patch("samplemind.integrations.ai_manager.SampleMindAIManager", FakeAIManager),
+    ):
+        worker_state.init_worker_process()
+        first = worker_state.get_audio_engine()
+        assert worker_state.get_audio_engine() is first
+        assert isinstance(worker_state.get_ai_manager(), FakeAIManager)
+
+    assert FakeAudioEngine.instances == 1
+    worker_state.shutdown_worker_process()
+    worker_state.reset_worker_state()
+
+
+def test_run_async_reuses_loop():
+    """run_async keeps one event loop alive across calls."""
+    import asyncio
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    worker_state.reset_worker_state()
+    assert worker_state.run_async(current_loop()) is worker_state.run_async(
+        current_loop()
+    )
+    worker_state.reset_worker_state()
+
+
+# ---------------------------------------------------------------------------
+# process_audio_analysis
+# ---------------------------------------------------------------------------
+
+
+def test_process_audio_analysis_uses_shared_engine(fake_worker):
+    """Repeated tasks reuse the same engine instead of constructing new ones."""
+    for i in range(3):
+        result = process_audio_analysis.apply(
+            kwargs={"file_id": f"f{i}", "file_path": f"/audio/ok{i}.wav"}
+        ).get()
+        assert result["status"] == "completed"
+        assert result["ai_analysis"] == {"summary": "120 bpm"}
+
+    assert FakeAudioEngine.instances == 1
+    assert len(fake_worker.calls) == 3
+
+
+# ---------------------------------------------------------------------------
+# Batch workflow
+# ---------------------------------------------------------------------------
+
+
+def test_build_batch_workflow_chunks_files():
+    """Files are split into ceil(n / chunk_size) chunk tasks."""
+    workflow = build_batch_workflow("b1", _file_infos(10), chunk_size=4)
+
+    sizes = [len(sig.kwargs["file_infos"]) for sig in workflow.tasks]
+    assert sizes == [4, 4, 2]
+    assert workflow.body.name.endswith("finalize_audio_batch")
+    assert workflow.body.kwargs["total_files"] == 10
+
+
+def test_analyze_audio_chunk_isolates_failures(fake_worker):
+    """A bad file is reported as failed without failing the chunk."""
+    results = analyze_audio_chunk.apply(
+        kwargs={
+            "batch_id": "b-chunk",
+            "file_infos": _file_infos(3, bad={1}),
+            "total_files": 3,
+        }
+    ).get()
+
+    assert [r["status"] for r in results] == ["completed", "failed", "completed"]
+    assert get_batch_progress("b-chunk") == {"total": 3, "processed": 3, "failed": 1}
+
+
+def test_batch_process_aggregates_results(fake_worker):
+    """The batch task replaces itself with the chord and returns its result."""
+    result = batch_process_audio_files.apply(
+        kwargs={
+            "batch_id": "b-agg",
+            "file_infos": _file_infos(7, bad={3}),
+            "analysis_options": {"chunk_size": 3},
+        }
+    ).get()
+
+    assert result["batch_id"] == "b-agg"
+    assert result["total_files"] == 7
+    assert result["successful"] == 6
+    assert result["failed"] == 1
+    assert result["status"] == "partial"
+    assert len(result["results"]) == 7
+    assert get_batch_progress("b-agg")["processed"] == 7
+
+
+def test_batch_process_empty(fake_worker):
+    """An empty batch completes immediately without a chord."""
+    result = batch_process_audio_files.apply(
+        kwargs={"batch_id": "b-empty", "file_infos": []}
+    ).get()
+
+    assert result["status"] == "completed"
+    assert result["total_files"] == 0
+
+
+@pytest.mark.performance
+def test_batch_throughput_eager(fake_worker):
+    """Warm engine keeps per-file overhead near the analysis cost itself."""
+    fake_worker.latency = 0.001
+    n_files = 200
+
+    start = time.perf_counter()
+    result = batch_process_audio_files.apply(
+        kwargs={
+            "batch_id": "b-perf",
+            "file_infos": _file_infos(n_files),
+            "analysis_options": {"chunk_size": 25},
+        }
+    ).get()
+    elapsed = time.perf_counter() - start
+
+    throughput = n_files / elapsed
+    assert result["successful"] == n_files
+    assert FakeAudioEngine.instances == 1
+    assert throughput > 100
@@ -0,0 +1,383 @@
+"""
+Unit tests for samplemind.core.batch and the /batch API routes
+
+The worker pool runs on threads with a fake analyze function, and the job
+store is a SQLite file under tmp_path, so no audio, Redis or process pool
+is needed.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from samplemind.core.batch import (
+    BatchJob,
+    BatchWorkerPool,
+    JobStatus,
+    SQLiteJobStore,
+    safe_filename,
+)
+from samplemind.core.batch.worker_pool import RECOVERY_LOCK
+from samplemind.interfaces.api.routes import batch as batch_routes
+
+
+@pytest.fixture
+def store(tmp_path):
+    job_store = SQLiteJobStore(tmp_path / "jobs.db")
+    yield job_store
+    job_store.close()
+
+
+def _fake_analyze(path: str) -> dict:
+    if "bad" in path:
+        raise ValueError("corrupt audio")
+    return {"file": path, "features": {"tempo": 120.0}}
+
+
+def _make_pool(
+    store, analyze_fn=_fake_analyze, max_workers=2, **kwargs
+) -> BatchWorkerPool:
+    return BatchWorkerPool(
+        store,
+        max_workers=max_workers,
+        analyze_fn=analyze_fn,
+        use_processes=False,
+        **kwargs,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Job store
+# ---------------------------------------------------------------------------
+
+
+def test_sqlite_store_counts_and_paginates(store):
+    """Results update counters atomically and page in arrival order."""
+    store.create_job(BatchJob(job_id="j1", total_files=3, tenant_id="t1"))
+    store.record_result("j1", "a.wav", result={"tempo": 1})
+    store.record_result("j1", "b.wav", error="boom")
+    job = store.record_result("j1", "c.wav", result={"tempo": 3})
+
+    assert (job.processed_files, job.failed_files) == (2, 1)
+    assert job.progress_percent == 100.0
+
+    page = store.list_results("j1", offset=1, limit=5)
+    assert [e["file"] for e in page] == ["b.wav", "c.wav"]
+    assert page[0] == {"seq": 1, "file": "b.wav", "status": "failed", "error": "boom"}
+    assert page[1]["result"] == {"tempo": 3}
+
+
+def test_sqlite_store_records_each_file_once(store):
+    """A repeated result for a file is ignored; counters count distinct files."""
+    store.create_job(BatchJob(job_id="j1", total_files=2), ["a.wav", "b.wav"])
+    store.record_result("j1", "a.wav", result={"tempo": 1})
+    store.record_result("j1", "a.wav", error="analyzed twice")
+    job = store.record_result("j1", "a.wav", result={"tempo": 2})
+
+    assert (job.processed_files, job.failed_files) == (1, 0)
+    assert [e["result"] for e in store.list_results("j1")] == [{"tempo": 1}]
+    assert store.pending_files("j1") == ["b.wav"]
+
+    assert store.record_result("missing", "a.wav", result={}) is None
+    with pytest.raises(ValueError):
+        store.create_job(BatchJob(job_id="j2", total_files=2), ["a.wav", "a.wav"])
+
+
+def test_sqlite_store_leases_and_locks(store):
+    """Jobs and locks can only be taken over once their lease has expired."""
+    store.create_job(BatchJob(job_id="j1", total_files=1), ["a.wav"])
+    assert store.claim_job("j1", "pool-a", lease_seconds=60)
+    assert store.claim_job("j1", "pool-a", lease_seconds=60)  # renewal
+    assert not store.claim_job("j1", "pool-b", lease_seconds=60)
+    assert store.claim_job("j1", "pool-a", lease_seconds=-1)  # lapses
+    assert store.claim_job("j1", "pool-b", lease_seconds=60)
+    assert store.get_job("j1").owner == "pool-b"
+    store.update_job("j1", status=JobStatus.COMPLETED)
+    assert not store.claim_job("j1", "pool-b", lease_seconds=60)
+
+    assert store.acquire_lock("recovery", "pool-a", ttl=60)
+    assert store.acquire_lock("recovery", "pool-a", ttl=60)
+    assert not store.acquire_lock("recovery", "pool-b", ttl=60)
+    assert store.acquire_lock("recovery", "pool-a", ttl=-1)
+    assert store.acquire_lock("recovery", "pool-b", ttl=60)
+
+
+def test_sqlite_store_survives_reopen(tmp_path):
+    """Job state is durable across store instances (i.e. API restarts)."""
+    first = SQLiteJobStore(tmp_path / "jobs.db")
+    first.create_job(BatchJob(job_id="j1", total_files=1))
+    first.update_job("j1", status=JobStatus.PROCESSING)
+    first.close()
+
+    second = SQLiteJobStore(tmp_path / "jobs.db")
+    assert second.get_job("j1").status == JobStatus.PROCESSING
+    second.close()
+
+
+def test_safe_filename_strips_paths():
+    assert safe_filename("../../etc/passwd", 3) == "00003_passwd"
+    assert safe_filename(None, 0) == "00000_upload"
+
+
+# ---------------------------------------------------------------------------
+# Worker pool
+# ---------------------------------------------------------------------------
+
+
+def test_pool_completes_job_and_isolates_failures(store):
+    pool = _make_pool(store)
+    pool.submit_job(
+        BatchJob(job_id="j1", total_files=4),
+        ["ok0.wav", "bad1.wav", "ok2.wav", "ok3.wav"],
+    )
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    job = store.get_job("j1")
+    assert job.status == JobStatus.COMPLETED
+    assert (job.processed_files, job.failed_files) == (3, 1)
+
+
+def test_pool_schedules_tenants_round_robin(store):
+    """A small tenant is served between a large tenant's files, not after."""
+    order: list[str] = []
+    gate = threading.Event()
+
+    def analyze(path: str) -> dict:
+        gate.wait(5)
+        order.append(path)
+        return {}
+
+    pool = _make_pool(store, analyze_fn=analyze, max_workers=1)
+    pool.submit_job(
+        BatchJob(job_id="big", total_files=6, tenant_id="a"),
+        [f"a{i}" for i in range(6)],
+    )
+    pool.submit_job(
+        BatchJob(job_id="small", total_files=2, tenant_id="b"),
+        ["b0", "b1"],
+    )
+    gate.set()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    # b's files are interleaved into the first few dispatches
+    assert order.index("b1") < 5
+    assert store.get_job("small").status == JobStatus.COMPLETED
+
+
+def test_cancel_drops_queued_work(store):
+    gate = threading.Event()
+    analyzed: list[str] = []
+
+    def analyze(path: str) -> dict:
+        gate.wait(5)
+        analyzed.append(path)
+        return {}
+
+    pool = _make_pool(store, analyze_fn=analyze, max_workers=1)
+    pool.submit_job(BatchJob(job_id="j1", total_files=20), [f"f{i}" for i in range(20)])
+    time.sleep(0.05)
+
+    dropped = pool.cancel_job("j1")
+    gate.set()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    assert dropped >= 18
+    assert len(analyzed) <= 2
+    job = store.get_job("j1")
+    assert job.status == JobStatus.CANCELLED
+    # In-flight results arriving after cancellation are discarded
+    assert job.finished_files == 0
+    assert pool._cancelled == set()
+
+
+def test_pool_recovers_unfinished_jobs_on_start(store):
+    """Files left unfinished by a previous process are queued again on start."""
+    files = [f"f{i}.wav" for i in range(5)]
+    store.create_job(BatchJob(job_id="j1", total_files=5), files)
+    store.update_job("j1", status=JobStatus.PROCESSING)
+    store.record_result("j1", "f0.wav", result={})
+    store.record_result("j1", "f3.wav", error="corrupt audio")
+    store.create_job(BatchJob(job_id="done", total_files=1), ["x.wav"])
+    store.update_job("done", status=JobStatus.COMPLETED)
+    assert store.pending_files("j1") == ["f1.wav", "f2.wav", "f4.wav"]
+
+    analyzed: list[str] = []
+
+    def analyze(path: str) -> dict:
+        analyzed.append(path)
+        return {}
+
+    pool = _make_pool(store, analyze_fn=analyze)
+    pool.start()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    assert sorted(analyzed) == ["f1.wav", "f2.wav", "f4.wav"]
+    job = store.get_job("j1")
+    assert job.status == JobStatus.COMPLETED
+    assert (job.processed_files, job.failed_files) == (4, 1)
+    assert store.list_unfinished_jobs() == []
+
+
+def test_recovery_skips_jobs_with_a_live_lease(store):
+    """Only jobs whose owner stopped renewing its lease are resumed."""
+    store.create_job(BatchJob(job_id="orphan", total_files=2), ["o0", "o1"])
+    store.claim_job("orphan", "dead-pool", lease_seconds=-1)
+    store.create_job(BatchJob(job_id="busy", total_files=2), ["b0", "b1"])
+    store.claim_job("busy", "live-pool", lease_seconds=60)
+
+    analyzed: list[str] = []
+    pool = _make_pool(store, analyze_fn=lambda path: analyzed.append(path) or {})
+    pool.start()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    assert sorted(analyzed) == ["o0", "o1"]
+    assert store.get_job("orphan").status == JobStatus.COMPLETED
+    busy = store.get_job("busy")
+    assert (busy.status, busy.owner) == (JobStatus.PENDING, "live-pool")
+
+
+def test_only_the_elected_pool_recovers(store):
+    """A pool that does not hold the recovery lock leaves orphans alone."""
+    store.create_job(BatchJob(job_id="orphan", total_files=1), ["o0"])
+    assert store.acquire_lock(RECOVERY_LOCK, "other-pool", ttl=60)
+
+    analyzed: list[str] = []
+    pool = _make_pool(store, analyze_fn=lambda path: analyzed.append(path) or {})
+    pool.start()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    assert analyzed == []
+    assert store.get_job("orphan").status == JobStatus.PENDING
+
+
+def test_two_pools_on_one_store_run_each_file_once(store):
+    """A running job keeps its lease, so another pool's recovery skips it."""
+    gate = threading.Event()
+    analyzed: list[str] = []
+
+    def analyze(path: str) -> dict:
+        gate.wait(5)
+        analyzed.append(path)
+        return {}
+
+    owner = _make_pool(
+        store, analyze_fn=analyze, max_workers=1, recovery=False, lease_seconds=1.0
+    )
+    owner.submit_job(BatchJob(job_id="j1", total_files=3), ["a1", "a2", "a3"])
+    time.sleep(1.5)  # past the first lease: only renewal keeps the job owned
+
+    other = _make_pool(store, analyze_fn=analyze, lease_seconds=1.0)
+    other.start()
+    gate.set()
+    assert owner.wait_idle(timeout=5) and other.wait_idle(timeout=5)
+    other.shutdown()
+    owner.shutdown()
+
+    assert sorted(analyzed) == ["a1", "a2", "a3"]
+    job = store.get_job("j1")
+    assert job.status == JobStatus.COMPLETED
+    assert (job.processed_files, job.total_files) == (3, 3)
+
+
+def test_job_deleted_mid_run_is_treated_as_cancelled(store):
+    """Results for a deleted job are dropped and the pool keeps working."""
+    gate = threading.Event()
+
+    def analyze(path: str) -> dict:
+        gate.wait(5)
+        return {}
+
+    pool = _make_pool(store, analyze_fn=analyze, max_workers=1)
+    pool.submit_job(BatchJob(job_id="j1", total_files=3), ["f0", "f1", "f2"])
+    time.sleep(0.05)
+    store.delete_job("j1")
+    gate.set()
+    assert pool.wait_idle(timeout=5)
+
+    pool.submit_job(BatchJob(job_id="j2", total_files=1), ["g0"])
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    assert store.get_job("j1") is None
+    assert store.list_results("j1") == []
+    assert store.get_job("j2").status == JobStatus.COMPLETED
+    assert pool._cancelled == set()
+
+
+def test_pool_honours_cancel_from_another_worker(store):
+    """A cancel written only to the shared store stops queued dispatches."""
+    gate = threading.Event()
+    analyzed: list[str] = []
+
+    def analyze(path: str) -> dict:
+        gate.wait(5)
+        analyzed.append(path)
+        return {}
+
+    pool = _make_pool(store, analyze_fn=analyze, max_workers=1)
+    pool.submit_job(BatchJob(job_id="j1", total_files=10), [f"f{i}" for i in range(10)])
+    time.sleep(0.05)
+
+    # Another API worker sharing the store cancels the job
+    store.update_job("j1", status=JobStatus.CANCELLED, completed_at=time.time())
+    gate.set()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    assert len(analyzed) <= 2
+    assert pool.pending_count("j1") == 0
+    assert store.get_job("j1").status == JobStatus.CANCELLED
+
+
+# ---------------------------------------------------------------------------
+# Routes
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def client(store, tmp_path):
+    pool = _make_pool(store)
+    app = FastAPI()
+    app.include_router(batch_routes.router)
+    with (
+        patch.object(batch_routes, "_pool", pool),
+        patch.object(batch_routes, "BATCH_UPLOAD_ROOT", tmp_path / "uploads"),
+    ):
+        yield TestClient(app), pool
+    pool.shutdown()
+
+
+def test_batch_routes_lifecycle(client):
+    http, pool = client
+    files = [("files", (f"s{i}.wav", b"RIFF" * 64, "audio/wav")) for i in range(5)]
+
+    resp = http.post("/batch/analyze", files=files, headers={"X-Tenant-ID": "t1"})
+    assert resp.status_code == 200
+    job_id = resp.json()["job_id"]
+    assert pool.wait_idle(timeout=5)
+
+    status = http.get(f"/batch/status/{job_id}").json()
+    assert status["status"] == "completed"
+    assert status["tenant_id"] == "t1"
+    assert status["processed_files"] == 5
+
+    page = http.get(f"/batch/results/{job_id}", params={"limit": 3}).json()
+    assert len(page["results"]) == 3
+    assert page["next_offset"] == 3
+    page = http.get(f"/batch/results/{job_id}", params={"offset": 3}).json()
+    assert len(page["results"]) == 2
+    assert page["next_offset"] is None
+
+    assert http.get("/batch/status/missing").status_code == 404
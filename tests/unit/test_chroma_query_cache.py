@@ -0,0 +1,101 @@
+"""
+Unit tests for the ChromaDB query result cache.
+
+Tests:
+- Filtered queries are cached under a canonical filter key
+- Writes bump the collection generation (no stale results)
+- LRU bound and background TTL sweeping
+- Hit/miss statistics
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from samplemind.core.database import chroma
+from samplemind.core.database.chroma import QueryResultCache
+
+
+@pytest.fixture
+def collection():
+    cache = QueryResultCache(max_entries=8, ttl_seconds=60, sweep_interval=60)
+    coll = MagicMock()
+    coll.name = "samples"
+    coll.query.side_effect = lambda query_embeddings, n_results, where: {
+        "ids": [[f"id{coll.query.call_count}"]],
+        "distances": [[0.1]],
+        "metadatas": [[{"where": where}]],
+    }
+    with (
+        patch.object(chroma, "_collection", coll),
+        patch.object(chroma, "_query_cache", cache),
+    ):
+        yield coll
+    cache.close()
+
+
+async def test_filtered_queries_are_cached(collection):
+    first = await chroma.query_similar([0.1, 0.2], where={"genre": "trap", "bpm": 140})
+    second = await chroma.query_similar([0.1, 0.2], where={"bpm": 140, "genre": "trap"})
+    other = await chroma.query_similar([0.1, 0.2], where={"genre": "house"})
+
+    assert second == first
+    assert other != first
+    assert collection.query.call_count == 2
+    stats = chroma.get_query_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["hit_rate_percent"] == pytest.approx(33.33)
+
+
+async def test_writes_invalidate_cached_results(collection):
+    await chroma.query_similar([0.1, 0.2])
+    await chroma.add_embedding("new", [0.3, 0.4], {"genre": "trap"})
+    refreshed = await chroma.query_similar([0.1, 0.2])
+    assert refreshed["ids"] == ["id2"]
+
+    await chroma.delete_embedding("new")
+    assert (await chroma.query_similar([0.1, 0.2]))["ids"] == ["id3"]
+    assert chroma.get_query_cache_stats()["invalidations"] == 2
+
+
+def test_result_from_before_a_write_is_not_stored():
+    cache = QueryResultCache()
+    key = cache.make_key("c", cache.generation("c"), [1.0], 5, None)
+    cache.bump_generation("c")  # write lands while the query is running
+    cache.set(key, {"ids": ["a"]})
+    assert cache.stats()["cached_queries"] == 0
+
+
+def test_cached_results_are_isolated_from_callers():
+    cache = QueryResultCache()
+    key = cache.make_key("c", 0, [1.0], 5, None)
+    result = {"ids": ["a"], "metadatas": [{"bpm": 120}]}
+    cache.set(key, result)
+    result["ids"].append("b")
+    result["metadatas"][0]["bpm"] = 90
+
+    hit = cache.get(key)
+    assert hit == {"ids": ["a"], "metadatas": [{"bpm": 120}]}
+    hit["metadatas"][0]["bpm"] = 60
+    assert cache.get(key)["metadatas"][0]["bpm"] == 120
+
+
+def test_lru_bound_and_ttl_sweep():
+    cache = QueryResultCache(max_entries=3, ttl_seconds=0.05, sweep_interval=0.02)
+    keys = [cache.make_key("c", 0, [float(i)], 5, None) for i in range(4)]
+    for key in keys[:3]:
+        cache.set(key, {"ids": []})
+    cache.get(keys[0])  # refresh: keys[1] becomes least recently used
+    cache.set(keys[3], {"ids": []})
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == {"ids": []}
+    assert cache.stats()["evictions"] == 1
+
+    deadline = time.monotonic() + 2
+    while cache.stats()["cached_queries"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.stats()["cached_queries"] == 0
+    cache.close()
@@ -213,3 +213,80 @@ def test_log_uncertain_writes_jsonl(tmp_path):
     record = json.loads(lines[0])
     assert record["task"] == "energy"
     assert record["predicted_label"] == "low"
+
+
+# ── vectorised batch inference ────────────────────────────────────────────────
+
+
+def _trained_clf(n_train: int = 120, n_features: int = 16) -> EnsembleClassifier:
+    pytest.importorskip("sklearn")
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(n_train, n_features)).astype(np.float32)
+    y = np.array(["low", "mid", "high"])[np.argmax(X[:, :3], axis=1)].tolist()
+    clf = EnsembleClassifier.__new__(EnsembleClassifier)
+    clf._models = {}
+    clf._label_encoders = {}
+    clf._classes = {}
+    return clf.fit(X, y, task="energy")
+
+
+def test_predict_batch_matches_per_row(tmp_path):
+    import samplemind.ai.classification.ensemble as mod
+
+    clf = _trained_clf()
+    X = np.random.default_rng(3).normal(size=(50, 16)).astype(np.float32)
+
+    with patch.object(mod, "ACTIVE_LEARNING_DIR", tmp_path):
+        batch = clf.predict_batch(X, task="energy")
+        rows = [clf.predict_one(x, task="energy") for x in X]
+
+    assert len(batch) == 50
+    assert batch.labels == [r.label for r in rows]
+    np.testing.assert_allclose(batch.confidences, [r.confidence for r in rows])
+    assert batch.is_uncertain.tolist() == [r.is_uncertain for r in rows]
+    assert batch[7].label == rows[7].label
+    assert batch[7].probabilities == pytest.approx(rows[7].probabilities)
+    assert batch[-1].model_votes == rows[-1].model_votes
+
+
+def test_predict_batch_logs_uncertain_rows_in_one_write(tmp_path):
+    import samplemind.ai.classification.ensemble as mod
+
+    clf = _fitted_clf()
+    X = np.random.rand(6, 20).astype(np.float32)
+    # Rows 0..5: third model disagrees → average confidence drops below threshold
+    clf._models["energy"]["flat"] = MagicMock()
+    clf._models["energy"]["flat"].predict_proba.return_value = np.tile(
+        [0.9, 0.05, 0.05], (6, 1)
+    )
+
+    with (
+        patch.object(mod, "ACTIVE_LEARNING_DIR", tmp_path),
+        patch.object(clf, "_log_uncertain") as per_row_log,
+    ):
+        batch = clf.predict_batch(X, task="energy")
+
+    per_row_log.assert_not_called()
+    assert batch.is_uncertain.all()
+    lines = (tmp_path / "uncertain.jsonl").read_text().splitlines()
+    assert len(lines) == 6
+
+
+def test_batched_and_per_row_agree_on_a_larger_model(tmp_path):
+    # Throughput of the two paths is tracked by the ensemble.predict_batch /
+    # ensemble.predict_per_row benchmarks; only their outputs are compared here
+    import samplemind.ai.classification.ensemble as mod
+
+    clf = _trained_clf(n_train=300)
+    X = np.random.default_rng(5).normal(size=(200, 16)).astype(np.float32)
+
+    with patch.object(mod, "ACTIVE_LEARNING_DIR", tmp_path):
+        rows = [clf.predict_one(x, task="energy") for x in X]
+        batch = clf.predict_batch(X, task="energy")
+
+    assert batch.labels == [r.label for r in rows]
+    np.testing.assert_allclose(batch.confidences, [r.confidence for r in rows])
+    assert batch.is_uncertain.tolist() == [r.is_uncertain for r in rows]
+    for got, want in zip(batch, rows, strict=True):
+        assert got.probabilities == pytest.approx(want.probabilities)
+        assert got.model_votes == want.model_votes
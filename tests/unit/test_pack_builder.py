@@ -211,3 +211,104 @@ def test_read_manifest_raises_for_missing_file(tmp_path):
     # Missing file → FileNotFoundError (zipfile.ZipFile raises before PackBuildError)
     with pytest.raises((PackBuildError, FileNotFoundError, OSError)):
         PackBuilder.read_manifest(str(tmp_path / "nonexistent.smpack"))
+
+
+# ── PackBuilder.build — streaming archive ─────────────────────────────────────
+
+
+def _write_tone(path: Path, fmt: str, seconds: float = 0.5) -> None:
+    import numpy as np
+    import soundfile as sf
+
+    sr = 22050
+    t = np.arange(int(sr * seconds)) / sr
+    sf.write(str(path), 0.3 * np.sin(2 * np.pi * 220 * t), sr, format=fmt)
+
+
+@pytest.mark.asyncio
+async def test_build_streams_audio_with_per_format_compression(tmp_path):
+    lib = tmp_path / "lib"
+    (lib / "a").mkdir(parents=True)
+    (lib / "b").mkdir()
+    _write_tone(lib / "a" / "kick_140_.wav", "WAV")
+    _write_tone(lib / "b" / "kick_140_.wav", "WAV")
+    _write_tone(lib / "a" / "pad.flac", "FLAC")
+    paths = [
+        str(lib / "a" / "kick_140_.wav"),
+        str(lib / "b" / "kick_140_.wav"),
+        str(lib / "a" / "pad.flac"),
+    ]
+
+    builder = PackBuilder.__new__(PackBuilder)
+    builder._index = None
+    events: list[tuple[str, int, int]] = []
+
+    output = await builder.build(
+        name="Stream Pack",
+        sample_paths=paths,
+        output_dir=str(tmp_path / "out"),
+        progress=lambda stage, done, total: events.append((stage, done, total)),
+        max_workers=2,
+    )
+
+    with zipfile.ZipFile(output) as zf:
+        infos = {info.filename: info for info in zf.infolist()}
+        manifest = json.loads(zf.read("manifest.json"))
+
+    assert set(infos) == {
+        "manifest.json",
+        "audio/kick_140_.wav",
+        "audio/kick_140_-2.wav",
+        "audio/pad.flac",
+        "preview.wav",
+    }
+    assert infos["audio/pad.flac"].compress_type == zipfile.ZIP_STORED
+    assert infos["audio/kick_140_.wav"].compress_type == zipfile.ZIP_DEFLATED
+    assert infos["audio/pad.flac"].file_size == (lib / "a" / "pad.flac").stat().st_size
+    assert [s["path"] for s in manifest["samples"]] == [
+        "audio/kick_140_.wav",
+        "audio/kick_140_-2.wav",
+        "audio/pad.flac",
+    ]
+    assert all(s["duration_s"] == pytest.approx(0.5) for s in manifest["samples"])
+    assert manifest["bpm_range"] == [140, 140]
+
+    assert [e for e in events if e[0] == "probe"][-1] == ("probe", 3, 3)
+    assert [e for e in events if e[0] == "write"] == [
+        ("write", i, 3) for i in (1, 2, 3)
+    ]
+    assert not list((tmp_path / "out").glob("*.part"))
+    assert PackBuilder.validate(output) == (True, [])
+
+
+@pytest.mark.asyncio
+async def test_build_uses_index_lookup_for_metadata(tmp_path):
+    from unittest.mock import MagicMock
+
+    from samplemind.core.search.faiss_index import IndexEntry
+
+    wav = tmp_path / "snare.wav"
+    _write_tone(wav, "WAV")
+    index = MagicMock()
+    index.get_entry.return_value = IndexEntry(
+        index_id=0,
+        path=str(wav),
+        filename="snare.wav",
+        bpm=95.0,
+        key="Dm",
+        genre_labels=["lofi"],
+    )
+
+    builder = PackBuilder.__new__(PackBuilder)
+    builder._index = index
+    output = await builder.build(
+        name="Lofi", sample_paths=[str(wav)], output_dir=str(tmp_path)
+    )
+
+    sample = PackBuilder.read_manifest(output)["samples"][0]
+    assert (sample["bpm"], sample["key"], sample["genre_labels"]) == (
+        95.0,
+        "Dm",
+        ["lofi"],
+    )
+    index.get_entry.assert_called_once_with(str(wav))
@@ -0,0 +1,255 @@
+"""
+Unit tests for samplemind.core.progress
+
+Covers delta coalescing and rate limiting, last-value retention, cross-thread
+publishing, the Redis stream bridge (with an in-memory fake client) and a
+1k-subscriber fan-out load test.  The batch progress WebSocket is exercised
+end to end through FastAPI's TestClient.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from samplemind.core.batch import BatchJob, BatchWorkerPool, SQLiteJobStore
+from samplemind.core.progress import (
+    ProgressBus,
+    RedisStreamBridge,
+    batch_topic,
+    get_progress_bus,
+    reset_progress_bus,
+)
+from samplemind.interfaces.api.routes import batch as batch_routes
+from samplemind.interfaces.api.routes import websocket as websocket_routes
+
+
+async def _drain(subscription) -> list[dict]:
+    return [delta async for delta in subscription]
+
+
+# ---------------------------------------------------------------------------
+# ProgressBus
+# ---------------------------------------------------------------------------
+
+
+async def test_deltas_only_carry_changed_fields():
+    bus = ProgressBus()
+    sub = bus.subscribe("t", min_interval=0)
+
+    bus.publish("t", {"status": "processing", "processed": 1, "total": 3})
+    assert await sub.next_delta() == {
+        "status": "processing",
+        "processed": 1,
+        "total": 3,
+    }
+
+    bus.publish("t", {"status": "processing", "processed": 2, "total": 3})
+    assert await sub.next_delta() == {"processed": 2}
+
+    bus.publish("t", {"status": "completed", "processed": 3}, final=True)
+    assert await sub.next_delta() == {"status": "completed", "processed": 3}
+    assert await sub.next_delta() is None
+    assert bus.subscriber_count("t") == 0
+
+
+async def test_rate_limit_coalesces_bursts():
+    """A burst of events between deliveries collapses into one delta."""
+    bus = ProgressBus()
+    sub = bus.subscribe("t", min_interval=0.05)
+
+    bus.publish("t", {"processed": 0})
+    assert await sub.next_delta() == {"processed": 0}
+
+    for i in range(1, 101):
+        bus.publish("t", {"processed": i})
+    bus.publish("t", {"status": "completed"}, final=True)
+
+    deltas = await _drain(sub)
+    assert deltas == [{"processed": 100, "status": "completed"}]
+    assert sub.coalesced >= 100
+
+
+async def test_late_subscriber_starts_from_snapshot():
+    bus = ProgressBus()
+    bus.publish("t", {"status": "processing", "processed": 5})
+    bus.publish("t", {"processed": 7})
+
+    sub = bus.subscribe("t", min_interval=0)
+    assert await sub.next_delta() == {"status": "processing", "processed": 7}
+    sub.close()
+    assert bus.latest("t") == {"status": "processing", "processed": 7}
+
+
+async def test_primed_state_is_not_resent():
+    bus = ProgressBus()
+    bus.publish("t", {"processed": 1})
+
+    sub = bus.subscribe("t", min_interval=0)
+    sub.prime({"processed": 1})
+    bus.publish("t", {"processed": 2}, final=True)
+
+    assert await _drain(sub) == [{"processed": 2}]
+
+
+async def test_publish_from_worker_thread():
+    bus = ProgressBus()
+    sub = bus.subscribe("t", min_interval=0.01)
+
+    def produce():
+        for i in range(50):
+            bus.publish("t", {"processed": i})
+            time.sleep(0.001)
+        bus.publish("t", {"status": "completed"}, final=True)
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    deltas = await asyncio.wait_for(_drain(sub), timeout=5)
+    thread.join()
+
+    assert sub.snapshot == {"processed": 49, "status": "completed"}
+    assert len(deltas) < 50
+
+
+def test_subscriptions_of_closed_loops_are_dropped():
+    bus = ProgressBus()
+
+    async def subscribe():
+        return bus.subscribe("t")
+
+    sub = asyncio.run(subscribe())  # the loop is closed on return
+    assert bus.subscriber_count("t") == 1
+
+    bus.publish("t", {"processed": 1})
+    assert bus.subscriber_count("t") == 0
+    assert sub._closed
+
+
+def test_retained_topics_are_bounded():
+    bus = ProgressBus(max_topics=10)
+    for i in range(25):
+        bus.publish(f"t{i}", {"i": i})
+    assert bus.latest("t0") is None
+    assert bus.latest("t24") == {"i": 24}
+
+
+# ---------------------------------------------------------------------------
+# Redis stream bridge
+# ---------------------------------------------------------------------------
+
+
+class FakeStreamClient:
+    def __init__(self) -> None:
+        self.entries: list[tuple[str, dict]] = []
+
+    def xadd(self, stream, fields, maxlen=None, approximate=True):
+        entry_id = f"{len(self.entries) + 1}-0"
+        self.entries.append((entry_id, {k: str(v) for k, v in fields.items()}))
+        return entry_id
+
+
+async def test_bridge_forwards_and_skips_own_entries():
+    local_bus, remote_bus = ProgressBus(), ProgressBus()
+    client = FakeStreamClient()
+    local = RedisStreamBridge(local_bus, client)
+    remote = RedisStreamBridge(remote_bus, client)
+    local_bus.attach_bridge(local)
+
+    sub = remote_bus.subscribe("batch:j1", min_interval=0)
+    local_bus.publish("batch:j1", {"processed": 3}, final=True)
+    assert len(client.entries) == 1
+
+    # The publishing node ignores its own entry; the other node delivers it
+    for _, fields in client.entries:
+        local._dispatch(fields)
+        remote._dispatch(fields)
+
+    assert await _drain(sub) == [{"processed": 3}]
+    assert local_bus.published == 1
+
+
+# ---------------------------------------------------------------------------
+# Load
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.performance
+async def test_fanout_to_1000_subscribers():
+    """1k concurrent subscribers each see the final state with bounded sends."""
+    bus = ProgressBus()
+    n_subscribers, n_events = 1000, 500
+    subs = [bus.subscribe("job", min_interval=0.02) for _ in range(n_subscribers)]
+    consumers = [asyncio.create_task(_drain(sub)) for sub in subs]
+
+    def produce():
+        for i in range(n_events):
+            bus.publish("job", {"processed": i + 1, "total": n_events})
+            time.sleep(0.0005)
+        bus.publish("job", {"status": "completed"}, final=True)
+
+    start = time.perf_counter()
+    producer = threading.Thread(target=produce)
+    producer.start()
+    results = await asyncio.wait_for(asyncio.gather(*consumers), timeout=30)
+    producer.join()
+    elapsed = time.perf_counter() - start
+
+    sends = sum(len(r) for r in results)
+    assert all(sub.snapshot["processed"] == n_events for sub in subs)
+    assert all(sub.snapshot["status"] == "completed" for sub in subs)
+    # Rate limit caps each socket at one delivery per interval (+ first/final)
+    assert max(len(r) for r in results) <= elapsed / 0.02 + 2
+    assert sends < n_subscribers * n_events
+    assert bus.subscriber_count() == 0
+
+
+# ---------------------------------------------------------------------------
+# WebSocket endpoint
+# ---------------------------------------------------------------------------
+
+
+def test_progress_websocket_pushes_until_completed(tmp_path):
+    reset_progress_bus()
+    store = SQLiteJobStore(tmp_path / "jobs.db")
+    gate = threading.Event()
+
+    def analyze(path: str) -> dict:
+        gate.wait(5)
+        return {"file": path}
+
+    pool = BatchWorkerPool(
+        store, max_workers=1, analyze_fn=analyze, use_processes=False
+    )
+    pool.add_listener(batch_routes._publish_job_progress)
+
+    app = FastAPI()
+    app.include_router(websocket_routes.router)
+    with patch.object(batch_routes, "_pool", pool):
+        pool.submit_job(BatchJob(job_id="j1", total_files=3), ["a", "b", "c"])
+        with TestClient(app).websocket_connect("/ws/progress/j1") as ws:
+            first = ws.receive_json()
+            assert first["job_id"] == "j1"
+            assert first["total"] == 3
+            gate.set()
+
+            messages = [first]
+            while messages[-1].get("status") not in ("completed", "failed"):
+                messages.append(ws.receive_json())
+
+    pool.shutdown()
+    store.close()
+    reset_progress_bus()
+
+    assert messages[-1]["status"] == "completed"
+    merged: dict = {}
+    for message in messages:
+        merged.update(message)
+    assert merged["processed"] == 3
+    assert merged["progress"] == 100.0
+    assert get_progress_bus().latest(batch_topic("j1")) is None
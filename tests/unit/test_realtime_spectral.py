@@ -1,6 +1,15 @@
+import time
+
 import numpy as np
+import pytest
+from scipy import signal
 
-from samplemind.core.processing.realtime_spectral import RealtimeSpectral
+from samplemind.core.processing.realtime_spectral import (
+    AudioRingBuffer,
+    PitchDetector,
+    RealtimeSpectral,
+    StreamingBandpass,
+)
 
 
 def test_realtime_spectral_sine_wave():
@@ -33,5 +42,85 @@ def test_realtime_spectral_sine_wave():
         assert abs(frame.pitch_hz - frequency) < 5.0
 
 
+def test_ring_buffer_wraps_in_order():
+    ring = AudioRingBuffer(8)
+    ring.write(np.arange(5, dtype=float))
+    ring.write(np.arange(5, 11, dtype=float))
+
+    assert len(ring) == 8
+    np.testing.assert_array_equal(ring.latest(8), np.arange(3, 11))
+    np.testing.assert_array_equal(ring.latest(3), [8, 9, 10])
+    with pytest.raises(ValueError):
+        AudioRingBuffer(4).latest(1)
+
+
+def test_streaming_bandpass_matches_one_shot_filter():
+    """Chunked filtering with carried state equals filtering the whole signal."""
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal(10_000)
+    stream = StreamingBandpass(44100, 50.0, 4000.0)
+
+    chunked = np.concatenate(
+        [stream.process(audio[i : i + 333]) for i in range(0, len(audio), 333)]
+    )
+    zi = signal.sosfilt_zi(stream.sos) * audio[0]
+    whole, _ = signal.sosfilt(stream.sos, audio, zi=zi)
+
+    np.testing.assert_allclose(chunked, whole, atol=1e-10)
+
+
+@pytest.mark.parametrize("sample_rate", [44100, 48000])
+@pytest.mark.parametrize("frequency", [82.41, 440.0, 1760.0])
+def test_yin_pitch_is_cent_accurate(sample_rate, frequency):
+    detector = PitchDetector(sample_rate)
+    t = np.arange(8192) / sample_rate
+    tone = 0.5 * np.sin(2 * np.pi * frequency * t)
+
+    detector.detect(tone[:4096])  # settle the filter
+    pitch, confidence = detector.detect(tone[4096:])
+
+    assert pitch is not None
+    assert abs(detector.get_pitch_cents(pitch, frequency)) < 5
+    assert confidence > 0.9
+
+
+def test_push_emits_a_frame_per_hop():
+    analyzer = RealtimeSpectral(sample_rate=44100, fft_size=2048, hop_length=512)
+    audio = 0.5 * np.sin(2 * np.pi * 440.0 * np.arange(44100) / 44100)
+
+    frames = []
+    for start in range(0, len(audio), 300):
+        frames.extend(analyzer.push(audio[start : start + 300]))
+
+    assert len(frames) == (len(audio) - 2048) // 512 + 1
+    assert frames[0].timestamp_ms == pytest.approx(2048 / 44.1)
+    assert frames[1].timestamp_ms - frames[0].timestamp_ms == pytest.approx(512 / 44.1)
+    assert abs(frames[-1].pitch_hz - 440.0) < 1.0
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("sample_rate", [44100, 48000])
+@pytest.mark.parametrize("block_size", [256, 512, 1024])
+def test_push_latency_within_buffer_period(sample_rate, block_size):
+    """Per-block processing stays well inside the audio buffer period."""
+    analyzer = RealtimeSpectral(
+        sample_rate=sample_rate, fft_size=2048, hop_length=512, copy_output=False
+    )
+    audio = np.random.default_rng(1).standard_normal(sample_rate * 3) * 0.1
+    period = block_size / sample_rate
+
+    timings = []
+    for start in range(0, len(audio) - block_size, block_size):
+        block = audio[start : start + block_size]
+        t0 = time.perf_counter()
+        analyzer.push(block)
+        timings.append(time.perf_counter() - t0)
+
+    median = float(np.median(timings))
+    p99 = float(np.percentile(timings, 99))
+    assert median < 0.25 * period
+    assert p99 < period
+
+
 if __name__ == "__main__":
     test_realtime_spectral_sine_wave()
@@ -0,0 +1,133 @@
+"""
+Unit tests for SimilarityDatabase library indexing.
+
+Tests:
+- Batched writes and checkpointed resume after an interruption
+- Files whose content is already indexed are skipped
+- Process-pool embedding matches in-process embedding
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from samplemind.core.similarity import AudioEmbeddingEngine, SimilarityDatabase
+from samplemind.core.similarity.embedding_engine import EMBEDDING_DIM, AudioEmbedding
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def embed_calls(monkeypatch):
+    """Fast deterministic embeddings (in-process) that record each call."""
+    calls: list[str] = []
+
+    def fake_generate(
+        self, file_path, include_metadata=True, use_music2vec=False, file_id=None
+    ):
+        file_path = Path(file_path)
+        calls.append(file_path.name)
+        seed = int(hashlib.sha1(file_path.read_bytes()).hexdigest()[:8], 16)
+        vector = (
+            np.random.default_rng(seed).normal(size=EMBEDDING_DIM).astype(np.float32)
+        )
+        return AudioEmbedding(
+            file_id=file_id or self._compute_file_hash(file_path),
+            file_path=file_path,
+            embedding=vector / np.linalg.norm(vector),
+            metadata={"file_path": str(file_path), "file_name": file_path.name},
+        )
+
+    monkeypatch.setattr(AudioEmbeddingEngine, "generate_embedding", fake_generate)
+    return calls
+
+
+@pytest.fixture
+def library(tmp_path):
+    folder = tmp_path / "library"
+    (folder / "drums").mkdir(parents=True)
+    for i in range(10):
+        sub = folder / "drums" if i % 2 else folder
+        (sub / f"sample_{i:02d}.wav").write_bytes(f"RIFF{i}".encode() * 32)
+    (folder / "notes.txt").write_text("not audio")
+    return folder
+
+
+@pytest.fixture
+def db(tmp_path):
+    return SimilarityDatabase(persist_directory=str(tmp_path / "db"))
+
+
+def test_interrupted_index_resumes_from_checkpoint(db, library, embed_calls):
+    def interrupt_after_five(current, total, filename):
+        if len(embed_calls) == 5:
+            raise Interrupted
+
+    with pytest.raises(Interrupted):
+        db.index_library(
+            library, max_workers=1, batch_size=2, progress_callback=interrupt_after_five
+        )
+    assert db.collection.count() == 4  # two full batches were written
+    assert db._checkpoint_path(library).exists()
+
+    embed_calls.clear()
+    indexed = db.index_library(library, max_workers=1, batch_size=2)
+
+    stats = db.last_index_stats
+    assert stats.resumed
+    # The 5th file was embedded but never written, so it is redone
+    assert len(embed_calls) == 6
+    assert indexed == 6
+    assert stats.skipped == 4
+    assert db.collection.count() == 10
+    assert not db._checkpoint_path(library).exists()
+    assert stats.files_per_second > 0
+
+
+def test_already_indexed_content_is_skipped(db, library, embed_calls):
+    assert db.index_library(library, max_workers=1) == 10
+
+    # A copy of existing content under a new name is not embedded again
+    (library / "copy_of_03.wav").write_bytes(
+        (library / "drums" / "sample_03.wav").read_bytes()
+    )
+    (library / "new.wav").write_bytes(b"RIFF-new" * 32)
+    embed_calls.clear()
+
+    assert db.index_library(library, max_workers=1) == 1
+    assert embed_calls == ["new.wav"]
+    assert db.last_index_stats.skipped == 11
+    assert db.collection.count() == 11
+
+
+def test_process_pool_embeddings_match_in_process(tmp_path):
+    sf = pytest.importorskip("soundfile")
+    sr = 22050
+    t = np.linspace(0, 0.5, sr // 2, endpoint=False)
+    paths = []
+    for i, freq in enumerate([110.0, 440.0, 1760.0]):
+        path = tmp_path / f"tone_{i}.wav"
+        sf.write(path, 0.5 * np.sin(2 * np.pi * freq * t), sr)
+        paths.append(path)
+    paths.insert(1, tmp_path / "missing.wav")
+
+    engine = AudioEmbeddingEngine()
+    progress = []
+    pooled = engine.generate_embeddings_batch(
+        paths, max_workers=2, progress_callback=lambda c, n, f: progress.append(c)
+    )
+    serial = engine.generate_embeddings_batch(paths, max_workers=1)
+
+    assert [e.file_path.name for e in pooled] == [
+        "tone_0.wav",
+        "tone_1.wav",
+        "tone_2.wav",
+    ]
+    assert progress == [1, 2, 3, 4]
+    for a, b in zip(pooled, serial, strict=True):
+        assert a.file_id == b.file_id
+        np.testing.assert_allclose(a.embedding, b.embedding, atol=1e-5)
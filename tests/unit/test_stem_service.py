@@ -0,0 +1,187 @@
+"""
+Unit tests for the warm-model stem separation service.
+
+A small stand-in model (fixed per-stem gains, no weights to download) runs
+on CPU, so chunking, cross-fading, worker reuse and stats are testable.
+
+Tests:
+- Chunked output matches whole-file separation; chunks stay bounded
+- Mono input, stem selection and two-stem mode
+- The model is loaded once and reused across files and batches
+- Worker processes keep their model across batches
+- StemSeparationEngine delegates to the service
+"""
+
+import functools
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from samplemind.core.processing.stem_separation import StemSeparationEngine
+from samplemind.core.processing.stem_service import StemSeparationService
+
+sf = pytest.importorskip("soundfile")
+
+SR = 8000
+GAINS = {"vocals": 0.1, "drums": 0.2, "bass": 0.3, "other": 0.4}
+
+
+class GainModel:
+    """Stand-in separator: each stem is the mix scaled by a fixed gain."""
+
+    sources = tuple(GAINS)
+    samplerate = SR
+    audio_channels = 2
+
+    def __init__(self, load_log: str | None = None) -> None:
+        self.chunk_frames: list[int] = []
+        if load_log:
+            with open(load_log, "a") as f:
+                f.write(f"{os.getpid()}\n")
+
+    def separate(self, mix: np.ndarray) -> np.ndarray:
+        assert mix.shape[0] == self.audio_channels
+        self.chunk_frames.append(mix.shape[1])
+        gains = np.array(list(GAINS.values()), dtype=np.float32)[:, None, None]
+        return gains * mix[None]
+
+
+def _tone(path: Path, seconds: float, channels: int = 2) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    audio = 0.5 * np.sin(2 * np.pi * 220 * t)
+    audio = np.stack([audio, audio * 0.5], axis=1)[:, :channels].astype(np.float32)
+    sf.write(path, audio, SR, subtype="FLOAT")
+    return audio
+
+
+@pytest.fixture
+def tracks(tmp_path):
+    folder = tmp_path / "in"
+    folder.mkdir()
+    return [folder / f"track_{i}.wav" for i in range(4)]
+
+
+def test_chunked_output_matches_whole_file(tmp_path):
+    audio = _tone(tmp_path / "mix.wav", 2.05)
+    model = GainModel()
+    service = StemSeparationService(
+        model_factory=lambda: model,
+        model_name="gain",
+        chunk_seconds=0.25,
+        chunk_overlap=0.2,
+    )
+
+    result = service.separate(tmp_path / "mix.wav", output_directory=tmp_path / "out")
+
+    assert result.output_directory == (tmp_path / "out" / "gain" / "mix").resolve()
+    assert set(result.stems) == set(GAINS)
+    for name, gain in GAINS.items():
+        stem, sr = sf.read(result.stems[name], dtype="float32")
+        assert sr == SR
+        np.testing.assert_allclose(stem, audio * gain, atol=1e-6)
+    # Memory is bounded by the chunk, not the 2 s track
+    assert len(model.chunk_frames) > 8
+    assert max(model.chunk_frames) == int(0.25 * SR)
+    assert service.stats.files == 1
+    assert service.stats.audio_seconds == pytest.approx(2.05)
+    assert service.stats.realtime_factor > 0
+
+
+def test_mono_input_stem_selection_and_two_stems(tmp_path):
+    audio = _tone(tmp_path / "mono.wav", 0.5, channels=1)
+    service = StemSeparationService(
+        model_factory=GainModel, model_name="gain", chunk_seconds=0.1
+    )
+
+    selected = service.separate(
+        tmp_path / "mono.wav", tmp_path / "a", stems=["drums", "bass"]
+    )
+    assert set(selected.stems) == {"drums", "bass"}
+    drums, _ = sf.read(selected.stems["drums"], dtype="float32", always_2d=True)
+    np.testing.assert_allclose(drums, audio * 0.2, atol=1e-6)
+
+    split = service.separate(tmp_path / "mono.wav", tmp_path / "b", two_stems="vocals")
+    assert set(split.stems) == {"vocals", "no_vocals"}
+    rest, _ = sf.read(split.stems["no_vocals"], dtype="float32", always_2d=True)
+    np.testing.assert_allclose(rest, audio * 0.9, atol=1e-6)
+
+
+def test_model_is_loaded_once_for_many_files(tmp_path, tracks):
+    for path in tracks:
+        _tone(path, 0.3)
+    loads = []
+    service = StemSeparationService(
+        model_factory=lambda: loads.append(1) or GainModel(), model_name="gain"
+    )
+
+    progress = []
+    results = service.separate_batch(
+        tracks, tmp_path / "out", progress_callback=lambda c, t: progress.append((c, t))
+    )
+    service.separate_batch(tracks[:1], tmp_path / "out2")
+
+    assert [r.output_directory.name for r in results] == [p.stem for p in tracks]
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    assert len(loads) == 1
+    assert service.stats.model_loads == 1
+    assert service.stats.files == 5
+
+
+def test_batch_reports_failures_after_processing_the_rest(tmp_path, tracks):
+    for path in tracks[1:]:
+        _tone(path, 0.2)
+    service = StemSeparationService(model_factory=GainModel, model_name="gain")
+
+    with pytest.raises(RuntimeError, match="1 of 4"):
+        service.separate_batch(tracks, tmp_path / "out")
+    assert service.stats.files == 3
+    assert service.stats.failed == 1
+    assert (tmp_path / "out" / "gain" / "track_3" / "bass.wav").exists()
+
+
+def test_worker_pool_keeps_models_across_batches(tmp_path, tracks):
+    for path in tracks:
+        _tone(path, 0.3)
+    load_log = tmp_path / "loads.txt"
+    with StemSeparationService(
+        model_factory=functools.partial(GainModel, str(load_log)),
+        model_name="gain",
+        max_workers=2,
+        chunk_seconds=0.1,
+    ) as service:
+        first = service.separate_batch(tracks, tmp_path / "out")
+        second = service.separate_batch(tracks, tmp_path / "out2")
+
+    assert len(first) == len(second) == 4
+    stem, _ = sf.read(second[2].stems["other"], dtype="float32")
+    np.testing.assert_allclose(
+        stem, sf.read(tracks[2], dtype="float32")[0] * 0.4, atol=1e-6
+    )
+    # One load per worker process, not per file or per batch
+    loads = len(load_log.read_text().split())
+    assert loads <= 2
+    # Counted as workers report them, not when the pool is created
+    assert 1 <= service.stats.model_loads <= loads
+    assert service.stats.files == 8
+
+
+def test_engine_delegates_to_in_process_service(tmp_path, monkeypatch):
+    audio = _tone(tmp_path / "mix.wav", 0.4)
+    monkeypatch.setattr(
+        StemSeparationEngine, "_assert_dependency", staticmethod(lambda: None)
+    )
+    engine = StemSeparationEngine(model="mdx_extra", in_process=True)
+    engine._service = StemSeparationService(
+        model_factory=GainModel, model_name=engine.model
+    )
+
+    result = engine.separate(tmp_path / "mix.wav", output_directory=tmp_path / "out")
+
+    assert result.command == []
+    assert result.output_directory == (tmp_path / "out" / "mdx_extra" / "mix").resolve()
+    vocals, _ = sf.read(result.stems["vocals"], dtype="float32")
+    np.testing.assert_allclose(vocals, audio * 0.1, atol=1e-6)
+    engine.close()
+    assert engine._service is None
@@ -0,0 +1,122 @@
+"""
+Unit tests for the micro-benchmark suite.
+
+Tests:
+- Synthetic fixtures are byte-identical across runs
+- measure() calibrates fast operations and reports per-op times
+- Missing optional dependencies skip a benchmark instead of failing
+- Baseline comparison flags regressions beyond the threshold
+"""
+
+import hashlib
+
+import pytest
+
+from samplemind.utils import benchmarking
+from samplemind.utils.benchmarking import (
+    BenchmarkSkipped,
+    compare_reports,
+    generate_fixtures,
+    has_regressions,
+    load_report,
+    measure,
+    run_suite,
+    save_report,
+)
+
+
+def _digest(paths):
+    return {
+        name: hashlib.sha256(p.read_bytes()).hexdigest() for name, p in paths.items()
+    }
+
+
+def test_fixtures_are_deterministic(tmp_path):
+    first = generate_fixtures(tmp_path / "a")
+    second = generate_fixtures(tmp_path / "b")
+    assert set(first) == {"drum_loop", "chord_pad", "noise_burst"}
+    assert _digest(first) == _digest(second)
+
+
+def test_measure_calibrates_fast_operations():
+    calls = []
+    result = measure(
+        "noop", lambda: calls.append(1), rounds=3, warmup=1, min_round_ms=1.0
+    )
+
+    assert result.ops_per_round > 1
+    assert len(calls) > 3 * result.ops_per_round
+    assert 0 < result.min_ms <= result.median_ms <= result.p95_ms
+    assert result.ops_per_second > 0
+
+
+def test_run_suite_reports_skipped_benchmarks(tmp_path, monkeypatch):
+    def needs_extra(fixtures):
+        raise BenchmarkSkipped("extra not installed")
+
+    def with_cleanup(fixtures):
+        try:
+            yield lambda: fixtures["noise_burst"].stat()
+        finally:
+            cleaned.append(True)
+
+    cleaned = []
+    monkeypatch.setitem(benchmarking.BENCHMARKS, "test.skipped", needs_extra)
+    monkeypatch.setitem(benchmarking.BENCHMARKS, "test.generator", with_cleanup)
+
+    report = run_suite(
+        ["test.skipped", "test.generator"], fixtures_dir=tmp_path, rounds=2
+    )
+
+    assert report["results"]["test.skipped"]["skipped"] == "extra not installed"
+    assert report["results"]["test.generator"]["median_ms"] > 0
+    assert cleaned == [True]
+    save_report(report, tmp_path / "report.json")
+    assert load_report(tmp_path / "report.json")["results"] == report["results"]
+
+    with pytest.raises(ValueError):
+        run_suite(["does.not.exist"], fixtures_dir=tmp_path)
+
+
+def _report(**medians):
+    return {
+        "schema": 1,
+        "results": {
+            name: {"median_ms": ms, "min_ms": ms * 0.95, "skipped": None}
+            for name, ms in medians.items()
+        },
+    }
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = _report(fast=1.0, slow=10.0, steady=5.0, gone=1.0)
+    current = _report(fast=0.5, slow=13.0, steady=5.5, added=2.0)
+    current["results"]["steady"]["skipped"] = None
+
+    by_name = {c.name: c for c in compare_reports(baseline, current, threshold=0.2)}
+
+    assert by_name["slow"].status == "regressed"
+    assert by_name["slow"].change == pytest.approx(0.3)
+    assert by_name["fast"].status == "improved"
+    assert by_name["steady"].status == "ok"
+    assert by_name["gone"].status == "missing"
+    assert by_name["added"].status == "new"
+    assert has_regressions(list(by_name.values()))
+
+    # Per-benchmark thresholds and noisy runs
+    relaxed = compare_reports(
+        baseline, current, threshold=0.2, thresholds={"slow": 0.5}
+    )
+    assert not has_regressions(relaxed)
+    current["results"]["slow"]["min_ms"] = 9.0  # fastest round still within baseline
+    assert not has_regressions(compare_reports(baseline, current, threshold=0.2))
+
+
+def test_skipped_benchmarks_never_fail_the_gate():
+    baseline = _report(faiss=1.0)
+    current = _report(faiss=100.0)
+    current["results"]["faiss"]["skipped"] = "faiss not installed"
+
+    [comparison] = compare_reports(baseline, current)
+    assert comparison.status == "skipped"
+    assert not has_regressions([comparison])
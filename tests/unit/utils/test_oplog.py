@@ -0,0 +1,154 @@
+"""
+Unit tests for append-only record persistence.
+
+Tests:
+- Snapshot + log round trip, compaction and legacy JSON files
+- Torn final entries and crashes between compaction steps
+- Substring index agrees with a linear scan
+- Favorites, recent files and sessions persist through the log
+"""
+
+import json
+import random
+
+from samplemind.core.history.recent_files import RecentFilesManager
+from samplemind.core.library.favorites import FavoritesManager, Sample
+from samplemind.core.session.session_manager import AnalysisResult, SessionManager
+from samplemind.utils.oplog import OpLog, SubstringIndex
+
+
+def test_oplog_round_trip_and_compaction(tmp_path):
+    log = OpLog(tmp_path / "record.json", compact_every=3)
+    log.compact({"items": []})
+    for i in range(2):
+        log.append({"op": "add", "value": i})
+    assert not log.needs_compaction
+
+    state, ops = OpLog(tmp_path / "record.json").load()
+    assert state == {"items": []}
+    assert [op["value"] for op in ops] == [0, 1]
+
+    log.append({"op": "add", "value": 2})
+    assert log.needs_compaction
+    log.compact({"items": [0, 1, 2]})
+    assert not log.log_path.exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+    state, ops = OpLog(tmp_path / "record.json").load()
+    assert state == {"items": [0, 1, 2]}
+    assert ops == []
+
+
+def test_oplog_reads_legacy_json_as_snapshot(tmp_path):
+    (tmp_path / "old.json").write_text(json.dumps([{"a": 1}]))
+    state, ops = OpLog(tmp_path / "old.json").load()
+    assert state == [{"a": 1}]
+    assert ops == []
+
+
+def test_oplog_survives_torn_append_and_interrupted_compaction(tmp_path):
+    log = OpLog(tmp_path / "record.json")
+    log.compact([])
+    log.append({"op": "add", "value": 1})
+    with open(log.log_path, "a") as f:
+        f.write('{"op": "add", "val')  # crash mid-write
+
+    reopened = OpLog(tmp_path / "record.json")
+    _, ops = reopened.load()
+    assert [op["value"] for op in ops] == [1]
+    reopened.append({"op": "add", "value": 2})
+    _, ops = OpLog(tmp_path / "record.json").load()
+    assert [op["value"] for op in ops] == [1, 2]
+
+    # Snapshot replaced but the process died before truncating the log
+    stale = log.log_path.read_bytes()
+    reopened.compact([1, 2])
+    log.log_path.write_bytes(stale)
+    state, ops = OpLog(tmp_path / "record.json").load()
+    assert state == [1, 2]
+    assert ops == []
+
+
+def test_substring_index_matches_linear_scan():
+    rng = random.Random(3)
+    words = ["kick", "snare", "hat", "808", "vox", "pad", "Bass", "lo-fi"]
+    texts = {
+        f"s{i}": ["_".join(rng.sample(words, 2)) + ".wav", rng.choice(words)]
+        for i in range(300)
+    }
+    index = SubstringIndex()
+    for key, fields in texts.items():
+        index.add(key, fields)
+    for key in list(texts)[::7]:
+        index.remove(key)
+        del texts[key]
+
+    for query in ["kick", "BASS", "ar", "8", "", "e_8", "lo-fi_p", "zzz", ".wav"]:
+        expected = [
+            k for k, fs in texts.items() if any(query.lower() in f.lower() for f in fs)
+        ]
+        assert index.search(query) == expected
+
+
+def test_favorites_append_instead_of_rewriting(tmp_path):
+    manager = FavoritesManager(str(tmp_path), compact_every=10_000)
+    manager.create_collection("Drums")
+    snapshot = tmp_path / "drums.json"
+    snapshot_size = snapshot.stat().st_size
+
+    for i in range(1000):
+        sample = Sample(
+            f"id{i}", f"kick_{i:04d}.wav", f"/lib/kick_{i:04d}.wav", {"genre": "techno"}
+        )
+        manager.add_to_collection("drums", sample)
+        if i % 100 == 0:
+            manager.add_to_favorites(sample)
+    manager.remove_from_collection("drums", "id5")
+    manager.rename_collection("drums", "Techno Drums")
+
+    assert snapshot.stat().st_size == snapshot_size  # only the log grew
+    assert len((tmp_path / "drums.log").read_text().splitlines()) == 1002
+
+    reloaded = FavoritesManager(str(tmp_path))
+    drums = reloaded.get_collection("drums")
+    assert drums.name == "Techno Drums"
+    assert drums.get_size() == 999
+    assert [s.id for s in drums.search_samples("kick_000")] == [
+        f"id{i}" for i in range(10) if i != 5
+    ]
+    assert reloaded.get_collection("favorites").get_size() == 10
+    assert set(reloaded.search_all_collections("KICK_0100")) == {"drums", "favorites"}
+    assert len(drums.search_samples("techno")) == 999
+
+
+def test_recent_files_and_sessions_replay_log(tmp_path):
+    recent = RecentFilesManager(max_history=3, config_dir=tmp_path, compact_every=4)
+    files = []
+    for i in range(5):
+        path = tmp_path / f"{i}.wav"
+        path.write_bytes(b"\0")
+        files.append(path)
+        recent.add(path)
+    recent.add(files[2])
+    recent.remove(files[4])
+
+    reloaded = RecentFilesManager(max_history=3, config_dir=tmp_path)
+    assert [f.name for f in reloaded.get_all()] == ["2.wav", "3.wav"]
+
+    sessions = SessionManager(str(tmp_path / "sessions"))
+    session = sessions.create_session("Mix")
+    for i in range(3):
+        sessions.add_result(
+            session.session_id, AnalysisResult(f"f{i}", f"{i}.wav", f"/x/{i}.wav")
+        )
+    sessions.remove_result(session.session_id, "f1")
+    sessions.add_note(session.session_id, "check the low end")
+    sessions.archive_session(session.session_id)
+
+    restored = SessionManager(str(tmp_path / "sessions")).get_session(
+        session.session_id
+    )
+    assert sorted(restored.results) == ["f0", "f2"]
+    assert restored.notes == session.notes
+    assert restored.status.value == "archived"
+    assert restored.modified_at == session.modified_at